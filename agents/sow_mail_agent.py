@@ -6,9 +6,12 @@ Fırsat analizinden otomatik SOW ve mail şablonu oluşturur
 Sample SOW formatını kullanarak profesyonel SOW ve mail hazırlar
 """
 
+import hashlib
 import json
 import logging
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -37,6 +40,48 @@ except ImportError:
     DOCUMENT_PROCESSOR_AVAILABLE = False
     logger.warning("DocumentProcessor not available")
 
+# Bölüm önbelleği: (bölüm adı, girdi hash'i) -> üretilmiş metin
+SECTION_CACHE_SIZE = 256
+# PDF'lerin hangi içerikten üretildiğini tutan dosya (çıktı klasöründe)
+RENDER_MANIFEST = ".sow_render_cache.json"
+
+
+def _content_hash(*parts: Any) -> str:
+    """Bölüm girdilerinin kararlı hash'i (dict sırası önemsiz)"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Modül düzeyinde önbellek: make_sow_mail_agent her çağrıda yeni ajan üretse de
+# aynı girdili bölümler tekrar üretilmez. Yalnızca girdisinin saf fonksiyonu
+# olan bölümler (tablo / metin / HTML) saklanır; LLM çıktıları saklanmaz.
+_section_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_section_cache_lock = threading.Lock()
+section_cache_stats = {"hits": 0, "misses": 0}
+
+
+def memoized_section(section: str, inputs: Any, build):
+    """``build()`` sonucunu (bölüm, girdi hash'i) anahtarıyla sakla; girdi aynıysa yeniden kullan"""
+    key = (section, _content_hash(inputs))
+    with _section_cache_lock:
+        if key in _section_cache:
+            _section_cache.move_to_end(key)
+            section_cache_stats["hits"] += 1
+            return _section_cache[key]
+    value = build()
+    with _section_cache_lock:
+        section_cache_stats["misses"] += 1
+        _section_cache[key] = value
+        if len(_section_cache) > SECTION_CACHE_SIZE:
+            _section_cache.popitem(last=False)
+    return value
+
+
+def clear_section_cache() -> None:
+    with _section_cache_lock:
+        _section_cache.clear()
+        section_cache_stats.update(hits=0, misses=0)
+
 
 class SOWMailAgent:
     """SOW ve Mail oluşturan ajan"""
@@ -50,6 +95,25 @@ class SOWMailAgent:
         self.sample_sow_template = None
         self._load_sample_sow_template()
     
+    @staticmethod
+    def _read_render_manifest(folder: Path) -> Dict[str, str]:
+        try:
+            return json.loads((folder / RENDER_MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+    
+    def _pdf_is_current(self, pdf_path: Path, content_key: str) -> bool:
+        """PDF mevcut ve aynı içerikten üretilmişse True (yeniden render gerekmez)"""
+        return pdf_path.exists() and self._read_render_manifest(pdf_path.parent).get(pdf_path.name) == content_key
+    
+    def _remember_pdf(self, pdf_path: Path, content_key: str) -> None:
+        manifest = self._read_render_manifest(pdf_path.parent)
+        manifest[pdf_path.name] = content_key
+        try:
+            (pdf_path.parent / RENDER_MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"[SOW PDF] Render manifest could not be written: {e}")
+    
     def _load_sample_sow_template(self):
         """Sample SOW formatını yükle"""
         sample_sow_path = Path("samples") / "SAMPLE SOW FOR CHTGPT.pdf"
@@ -172,8 +236,8 @@ FOR HOTEL ACCOMMODATIONS AND MEETING SPACE
                 opp_info, event_req, commercial, compliance, vendor_profile
             )
         
-        # HTML formatı oluştur
-        sow_html = self._convert_markdown_to_html(sow_text)
+        # HTML formatı oluştur (aynı SOW metni için önbellekten)
+        sow_html = memoized_section('sow_html', sow_text, lambda: self._convert_markdown_to_html(sow_text))
         
         # PDF oluşturma (opsiyonel - output_folder varsa)
         sow_pdf_path = None
@@ -219,20 +283,28 @@ FOR HOTEL ACCOMMODATIONS AND MEETING SPACE
         sow_text = sow_result.get('sow_text', '')
         
         # Internal PDF (kullanıcıya - tüm detaylar dahil)
+        # Her PDF, üretildiği içeriğin hash'iyle kaydedilir; içerik değişmediyse mevcut dosya kullanılır
         internal_pdf_path = folder / f"sow_internal_{opportunity_code}.pdf"
+        internal_title = f"Statement of Work (SOW) - Internal - {opportunity_code}"
+        internal_key = _content_hash('internal', sow_text, internal_title)
         try:
-            markdown_to_pdf(
-                markdown_text=sow_text,
-                output_path=str(internal_pdf_path),
-                title=f"Statement of Work (SOW) - Internal - {opportunity_code}"
-            )
-            logger.info(f"[SOW PDF] Internal PDF created: {internal_pdf_path}")
+            if self._pdf_is_current(internal_pdf_path, internal_key):
+                logger.info(f"[SOW PDF] Internal PDF unchanged, reusing: {internal_pdf_path}")
+            else:
+                markdown_to_pdf(
+                    markdown_text=sow_text,
+                    output_path=str(internal_pdf_path),
+                    title=internal_title
+                )
+                if internal_pdf_path.exists():
+                    self._remember_pdf(internal_pdf_path, internal_key)
+                logger.info(f"[SOW PDF] Internal PDF created: {internal_pdf_path}")
         except Exception as e:
             logger.error(f"[SOW PDF] Error creating internal PDF: {e}", exc_info=True)
             internal_pdf_path = None
         
         # Hotel PDF (otellere gönderilecek - markdown'dan)
-        hotel_sow_text = self._create_hotel_version_sow(sow_text)
+        hotel_sow_text = memoized_section('hotel_sow_text', sow_text, lambda: self._create_hotel_version_sow(sow_text))
         hotel_pdf_path = folder / f"sow_hotel_{opportunity_code}.pdf"
         try:
             logger.info(f"[SOW PDF] Creating hotel PDF: {hotel_pdf_path}")
@@ -242,13 +314,21 @@ FOR HOTEL ACCOMMODATIONS AND MEETING SPACE
                 logger.warning(f"[SOW PDF] Hotel SOW text is empty, using full SOW text")
                 hotel_sow_text = sow_text
             
-            logger.info(f"[SOW PDF] Calling markdown_to_pdf for hotel PDF...")
-            success = markdown_to_pdf(
-                markdown_text=hotel_sow_text,
-                output_path=str(hotel_pdf_path),
-                title=f"Statement of Work (SOW) - {opportunity_code}"
-            )
-            logger.info(f"[SOW PDF] markdown_to_pdf returned: {success}")
+            hotel_title = f"Statement of Work (SOW) - {opportunity_code}"
+            hotel_key = _content_hash('hotel', hotel_sow_text, hotel_title)
+            if self._pdf_is_current(hotel_pdf_path, hotel_key):
+                logger.info(f"[SOW PDF] Hotel PDF unchanged, reusing: {hotel_pdf_path}")
+                success = True
+            else:
+                logger.info(f"[SOW PDF] Calling markdown_to_pdf for hotel PDF...")
+                success = markdown_to_pdf(
+                    markdown_text=hotel_sow_text,
+                    output_path=str(hotel_pdf_path),
+                    title=hotel_title
+                )
+                logger.info(f"[SOW PDF] markdown_to_pdf returned: {success}")
+                if success and hotel_pdf_path.exists():
+                    self._remember_pdf(hotel_pdf_path, hotel_key)
             logger.info(f"[SOW PDF] Hotel PDF exists: {hotel_pdf_path.exists()}")
             
             if success and hotel_pdf_path.exists():
@@ -279,19 +359,30 @@ FOR HOTEL ACCOMMODATIONS AND MEETING SPACE
             # Analiz verilerinden ve SOW metninden SOW verilerini çıkar
             if report_data:
                 logger.info(f"[SOW PDF] Extracting SOW data from report_data and sow_text...")
-                sow_data = self._extract_sow_data_for_gpt_pdf(report_data, sow_text)
+                sow_data = memoized_section(
+                    'gpt_sow_data',
+                    (report_data, sow_text),
+                    lambda: self._extract_sow_data_for_gpt_pdf(report_data, sow_text),
+                )
                 logger.info(f"[SOW PDF] Extracted SOW data keys: {list(sow_data.keys()) if sow_data else 'None'}")
             else:
                 logger.warning(f"[SOW PDF] No report_data provided, using placeholder data")
                 sow_data = None
             
-            logger.info(f"[SOW PDF] Calling generate_gpt_style_sow_pdf...")
-            success = generate_gpt_style_sow_pdf(
-                output_path=str(hotel_gpt_pdf_path),
-                opportunity_code=opportunity_code,
-                sow_data=sow_data
-            )
-            logger.info(f"[SOW PDF] generate_gpt_style_sow_pdf returned: {success}")
+            gpt_key = _content_hash('hotel_gpt', opportunity_code, sow_data)
+            if self._pdf_is_current(hotel_gpt_pdf_path, gpt_key):
+                logger.info(f"[SOW PDF] GPT format Hotel SOW PDF unchanged, reusing: {hotel_gpt_pdf_path}")
+                success = True
+            else:
+                logger.info(f"[SOW PDF] Calling generate_gpt_style_sow_pdf...")
+                success = generate_gpt_style_sow_pdf(
+                    output_path=str(hotel_gpt_pdf_path),
+                    opportunity_code=opportunity_code,
+                    sow_data=sow_data
+                )
+                logger.info(f"[SOW PDF] generate_gpt_style_sow_pdf returned: {success}")
+                if success and hotel_gpt_pdf_path.exists():
+                    self._remember_pdf(hotel_gpt_pdf_path, gpt_key)
             logger.info(f"[SOW PDF] File exists check: {hotel_gpt_pdf_path.exists()}")
             
             if success and hotel_gpt_pdf_path.exists():
@@ -1089,10 +1180,12 @@ IMPORTANT:
         # Sleeping Room Table
         # Eğer date_range "unknown" ise, tablo yerine basit format kullan
         if date_range and date_range.lower() not in ['unknown', 'tbd', '']:
-            sleeping_room_table = self._build_sleeping_room_table(
-                date_range,
-                event_req.get('room_block_plan', ''),
-                event_req.get('participants_target', 0)
+            room_block_plan = event_req.get('room_block_plan', '')
+            participants_target = event_req.get('participants_target', 0)
+            sleeping_room_table = memoized_section(
+                'sleeping_room_table',
+                (date_range, room_block_plan, participants_target),
+                lambda: self._build_sleeping_room_table(date_range, room_block_plan, participants_target),
             )
         else:
             # Basit format (tarih bilgisi yoksa)
@@ -1110,7 +1203,11 @@ IMPORTANT:
         # Function Space Table
         # Eğer date_range "unknown" ise, basit format kullan
         if date_range and date_range.lower() not in ['unknown', 'tbd', '']:
-            function_space_table = self._build_function_space_table(date_range, event_req)
+            function_space_table = memoized_section(
+                'function_space_table',
+                (date_range, event_req.get('participants_target', 0), event_req.get('meeting_spaces'), event_req.get('av_requirements')),
+                lambda: self._build_function_space_table(date_range, event_req),
+            )
         else:
             # Basit format (tarih bilgisi yoksa)
             meeting_spaces = event_req.get('meeting_spaces', 'TBD')
@@ -1121,7 +1218,11 @@ IMPORTANT:
                 function_space_table = f"**Meeting Spaces:** TBD\n**AV Requirements:** TBD"
         
         # Detailed AV Requirements
-        detailed_av = self._build_detailed_av_requirements(event_req)
+        detailed_av = memoized_section(
+            'detailed_av',
+            (event_req.get('participants_target', 120), event_req.get('av_requirements', '')),
+            lambda: self._build_detailed_av_requirements(event_req),
+        )
         
         # F&B Requirements
         fnb_req = event_req.get('fnb_requirements', 'Light refreshments, coffee service')
@@ -107,6 +107,33 @@ export async function getAnalysisLogs(analysisResultId: number, limit = 100): Pr
   return data || []
 }
 
+export type AnalysisStreamEvent =
+  | ({ type: 'log' } & Omit<AnalysisLog, 'analysis_result_id'>)
+  | { type: 'status'; status: string }
+  | { type: 'end' }
+
+/**
+ * Subscribe to the live progress stream (Server-Sent Events) of an analysis job.
+ * Returns a function that closes the stream.
+ */
+export function subscribeAnalysisEvents(
+  analysisResultId: number,
+  onEvent: (event: AnalysisStreamEvent) => void,
+  afterId = 0,
+): () => void {
+  const base = import.meta.env.VITE_API_URL || ''
+  const source = new EventSource(`${base}${API_BASE}/results/${analysisResultId}/events?after_id=${afterId}`)
+  const handle = (message: MessageEvent) => {
+    const event = JSON.parse(message.data) as AnalysisStreamEvent
+    onEvent(event)
+    if (event.type === 'end') source.close()
+  }
+  source.addEventListener('log', handle as EventListener)
+  source.addEventListener('status', handle as EventListener)
+  source.addEventListener('end', handle as EventListener)
+  return () => source.close()
+}
+
 export async function listAnalysisResults(opportunityId: number, limit = 20): Promise<AnalysisResult[]> {
   const { data } = await api.get(`${API_BASE}/opportunity/${opportunityId}/results`, {
     params: { limit },
@@ -32,6 +32,7 @@ import {
 } from "./ui/table";
 import { Opportunity } from "../api/opportunities";
 import api from "../api/client";
+import { subscribeAnalysisEvents } from "../api/pipeline";
 import EmailHistory from "./EmailHistory";
 import { Collapsible, CollapsibleContent, CollapsibleTrigger } from "./ui/collapsible";
 
@@ -136,6 +137,7 @@ export default function AIAnalysis({ opportunity }: AIAnalysisProps) {
   const [analysisResult, setAnalysisResult] = useState<AnalysisResult | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [latestLog, setLatestLog] = useState<string | null>(null);
 
   useEffect(() => {
     const fetchAnalysis = async () => {
@@ -162,6 +164,24 @@ export default function AIAnalysis({ opportunity }: AIAnalysisProps) {
     fetchAnalysis();
   }, [opportunity]);
 
+  // Live progress while the job is pending/running (server push, no polling)
+  const streamingId = analysisResult && !["completed", "failed"].includes(analysisResult.status) ? analysisResult.id : null;
+  useEffect(() => {
+    if (!streamingId) return;
+    return subscribeAnalysisEvents(streamingId, async (event) => {
+      if (event.type === "log") {
+        setLatestLog(event.message);
+      } else if (event.type === "status") {
+        if (event.status === "completed") {
+          const response = await api.get(`/pipeline/results/${streamingId}`);
+          setAnalysisResult(response.data);
+        } else {
+          setAnalysisResult((prev) => (prev && prev.id === streamingId ? { ...prev, status: event.status } : prev));
+        }
+      }
+    });
+  }, [streamingId]);
+
   if (!opportunity) {
     return (
       <div className="flex flex-col items-center justify-center h-[60vh] text-slate-500">
@@ -306,6 +326,10 @@ See attached pricing schedule for detailed cost breakdown.
             );
           })}
         </div>
+
+        {streamingId && latestLog && (
+          <p className="relative z-10 mt-6 text-center text-xs font-mono text-slate-500 truncate">{latestLog}</p>
+        )}
       </Card>
 
       {/* Detailed Results Tabs */}
@@ -26,7 +26,7 @@ import api from "../api/client";
 interface AnalysisResult {
   id: number;
   status: string;
-  result_json: any;
+  result_json?: any;
   created_at: string;
   completed_at: string;
   opportunity: {
@@ -52,6 +52,17 @@ export default function ResultsReports() {
   const [selectedAnalysis, setSelectedAnalysis] = useState<AnalysisResult | null>(null);
   const [loading, setLoading] = useState(true);
 
+  // List rows are summaries without result_json; load the full result on selection
+  const selectAnalysis = async (analysis: AnalysisResult) => {
+    setSelectedAnalysis(analysis);
+    try {
+      const response = await api.get(`/pipeline/results/${analysis.id}`);
+      setSelectedAnalysis((current) => (current?.id === analysis.id ? { ...analysis, ...response.data } : current));
+    } catch (err) {
+      console.error("Error fetching analysis result:", err);
+    }
+  };
+
   useEffect(() => {
     const fetchHistory = async () => {
       try {
@@ -59,7 +70,7 @@ export default function ResultsReports() {
         const response = await api.get("/pipeline/results?limit=50");
         setAnalysisHistory(response.data);
         if (response.data.length > 0) {
-          setSelectedAnalysis(response.data[0]);
+          selectAnalysis(response.data[0]);
         }
       } catch (err) {
         console.error("Error fetching analysis history:", err);
@@ -122,7 +133,7 @@ export default function ResultsReports() {
                   <TableRow
                     key={analysis.id}
                     className={`border-slate-800 hover:bg-slate-800/30 cursor-pointer transition-colors ${selectedAnalysis?.id === analysis.id ? "bg-blue-500/5 border-l-2 border-l-blue-500" : "border-l-2 border-l-transparent"}`}
-                    onClick={() => setSelectedAnalysis(analysis)}
+                    onClick={() => selectAnalysis(analysis)}
                   >
                     <TableCell className="text-blue-400 font-mono text-xs pl-6">#{analysis.id}</TableCell>
                     <TableCell className="text-slate-300 font-medium text-xs">{analysis.opportunity?.notice_id || "-"}</TableCell>
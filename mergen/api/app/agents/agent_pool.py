@@ -0,0 +1,94 @@
+"""
+AutoGen Agent Pool
+==================
+Reuses AssistantAgent instances across analysis runs.
+
+Building an AssistantAgent creates its OpenAI client wrapper and validates the
+LLM config. Every pipeline step used to pay that cost. The pool keeps idle
+agents per key (agent kind, model, API key). An agent is checked out for
+one chat and cleared with ``reset()`` (chat history, reply counters) when it
+is returned. It is never shared by two chats at the same time.
+
+Only agents of the classic ``autogen`` API (they have ``reset()``) are
+pooled. Agents from other APIs are built per run as before. With ``agent()``,
+an agent whose chat raised is dropped, not returned to the pool.
+``AGENT_POOL_SIZE`` is the number of idle agents kept per key; 0 disables
+pooling.
+
+    with agent_pool.agent(("reviewer", llm_model, api_key), lambda: create_reviewer_agent(llm_model, api_key)) as reviewer:
+        user.initiate_chat(reviewer, message=message)
+        last_message = reviewer.last_message()
+"""
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AgentPool:
+    """Idle AutoGen agents by key; see module docstring."""
+
+    def __init__(self, max_idle: Optional[int] = None):
+        self._max_idle = max_idle
+        self._idle: Dict[Hashable, List[Any]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def max_idle(self) -> int:
+        return self._max_idle if self._max_idle is not None else settings.agent_pool_size
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Take an idle agent for ``key`` or build one with ``factory``."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop()
+        agent = factory()
+        with self._lock:
+            self.created += 1
+        return agent
+
+    def release(self, key: Hashable, agent: Any) -> None:
+        """Reset an agent taken with ``acquire`` and keep it for the next run."""
+        if self.max_idle <= 0 or not callable(getattr(agent, "reset", None)):
+            return
+        try:
+            agent.reset()
+        except Exception as e:
+            logger.warning(f"Agent reset failed, dropping pooled agent: {e}")
+            return
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self.max_idle:
+                idle.append(agent)
+
+    @contextmanager
+    def agent(self, key: Hashable, factory: Callable[[], Any]) -> Iterator[Any]:
+        """Check out an agent for ``key`` (built with ``factory`` if none is idle)."""
+        agent = self.acquire(key, factory)
+        yield agent
+        # Only reached when the chat completed; failed agents are discarded
+        self.release(key, agent)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": sum(len(agents) for agents in self._idle.values()),
+            }
+
+
+agent_pool = AgentPool()
@@ -15,6 +15,7 @@ from typing import Any, Dict, Optional, List
 
 from ..services.amadeus_client import search_hotels_by_city_code
 from ..config import settings
+from ..services.llm.prompt_registry import register_prompt, render_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -383,17 +384,7 @@ if AUTOGEN_AVAILABLE:
         logger.warning("Tool decorator not available - tool may not work with AutoGen")
 
 
-def create_hotel_matcher_agent(llm_model: str = "gpt-4o-mini") -> AssistantAgent:
-    debug_log(f"create_hotel_matcher_agent called with model: {llm_model}")
-    if not AUTOGEN_AVAILABLE:
-        raise HotelMatcherUnavailableError("pyautogen not installed. Run `pip install pyautogen`.")
-
-    import os
-    # Get API key from environment
-    api_key = os.getenv("OPENAI_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY")
-    debug_log(f"API key found: {bool(api_key)}")
-    
-    system_message = """You are HotelMatcherAgent, an expert hotel matching agent that analyzes hotels from Amadeus API against detailed SOW (Statement of Work) requirements.
+register_prompt("hotel_matcher.system", """You are HotelMatcherAgent, an expert hotel matching agent that analyzes hotels from Amadeus API against detailed SOW (Statement of Work) requirements.
 
 **YOUR TASK:**
 1. Call `amadeus_search_hotels_tool` with the provided city_code, check_in, check_out, and adults parameters
@@ -501,7 +492,20 @@ Respond with JSON containing:
     "hotels": [],
     "reasoning": "Why the search could not be performed"
   }
-- Never return plain text error messages - always use JSON format"""
+- Never return plain text error messages - always use JSON format""", version="1", static=True)
+
+
+def create_hotel_matcher_agent(llm_model: str = "gpt-4o-mini") -> AssistantAgent:
+    debug_log(f"create_hotel_matcher_agent called with model: {llm_model}")
+    if not AUTOGEN_AVAILABLE:
+        raise HotelMatcherUnavailableError("pyautogen not installed. Run `pip install pyautogen`.")
+
+    import os
+    # Get API key from environment
+    api_key = os.getenv("OPENAI_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY")
+    debug_log(f"API key found: {bool(api_key)}")
+    
+    system_message = render_prompt("hotel_matcher.system")
     
     # Try old API first (more stable), then fall back to new API if needed
     # Old API - use llm_config
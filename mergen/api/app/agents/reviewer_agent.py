@@ -8,6 +8,9 @@ import json
 import logging
 from typing import Any, Dict, Optional
 
+from ..services.llm.prompt_registry import register_prompt, render_prompt
+from .agent_pool import agent_pool
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -29,12 +32,7 @@ class ReviewerAgentUnavailableError(RuntimeError):
     pass
 
 
-def create_reviewer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
-    """Create ReviewerAgent for Pass 2."""
-    if not AUTOGEN_AVAILABLE:
-        raise ReviewerAgentUnavailableError("pyautogen not installed")
-    
-    system_message = """You are a Requirements Reviewer Agent (Pass 2).
+register_prompt("reviewer.system", """You are a Requirements Reviewer Agent (Pass 2).
 
 Your task: Review and correct the raw analyzer JSON output from Pass 1.
 
@@ -55,7 +53,15 @@ CRITICAL RULES:
 5. Fix obvious OCR/parsing errors
 6. Output must be valid JSON matching SOWDataModel schema
 
-Output: Clean normalized JSON that strictly follows SOWDataModel schema."""
+Output: Clean normalized JSON that strictly follows SOWDataModel schema.""", version="1", static=True)
+
+
+def create_reviewer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
+    """Create ReviewerAgent for Pass 2."""
+    if not AUTOGEN_AVAILABLE:
+        raise ReviewerAgentUnavailableError("pyautogen not installed")
+    
+    system_message = render_prompt("reviewer.system")
     
     llm_config = {
         "config_list": [{
@@ -99,7 +105,6 @@ def run_reviewer_agent(
     if not api_key:
         logger.warning("No API key provided, ReviewerAgent may not work")
     
-    reviewer = create_reviewer_agent(llm_model, api_key)
     # New autogen_agentchat API uses different parameters
     try:
         user = UserProxyAgent(
@@ -129,8 +134,9 @@ CORRECT:
 Output ONLY valid normalized JSON that strictly follows SOWDataModel schema. Do not include any explanatory text."""
     
     try:
-        user.initiate_chat(reviewer, message=reviewer_message)
-        last_message = reviewer.last_message()
+        with agent_pool.agent(("reviewer", llm_model, api_key), lambda: create_reviewer_agent(llm_model, api_key)) as reviewer:
+            user.initiate_chat(reviewer, message=reviewer_message)
+            last_message = reviewer.last_message()
         
         if not last_message:
             raise RuntimeError("ReviewerAgent produced no output")
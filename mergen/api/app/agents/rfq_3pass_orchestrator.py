@@ -5,15 +5,33 @@ Enterprise Pipeline v3 implementation
 Pass 1: AnalyzerAgent - RFQ → Raw structured JSON
 Pass 2: ReviewerAgent - Error correction + normalization
 Pass 3: SOWGeneratorAgent - (Fallback) SOW generation
+
+Step graph of one RFQ (``run_rfq_3pass_pipeline``):
+
+    RFQ text → Pass 1 → Pass 2 ─┐
+    seating chart parse ────────┴→ SOWDataModel → SOW (template / Pass 3) → PDF
+
+The seating chart is parsed in parallel with text extraction and the two
+LLM passes. Nothing else in the chain can start early: Pass 2 reviews the
+whole Pass 1 JSON in one chat, and the SOW is built from the whole model.
+``run_rfq_3pass_batch`` runs many RFQs on a thread pool capped at
+``RFQ_3PASS_CONCURRENCY`` and renders their template SOW PDFs in one
+``html_batch_to_pdf`` call on the WeasyPrint process pool. Each RFQ's result
+is the same dict a sequential call returns.
 """
 from __future__ import annotations
 
 import json
 import logging
 import os
-from typing import Any, Dict, Optional, List
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, List, Sequence
 from pathlib import Path
 
+from ..config import settings
+from ..services.llm.prompt_registry import register_prompt, render_prompt
+
 logger = logging.getLogger(__name__)
 
 # Import agents
@@ -25,7 +43,7 @@ from ..services.parsing.seating_chart_parser import parse_seating_chart_pdf
 from ..services.parsing.document_analyzer import analyze_document
 from ..services.sow_template_engine import render_sow_from_model
 try:
-    from ..services.sow_pdf_generator_weasyprint import html_to_pdf, generate_pdf_from_markdown
+    from ..services.sow_pdf_generator_weasyprint import html_to_pdf, html_batch_to_pdf, generate_pdf_from_markdown
     WEASYPRINT_AVAILABLE = True
 except (ImportError, OSError):
     WEASYPRINT_AVAILABLE = False
@@ -50,6 +68,23 @@ class RFQ3PassOrchestratorUnavailableError(RuntimeError):
     pass
 
 
+# Side steps of a pipeline (seating chart parsing); separate from the batch pool
+# so a batch worker waiting on its side step can never block it
+_step_executor: Optional[ThreadPoolExecutor] = None
+_step_executor_lock = threading.Lock()
+
+
+def _get_step_executor() -> ThreadPoolExecutor:
+    global _step_executor
+    with _step_executor_lock:
+        if _step_executor is None:
+            _step_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.rfq_3pass_concurrency),
+                thread_name_prefix="rfq-3pass-step",
+            )
+        return _step_executor
+
+
 # SOWDataModel - Normalized Full Schema
 SOW_DATA_MODEL_SCHEMA = {
     "event_name": str,
@@ -79,12 +114,7 @@ SOW_DATA_MODEL_SCHEMA = {
 }
 
 
-def create_analyzer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
-    """Pass 1: AnalyzerAgent - RFQ → Raw structured JSON"""
-    if not AUTOGEN_AVAILABLE:
-        raise RFQ3PassOrchestratorUnavailableError("pyautogen not installed")
-    
-    system_message = """You are a Structured Requirements Analyzer Agent (Pass 1).
+register_prompt("rfq_3pass.analyzer.system", """You are a Structured Requirements Analyzer Agent (Pass 1).
 
 Your task: Extract ALL requirements from RFQ PDF content and output normalized JSON.
 
@@ -97,7 +127,15 @@ CRITICAL RULES:
 6. DO NOT make up any data - use "TBD" for missing fields
 7. Extract compliance clauses element-by-element
 
-Output format must match SOWDataModel schema exactly."""
+Output format must match SOWDataModel schema exactly.""", version="1", static=True)
+
+
+def create_analyzer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
+    """Pass 1: AnalyzerAgent - RFQ → Raw structured JSON"""
+    if not AUTOGEN_AVAILABLE:
+        raise RFQ3PassOrchestratorUnavailableError("pyautogen not installed")
+    
+    system_message = render_prompt("rfq_3pass.analyzer.system")
     
     llm_config = {
         "config_list": [{
@@ -115,12 +153,7 @@ Output format must match SOWDataModel schema exactly."""
     )
 
 
-def create_reviewer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
-    """Pass 2: ReviewerAgent - Error correction + normalization"""
-    if not AUTOGEN_AVAILABLE:
-        raise RFQ3PassOrchestratorUnavailableError("pyautogen not installed")
-    
-    system_message = """You are a Requirements Reviewer Agent (Pass 2).
+register_prompt("rfq_3pass.reviewer.system", """You are a Requirements Reviewer Agent (Pass 2).
 
 Your task: Review and correct the raw analyzer JSON output.
 
@@ -133,7 +166,15 @@ CORRECT:
 - Merge duplicate lists
 - Ensure 100% schema compliance
 
-Output: Clean normalized JSON that strictly follows SOWDataModel schema."""
+Output: Clean normalized JSON that strictly follows SOWDataModel schema.""", version="1", static=True)
+
+
+def create_reviewer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
+    """Pass 2: ReviewerAgent - Error correction + normalization"""
+    if not AUTOGEN_AVAILABLE:
+        raise RFQ3PassOrchestratorUnavailableError("pyautogen not installed")
+    
+    system_message = render_prompt("rfq_3pass.reviewer.system")
     
     llm_config = {
         "config_list": [{
@@ -151,12 +192,7 @@ Output: Clean normalized JSON that strictly follows SOWDataModel schema."""
     )
 
 
-def create_sow_generator_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
-    """Pass 3: SOWGeneratorAgent - (Fallback) SOW generation"""
-    if not AUTOGEN_AVAILABLE:
-        raise RFQ3PassOrchestratorUnavailableError("pyautogen not installed")
-    
-    system_message = """You are a SOW Generator Agent (Pass 3 - Fallback).
+register_prompt("rfq_3pass.sow_generator.system", """You are a SOW Generator Agent (Pass 3 - Fallback).
 
 Your task: Generate SOW Markdown from normalized event specification.
 
@@ -166,7 +202,15 @@ IMPORTANT:
 - Do NOT hallucinate
 - Include: event summary, sleeping rooms table, function space tables, F&B tables, AV requirements, commercial terms, compliance clauses
 
-Output: Professional SOW in Markdown format."""
+Output: Professional SOW in Markdown format.""", version="1", static=True)
+
+
+def create_sow_generator_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
+    """Pass 3: SOWGeneratorAgent - (Fallback) SOW generation"""
+    if not AUTOGEN_AVAILABLE:
+        raise RFQ3PassOrchestratorUnavailableError("pyautogen not installed")
+    
+    system_message = render_prompt("rfq_3pass.sow_generator.system")
     
     llm_config = {
         "config_list": [{
@@ -272,6 +316,27 @@ def run_3pass_rfq_analysis(
     return results
 
 
+def _sow_pdf_target(rfq_pdf_path: str, output_dir: Optional[str] = None) -> Path:
+    """SOW PDF written for an RFQ (next to the RFQ unless output_dir is given)."""
+    rfq_path = Path(rfq_pdf_path)
+    return Path(output_dir or rfq_path.parent) / f"{rfq_path.stem}_sow.pdf"
+
+
+def _generate_fallback_sow(results: Dict[str, Any], sow_pdf_path: Path, llm_model: str, api_key: Optional[str]) -> None:
+    """Step 5 fallback: Pass 3 SOW generator (markdown) → PDF."""
+    logger.info("Step 5: Generating SOW using LLM fallback...")
+    sow_markdown = run_sow_generator_agent(
+        normalized_json=results["normalized_json"],
+        llm_model=llm_model,
+        api_key=api_key,
+    )
+    results["fallback_markdown"] = sow_markdown
+    
+    generate_pdf_from_markdown(sow_markdown, str(sow_pdf_path))
+    results["sow_pdf_path"] = str(sow_pdf_path)
+    logger.info(f"SOW PDF generated (fallback): {sow_pdf_path}")
+
+
 def run_rfq_3pass_pipeline(
     rfq_pdf_path: str,
     seating_chart_pdf_path: Optional[str] = None,
@@ -279,6 +344,8 @@ def run_rfq_3pass_pipeline(
     output_dir: Optional[str] = None,
     llm_model: str = "gpt-4o-mini",
     api_key: Optional[str] = None,
+    parallel: bool = True,
+    render_pdf: bool = True,
 ) -> Dict[str, Any]:
     """
     Run complete 3-pass RFQ → SOW pipeline.
@@ -302,6 +369,9 @@ def run_rfq_3pass_pipeline(
         output_dir: Directory for output files (default: same as RFQ PDF directory)
         llm_model: LLM model to use
         api_key: OpenAI API key (if None, uses environment variable)
+        parallel: Parse the seating chart while steps 1-2 run (same results as sequential)
+        render_pdf: False leaves the template SOW as ``sow_html`` without a PDF
+                    (``run_rfq_3pass_batch`` renders those in one batch)
         
     Returns:
         {
@@ -325,13 +395,8 @@ def run_rfq_3pass_pipeline(
     if not rfq_path.exists():
         raise FileNotFoundError(f"RFQ PDF not found: {rfq_pdf_path}")
     
-    # Set output directory
-    if output_dir:
-        output_path = Path(output_dir)
-    else:
-        output_path = rfq_path.parent
-    
-    output_path.mkdir(parents=True, exist_ok=True)
+    sow_pdf_path = _sow_pdf_target(rfq_pdf_path, output_dir)
+    sow_pdf_path.parent.mkdir(parents=True, exist_ok=True)
     
     results = {
         "analyzer_json": None,
@@ -344,6 +409,12 @@ def run_rfq_3pass_pipeline(
         "errors": [],
     }
     
+    # Step 3 only needs the seating chart file; start it before the LLM passes
+    has_seating_chart = bool(seating_chart_pdf_path and Path(seating_chart_pdf_path).exists())
+    seating_future: Optional[Future] = None
+    if parallel and has_seating_chart:
+        seating_future = _get_step_executor().submit(parse_seating_chart_pdf, seating_chart_pdf_path)
+    
     try:
         # Step 1: Extract text from RFQ PDF
         logger.info(f"Step 1: Extracting text from RFQ PDF: {rfq_pdf_path}")
@@ -373,9 +444,12 @@ def run_rfq_3pass_pipeline(
         
         # Step 3: Parse seating chart if provided
         seating_layout = None
-        if seating_chart_pdf_path and Path(seating_chart_pdf_path).exists():
+        if has_seating_chart:
             logger.info(f"Step 3: Parsing seating chart: {seating_chart_pdf_path}")
-            seating_layout = parse_seating_chart_pdf(seating_chart_pdf_path)
+            if seating_future is not None:
+                seating_layout = seating_future.result()
+            else:
+                seating_layout = parse_seating_chart_pdf(seating_chart_pdf_path)
             results["seating_layout"] = seating_layout
         
         # Step 4: Create SOWDataModel
@@ -387,14 +461,13 @@ def run_rfq_3pass_pipeline(
         results["data_model"] = data_model
         
         # Step 5: Generate SOW (template engine or fallback)
-        sow_pdf_filename = f"{rfq_path.stem}_sow.pdf"
-        sow_pdf_path = output_path / sow_pdf_filename
-        
         if use_template_engine and WEASYPRINT_AVAILABLE:
             try:
                 logger.info("Step 5: Generating SOW using template engine...")
                 sow_html = render_sow_from_model(data_model)
                 results["sow_html"] = sow_html
+                if not render_pdf:
+                    return results
                 
                 html_to_pdf(sow_html, str(sow_pdf_path))
                 results["sow_pdf_path"] = str(sow_pdf_path)
@@ -408,17 +481,7 @@ def run_rfq_3pass_pipeline(
             use_template_engine = False
         
         if not use_template_engine:
-            logger.info("Step 5: Generating SOW using LLM fallback...")
-            sow_markdown = run_sow_generator_agent(
-                normalized_json=results["normalized_json"],
-                llm_model=llm_model,
-                api_key=api_key,
-            )
-            results["fallback_markdown"] = sow_markdown
-            
-            generate_pdf_from_markdown(sow_markdown, str(sow_pdf_path))
-            results["sow_pdf_path"] = str(sow_pdf_path)
-            logger.info(f"SOW PDF generated (fallback): {sow_pdf_path}")
+            _generate_fallback_sow(results, sow_pdf_path, llm_model, api_key)
         
         logger.info("3-pass RFQ pipeline completed successfully")
         return results
@@ -426,5 +489,83 @@ def run_rfq_3pass_pipeline(
     except Exception as e:
         logger.error(f"Error in 3-pass RFQ pipeline: {e}", exc_info=True)
         results["errors"].append(f"Pipeline error: {e}")
+        if seating_future is not None:
+            seating_future.cancel()  # not started yet: nothing needs the layout anymore
         return results
 
+
+def run_rfq_3pass_batch(
+    rfqs: Sequence[Dict[str, Any]],
+    max_concurrency: Optional[int] = None,
+    **options,
+) -> List[Dict[str, Any]]:
+    """
+    Run ``run_rfq_3pass_pipeline`` for many RFQs, at most ``max_concurrency``
+    (default RFQ_3PASS_CONCURRENCY) at a time.
+    
+    Args:
+        rfqs: One dict of ``run_rfq_3pass_pipeline`` arguments per RFQ
+              (at least ``rfq_pdf_path``)
+        max_concurrency: Pipelines running at the same time
+        **options: Arguments shared by all RFQs (e.g. llm_model, output_dir)
+        
+    Returns:
+        Pipeline results in the order of ``rfqs``
+    """
+    if not AUTOGEN_AVAILABLE:
+        raise RFQ3PassOrchestratorUnavailableError("pyautogen not installed")
+    
+    jobs = [{**options, **rfq} for rfq in rfqs]
+    # Check inputs up front so a bad path does not abort the batch halfway
+    targets = set()
+    for job in jobs:
+        rfq_path = Path(job["rfq_pdf_path"])
+        if not rfq_path.exists():
+            raise FileNotFoundError(f"RFQ PDF not found: {rfq_path}")
+        target = _sow_pdf_target(job["rfq_pdf_path"], job.get("output_dir"))
+        if target in targets:
+            raise ValueError(f"Two RFQs in the batch would write the same SOW PDF: {target}")
+        targets.add(target)
+    
+    if not jobs:
+        return []
+    concurrency = max(1, min(max_concurrency or settings.rfq_3pass_concurrency, len(jobs)))
+    logger.info(f"Running 3-pass RFQ pipeline for {len(jobs)} RFQs (concurrency={concurrency})")
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rfq-3pass") as executor:
+        futures = [executor.submit(run_rfq_3pass_pipeline, **{**job, "render_pdf": False}) for job in jobs]
+        results = [future.result() for future in futures]
+    _render_batch_sow_pdfs(jobs, results)
+    return results
+
+
+def _render_batch_sow_pdfs(jobs: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> None:
+    """
+    Render the template SOWs of a batch in one ``html_batch_to_pdf`` call;
+    a document that fails there gets the LLM fallback, as in a single run.
+    """
+    pending = [
+        (job, result, _sow_pdf_target(job["rfq_pdf_path"], job.get("output_dir")))
+        for job, result in zip(jobs, results)
+        if result["sow_html"] and not result["sow_pdf_path"]
+    ]
+    if not pending:
+        return
+    try:
+        rendered = html_batch_to_pdf([(result["sow_html"], str(target)) for _, result, target in pending])
+    except Exception as e:
+        logger.warning(f"Batch SOW PDF rendering failed: {e}")
+        rendered = [None] * len(pending)
+    
+    for (job, result, target), pdf_path in zip(pending, rendered):
+        if pdf_path:
+            result["sow_pdf_path"] = pdf_path
+            logger.info(f"SOW PDF generated: {pdf_path}")
+            continue
+        logger.warning(f"Template engine failed for {job['rfq_pdf_path']}, falling back to LLM generator")
+        api_key = job.get("api_key") or os.getenv("OPENAI_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY")
+        try:
+            _generate_fallback_sow(result, target, job.get("llm_model", "gpt-4o-mini"), api_key)
+        except Exception as e:
+            logger.error(f"Error in 3-pass RFQ pipeline: {e}", exc_info=True)
+            result["errors"].append(f"Pipeline error: {e}")
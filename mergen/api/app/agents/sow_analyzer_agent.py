@@ -9,6 +9,9 @@ import re
 import time
 from typing import Any, Dict, Optional, List
 
+from ..services.llm.prompt_registry import register_prompt, render_prompt
+from .agent_pool import agent_pool
+
 logger = logging.getLogger(__name__)
 
 # Import LLM logger for database logging
@@ -52,46 +55,7 @@ except ImportError:
 class SOWAnalyzerUnavailableError(RuntimeError):
     pass
 
-def create_sow_analyzer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
-    """Create an AutoGen agent for analyzing SOW documents."""
-    if not AUTOGEN_AVAILABLE:
-        raise SOWAnalyzerUnavailableError("pyautogen not installed. Run `pip install pyautogen`.")
-
-    import os
-    # Get API key from parameter or environment
-    if not api_key:
-        api_key = os.getenv("OPENAI_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY")
-    
-    # NOTE:
-    # We intentionally keep max_tokens well below 4k to avoid
-    # "max_tokens too large" errors on models with 4k completion limits.
-    # However, GPT-4o-mini supports up to 16k tokens, so we can use 4000 safely.
-    if not api_key:
-        logger.warning("OPENAI_API_KEY or AZURE_OPENAI_API_KEY not set. AutoGen may not work without API key.")
-        llm_config = {
-            "config_list": [
-                {
-                    "model": llm_model,
-                }
-            ],
-            "temperature": 0.1,
-            "max_tokens": 4000,  # Increased from 3500 for better completeness
-            "response_format": {"type": "json_object"},  # Force JSON output mode
-        }
-    else:
-        llm_config = {
-            "config_list": [
-                {
-                    "model": llm_model,
-                    "api_key": api_key,
-                }
-            ],
-            "temperature": 0.1,
-            "max_tokens": 4000,  # Increased from 3500 for better completeness
-            "response_format": {"type": "json_object"},  # Force JSON output mode - CRITICAL for production
-        }
-
-    system_message = """You are a SOW (Statement of Work) Analyzer Agent. Your task is to extract detailed, structured information from SOW documents and Combined Synopsis documents.
+register_prompt("sow_analyzer.system", """You are a SOW (Statement of Work) Analyzer Agent. Your task is to extract detailed, structured information from SOW documents and Combined Synopsis documents.
 
 **CRITICAL INSTRUCTIONS:**
 - Extract ALL information from BOTH SOW and Combined Synopsis documents if both are provided.
@@ -433,7 +397,49 @@ Respond with a comprehensive JSON structure containing ALL extracted information
   "data_quality_issues": []
 }
 
-Be thorough and extract every detail mentioned in the document. If information is missing, use null or empty arrays, but NEVER say "None specified" if the information actually exists."""
+Be thorough and extract every detail mentioned in the document. If information is missing, use null or empty arrays, but NEVER say "None specified" if the information actually exists.""", version="1", static=True)
+
+
+def create_sow_analyzer_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
+    """Create an AutoGen agent for analyzing SOW documents."""
+    if not AUTOGEN_AVAILABLE:
+        raise SOWAnalyzerUnavailableError("pyautogen not installed. Run `pip install pyautogen`.")
+
+    import os
+    # Get API key from parameter or environment
+    if not api_key:
+        api_key = os.getenv("OPENAI_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY")
+    
+    # NOTE:
+    # We intentionally keep max_tokens well below 4k to avoid
+    # "max_tokens too large" errors on models with 4k completion limits.
+    # However, GPT-4o-mini supports up to 16k tokens, so we can use 4000 safely.
+    if not api_key:
+        logger.warning("OPENAI_API_KEY or AZURE_OPENAI_API_KEY not set. AutoGen may not work without API key.")
+        llm_config = {
+            "config_list": [
+                {
+                    "model": llm_model,
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": 4000,  # Increased from 3500 for better completeness
+            "response_format": {"type": "json_object"},  # Force JSON output mode
+        }
+    else:
+        llm_config = {
+            "config_list": [
+                {
+                    "model": llm_model,
+                    "api_key": api_key,
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": 4000,  # Increased from 3500 for better completeness
+            "response_format": {"type": "json_object"},  # Force JSON output mode - CRITICAL for production
+        }
+
+    system_message = render_prompt("sow_analyzer.system")
 
     # Use appropriate API based on what's available
     if AUTOGEN_NEW_API:
@@ -495,7 +501,6 @@ def analyze_sow_document(
     if not api_key:
         api_key = os.getenv("OPENAI_API_KEY") or os.getenv("AZURE_OPENAI_API_KEY")
 
-    assistant = create_sow_analyzer_agent(llm_model=llm_model, api_key=api_key)
     try:
         user = UserProxyAgent(
             name="SOWAnalysisUser",
@@ -603,139 +608,143 @@ Respond with a comprehensive JSON structure containing ALL extracted information
 
 Respond ONLY with valid JSON. Do not include any explanatory text outside the JSON structure."""
 
-    # Retry mechanism for robust JSON parsing
-    max_retries = 2
-    retry_count = 0
+    agent_key = ("sow_analyzer", llm_model, api_key)
+    try:
+        # A chat that raises drops its agent instead of returning it to the pool
+        with agent_pool.agent(agent_key, lambda: create_sow_analyzer_agent(llm_model=llm_model, api_key=api_key)) as assistant:
+            # Retry mechanism for robust JSON parsing
+            max_retries = 2
+            retry_count = 0
     
-    while retry_count <= max_retries:
-        try:
-            # Track start time for latency
-            start_time = time.time()
+            while retry_count <= max_retries:
+                try:
+                    # Track start time for latency
+                    start_time = time.time()
             
-            user.initiate_chat(assistant, message=user_message)
-            last_message = assistant.last_message()
+                    user.initiate_chat(assistant, message=user_message)
+                    last_message = assistant.last_message()
             
-            # Calculate latency
-            latency_ms = int((time.time() - start_time) * 1000)
+                    # Calculate latency
+                    latency_ms = int((time.time() - start_time) * 1000)
             
-            # Log LLM call to database if agent_run_id is provided
-            if LLM_LOGGER_AVAILABLE and agent_run_id:
-                try:
-                    db = SessionLocal()
-                    try:
-                        # Extract prompt (first 50000 chars)
-                        prompt_text = user_message[:50000] if len(user_message) > 50000 else user_message
+                    # Log LLM call to database if agent_run_id is provided
+                    if LLM_LOGGER_AVAILABLE and agent_run_id:
+                        try:
+                            db = SessionLocal()
+                            try:
+                                # Extract prompt (first 50000 chars)
+                                prompt_text = user_message[:50000] if len(user_message) > 50000 else user_message
                         
-                        # Extract response
-                        content = last_message.get("content", "") if last_message else ""
-                        if isinstance(content, list):
-                            content = content[0].get("text", "") if content else ""
-                        response_text = str(content)[:100000] if content else ""  # Limit response size
+                                # Extract response
+                                content = last_message.get("content", "") if last_message else ""
+                                if isinstance(content, list):
+                                    content = content[0].get("text", "") if content else ""
+                                response_text = str(content)[:100000] if content else ""  # Limit response size
                         
-                        # Try to extract token usage from message metadata if available
-                        prompt_tokens = None
-                        completion_tokens = None
-                        total_tokens = None
-                        if last_message and isinstance(last_message, dict):
-                            # Check for token usage in metadata
-                            metadata = last_message.get("metadata", {})
-                            if isinstance(metadata, dict):
-                                usage = metadata.get("usage", {})
-                                if isinstance(usage, dict):
-                                    prompt_tokens = usage.get("prompt_tokens")
-                                    completion_tokens = usage.get("completion_tokens")
-                                    total_tokens = usage.get("total_tokens")
+                                # Try to extract token usage from message metadata if available
+                                prompt_tokens = None
+                                completion_tokens = None
+                                total_tokens = None
+                                if last_message and isinstance(last_message, dict):
+                                    # Check for token usage in metadata
+                                    metadata = last_message.get("metadata", {})
+                                    if isinstance(metadata, dict):
+                                        usage = metadata.get("usage", {})
+                                        if isinstance(usage, dict):
+                                            prompt_tokens = usage.get("prompt_tokens")
+                                            completion_tokens = usage.get("completion_tokens")
+                                            total_tokens = usage.get("total_tokens")
                         
-                        # Log the LLM call
-                        log_llm_call(
-                            db=db,
-                            provider="openai",
-                            model=llm_model,
-                            prompt=prompt_text,
-                            response_text=response_text,
-                            agent_run_id=agent_run_id,
-                            agent_name="SOWAnalyzerAgent",
-                            prompt_tokens=prompt_tokens,
-                            completion_tokens=completion_tokens,
-                            total_tokens=total_tokens,
-                            latency_ms=latency_ms,
-                        )
-                        logger.info(f"Logged LLM call to database for agent_run_id={agent_run_id}")
-                    finally:
-                        db.close()
-                except Exception as log_exc:
-                    logger.warning(f"Failed to log LLM call to database: {log_exc}", exc_info=True)
+                                # Log the LLM call
+                                log_llm_call(
+                                    db=db,
+                                    provider="openai",
+                                    model=llm_model,
+                                    prompt=prompt_text,
+                                    response_text=response_text,
+                                    agent_run_id=agent_run_id,
+                                    agent_name="SOWAnalyzerAgent",
+                                    prompt_tokens=prompt_tokens,
+                                    completion_tokens=completion_tokens,
+                                    total_tokens=total_tokens,
+                                    latency_ms=latency_ms,
+                                )
+                                logger.info(f"Logged LLM call to database for agent_run_id={agent_run_id}")
+                            finally:
+                                db.close()
+                        except Exception as log_exc:
+                            logger.warning(f"Failed to log LLM call to database: {log_exc}", exc_info=True)
             
-            if not last_message:
-                raise RuntimeError("SOW analyzer produced no output.")
+                    if not last_message:
+                        raise RuntimeError("SOW analyzer produced no output.")
             
-            content = last_message.get("content", "")
-            if isinstance(content, list):
-                content = content[0].get("text", "") if content else ""
-            if isinstance(content, dict):
-                # If content is already a dict, validate and return
-                return _validate_and_fix_sow_output(content)
+                    content = last_message.get("content", "")
+                    if isinstance(content, list):
+                        content = content[0].get("text", "") if content else ""
+                    if isinstance(content, dict):
+                        # If content is already a dict, validate and return
+                        return _validate_and_fix_sow_output(content)
             
-            # Strip markdown fences if present
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                content = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                content = content[json_start:json_end].strip()
+                    # Strip markdown fences if present
+                    if "```json" in content:
+                        json_start = content.find("```json") + 7
+                        json_end = content.find("```", json_start)
+                        content = content[json_start:json_end].strip()
+                    elif "```" in content:
+                        json_start = content.find("```") + 3
+                        json_end = content.find("```", json_start)
+                        content = content[json_start:json_end].strip()
             
-            # Try to isolate JSON object
-            if "{" in content and "}" in content:
-                json_start = content.find("{")
-                json_end = content.rfind("}") + 1
-                content = content[json_start:json_end]
+                    # Try to isolate JSON object
+                    if "{" in content and "}" in content:
+                        json_start = content.find("{")
+                        json_end = content.rfind("}") + 1
+                        content = content[json_start:json_end]
             
-            # Use json_repair if available, fallback to standard json
-            if JSON_REPAIR_AVAILABLE:
-                try:
-                    decoded_json = json_repair.loads(content)
-                except Exception as repair_error:
-                    logger.warning(f"json_repair failed, trying standard json: {repair_error}")
-                    decoded_json = json.loads(content)
-            else:
-                decoded_json = json.loads(content)
+                    # Use json_repair if available, fallback to standard json
+                    if JSON_REPAIR_AVAILABLE:
+                        try:
+                            decoded_json = json_repair.loads(content)
+                        except Exception as repair_error:
+                            logger.warning(f"json_repair failed, trying standard json: {repair_error}")
+                            decoded_json = json.loads(content)
+                    else:
+                        decoded_json = json.loads(content)
             
-            # Validate and fix output
-            validated_json = _validate_and_fix_sow_output(decoded_json)
-            return validated_json
+                    # Validate and fix output
+                    validated_json = _validate_and_fix_sow_output(decoded_json)
+                    return validated_json
             
-        except (json.JSONDecodeError, ValueError) as e:
-            retry_count += 1
-            if retry_count <= max_retries:
-                logger.warning(f"JSON parse error (attempt {retry_count}/{max_retries}): {e}")
-                logger.warning(f"Raw content preview: {content[:500] if 'content' in locals() else 'N/A'}")
-                # Retry with error message to LLM
-                error_message = f"The previous JSON output had a parsing error: {str(e)}. Please fix the JSON and respond with valid JSON only."
-                user_message = f"{user_message}\n\n**ERROR FROM PREVIOUS ATTEMPT:**\n{error_message}\n\nPlease correct the JSON and respond again."
-            else:
-                logger.error(f"Failed to parse SOW analyzer JSON output after {max_retries} retries: {e}")
-                logger.error(f"Raw content: {content[:1000] if 'content' in locals() else 'N/A'}")
-                return {
-                    "error": "Failed to parse LLM response as JSON after retries",
-                    "raw_content_preview": content[:1000] if 'content' in locals() else "",
-                    "extraction_error": str(e),
-                    "table_extraction_failed": True,
-                }
-        except Exception as exc:
-            logger.error(f"Error in SOW analysis: {exc}", exc_info=True)
-            # Return error structure instead of raising to prevent pipeline crash
+                except (json.JSONDecodeError, ValueError) as e:
+                    retry_count += 1
+                    if retry_count <= max_retries:
+                        logger.warning(f"JSON parse error (attempt {retry_count}/{max_retries}): {e}")
+                        logger.warning(f"Raw content preview: {content[:500] if 'content' in locals() else 'N/A'}")
+                        # Retry with error message to LLM
+                        error_message = f"The previous JSON output had a parsing error: {str(e)}. Please fix the JSON and respond with valid JSON only."
+                        user_message = f"{user_message}\n\n**ERROR FROM PREVIOUS ATTEMPT:**\n{error_message}\n\nPlease correct the JSON and respond again."
+                    else:
+                        logger.error(f"Failed to parse SOW analyzer JSON output after {max_retries} retries: {e}")
+                        logger.error(f"Raw content: {content[:1000] if 'content' in locals() else 'N/A'}")
+                        return {
+                            "error": "Failed to parse LLM response as JSON after retries",
+                            "raw_content_preview": content[:1000] if 'content' in locals() else "",
+                            "extraction_error": str(e),
+                            "table_extraction_failed": True,
+                        }
+    
+            # Should not reach here, but safety fallback
             return {
-                "error": str(exc),
+                "error": "SOW analysis failed after retries",
                 "table_extraction_failed": True,
             }
-    
-    # Should not reach here, but safety fallback
-    return {
-        "error": "SOW analysis failed after retries",
-        "table_extraction_failed": True,
-    }
+    except Exception as exc:
+        logger.error(f"Error in SOW analysis: {exc}", exc_info=True)
+        # Return error structure instead of raising to prevent pipeline crash
+        return {
+            "error": str(exc),
+            "table_extraction_failed": True,
+        }
 
 
 def _validate_and_fix_sow_output(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -8,6 +8,9 @@ import json
 import logging
 from typing import Any, Dict, Optional
 
+from ..services.llm.prompt_registry import register_prompt, render_prompt
+from .agent_pool import agent_pool
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -29,12 +32,7 @@ class SOWGeneratorAgentUnavailableError(RuntimeError):
     pass
 
 
-def create_sow_generator_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
-    """Create SOWGeneratorAgent for Pass 3 (Fallback)."""
-    if not AUTOGEN_AVAILABLE:
-        raise SOWGeneratorAgentUnavailableError("pyautogen not installed")
-    
-    system_message = """You are a SOW Generator Agent (Pass 3 - Fallback).
+register_prompt("sow_generator.system", """You are a SOW Generator Agent (Pass 3 - Fallback).
 
 Your task: Generate professional Statement of Work (SOW) in Markdown format from normalized RFQ data.
 
@@ -56,7 +54,15 @@ IMPORTANT RULES:
 7. Format dates consistently (YYYY-MM-DD or Month DD, YYYY)
 8. Include capacity, setup types, and special requirements clearly
 
-Output: Professional SOW in Markdown format only. No JSON, no explanations."""
+Output: Professional SOW in Markdown format only. No JSON, no explanations.""", version="1", static=True)
+
+
+def create_sow_generator_agent(llm_model: str = "gpt-4o-mini", api_key: Optional[str] = None) -> AssistantAgent:
+    """Create SOWGeneratorAgent for Pass 3 (Fallback)."""
+    if not AUTOGEN_AVAILABLE:
+        raise SOWGeneratorAgentUnavailableError("pyautogen not installed")
+    
+    system_message = render_prompt("sow_generator.system")
     
     llm_config = {
         "config_list": [{
@@ -100,7 +106,6 @@ def run_sow_generator_agent(
     if not api_key:
         logger.warning("No API key provided, SOWGeneratorAgent may not work")
     
-    generator = create_sow_generator_agent(llm_model, api_key)
     # New autogen_agentchat API uses different parameters
     try:
         user = UserProxyAgent(
@@ -138,8 +143,9 @@ REQUIREMENTS:
 Output ONLY the SOW Markdown text. Do not include JSON, explanations, or code blocks."""
     
     try:
-        user.initiate_chat(generator, message=generator_message)
-        last_message = generator.last_message()
+        with agent_pool.agent(("sow_generator", llm_model, api_key), lambda: create_sow_generator_agent(llm_model, api_key)) as generator:
+            user.initiate_chat(generator, message=generator_message)
+            last_message = generator.last_message()
         
         if not last_message:
             raise RuntimeError("SOWGeneratorAgent produced no output")
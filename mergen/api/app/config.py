@@ -62,6 +62,8 @@ class Settings(BaseSettings):
     ollama_host: str = os.getenv("OLLAMA_HOST", "http://host.docker.internal:11434")
     generator_model: str = os.getenv("GENERATOR_MODEL", "gpt-4o")
     extractor_model: str = os.getenv("EXTRACTOR_MODEL", "gpt-4o-mini")
+    # Idle AutoGen agents kept per agent/model for reuse across runs (see agents/agent_pool.py); 0 disables
+    agent_pool_size: int = int(os.getenv("AGENT_POOL_SIZE", "2"))
 
     # -- SAM.gov --------------------------------------------------------------
     sam_api_key: Optional[str] = os.getenv("SAM_API_KEY")
@@ -80,12 +82,63 @@ class Settings(BaseSettings):
     smtp_use_tls: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
     smtp_from_email: str = os.getenv("SMTP_FROM_EMAIL", "noreply@mergenlite.com")
     pipeline_notification_email: Optional[str] = os.getenv("PIPELINE_NOTIFICATION_EMAIL")
+    # Connection reuse and retries (see services/mail_service.py)
+    smtp_pool_size: int = int(os.getenv("SMTP_POOL_SIZE", "2"))  # idle connections kept per server/account
+    smtp_idle_timeout: float = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+    smtp_timeout: float = float(os.getenv("SMTP_TIMEOUT", "30"))
+    smtp_send_attempts: int = int(os.getenv("SMTP_SEND_ATTEMPTS", "3"))
+    smtp_retry_backoff: float = float(os.getenv("SMTP_RETRY_BACKOFF", "2"))  # seconds, doubles per attempt
 
     # -- Telegram Notifications -----------------------------------------------
     telegram_bot_token: Optional[str] = os.getenv("TELEGRAM_BOT_TOKEN")
     telegram_chat_id: Optional[str] = os.getenv("TELEGRAM_CHAT_ID")
     telegram_enabled: bool = os.getenv("TELEGRAM_ENABLED", "false").lower() == "true"
 
+    # -- Redis / job queue ----------------------------------------------------
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    job_queue_enabled: bool = os.getenv("JOB_QUEUE_ENABLED", "false").lower() == "true"
+    # Worker processes per queue, e.g. "extraction=2,analysis=2,hotel_match=1,delivery=1"
+    worker_concurrency: str = os.getenv(
+        "WORKER_CONCURRENCY", "extraction=2,analysis=2,hotel_match=1,delivery=1"
+    )
+
+    # -- Pipeline concurrency (per process) -----------------------------------
+    daily_scan_concurrency: int = int(os.getenv("DAILY_SCAN_CONCURRENCY", "3"))
+    pipeline_llm_concurrency: int = int(os.getenv("PIPELINE_LLM_CONCURRENCY", "2"))
+    pipeline_download_concurrency: int = int(os.getenv("PIPELINE_DOWNLOAD_CONCURRENCY", "4"))
+    # RFQs processed at the same time by run_rfq_3pass_batch (see agents/rfq_3pass_orchestrator.py)
+    rfq_3pass_concurrency: int = int(os.getenv("RFQ_3PASS_CONCURRENCY", "2"))
+    # Attachment files downloaded in parallel within one download job / per remote host
+    attachment_download_concurrency: int = int(os.getenv("ATTACHMENT_DOWNLOAD_CONCURRENCY", "4"))
+    attachment_download_per_host: int = int(os.getenv("ATTACHMENT_DOWNLOAD_PER_HOST", "2"))
+    # Seconds a pipeline waits for its download job before continuing without it
+    attachment_download_timeout: int = int(os.getenv("ATTACHMENT_DOWNLOAD_TIMEOUT", "300"))
+    # PDF / mail delivery threads when the delivery queue is not used (see services/delivery_service.py)
+    delivery_workers: int = int(os.getenv("DELIVERY_WORKERS", "2"))
+
+    # -- Job log writer (see services/job_log_writer.py) ----------------------
+    job_log_batch_size: int = int(os.getenv("JOB_LOG_BATCH_SIZE", "50"))
+    # Max seconds a buffered INFO row waits; shorter intervals mean 1-2 row inserts
+    job_log_flush_interval: float = float(os.getenv("JOB_LOG_FLUSH_INTERVAL", "2.0"))
+
+    # -- Shared rate limits (Redis token buckets, see services/redis_client.py) --
+    # Calls per second across all API and worker processes
+    sam_rate_per_sec: float = float(os.getenv("SAM_RATE_PER_SEC", "0.2"))
+    # SAM.gov daily request quota (sliding 24h window); 0 disables the check
+    sam_daily_quota: int = int(os.getenv("SAM_DAILY_QUOTA", "0"))
+    amadeus_rate_per_sec: float = float(os.getenv("AMADEUS_RATE_PER_SEC", "5"))
+    llm_rate_per_sec: float = float(os.getenv("LLM_RATE_PER_SEC", "5"))
+
+    # -- Response cache (see services/response_cache.py) ----------------------
+    # Seconds a read response stays in the Redis cache; 0 disables it (ETags still apply)
+    response_cache_ttl: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+    # -- GSA per-diem rates (see services/compliance/per_diem_index.py) -------
+    # Directory with the GSA per-diem rate / ZIP CSV files (default <DATA_DIR>/per_diem)
+    per_diem_data_dir: Optional[str] = os.getenv("PER_DIEM_DATA_DIR")
+    # Lodging limit for localities not listed in the rate files (GSA standard CONUS rate)
+    per_diem_standard_lodging: float = float(os.getenv("PER_DIEM_STANDARD_LODGING", "110"))
+
     # -- Feature flags --------------------------------------------------------
     hotel_match_use_autogen: bool = os.getenv("HOTEL_MATCH_USE_AUTOGEN", "false").lower() == "true"
 
@@ -110,6 +163,17 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        """``database_url`` with the asyncpg driver (used by ``db.get_async_db``)."""
+        url = self.database_url
+        for prefix in ("postgresql+psycopg2://", "postgresql+psycopg://", "postgresql://", "postgres://"):
+            if url.startswith(prefix):
+                url = "postgresql+asyncpg://" + url[len(prefix):]
+                break
+        # asyncpg takes ``ssl`` instead of libpq's ``sslmode``
+        return url.replace("sslmode=", "ssl=")
+
     @property
     def is_production(self) -> bool:
         return self.env in ("prod", "production")
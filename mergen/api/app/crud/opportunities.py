@@ -1,13 +1,19 @@
 """
 CRUD operations for Opportunities
 """
+import base64
+import json
 import logging
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from sqlalchemy import Select, and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from ..models import Opportunity, OpportunityAttachment
+from ..models import AIAnalysisResult, Opportunity, OpportunityAttachment
 from ..schemas import OpportunityCreate, OpportunityAttachmentCreate
+from .projections import opportunity_summary_options
+from ..services.dashboard_stats_service import record_opportunity_created
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,7 @@ def upsert_opportunity(db: Session, data: Dict[str, Any]) -> Opportunity:
     if not obj and data.get("opportunity_id"):
         obj = db.query(Opportunity).filter(Opportunity.opportunity_id == data.get("opportunity_id")).first()
     
+    created = obj is None
     if obj:
         # Update existing
         for key, value in data.items():
@@ -56,6 +63,9 @@ def upsert_opportunity(db: Session, data: Dict[str, Any]) -> Opportunity:
         logger.error(f"Error upserting opportunity {notice_id}: {e}", exc_info=True)
         raise
     
+    if created:
+        record_opportunity_created(db, obj.naics_code)
+    
     return obj
 
 
@@ -69,43 +79,119 @@ def get_opportunity_by_notice_id(db: Session, notice_id: str) -> Optional[Opport
     return db.query(Opportunity).filter(Opportunity.notice_id == notice_id).first()
 
 
-def list_opportunities(
-    db: Session,
+def encode_cursor(opportunity: Opportunity) -> str:
+    """Opaque keyset cursor for the (posted_date, id) position after ``opportunity``."""
+    payload = {
+        "p": opportunity.posted_date.isoformat() if opportunity.posted_date else None,
+        "i": opportunity.id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Inverse of ``encode_cursor``; raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        posted = datetime.fromisoformat(payload["p"]) if payload.get("p") else None
+        return posted, int(payload["i"])
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
+def _keyset_after(posted_date: Optional[datetime], last_id: int):
+    """Rows after the cursor for ORDER BY posted_date DESC NULLS LAST, id DESC."""
+    if posted_date is None:
+        return and_(Opportunity.posted_date.is_(None), Opportunity.id < last_id)
+    return or_(
+        Opportunity.posted_date < posted_date,
+        and_(Opportunity.posted_date == posted_date, Opportunity.id < last_id),
+        Opportunity.posted_date.is_(None),
+    )
+
+
+def opportunity_list_statement(
     skip: int = 0,
     limit: int = 100,
     naics_code: Optional[str] = None,
     keyword: Optional[str] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
-) -> List[Opportunity]:
-    """List opportunities with filters"""
-    query = db.query(Opportunity)
+    summary: bool = False,
+    notice_id: Optional[str] = None,
+    opportunity_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    sort: str = "posted_date",
+) -> Select:
+    """
+    SELECT for an opportunity list with filters (summary=True skips the
+    raw_data/cached_data payload). Shared by the sync and async readers.
+
+    keyword: ranked full-text search on ``search_vector`` (GIN), OR'ed with a
+        title substring match served by the pg_trgm index for partial words.
+    cursor: keyset pagination on (posted_date DESC NULLS LAST, id DESC); when
+        given, ``skip`` is ignored. ``sort="relevance"`` orders keyword
+        matches by rank and uses offset paging.
+    """
+    stmt = select(Opportunity)
+    if summary:
+        stmt = stmt.options(*opportunity_summary_options())
     
     if naics_code:
-        query = query.filter(Opportunity.naics_code == naics_code)
+        stmt = stmt.filter(Opportunity.naics_code == naics_code)
+    
+    if notice_id:
+        stmt = stmt.filter(Opportunity.notice_id.ilike(f"%{notice_id}%"))
     
+    if opportunity_id:
+        stmt = stmt.filter(Opportunity.opportunity_id == str(opportunity_id))
+    
+    ts_query = None
     if keyword:
-        like_pattern = f"%{keyword}%"
-        query = query.filter(
-            (Opportunity.title.ilike(like_pattern)) |
-            (Opportunity.description.ilike(like_pattern))
-        )
+        ts_query = func.websearch_to_tsquery("english", keyword)
+        stmt = stmt.filter(or_(
+            Opportunity.search_vector.op("@@")(ts_query),
+            Opportunity.title.ilike(f"%{keyword}%"),
+        ))
     
     if date_from:
-        query = query.filter(Opportunity.posted_date >= date_from)
+        stmt = stmt.filter(Opportunity.posted_date >= date_from)
     
     if date_to:
-        query = query.filter(Opportunity.posted_date <= date_to)
+        stmt = stmt.filter(Opportunity.posted_date <= date_to)
     
-    # Order by posted_date desc, nulls last
-    try:
-        from sqlalchemy import desc
-        query = query.order_by(desc(Opportunity.posted_date).nulls_last())
-    except Exception:
-        # Fallback: simple order
-        query = query.order_by(Opportunity.posted_date.desc())
+    if ts_query is not None and sort == "relevance" and not cursor:
+        rank = func.ts_rank_cd(Opportunity.search_vector, ts_query)
+        return stmt.order_by(desc(rank), desc(Opportunity.id)).offset(skip).limit(limit)
+    
+    # Order by posted_date desc, nulls last; id breaks ties so the keyset is total
+    stmt = stmt.order_by(desc(Opportunity.posted_date).nulls_last(), desc(Opportunity.id))
     
-    return query.offset(skip).limit(limit).all()
+    if cursor:
+        posted_date, last_id = decode_cursor(cursor)
+        return stmt.filter(_keyset_after(posted_date, last_id)).limit(limit)
+    
+    return stmt.offset(skip).limit(limit)
+
+
+def list_opportunities(db: Session, **filters: Any) -> List[Opportunity]:
+    """List opportunities; see ``opportunity_list_statement`` for the filters."""
+    return list(db.scalars(opportunity_list_statement(**filters)).all())
+
+
+async def list_opportunities_async(db: AsyncSession, **filters: Any) -> List[Opportunity]:
+    """Async variant of ``list_opportunities``."""
+    return list((await db.scalars(opportunity_list_statement(**filters))).all())
+
+
+async def get_opportunity_with_attachments_async(db: AsyncSession, opportunity_id: int) -> Optional[Opportunity]:
+    """Opportunity by database ID with its attachments eagerly loaded (no lazy loads in async)."""
+    stmt = (
+        select(Opportunity)
+        .options(selectinload(Opportunity.attachments))
+        .filter(Opportunity.id == opportunity_id)
+    )
+    return (await db.scalars(stmt)).first()
 
 
 def create_attachment(db: Session, attachment_data: Dict[str, Any]) -> OpportunityAttachment:
@@ -128,3 +214,47 @@ def get_attachments_for_opportunity(db: Session, opportunity_id: int) -> List[Op
         OpportunityAttachment.opportunity_id == opportunity_id
     ).all()
 
+
+async def get_attachments_for_opportunity_async(db: AsyncSession, opportunity_id: int) -> List[OpportunityAttachment]:
+    """Async variant of ``get_attachments_for_opportunity``."""
+    stmt = select(OpportunityAttachment).filter(OpportunityAttachment.opportunity_id == opportunity_id)
+    return list((await db.scalars(stmt)).all())
+
+
+async def opportunity_validators_async(db: AsyncSession, opportunity_id: int) -> Optional[Tuple[Any, ...]]:
+    """
+    Cheap change markers for the detail/attachment views (ETag input): the
+    row timestamps plus the state of each attachment, without the JSON payloads.
+    """
+    row = (await db.execute(
+        select(Opportunity.updated_at, Opportunity.created_at).filter(Opportunity.id == opportunity_id)
+    )).first()
+    if row is None:
+        return None
+    attachments = (await db.execute(
+        select(
+            OpportunityAttachment.id,
+            OpportunityAttachment.downloaded,
+            OpportunityAttachment.content_hash,
+            OpportunityAttachment.size_bytes,
+            OpportunityAttachment.local_path,
+        )
+        .filter(OpportunityAttachment.opportunity_id == opportunity_id)
+        .order_by(OpportunityAttachment.id)
+    )).all()
+    return (*row, [tuple(attachment) for attachment in attachments])
+
+
+async def analysis_results_validators_async(
+    db: AsyncSession, opportunity_id: int, analysis_type: Optional[str] = None
+) -> Tuple[Any, ...]:
+    """Change markers (ETag input) of an opportunity's analysis results."""
+    stmt = select(
+        func.count(AIAnalysisResult.id),
+        func.max(AIAnalysisResult.id),
+        func.max(AIAnalysisResult.updated_at),
+        func.max(AIAnalysisResult.completed_at),
+    ).filter(AIAnalysisResult.opportunity_id == opportunity_id)
+    if analysis_type:
+        stmt = stmt.filter(AIAnalysisResult.analysis_type == analysis_type)
+    return tuple((await db.execute(stmt)).one())
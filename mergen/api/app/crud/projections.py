@@ -0,0 +1,32 @@
+"""
+Summary projections for list endpoints
+======================================
+``Opportunity.raw_data`` / ``cached_data`` and ``AIAnalysisResult.result_json``
+hold large JSON documents that list views never render. The loader options
+below defer those column groups so list queries only transfer the summary
+columns; the ``*SummaryRead`` schemas in ``schemas.py`` serialize exactly
+those. Detail endpoints load the full row.
+
+Deferral is applied per query (not on the mapper) because pipeline and agent
+code read these columns from instances that may outlive their session.
+``raiseload=True`` turns an accidental access into an error instead of a
+silent per-row lazy load.
+"""
+
+from sqlalchemy.orm import defer
+
+from ..models import AIAnalysisResult, Opportunity
+
+# Column groups that are never needed to render a list row
+OPPORTUNITY_PAYLOAD_COLUMNS = (Opportunity.raw_data, Opportunity.cached_data)
+ANALYSIS_PAYLOAD_COLUMNS = (AIAnalysisResult.result_json,)
+
+
+def opportunity_summary_options(raiseload: bool = True) -> list:
+    """Loader options that skip the opportunity payload columns."""
+    return [defer(column, raiseload=raiseload) for column in OPPORTUNITY_PAYLOAD_COLUMNS]
+
+
+def analysis_summary_options(raiseload: bool = True) -> list:
+    """Loader options that skip the analysis result payload."""
+    return [defer(column, raiseload=raiseload) for column in ANALYSIS_PAYLOAD_COLUMNS]
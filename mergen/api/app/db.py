@@ -6,6 +6,8 @@ Single source of database connectivity.
 - Falls back to individual POSTGRES_* vars via config.Settings
 - Connection pool tuned for production (pre-ping, recycle, pool size)
 - Provides `get_db` FastAPI dependency
+- Commits invalidate cached API responses of the written rows (services/response_cache)
+- Async engine/session (asyncpg) for read-heavy `async def` routes: `get_async_db`
 - `init_pgvector()` helper to enable pgvector extension on first run
 - `check_db_health()` for readiness probes
 """
@@ -13,10 +15,14 @@ Single source of database connectivity.
 import logging
 from contextlib import contextmanager
 
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
 from .config import settings
+from .services.response_cache import install_invalidation_hooks
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,10 @@ engine = create_engine(
 # ---------------------------------------------------------------------------
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Every Session (sync, and the sync side of AsyncSession) drops the cached
+# responses of the rows it commits
+install_invalidation_hooks(Session)
+
 # ---------------------------------------------------------------------------
 # Declarative base — all models inherit from this
 # ---------------------------------------------------------------------------
@@ -55,6 +65,55 @@ def get_db():
         db.close()
 
 
+# ---------------------------------------------------------------------------
+# Async engine (asyncpg) — created on first use so scripts and workers that
+# only use the sync session never need the asyncpg driver
+# ---------------------------------------------------------------------------
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            settings.async_database_url,
+            pool_pre_ping=True,
+            pool_recycle=300,
+            pool_size=10,
+            max_overflow=20,
+            echo=settings.env == "dev",
+        )
+        # Routes serialize ORM objects after the session ends: keep them loaded
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, expire_on_commit=False, autoflush=False
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """New AsyncSession (counterpart of ``SessionLocal`` for async code)."""
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Yield an AsyncSession for a single request, then close.
+
+    Relationships are not lazy-loaded in async sessions; queries must eager
+    load (``selectinload``) whatever the response model serializes.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _AsyncSessionLocal = None
+
+
 # ---------------------------------------------------------------------------
 # Context-manager variant (for background tasks / scripts)
 # ---------------------------------------------------------------------------
@@ -179,6 +179,10 @@ async def startup_event():
     # 2. pgvector
     init_pgvector()
 
+    # Catalog output files written outside the API (background thread, see artifact_catalog)
+    from .services.artifact_catalog import reconcile_in_background
+    reconcile_in_background()
+
     # 3. Startup notification
     from .services.notifications import notify_info
     await notify_info(
@@ -191,3 +195,14 @@ async def startup_event():
     )
 
     logger.info("[startup] Application ready ✓")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the shared attachment download loop, the SOW PDF batch pool and close the async DB pool."""
+    from .db import dispose_async_engine
+    from .services.download_runner import shutdown_download_runner
+    from .services.sow_pdf_generator_weasyprint import shutdown_batch_pool
+    shutdown_download_runner()
+    shutdown_batch_pool()
+    await dispose_async_engine()
@@ -5,9 +5,11 @@ Models package — re-exports from db_models.py (Single Source of Truth).
 from .db_models import (
     Opportunity,
     OpportunityAttachment,
+    AttachmentBlob,
     OpportunityHistory,
     AIAnalysisResult,
     AnalysisLog,
+    GeneratedArtifact,
     AgentRun,
     AgentMessage,
     Document,
@@ -15,6 +17,8 @@ from .db_models import (
     EmailLog,
     Hotel,
     DecisionCache,
+    DecisionCacheNotice,
+    DashboardStat,
     TrainingExample,
     SyncJob,
     SyncLog,
@@ -36,10 +40,12 @@ __all__ = [
     # Core
     "Opportunity",
     "OpportunityAttachment",
+    "AttachmentBlob",
     "OpportunityHistory",
     # Analysis
     "AIAnalysisResult",
     "AnalysisLog",
+    "GeneratedArtifact",
     # Agents
     "AgentRun",
     "AgentMessage",
@@ -63,6 +69,8 @@ __all__ = [
     "DownloadLog",
     # Learning
     "DecisionCache",
+    "DecisionCacheNotice",
+    "DashboardStat",
     "TrainingExample",
     # SOW
     "SOWDataModel",
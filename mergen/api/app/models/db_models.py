@@ -5,7 +5,7 @@ All table definitions live here.  Other files (models_unified.py,
 mergenlite_models.py) are DEPRECATED and will be removed.
 
 Tables:
-  Core      : opportunities, opportunity_attachments
+  Core      : opportunities, opportunity_attachments, attachment_blobs
   Analysis  : ai_analysis_results, analysis_logs
   Jobs      : sync_jobs, sync_logs, download_jobs, download_logs
   Hotel     : hotels, email_log
@@ -13,21 +13,29 @@ Tables:
   Documents : documents, requirements, evidence,
               facility_features, pricing_items, past_performance, clauses
   RAG       : vector_chunks (pgvector)
-  Meta      : opportunity_history, decision_cache, training_examples
+  Meta      : opportunity_history, decision_cache, decision_cache_notices,
+              training_examples, dashboard_stats
 """
 
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Computed,
+    Index,
     Integer,
     String,
     Text,
+    Date,
     DateTime,
     Float,
     Boolean,
     ForeignKey,
     JSON,
+    UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 # pgvector — graceful fallback if extension not available
@@ -42,10 +50,29 @@ except ImportError:
 from app.db import Base
 
 
+# Weighted full-text document for opportunity search (generated column, so every
+# insert/upsert keeps it current). Must match migration 0007.
+OPPORTUNITY_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(notice_id, '') || ' ' || "
+    "coalesce(solicitation_number, '') || ' ' || coalesce(agency, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
 class Opportunity(Base):
     """Unified Opportunity model shared by React + FastAPI."""
 
     __tablename__ = "opportunities"
+    __table_args__ = (
+        Index("ix_opportunities_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_opportunities_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        # Keyset pagination: ORDER BY posted_date DESC NULLS LAST, id DESC
+        Index("ix_opportunities_posted_date_id", text("posted_date DESC NULLS LAST"), text("id DESC")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     opportunity_id = Column(String(255), nullable=False, index=True)
@@ -80,6 +107,8 @@ class Opportunity(Base):
     cached_data = Column(JSON, nullable=True)
     cache_updated_at = Column(DateTime(timezone=True), nullable=True)
 
+    search_vector = deferred(Column(TSVECTOR, Computed(OPPORTUNITY_SEARCH_VECTOR_SQL, persisted=True), nullable=True))
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
@@ -139,6 +168,8 @@ class OpportunityAttachment(Base):
     local_path = Column(String(1024), nullable=True)
     downloaded = Column(Boolean, default=False, nullable=False)
     storage_path = Column(String(1024), nullable=True)
+    # SHA-256 of the file; local_path then points at the shared AttachmentBlob
+    content_hash = Column(String(64), ForeignKey("attachment_blobs.sha256", ondelete="SET NULL"), nullable=True, index=True)
 
     extra_metadata = Column(JSON, nullable=True)
 
@@ -146,6 +177,25 @@ class OpportunityAttachment(Base):
     downloaded_at = Column(DateTime(timezone=True), nullable=True)
 
     opportunity = relationship("Opportunity", back_populates="attachments")
+    blob = relationship("AttachmentBlob", back_populates="attachments")
+
+
+class AttachmentBlob(Base):
+    """Content-addressed attachment file, shared by every attachment with the same bytes."""
+
+    __tablename__ = "attachment_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size_bytes = Column(Integer, nullable=True)
+    mime_type = Column(String(255), nullable=True)
+    storage_path = Column(String(1024), nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    parsed_result = Column(JSON, nullable=True)  # cached analyze_document() output
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+
+    attachments = relationship("OpportunityAttachment", back_populates="blob")
 
 
 class AIAnalysisResult(Base):
@@ -194,6 +244,31 @@ class AnalysisLog(Base):
     analysis_result = relationship("AIAnalysisResult", back_populates="logs")
 
 
+class GeneratedArtifact(Base):
+    """Catalog entry for a pipeline output file under DATA_DIR/opportunities/<notice>/outputs."""
+
+    __tablename__ = "generated_artifacts"
+    __table_args__ = (
+        Index("ix_generated_artifacts_modified_at_id", text("modified_at DESC"), text("id DESC")),
+        Index("ix_generated_artifacts_notice_modified", "notice_id", text("modified_at DESC")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String(1024), nullable=False, unique=True)  # relative to DATA_DIR
+    filename = Column(String(512), nullable=False)
+    notice_id = Column(String(255), nullable=False)
+    kind = Column(String(20), nullable=False, index=True)  # json / pdf / markdown / other
+
+    opportunity_id = Column(Integer, ForeignKey("opportunities.id", ondelete="SET NULL"), nullable=True, index=True)
+    analysis_result_id = Column(Integer, ForeignKey("ai_analysis_results.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    size_bytes = Column(BigInteger, nullable=True)
+    modified_at = Column(DateTime(timezone=True), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
+
+
 class SyncJob(Base):
     """Track SAM sync jobs."""
 
@@ -207,6 +282,7 @@ class SyncJob(Base):
     params = Column(JSON, nullable=True)
     count_new = Column(Integer, default=0)
     count_updated = Column(Integer, default=0)
+    count_skipped = Column(Integer, default=0, server_default="0")
     count_attachments = Column(Integer, default=0)
     total_processed = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
@@ -415,6 +491,10 @@ class DecisionCache(Base):
     """Stores reusable decision patterns (e.g., hotel selections)."""
 
     __tablename__ = "decision_cache"
+    __table_args__ = (
+        # Nearest-signature lookup: candidates share the location
+        Index("ix_decision_cache_sig_location", "sig_country", "sig_state", "sig_city"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     key_hash = Column(String(255), nullable=False, unique=True, index=True)
@@ -423,6 +503,55 @@ class DecisionCache(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     extra_metadata = Column(JSON, nullable=True)
 
+    # Bucketed signature (also in extra_metadata["signature"]), one column per field
+    sig_city = Column(String(255), nullable=True)
+    sig_state = Column(String(100), nullable=True)
+    sig_country = Column(String(100), nullable=True)
+    sig_naics = Column(String(50), nullable=True)
+    sig_location_type = Column(String(100), nullable=True)
+    sig_nights = Column(String(20), nullable=True)
+    sig_participants = Column(String(20), nullable=True)
+    sig_budget = Column(String(20), nullable=True)
+
+    notices = relationship("DecisionCacheNotice", back_populates="decision_cache", cascade="all, delete-orphan")
+
+
+class DecisionCacheNotice(Base):
+    """Notice → decision cache entry mapping (replaces scanning extra_metadata["notice_ids"])."""
+
+    __tablename__ = "decision_cache_notices"
+    __table_args__ = (UniqueConstraint("notice_id", "decision_cache_id", name="uq_decision_cache_notice"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    notice_id = Column(String(255), nullable=False, index=True)
+    decision_cache_id = Column(
+        Integer, ForeignKey("decision_cache.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    decision_cache = relationship("DecisionCache", back_populates="notices")
+
+
+class DashboardStat(Base):
+    """Incremental dashboard rollup; scope is "all" or "naics:<code>"."""
+
+    __tablename__ = "dashboard_stats"
+
+    scope = Column(String(150), primary_key=True)
+    naics_code = Column(String(100), nullable=True, index=True)
+
+    total_opportunities = Column(Integer, nullable=False, default=0, server_default="0")
+    new_today = Column(Integer, nullable=False, default=0, server_default="0")
+    new_today_date = Column(Date, nullable=True)
+    analyzed_opportunities = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Analysis duration (created_at → completed_at): mean = sum / count, percentiles from histogram
+    analysis_count = Column(Integer, nullable=False, default=0, server_default="0")
+    analysis_seconds_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    analysis_duration_histogram = Column(JSON, nullable=True)  # {"<bucket index>": count}
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
+
 
 class TrainingExample(Base):
     """Stores structured examples for future fine-tuning/RAG usage."""
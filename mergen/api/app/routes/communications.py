@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, load_only, selectinload
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
@@ -71,7 +71,19 @@ def get_communication_dashboard(db: Session = Depends(get_db)):
     Fetches the dashboard data: Opportunities -> Hotels -> Stats.
     """
     # Fetch active opportunities with their hotels
-    opportunities = db.query(Opportunity).options(joinedload(Opportunity.hotels)).filter(Opportunity.status != 'archived').all()
+    # Only the rendered opportunity columns; hotels in one extra IN query instead of a row-multiplying join
+    opportunities = db.query(Opportunity).options(
+        load_only(
+            Opportunity.id,
+            Opportunity.notice_id,
+            Opportunity.title,
+            Opportunity.agency,
+            Opportunity.place_of_performance,
+            Opportunity.response_deadline,
+            Opportunity.status,
+        ),
+        selectinload(Opportunity.hotels),
+    ).filter(Opportunity.status != 'archived').all()
     
     dashboard_data = []
     
@@ -3,12 +3,14 @@ from sqlalchemy.orm import Session
 from typing import List
 from ..db import get_db
 from ..models import Document
+from ..schemas import ComplianceMatrix
+from ..services.compliance.engine import build_compliance_matrix
 
 router = APIRouter()
 
 
-@router.get("/matrix")
-async def get_compliance_matrix(
+@router.get("/matrix", response_model=ComplianceMatrix)
+def get_compliance_matrix(
     rfq_id: int,
     db: Session = Depends(get_db)
 ):
@@ -23,15 +25,8 @@ async def get_compliance_matrix(
     if not rfq_doc:
         raise HTTPException(status_code=404, detail="RFQ not found")
     
-    # Return empty matrix for now - can be extended later with Document-based compliance
-    return {
-        "rfq_id": rfq_id,
-        "items": [],
-        "total_requirements": 0,
-        "compliant": 0,
-        "non_compliant": 0,
-        "partial": 0
-    }
+    # Cached per RFQ; rebuilt when its requirements or evidence change
+    return build_compliance_matrix(db, rfq_id)
 
 
 @router.get("/requirements/{rfq_id}")
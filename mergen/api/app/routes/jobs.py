@@ -4,18 +4,15 @@ Endpoints for scheduled/automated jobs (Cloud Scheduler integration)
 """
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 from pydantic import BaseModel
 import logging
-from datetime import datetime
 
-from ..db import get_db, SessionLocal
-from ..models import Opportunity, AIAnalysisResult
-from ..services.pipeline_service import create_pipeline_job, run_pipeline_job
-from ..services.sam_service import fetch_opportunities_from_sam
-from ..services.sam_gov.integration import SAMGovIntegration
-from ..services.sam_mapper import map_sam_record_to_opportunity
-from ..crud.opportunities import upsert_opportunity
+from ..db import get_db
+from ..models import Opportunity, AIAnalysisResult, SyncJob, SyncLog
+from ..schemas import SyncJobRead, SyncLogRead
+from ..services import artifact_catalog, blob_store
+from ..services.daily_scan_service import create_daily_scan_job, run_daily_scan
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
@@ -28,165 +25,30 @@ class DailyJobRequest(BaseModel):
     days_back: int = 1  # How many days back to search
     limit: int = 10  # Max opportunities to process
     force_refresh: bool = False  # Force re-analysis even if already analyzed
+    concurrency: Optional[int] = None  # Parallel pipelines (default: DAILY_SCAN_CONCURRENCY)
 
 
 async def process_daily_scan_job(
     naics_code: str,
     days_back: int,
     limit: int,
-    force_refresh: bool
+    force_refresh: bool,
+    job_id: Optional[str] = None,
+    concurrency: Optional[int] = None,
 ):
     """
     Background task: Fetch opportunities, analyze, and send emails.
     This runs asynchronously so Cloud Scheduler doesn't timeout.
+    Pipelines run on the analysis job queue (see daily_scan_service).
     """
-    db = SessionLocal()
-    try:
-        logger.info(f"📅 GÜNLÜK GÖREV BAŞLADI: NAICS {naics_code}, Son {days_back} gün, Max {limit} ilan")
-        
-        # Step 1: Fetch opportunities from SAM.gov
-        logger.info(f"🔍 SAM.gov'dan veri çekiliyor (NAICS: {naics_code})...")
-        try:
-            # Try SAM.gov integration first
-            sam_integration = SAMGovIntegration()
-            opportunities = await sam_integration.search_opportunities(
-                naics_codes=[naics_code],
-                date_range_days=days_back
-            )
-            
-            if not opportunities:
-                # Fallback to legacy SAM service
-                logger.info("SAM.gov integration returned no results, trying legacy SAM service...")
-                opportunities = await fetch_opportunities_from_sam({
-                    "naics": naics_code,
-                    "days_back": days_back,
-                    "limit": limit
-                })
-                # Convert to list if needed
-                if not isinstance(opportunities, list):
-                    opportunities = []
-        except Exception as sam_error:
-            logger.error(f"❌ SAM.gov veri çekme hatası: {sam_error}", exc_info=True)
-            opportunities = []
-        
-        if not opportunities:
-            logger.warning(f"⚠️  NAICS {naics_code} için ilan bulunamadı")
-            return {
-                "status": "completed",
-                "message": f"No opportunities found for NAICS {naics_code}",
-                "opportunities_processed": 0
-            }
-        
-        # Limit to max opportunities
-        opportunities = opportunities[:limit]
-        logger.info(f"✅ {len(opportunities)} ilan bulundu, analiz başlatılıyor...")
-        
-        # Step 2: Process each opportunity
-        processed_count = 0
-        analyzed_count = 0
-        errors = []
-        
-        for opp_data in opportunities:
-            try:
-                notice_id = opp_data.get('noticeId') or opp_data.get('notice_id') or opp_data.get('id')
-                if not notice_id:
-                    logger.warning(f"Skipping opportunity without notice_id: {opp_data.get('title', 'Unknown')[:50]}")
-                    continue
-                
-                # Check if already analyzed (unless force_refresh)
-                if not force_refresh:
-                    existing = db.query(Opportunity).filter(
-                        Opportunity.notice_id == str(notice_id)
-                    ).first()
-                    
-                    if existing:
-                        # Check if already analyzed
-                        existing_analysis = db.query(AIAnalysisResult).filter(
-                            AIAnalysisResult.opportunity_id == existing.id,
-                            AIAnalysisResult.analysis_type.in_(["sow_draft", "sow"]),
-                            AIAnalysisResult.status == "completed"
-                        ).first()
-                        
-                        if existing_analysis:
-                            logger.info(f"⏭️  İlan {notice_id} zaten analiz edilmiş, atlanıyor")
-                            continue
-                
-                # Create or update opportunity in database
-                try:
-                    # Map SAM data to Opportunity model
-                    opp_dict = map_sam_record_to_opportunity(opp_data)
-                    
-                    # Use upsert_opportunity from CRUD (it handles commit internally)
-                    opportunity = upsert_opportunity(db, opp_dict)
-                except Exception as db_error:
-                    logger.error(f"⚠️  İlan {notice_id} veritabanına kaydedilemedi: {db_error}")
-                    # upsert_opportunity already does rollback, but ensure clean state
-                    try:
-                        db.rollback()
-                    except Exception:
-                        pass  # Ignore if already rolled back
-                    continue
-                
-                logger.info(f"📄 İlan {notice_id} analiz ediliyor (Opportunity ID: {opportunity.id})...")
-                
-                # Step 3: Run SOW analysis
-                analysis_result, agent_run_id = create_pipeline_job(
-                    db=db,
-                    opportunity_id=opportunity.id,
-                    analysis_type="sow_draft",
-                    pipeline_version="v1",
-                    agent_name="autogen",
-                    initial_options={}
-                )
-                
-                # Run analysis synchronously (we're already in background task)
-                payload = {
-                    "opportunity_id": opportunity.id,
-                    "analysis_type": "sow_draft",
-                    "pipeline_version": "v1",
-                    "agent_name": "autogen",
-                    "options": {},
-                    "agent_run_id": agent_run_id
-                }
-                
-                run_pipeline_job(analysis_result.id, payload)
-                
-                analyzed_count += 1
-                processed_count += 1
-                
-                logger.info(f"✅ İlan {notice_id} analizi tamamlandı (Analysis ID: {analysis_result.id})")
-                
-                # Small delay to avoid overwhelming the system
-                import time
-                time.sleep(2)
-                
-            except Exception as opp_error:
-                error_msg = f"İlan {notice_id} işlenirken hata: {opp_error}"
-                logger.error(error_msg, exc_info=True)
-                errors.append(error_msg)
-                continue
-        
-        result = {
-            "status": "completed",
-            "message": f"Günlük görev tamamlandı: {processed_count} ilan işlendi, {analyzed_count} analiz yapıldı",
-            "opportunities_found": len(opportunities),
-            "opportunities_processed": processed_count,
-            "analyses_completed": analyzed_count,
-            "errors": errors if errors else None
-        }
-        
-        logger.info(f"✅✅✅ GÜNLÜK GÖREV TAMAMLANDI: {result['message']}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"❌ GÜNLÜK GÖREV HATASI: {e}", exc_info=True)
-        return {
-            "status": "failed",
-            "message": f"Günlük görev hatası: {e}",
-            "error": str(e)
-        }
-    finally:
-        db.close()
+    return await run_daily_scan(
+        naics_code=naics_code,
+        days_back=days_back,
+        limit=limit,
+        force_refresh=force_refresh,
+        job_id=job_id,
+        concurrency=concurrency,
+    )
 
 
 @router.post("/daily-scan")
@@ -204,18 +66,30 @@ async def trigger_daily_scan(
     Background task olarak çalışır, hemen 202 Accepted döner.
     """
     logger.info(f"📅 GÜNLÜK GÖREV TETİKLENDİ: NAICS {job.naics_code or job.target_id}")
+    naics_code = job.naics_code or job.target_id or "721110"
+    
+    # Persistent job record: progress can be polled via /daily-scan/jobs/{job_id}
+    job_id = create_daily_scan_job(db, {
+        "naics_code": naics_code,
+        "days_back": job.days_back,
+        "limit": job.limit,
+        "force_refresh": job.force_refresh,
+    })
     
     # İşlemi arka plana at (Cloud Scheduler timeout yemesin diye hemen 202 dönüyoruz)
     background_tasks.add_task(
         process_daily_scan_job,
-        naics_code=job.naics_code or job.target_id or "721110",
+        naics_code=naics_code,
         days_back=job.days_back,
         limit=job.limit,
-        force_refresh=job.force_refresh
+        force_refresh=job.force_refresh,
+        job_id=job_id,
+        concurrency=job.concurrency,
     )
     
     return {
         "status": "accepted",
+        "job_id": job_id,
         "message": f"Günlük analiz başlatıldı. Hedef: NAICS {job.naics_code or job.target_id}",
         "target_id": job.target_id,
         "naics_code": job.naics_code or job.target_id,
@@ -225,6 +99,37 @@ async def trigger_daily_scan(
     }
 
 
+@router.get("/daily-scan/jobs/{job_id}", response_model=SyncJobRead)
+async def get_daily_scan_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Günlük tarama iş kaydı (ilerleme: total_processed / count_new / count_skipped).
+    """
+    scan_job = db.query(SyncJob).filter(
+        SyncJob.job_id == job_id,
+        SyncJob.sync_type == "daily_scan"
+    ).first()
+    if not scan_job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return scan_job
+
+
+@router.get("/daily-scan/jobs/{job_id}/logs", response_model=List[SyncLogRead])
+async def get_daily_scan_job_logs(
+    job_id: str,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """
+    Günlük tarama iş kaydının logları (en yeni önce).
+    """
+    return db.query(SyncLog).filter(
+        SyncLog.job_id == job_id
+    ).order_by(SyncLog.timestamp.desc()).limit(min(max(limit, 1), 1000)).all()
+
+
 @router.get("/daily-scan/status")
 async def get_daily_scan_status(
     naics_code: str = "721110",
@@ -271,3 +176,28 @@ async def get_daily_scan_status(
         "opportunities": status_summary
     }
 
+
+
+@router.post("/attachment-blobs/gc")
+def collect_attachment_blobs(
+    dry_run: bool = False,
+    adopt_legacy: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Paylaşılan attachment blob'larının temizliği (referansı kalmayanlar silinir).
+    adopt_legacy=true ise eski notice klasörlerindeki dosyalar da blob store'a taşınır.
+    """
+    adopted = blob_store.adopt_legacy_files(db) if adopt_legacy and not dry_run else 0
+    result = blob_store.collect_garbage(db, dry_run=dry_run)
+    result["adopted"] = adopted
+    return result
+
+
+@router.post("/artifacts/reconcile")
+def reconcile_generated_artifacts(db: Session = Depends(get_db)):
+    """
+    Üretilen dosya kataloğunu diskle eşitler (API dışında oluşturulan dosyalar
+    eklenir, silinen dosyaların kayıtları kaldırılır).
+    """
+    return artifact_catalog.reconcile_artifacts(db)
@@ -7,9 +7,10 @@ import sys
 from pathlib import Path
 from typing import Optional, List
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 
 # Load .env file from mergen/.env
 try:
@@ -41,7 +42,7 @@ except Exception as e:
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from ..db import get_db
+from ..db import get_async_db, get_db
 from ..models import (
     Opportunity,
     OpportunityAttachment,
@@ -57,7 +58,7 @@ from ..models import (
     AIAnalysisResult,
 )
 from ..schemas import (
-    OpportunityRead,
+    OpportunitySummaryRead,
     OpportunityWithAttachments,
     OpportunityAttachmentRead,
     SyncResponse,
@@ -80,6 +81,7 @@ from ..schemas import (
 from fastapi import BackgroundTasks, Body
 import logging
 
+from ..services import response_cache
 from ..services.decision_cache_service import (
     lookup_decision_cache as lookup_decision_cache_service,
     persist_decision_cache,
@@ -90,22 +92,28 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/opportunities", tags=["opportunities"])
 
 
-@router.get("", response_model=List[OpportunityRead])
+@router.get("", response_model=List[OpportunitySummaryRead])
 async def get_opportunities(
+    response: Response,
     notice_id: Optional[str] = Query(None, description="Filter by notice ID"),
     opportunity_id: Optional[str] = Query(None, description="Filter by opportunity ID (UUID string)"),
     naics_code: Optional[str] = Query(None, description="Filter by NAICS code"),
-    keyword: Optional[str] = Query(None, description="Search in title/description"),
-    page: int = Query(1, ge=1, description="Page number"),
+    keyword: Optional[str] = Query(None, description="Full-text search in title/description (partial words match titles)"),
+    page: int = Query(1, ge=1, description="Page number (ignored when cursor is given)"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the X-Next-Cursor header of the previous page"),
+    sort: str = Query("posted_date", pattern="^(posted_date|relevance)$", description="posted_date (default) or relevance (with keyword)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    List opportunities with pagination and filters
+    List opportunities with pagination and filters.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch the
+    next page without OFFSET (stays fast on deep pages).
     """
     try:
         # Use CRUD function for consistency
-        from ..crud.opportunities import list_opportunities
+        from ..crud.opportunities import list_opportunities_async, encode_cursor
         
         # Calculate skip
         skip = (page - 1) * page_size
@@ -115,27 +123,29 @@ async def get_opportunities(
         date_to = None
         
         # Get opportunities
-        opportunities = list_opportunities(
-            db=db,
+        opportunities = await list_opportunities_async(
+            db,
             skip=skip,
             limit=page_size,
             naics_code=naics_code,
             keyword=keyword,
             date_from=date_from,
-            date_to=date_to
+            date_to=date_to,
+            summary=True,
+            notice_id=notice_id,
+            opportunity_id=opportunity_id,
+            cursor=cursor,
+            sort=sort,
         )
         
-        # Filter by notice_id if provided
-        if notice_id:
-            opportunities = [opp for opp in opportunities if notice_id.lower() in (opp.notice_id or "").lower()]
-            
-        # Filter by opportunity_id if provided (Exact match usually)
-        if opportunity_id:
-            opportunities = [opp for opp in opportunities if str(opp.opportunity_id) == str(opportunity_id)]
+        if len(opportunities) == page_size and not (keyword and sort == "relevance"):
+            response.headers["X-Next-Cursor"] = encode_cursor(opportunities[-1])
         
         # Pydantic response_model handles serialization automatically
         return opportunities
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing opportunities: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error listing opportunities: {str(e)}")
@@ -144,20 +154,34 @@ async def get_opportunities(
 @router.get("/{opportunity_id}", response_model=OpportunityWithAttachments)
 async def get_opportunity(
     opportunity_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get opportunity by database ID with attachments
+
+    Conditional GET (ETag from updated_at + attachment state) and served
+    from the response cache until the opportunity or its attachments change.
     """
     try:
-        from ..crud.opportunities import get_opportunity
-        
-        opportunity = get_opportunity(db, opportunity_id)
-        if not opportunity:
-            raise HTTPException(status_code=404, detail="Opportunity not found")
-        
-        # Pydantic response_model automatically includes attachments via relationship
-        return opportunity
+        from ..crud.opportunities import get_opportunity_with_attachments_async, opportunity_validators_async
+
+        async def _etag():
+            validators = await opportunity_validators_async(db, opportunity_id)
+            if validators is None:
+                raise HTTPException(status_code=404, detail="Opportunity not found")
+            return response_cache.make_etag("detail", validators)
+
+        async def _build():
+            opportunity = await get_opportunity_with_attachments_async(db, opportunity_id)
+            if not opportunity:
+                raise HTTPException(status_code=404, detail="Opportunity not found")
+            # Attachments are eagerly loaded
+            return OpportunityWithAttachments.model_validate(opportunity)
+
+        return await response_cache.cached_json_response(
+            request, response_cache.opportunity_scope(opportunity_id), "detail", _etag, _build
+        )
         
     except HTTPException:
         raise
@@ -169,16 +193,27 @@ async def get_opportunity(
 @router.get("/{opportunity_id}/attachments", response_model=List[OpportunityAttachmentRead])
 async def get_opportunity_attachments(
     opportunity_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get all attachments for an opportunity
+    Get all attachments for an opportunity (conditional GET, cached)
     """
     try:
-        from ..crud.opportunities import get_attachments_for_opportunity
+        from ..crud.opportunities import get_attachments_for_opportunity_async, opportunity_validators_async
+
+        async def _etag():
+            return response_cache.make_etag("attachments", await opportunity_validators_async(db, opportunity_id))
 
-        attachments = get_attachments_for_opportunity(db, opportunity_id)
-        return attachments
+        async def _build():
+            attachments = await get_attachments_for_opportunity_async(db, opportunity_id)
+            return [OpportunityAttachmentRead.model_validate(attachment) for attachment in attachments]
+
+        return await response_cache.cached_json_response(
+            request, response_cache.opportunity_scope(opportunity_id), "attachments", _etag, _build
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting attachments for opportunity {opportunity_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting attachments: {str(e)}")
@@ -188,33 +223,31 @@ async def get_opportunity_attachments(
 async def get_opportunity_history(
     opportunity_id: int,
     limit: int = Query(50, ge=1, le=500, description="Max history entries"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    history = (
-        db.query(OpportunityHistory)
+    history = await db.scalars(
+        select(OpportunityHistory)
         .filter(OpportunityHistory.opportunity_id == opportunity_id)
         .order_by(OpportunityHistory.created_at.desc())
         .limit(limit)
-        .all()
     )
-    return history
+    return history.all()
 
 
 @router.get("/{opportunity_id}/agent-runs", response_model=List[AgentRunRead])
 async def get_opportunity_agent_runs(
     opportunity_id: int,
     limit: int = Query(20, ge=1, le=200, description="Max agent runs"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        runs = (
-            db.query(AgentRun)
+        runs = await db.scalars(
+            select(AgentRun)
             .filter(AgentRun.opportunity_id == opportunity_id)
             .order_by(AgentRun.started_at.desc())
             .limit(limit)
-            .all()
         )
-        return runs
+        return runs.all()
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -225,56 +258,66 @@ async def get_opportunity_agent_runs(
 @router.get("/{opportunity_id}/hotel-matches", response_model=List[HotelMatchRead])
 async def get_hotel_matches_for_opportunity(
     opportunity_id: int,
+    request: Request,
     limit: int = Query(5, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    results = (
-        db.query(AIAnalysisResult)
-        .filter(
-            AIAnalysisResult.opportunity_id == opportunity_id,
-            AIAnalysisResult.analysis_type == "hotel_match",
-        )
-        .order_by(AIAnalysisResult.created_at.desc())
-        .limit(limit)
-        .all()
-    )
-    response: List[HotelMatchRead] = []
-    for res in results:
-        payload = res.result_json or {}
-        response.append(
-            HotelMatchRead(
-                id=res.id,
-                generated_at=res.completed_at or res.created_at,
-                hotels=payload.get("hotels", []),
-                reasoning=payload.get("reasoning"),
-                decision_metadata=payload.get("decision_metadata"),
+    from ..crud.opportunities import analysis_results_validators_async
+
+    async def _etag():
+        validators = await analysis_results_validators_async(db, opportunity_id, "hotel_match")
+        return response_cache.make_etag("hotel-matches", limit, validators)
+
+    async def _build():
+        results = await db.scalars(
+            select(AIAnalysisResult)
+            .filter(
+                AIAnalysisResult.opportunity_id == opportunity_id,
+                AIAnalysisResult.analysis_type == "hotel_match",
             )
+            .order_by(AIAnalysisResult.created_at.desc())
+            .limit(limit)
         )
-    return response
+        response: List[HotelMatchRead] = []
+        for res in results:
+            payload = res.result_json or {}
+            response.append(
+                HotelMatchRead(
+                    id=res.id,
+                    generated_at=res.completed_at or res.created_at,
+                    hotels=payload.get("hotels", []),
+                    reasoning=payload.get("reasoning"),
+                    decision_metadata=payload.get("decision_metadata"),
+                )
+            )
+        return response
+
+    return await response_cache.cached_json_response(
+        request, response_cache.opportunity_scope(opportunity_id), f"hotel-matches:{limit}", _etag, _build
+    )
 
 
 @router.get("/{opportunity_id}/training-examples", response_model=List[TrainingExampleRead])
 async def get_training_examples_for_opportunity(
     opportunity_id: int,
     limit: int = Query(20, ge=1, le=200, description="Max training examples"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    examples = (
-        db.query(TrainingExample)
+    examples = await db.scalars(
+        select(TrainingExample)
         .filter(TrainingExample.opportunity_id == opportunity_id)
         .order_by(TrainingExample.created_at.desc())
         .limit(limit)
-        .all()
     )
-    return examples
+    return examples.all()
 
 
 @router.get("/decision-cache/{key_hash}", response_model=DecisionCacheRead)
 async def get_decision_cache_entry(
     key_hash: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    entry = db.query(DecisionCache).filter(DecisionCache.key_hash == key_hash).first()
+    entry = await db.scalar(select(DecisionCache).filter(DecisionCache.key_hash == key_hash))
     if not entry:
         raise HTTPException(status_code=404, detail="Pattern not found")
     return entry
@@ -284,16 +327,15 @@ async def get_decision_cache_entry(
 async def get_email_logs_for_opportunity(
     opportunity_id: int,
     limit: int = Query(50, ge=1, le=500, description="Max email logs"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    logs = (
-        db.query(EmailLog)
+    logs = await db.scalars(
+        select(EmailLog)
         .filter(EmailLog.opportunity_id == opportunity_id)
         .order_by(EmailLog.created_at.desc())
         .limit(limit)
-        .all()
     )
-    return logs
+    return logs.all()
 
 
 @router.post("/{opportunity_id}/decision-cache/lookup", response_model=DecisionCacheLookupResponse)
@@ -311,7 +353,7 @@ async def lookup_decision_cache_route(
     context = payload.model_dump(exclude_none=True) if payload else {}
     notice_id = context.get("notice_id") or (opportunity.notice_id if opportunity else None)
     try:
-        key_hash, signature, entry = lookup_decision_cache_service(
+        key_hash, signature, entry, match_type = lookup_decision_cache_service(
             db,
             opportunity=opportunity,
             context=context,
@@ -332,6 +374,7 @@ async def lookup_decision_cache_route(
             key_hash=key_hash,
             signature=signature,
             matched=entry is not None,
+            match_type=match_type,
             pattern=pattern,
         )
     except Exception as e:
@@ -353,11 +396,12 @@ async def save_decision_cache_route(
 
     context = payload.model_dump(exclude_none=True)
     notice_id = context.get("notice_id") or (opportunity.notice_id if opportunity else None)
-    key_hash, signature, _ = lookup_decision_cache_service(
+    key_hash, signature, _, _ = lookup_decision_cache_service(
         db,
         opportunity=opportunity,
         context=context,
         notice_id=notice_id,
+        nearest=False,
     )
     entry = persist_decision_cache(
         db,
@@ -457,7 +501,8 @@ async def download_attachments_endpoint(
     Runs as background task, returns job_id immediately
     """
     try:
-        from ..services.attachment_service import download_attachments_for_opportunity
+        from ..services.attachment_service import run_download_job
+        from ..services.job_queue import dispatch
         from ..schemas import DownloadResponse
         
         # Verify opportunity exists
@@ -477,24 +522,22 @@ async def download_attachments_endpoint(
         db.add(job)
         db.commit()
         
-        # Add background task
-        async def run_download():
-            # Create new session for background task
-            from ..db import SessionLocal
-            bg_db = SessionLocal()
-            try:
-                await download_attachments_for_opportunity(bg_db, opportunity_id, job_id)
-            finally:
-                bg_db.close()
-        
-        background_tasks.add_task(run_download)
+        # Hand off to the extraction queue; falls back to BackgroundTasks
+        dispatched = dispatch(
+            "extraction",
+            run_download_job,
+            opportunity_id,
+            job_id,
+            background_tasks=background_tasks,
+            job_id=f"download-{job_id}",
+        )
         
-        logger.info(f"Started background download job {job_id} for opportunity {opportunity_id}")
+        logger.info(f"Started download job {job_id} for opportunity {opportunity_id} via {dispatched['mode']}")
         
         return DownloadResponse(
             success=True,
             job_id=job_id,
-            message="Download started in background"
+            message="Download queued" if dispatched["mode"] == "queue" else "Download started in background"
         )
         
     except HTTPException:
@@ -508,12 +551,12 @@ async def download_attachments_endpoint(
 @router.get("/sync/jobs/{job_id}", response_model=SyncJobRead)
 async def get_sync_job(
     job_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get sync job status by job_id
     """
-    job = db.query(SyncJob).filter(SyncJob.job_id == job_id).first()
+    job = await db.scalar(select(SyncJob).filter(SyncJob.job_id == job_id))
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
@@ -523,51 +566,51 @@ async def get_sync_job(
 async def get_sync_job_logs(
     job_id: str,
     limit: int = Query(100, ge=1, le=1000, description="Max logs to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get logs for a sync job
     """
     # Verify job exists
-    job = db.query(SyncJob).filter(SyncJob.job_id == job_id).first()
-    if not job:
+    job_exists = await db.scalar(select(SyncJob.id).filter(SyncJob.job_id == job_id))
+    if not job_exists:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get logs
-    logs = db.query(SyncLog).filter(
-        SyncLog.job_id == job_id
-    ).order_by(SyncLog.timestamp.desc()).limit(limit).all()
+    logs = await db.scalars(
+        select(SyncLog).filter(SyncLog.job_id == job_id).order_by(SyncLog.timestamp.desc()).limit(limit)
+    )
     
-    return logs
+    return logs.all()
 
 
 @router.get("/sync/jobs", response_model=List[SyncJobRead])
 async def list_sync_jobs(
     limit: int = Query(20, ge=1, le=100, description="Max jobs to return"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List recent sync jobs
     """
-    query = db.query(SyncJob)
+    stmt = select(SyncJob)
     
     if status:
-        query = query.filter(SyncJob.status == status)
+        stmt = stmt.filter(SyncJob.status == status)
     
-    jobs = query.order_by(SyncJob.created_at.desc()).limit(limit).all()
-    return jobs
+    jobs = await db.scalars(stmt.order_by(SyncJob.created_at.desc()).limit(limit))
+    return jobs.all()
 
 
 @router.get("/download/jobs/{job_id}", response_model=DownloadJobRead)
 async def get_download_job(
     job_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get download job status by job_id
     """
-    job = db.query(DownloadJob).filter(DownloadJob.job_id == job_id).first()
+    job = await db.scalar(select(DownloadJob).filter(DownloadJob.job_id == job_id))
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
@@ -577,22 +620,22 @@ async def get_download_job(
 async def get_download_job_logs(
     job_id: str,
     limit: int = Query(100, ge=1, le=1000, description="Max logs to return"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get logs for a download job
     """
     # Verify job exists
-    job = db.query(DownloadJob).filter(DownloadJob.job_id == job_id).first()
-    if not job:
+    job_exists = await db.scalar(select(DownloadJob.id).filter(DownloadJob.job_id == job_id))
+    if not job_exists:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Get logs
-    logs = db.query(DownloadLog).filter(
-        DownloadLog.job_id == job_id
-    ).order_by(DownloadLog.timestamp.desc()).limit(limit).all()
+    logs = await db.scalars(
+        select(DownloadLog).filter(DownloadLog.job_id == job_id).order_by(DownloadLog.timestamp.desc()).limit(limit)
+    )
     
-    return logs
+    return logs.all()
 
 
 @router.get("/download/jobs", response_model=List[DownloadJobRead])
@@ -600,18 +643,18 @@ async def list_download_jobs(
     opportunity_id: Optional[int] = Query(None, description="Filter by opportunity ID"),
     limit: int = Query(20, ge=1, le=100, description="Max jobs to return"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List recent download jobs
     """
-    query = db.query(DownloadJob)
+    stmt = select(DownloadJob)
     
     if opportunity_id:
-        query = query.filter(DownloadJob.opportunity_id == opportunity_id)
+        stmt = stmt.filter(DownloadJob.opportunity_id == opportunity_id)
     
     if status:
-        query = query.filter(DownloadJob.status == status)
+        stmt = stmt.filter(DownloadJob.status == status)
     
-    jobs = query.order_by(DownloadJob.created_at.desc()).limit(limit).all()
-    return jobs
+    jobs = await db.scalars(stmt.order_by(DownloadJob.created_at.desc()).limit(limit))
+    return jobs.all()
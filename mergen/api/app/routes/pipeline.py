@@ -2,27 +2,36 @@
 Pipeline API Routes
 Manages AutoGen-style analysis jobs, background processing, and artifact serving.
 """
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
+import json
 import os
 import logging
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from typing import Optional
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
-from ..db import get_db
+from ..db import AsyncSessionLocal, get_async_db, get_db
 from ..models import AIAnalysisResult, AnalysisLog, Opportunity, AgentRun, AgentMessage, LLMCall
 from ..schemas import (
     PipelineRunRequest,
     PipelineRunResponse,
     AnalysisResultRead,
+    AnalysisResultSummaryRead,
     AnalysisLogRead,
 )
-from ..services.pipeline_service import create_pipeline_job, run_pipeline_job
+from ..crud.projections import analysis_summary_options
+from ..services.pipeline_service import create_pipeline_job
+from ..services.job_queue import dispatch_pipeline_job, queue_stats
+from ..services.progress_bus import subscribe_analysis, unsubscribe_analysis
+from ..services import artifact_catalog, response_cache
 
 router = APIRouter(prefix="/api/pipeline", tags=["pipeline"])
 
@@ -30,6 +39,10 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_DIR = PROJECT_ROOT / "data"
 DATA_DIR = Path(os.getenv("DATA_DIR", str(DEFAULT_DATA_DIR))).resolve()
 
+TERMINAL_STATUSES = {"completed", "failed"}
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_BACKLOG_LIMIT = 1000
+
 
 @router.post("/run", response_model=PipelineRunResponse)
 async def run_pipeline(
@@ -56,103 +69,243 @@ async def run_pipeline(
 
     payload = request.model_dump()
     payload["agent_run_id"] = agent_run_id
-    
-    # Log that we're starting the background task
-    logger.info(f"[Pipeline {analysis_result.id}] Adding background task")
-    
-    # Wrap the sync function to ensure it runs properly
-    def run_pipeline_sync():
-        try:
-            logger.info(f"[Pipeline {analysis_result.id}] Background task wrapper started")
-            run_pipeline_job(analysis_result.id, payload)
-            logger.info(f"[Pipeline {analysis_result.id}] Background task wrapper completed")
-        except Exception as e:
-            logger.exception(f"[Pipeline {analysis_result.id}] Background task wrapper failed: {e}")
-    
-    background_tasks.add_task(run_pipeline_sync)
-    logger.info(f"[Pipeline {analysis_result.id}] Background task added")
+    payload["analysis_type"] = analysis_result.analysis_type
+
+    # Hand off to the stage queue (RQ worker); falls back to BackgroundTasks
+    dispatch = dispatch_pipeline_job(
+        analysis_result.id,
+        payload,
+        background_tasks=background_tasks,
+        priority=request.priority or "normal",
+    )
+    logger.info(
+        f"[Pipeline {analysis_result.id}] Dispatched via {dispatch['mode']} "
+        f"(queue={dispatch['queue']}, job={dispatch['job_id']})"
+    )
 
     return PipelineRunResponse(
         analysis_result_id=analysis_result.id,
         status=analysis_result.status,
-        message="Pipeline job started",
+        message="Pipeline job queued" if dispatch["mode"] == "queue" else "Pipeline job started",
+        queue=dispatch["queue"],
+        job_id=dispatch["job_id"],
     )
 
 
+@router.get("/queues")
+async def get_queue_stats():
+    """Queue depth per pipeline stage (extraction / analysis / hotel_match / delivery)."""
+    return queue_stats()
+
+
 @router.get("/results/{analysis_result_id}", response_model=AnalysisResultRead)
 async def get_analysis_result(
     analysis_result_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Return a single analysis result."""
-    result = db.query(AIAnalysisResult).filter(AIAnalysisResult.id == analysis_result_id).first()
-    if not result:
-        raise HTTPException(status_code=404, detail="Analysis result not found")
-    return result
+    """
+    Return a single analysis result.
+
+    ETag from status/updated_at/completed_at: polling clients get a 304
+    without result_json being loaded; the body is cached until the row changes.
+    """
+    async def _etag():
+        validators = (await db.execute(
+            select(AIAnalysisResult.status, AIAnalysisResult.updated_at, AIAnalysisResult.completed_at)
+            .filter(AIAnalysisResult.id == analysis_result_id)
+        )).first()
+        if validators is None:
+            raise HTTPException(status_code=404, detail="Analysis result not found")
+        return response_cache.make_etag("result", tuple(validators))
+
+    async def _build():
+        result = await db.get(AIAnalysisResult, analysis_result_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="Analysis result not found")
+        return AnalysisResultRead.model_validate(result)
+
+    return await response_cache.cached_json_response(
+        request, response_cache.analysis_scope(analysis_result_id), "result", _etag, _build
+    )
 
 
 @router.get("/results/{analysis_result_id}/logs", response_model=List[AnalysisLogRead])
 async def get_analysis_logs(
     analysis_result_id: int,
     limit: int = Query(100, ge=1, le=1000, description="Max log entries"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Return logs for a specific analysis job."""
-    logs = (
-        db.query(AnalysisLog)
+    logs = (await db.scalars(
+        select(AnalysisLog)
         .filter(AnalysisLog.analysis_result_id == analysis_result_id)
         .order_by(AnalysisLog.timestamp.desc())
         .limit(limit)
-        .all()
-    )
+    )).all()
     if not logs:
         # Ensure the result exists to distinguish "no logs yet" vs invalid id
-        exists = db.query(AIAnalysisResult).filter(AIAnalysisResult.id == analysis_result_id).first()
+        exists = await db.scalar(select(AIAnalysisResult.id).filter(AIAnalysisResult.id == analysis_result_id))
         if not exists:
             raise HTTPException(status_code=404, detail="Analysis result not found")
     return logs
 
 
-@router.get("/results", response_model=List[AnalysisResultRead])
+def _log_event(log: AnalysisLog) -> Dict[str, Any]:
+    return {
+        "type": "log",
+        "id": log.id,
+        "level": log.level,
+        "message": log.message,
+        "step": log.step,
+        "timestamp": log.timestamp.isoformat() if log.timestamp else None,
+    }
+
+
+async def _load_progress_snapshot(analysis_result_id: int, after_id: int) -> Optional[Dict[str, Any]]:
+    """Current status plus logs newer than ``after_id`` (own short-lived session)."""
+    async with AsyncSessionLocal() as db:
+        status = (await db.execute(
+            select(AIAnalysisResult.status).filter(AIAnalysisResult.id == analysis_result_id)
+        )).first()
+        if status is None:
+            return None
+        logs = await db.scalars(
+            select(AnalysisLog)
+            .filter(AnalysisLog.analysis_result_id == analysis_result_id, AnalysisLog.id > after_id)
+            .order_by(AnalysisLog.id)
+            .limit(STREAM_BACKLOG_LIMIT)
+        )
+        return {"status": status[0], "logs": [_log_event(log) for log in logs]}
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    lines = []
+    if event.get("type") == "log" and event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event.get('type', 'message')}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@router.get("/results/{analysis_result_id}/events")
+async def stream_analysis_events(
+    analysis_result_id: int,
+    request: Request,
+    after_id: int = Query(0, ge=0, description="Only replay logs with a larger id"),
+):
+    """
+    Server-Sent Events stream of an analysis job: ``log`` events for new
+    AnalysisLog rows, ``status`` events for status transitions and ``end`` when
+    the run is over. Already written logs are replayed first; reconnecting
+    clients resume from ``Last-Event-ID``.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        after_id = max(after_id, int(last_event_id))
+
+    # Subscribe before reading the backlog so no event falls in between
+    subscription = subscribe_analysis(analysis_result_id)
+    try:
+        snapshot = await _load_progress_snapshot(analysis_result_id, after_id)
+    except Exception:
+        unsubscribe_analysis(subscription)
+        raise
+    if snapshot is None:
+        unsubscribe_analysis(subscription)
+        raise HTTPException(status_code=404, detail="Analysis result not found")
+
+    async def _events():
+        last_id = after_id
+        try:
+            for event in snapshot["logs"]:
+                last_id = event["id"]
+                yield _format_sse(event)
+            yield _format_sse({"type": "status", "status": snapshot["status"]})
+            if snapshot["status"] in TERMINAL_STATUSES:
+                yield _format_sse({"type": "end"})
+                return
+
+            while not await request.is_disconnected():
+                if subscription.overflowed:
+                    # Slow client: events were dropped, replay missed logs from the DB
+                    subscription.overflowed = False
+                    missed = await _load_progress_snapshot(analysis_result_id, last_id)
+                    for event in (missed or {}).get("logs", []):
+                        last_id = event["id"]
+                        yield _format_sse(event)
+
+                event = await subscription.get(STREAM_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event.get("type") == "log":
+                    if event.get("id") is not None and event["id"] <= last_id:
+                        continue
+                    last_id = event.get("id") or last_id
+                yield _format_sse(event)
+                if event.get("type") == "end":
+                    return
+        finally:
+            unsubscribe_analysis(subscription)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/results", response_model=List[AnalysisResultSummaryRead])
 async def list_all_analysis_results(
     limit: int = Query(50, ge=1, le=200, description="Max results to return"),
     status: Optional[str] = Query(None, description="Filter by status"),
     analysis_type: Optional[str] = Query(None, description="Filter by analysis type"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List all analysis results across all opportunities."""
-    query = db.query(AIAnalysisResult)
+    """List all analysis results across all opportunities (result_json via /results/{id})."""
+    stmt = select(AIAnalysisResult).options(*analysis_summary_options())
     
     if status:
-        query = query.filter(AIAnalysisResult.status == status)
+        stmt = stmt.filter(AIAnalysisResult.status == status)
     if analysis_type:
-        query = query.filter(AIAnalysisResult.analysis_type == analysis_type)
+        stmt = stmt.filter(AIAnalysisResult.analysis_type == analysis_type)
     
-    results = (
-        query
+    results = await db.scalars(
+        stmt
         .order_by(AIAnalysisResult.created_at.desc())
         .limit(limit)
-        .all()
     )
-    return results
+    return results.all()
 
 
 @router.get("/opportunity/{opportunity_id}/results", response_model=List[AnalysisResultRead])
 async def list_analysis_results_for_opportunity(
     opportunity_id: int,
+    request: Request,
     limit: int = Query(20, ge=1, le=100, description="Max results to return"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List recent analysis results for a given opportunity."""
-    try:
-        results = (
-            db.query(AIAnalysisResult)
+    """List recent analysis results for a given opportunity (conditional GET, cached)."""
+    from ..crud.opportunities import analysis_results_validators_async
+
+    async def _etag():
+        validators = await analysis_results_validators_async(db, opportunity_id)
+        return response_cache.make_etag("results", limit, validators)
+
+    async def _build():
+        results = await db.scalars(
+            select(AIAnalysisResult)
             .filter(AIAnalysisResult.opportunity_id == opportunity_id)
             .order_by(AIAnalysisResult.created_at.desc())
             .limit(limit)
-            .all()
         )
-        return results
+        return [AnalysisResultRead.model_validate(result) for result in results]
+
+    try:
+        return await response_cache.cached_json_response(
+            request, response_cache.opportunity_scope(opportunity_id), f"results:{limit}", _etag, _build
+        )
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -260,41 +413,47 @@ async def get_generated_file(path: str):
 @router.get("/results/{analysis_result_id}/agent-outputs")
 async def get_agent_outputs(
     analysis_result_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get agent run outputs (messages and LLM calls) for an analysis result.
     """
-    result = db.query(AIAnalysisResult).filter(AIAnalysisResult.id == analysis_result_id).first()
+    result = (await db.execute(
+        select(AIAnalysisResult.opportunity_id).filter(AIAnalysisResult.id == analysis_result_id)
+    )).first()
     if not result:
         raise HTTPException(status_code=404, detail="Analysis result not found")
     
     # Find agent run associated with this analysis
-    agent_runs = (
-        db.query(AgentRun)
+    agent_runs = (await db.scalars(
+        select(AgentRun)
         .filter(AgentRun.opportunity_id == result.opportunity_id)
         .order_by(AgentRun.started_at.desc())
         .limit(5)
-        .all()
-    )
+    )).all()
+    run_ids = [run.id for run in agent_runs]
     
-    outputs = []
-    for run in agent_runs:
-        # Get messages for this run
-        messages = (
-            db.query(AgentMessage)
-            .filter(AgentMessage.agent_run_id == run.id)
+    # Messages and LLM calls of all runs in one query each
+    messages_by_run: Dict[int, List[AgentMessage]] = {run_id: [] for run_id in run_ids}
+    llm_calls_by_run: Dict[int, List[LLMCall]] = {run_id: [] for run_id in run_ids}
+    if run_ids:
+        for msg in await db.scalars(
+            select(AgentMessage)
+            .filter(AgentMessage.agent_run_id.in_(run_ids))
             .order_by(AgentMessage.created_at.asc())
-            .all()
-        )
-        
-        # Get LLM calls for this run
-        llm_calls = (
-            db.query(LLMCall)
-            .filter(LLMCall.agent_run_id == run.id)
+        ):
+            messages_by_run[msg.agent_run_id].append(msg)
+        for call in await db.scalars(
+            select(LLMCall)
+            .filter(LLMCall.agent_run_id.in_(run_ids))
             .order_by(LLMCall.created_at.asc())
-            .all()
-        )
+        ):
+            llm_calls_by_run[call.agent_run_id].append(call)
+    
+    outputs = []
+    for run in agent_runs:
+        messages = messages_by_run[run.id]
+        llm_calls = llm_calls_by_run[run.id]
         
         outputs.append({
             "agent_run": {
@@ -343,22 +502,21 @@ async def get_agent_outputs(
 async def get_agent_run_messages(
     agent_run_id: int,
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get all messages for a specific agent run.
     """
-    run = db.query(AgentRun).filter(AgentRun.id == agent_run_id).first()
+    run = await db.get(AgentRun, agent_run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Agent run not found")
     
-    messages = (
-        db.query(AgentMessage)
+    messages = (await db.scalars(
+        select(AgentMessage)
         .filter(AgentMessage.agent_run_id == agent_run_id)
         .order_by(AgentMessage.created_at.asc())
         .limit(limit)
-        .all()
-    )
+    )).all()
     
     return {
         "agent_run_id": agent_run_id,
@@ -383,22 +541,21 @@ async def get_agent_run_messages(
 async def get_agent_run_llm_calls(
     agent_run_id: int,
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get all LLM calls for a specific agent run.
     """
-    run = db.query(AgentRun).filter(AgentRun.id == agent_run_id).first()
+    run = await db.get(AgentRun, agent_run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Agent run not found")
     
-    llm_calls = (
-        db.query(LLMCall)
+    llm_calls = (await db.scalars(
+        select(LLMCall)
         .filter(LLMCall.agent_run_id == agent_run_id)
         .order_by(LLMCall.created_at.asc())
         .limit(limit)
-        .all()
-    )
+    )).all()
     
     return {
         "agent_run_id": agent_run_id,
@@ -424,48 +581,45 @@ async def get_agent_run_llm_calls(
 
 
 @router.get("/files/list")
-async def list_generated_files():
+async def list_generated_files(
+    limit: int = Query(100, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    notice_id: Optional[str] = Query(None, description="Only this notice's artifacts"),
+    kind: Optional[str] = Query(None, description="json / pdf / markdown / other"),
+    modified_after: Optional[datetime] = Query(None, description="Only artifacts modified since"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    List generated SOW/analysis files saved under DATA_DIR/opportunities/**/outputs.
-    Returns metadata for React UI to display download options.
+    List generated SOW/analysis files saved under DATA_DIR/opportunities/**/outputs,
+    newest first, from the artifact catalog. Returns metadata for React UI to
+    display download options.
     """
-    if not DATA_DIR.exists():
-        return {"files": []}
-
-    files = []
-    opportunities_dir = DATA_DIR / "opportunities"
-    if not opportunities_dir.exists():
-        return {"files": []}
-
-    for opp_dir in opportunities_dir.iterdir():
-        outputs_dir = opp_dir / "outputs"
-        if not outputs_dir.exists():
-            continue
-        for artifact in outputs_dir.glob("*"):
-            if not artifact.is_file():
-                continue
-            try:
-                stat = artifact.stat()
-                # Use relative path from DATA_DIR, not from cwd
-                try:
-                    rel_path = artifact.relative_to(DATA_DIR)
-                except ValueError:
-                    # If relative_to fails, use absolute path
-                    rel_path = Path(artifact)
-                
-                files.append(
-                    {
-                        "filename": artifact.name,
-                        "path": str(rel_path),
-                        "size": stat.st_size,
-                        "modified": stat.st_mtime,
-                        "notice_id": opp_dir.name,
-                    }
-                )
-            except (OSError, ValueError) as e:
-                # Skip files that can't be accessed
-                logger.warning(f"Error accessing file {artifact}: {e}")
-                continue
-
-    files.sort(key=lambda item: item["modified"], reverse=True)
-    return {"files": files}
+    if not cursor and await artifact_catalog.catalog_is_empty_async(db):
+        # First use after upgrade: catalog the files already on disk off the event loop
+        artifact_catalog.reconcile_in_background()
+
+    try:
+        rows, next_cursor = await artifact_catalog.list_artifacts_async(
+            db,
+            limit=limit,
+            cursor=cursor,
+            notice_id=notice_id,
+            kind=kind,
+            modified_after=modified_after,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    files = [
+        {
+            "filename": row.filename,
+            "path": row.path,
+            "size": row.size_bytes,
+            "modified": row.modified_at.timestamp(),
+            "notice_id": row.notice_id,
+            "kind": row.kind,
+            "analysis_result_id": row.analysis_result_id,
+        }
+        for row in rows
+    ]
+    return {"files": files, "next_cursor": next_cursor}
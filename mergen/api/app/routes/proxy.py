@@ -1,3 +1,4 @@
+import math
 from typing import Optional, List, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -7,8 +8,9 @@ from ..db import get_db
 from ..models import Opportunity
 from sqlalchemy.orm import Session
 from datetime import datetime
-from ..services.redis_client import cache_get_json, cache_set_json, token_bucket_allow
+from ..services.redis_client import cache_get_json, cache_set_json, token_bucket_acquire
 from ..services.circuit_breaker import CircuitBreaker
+from ..services.dashboard_stats_service import record_opportunities_created
 
 SAMIntegration = None
 SAM_AVAILABLE = False
@@ -55,30 +57,36 @@ def _parse_dt(v: Any):
 
 def _upsert_opportunities(db: Session, items: List[Dict[str, Any]]) -> int:
     saved = 0
+    created_naics: List[Optional[str]] = []
     for it in items:
         try:
             notice_id = it.get('noticeId') or it.get('solicitationNumber') or ''
             if not notice_id:
                 continue
             opp = db.query(Opportunity).filter(Opportunity.notice_id == notice_id).first()
-            if not opp:
+            created = opp is None
+            if created:
                 opp = Opportunity(notice_id=notice_id)
                 db.add(opp)
             opp.opportunity_id = it.get('opportunityId')
             opp.title = it.get('title')
             opp.naics_code = it.get('naicsCode')
-            opp.organization = it.get('fullParentPathName') or it.get('organization')
             opp.posted_date = _parse_dt(it.get('postedDate'))
             opp.response_deadline = _parse_dt(it.get('responseDeadLine'))
-            opp.source = it.get('source') or 'sam_live'
-            opp.raw_json = it
+            # organization / source / raw_json are read from raw_data
+            opp.raw_data = {**it, 'source': it.get('source') or 'sam_live'}
             saved += 1
+            if created:
+                created_naics.append(opp.naics_code)
         except Exception:
             continue
     try:
         db.commit()
     except Exception:
         db.rollback()
+        return saved
+    # Same rollup hook as crud.upsert_opportunity
+    record_opportunities_created(db, created_naics)
     return saved
 
 
@@ -103,8 +111,13 @@ def proxy_search(
         return JSONResponse(content=cached, headers={"X-Cache": "HIT", "X-Source": "cache"})
 
     # Rate limit & circuit breaker
-    if not token_bucket_allow("sam_search", rate_per_sec=1.0, burst=3):
-        raise HTTPException(status_code=429, detail="Rate limited. Please retry.")
+    allowed, retry_after = token_bucket_acquire("sam_search", rate_per_sec=1.0, burst=3)
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limited. Please retry.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
 
     if not SAM_AVAILABLE or SAMIntegration is None:
         raise HTTPException(status_code=503, detail="SAM integration is not available in this deployment.")
@@ -150,8 +163,13 @@ def proxy_noticedesc(id: str = Query(..., description="Notice ID, Opportunity ID
     if cached is not None:
         return JSONResponse(content=cached, headers={"X-Cache": "HIT", "X-Source": "cache"})
 
-    if not token_bucket_allow("sam_desc", rate_per_sec=1.0, burst=3):
-        raise HTTPException(status_code=429, detail="Rate limited. Please retry.")
+    allowed, retry_after = token_bucket_acquire("sam_desc", rate_per_sec=1.0, burst=3)
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limited. Please retry.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
 
     if not SAM_AVAILABLE or SAMIntegration is None:
         raise HTTPException(status_code=503, detail="SAM integration is not available in this deployment.")
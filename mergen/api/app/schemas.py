@@ -40,10 +40,12 @@ class OpportunityCreate(OpportunityBase):
     cached_data: Optional[Any] = None
 
 
-class OpportunityRead(OpportunityBase):
+class OpportunitySummaryRead(OpportunityBase):
+    """List-view projection: no raw_data/cached_data payload."""
+
     id: int
-    raw_data: Optional[Any] = None
-    cached_data: Optional[Any] = None
+    description: Optional[str] = None
+    sam_gov_link: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -51,6 +53,14 @@ class OpportunityRead(OpportunityBase):
         from_attributes = True
 
 
+class OpportunityRead(OpportunitySummaryRead):
+    raw_data: Optional[Any] = None
+    cached_data: Optional[Any] = None
+
+    class Config:
+        from_attributes = True
+
+
 class OpportunityAttachmentBase(BaseModel):
     opportunity_id: int
     name: str
@@ -69,6 +79,7 @@ class OpportunityAttachmentRead(OpportunityAttachmentBase):
     id: int
     attachment_type: Optional[str] = None
     downloaded: Optional[bool] = False
+    content_hash: Optional[str] = None
     created_at: Optional[datetime] = None
 
     class Config:
@@ -111,6 +122,7 @@ class SyncJobRead(BaseModel):
     params: Optional[Any] = None
     count_new: int = 0
     count_updated: int = 0
+    count_skipped: int = 0
     count_attachments: int = 0
     total_processed: int = 0
     error_message: Optional[str] = None
@@ -184,22 +196,26 @@ class PipelineRunRequest(BaseModel):
     analysis_type: Optional[str] = "sow_draft"
     agent_name: Optional[str] = "autogen"
     options: Optional[Dict[str, Any]] = None
+    priority: Optional[str] = "normal"  # "high" jumps the stage queue
 
 
 class PipelineRunResponse(BaseModel):
     analysis_result_id: int
     status: str
     message: Optional[str] = None
+    queue: Optional[str] = None
+    job_id: Optional[str] = None
+
 
+class AnalysisResultSummaryRead(BaseModel):
+    """List-view projection: no result_json payload."""
 
-class AnalysisResultRead(BaseModel):
     id: int
     opportunity_id: int
     analysis_type: str
     status: str
     pipeline_version: Optional[str] = None
     agent_name: Optional[str] = None
-    result_json: Optional[Any] = None
     confidence: Optional[float] = None
     pdf_path: Optional[str] = None
     json_path: Optional[str] = None
@@ -212,6 +228,10 @@ class AnalysisResultRead(BaseModel):
         from_attributes = True
 
 
+class AnalysisResultRead(AnalysisResultSummaryRead):
+    result_json: Optional[Any] = None
+
+
 class AnalysisLogRead(BaseModel):
     id: int
     analysis_result_id: int
@@ -302,6 +322,7 @@ class DecisionCacheLookupResponse(BaseModel):
     key_hash: str
     signature: Dict[str, str]
     matched: bool
+    match_type: Optional[str] = None  # exact / notice / nearest
     pattern: Optional[DecisionCacheRead] = None
 
 
@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from app.db import SessionLocal
 from app.models import Opportunity
+from app.services.dashboard_stats_service import record_opportunities_created
 from sam_integration import SAMIntegration
 import logging
 
@@ -42,6 +43,7 @@ def sync_naics_721110(days_back: int = 30, limit: int = 1000):
         
         count_new = 0
         count_updated = 0
+        created_naics = []
         
         for opp_data in opportunities:
             notice_id = opp_data.get('noticeId') or opp_data.get('opportunityId', '')
@@ -55,9 +57,8 @@ def sync_naics_721110(days_back: int = 30, limit: int = 1000):
                 existing.title = opp_data.get('title', existing.title)
                 existing.opportunity_id = opp_data.get('opportunityId', existing.opportunity_id)
                 existing.naics_code = opp_data.get('naicsCode', existing.naics_code)
-                existing.organization = opp_data.get('fullParentPathName', existing.organization)
-                existing.raw_json = opp_data
-                existing.source = opp_data.get('source', 'sam_live')
+                # organization / source / raw_json are read from raw_data
+                existing.raw_data = {**opp_data, 'source': opp_data.get('source', 'sam_live')}
                 existing.updated_at = datetime.now()
                 count_updated += 1
             else:
@@ -67,16 +68,16 @@ def sync_naics_721110(days_back: int = 30, limit: int = 1000):
                     opportunity_id=opp_data.get('opportunityId', ''),
                     title=opp_data.get('title', ''),
                     naics_code=opp_data.get('naicsCode', ''),
-                    organization=opp_data.get('fullParentPathName', ''),
                     posted_date=_parse_date(opp_data.get('postedDate')),
                     response_deadline=_parse_date(opp_data.get('responseDeadLine')),
-                    source=opp_data.get('source', 'sam_live'),
-                    raw_json=opp_data
+                    raw_data={**opp_data, 'source': opp_data.get('source', 'sam_live')}
                 )
                 db.add(new_opp)
                 count_new += 1
+                created_naics.append(new_opp.naics_code)
         
         db.commit()
+        record_opportunities_created(db, created_naics)
         
         logger.info(f"✅ Sync complete: {count_new} new, {count_updated} updated")
         
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from amadeus import Client, ResponseError
 
 from ..config import settings
+from .redis_client import token_bucket_wait
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,13 @@ def _build_client() -> Optional[Client]:
 _CLIENT = _build_client()
 
 
+def _throttle() -> None:
+    """Wait for the Amadeus quota shared by all API / worker processes."""
+    rate = settings.amadeus_rate_per_sec
+    if not token_bucket_wait("amadeus", rate_per_sec=rate, burst=max(1, int(rate))):
+        logger.warning("Amadeus rate limit wait exceeded; calling anyway")
+
+
 def search_hotels_by_city_code(
     city_code: str,
     check_in: str,
@@ -50,11 +58,13 @@ def search_hotels_by_city_code(
         # Step 1: Get hotel list by city code
         logger.info(f"Fetching hotel list for city code: {city_code}")
         try:
+            _throttle()
             hotel_list_response = _CLIENT.reference_data.locations.hotels.by_city.get(cityCode=city_code.upper())
         except AttributeError:
             # Fallback: try alternative API endpoint
             logger.warning("hotels.by_city not available, trying alternative method")
             # Use hotel list search instead
+            _throttle()
             hotel_list_response = _CLIENT.reference_data.locations.hotels.get(cityCode=city_code.upper())
         
         if not hotel_list_response.data or len(hotel_list_response.data) == 0:
@@ -81,6 +91,7 @@ def search_hotels_by_city_code(
             'bestRateOnly': True
         }
             
+        _throttle()
         offers_response = _CLIENT.shopping.hotel_offers_search.get(**offers_params)
         
         # --- CRITICAL FIX: DATA MAPPING ---
@@ -161,6 +172,7 @@ def lookup_city_code(city_name: str) -> Optional[str]:
     if not _CLIENT:
         return None
     try:
+        _throttle()
         resp = _CLIENT.reference_data.locations.get(
             keyword=city_name,
             subType="CITY",
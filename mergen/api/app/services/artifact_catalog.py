@@ -0,0 +1,249 @@
+"""
+Artifact Catalog
+================
+Database index of the pipeline output files under
+``DATA_DIR/opportunities/<notice_id>/outputs`` (analysis JSON/PDF, hotel match
+JSON/PDF, markdown drafts).
+
+The pipeline registers each file as it writes it (``register_artifact``), so
+``/api/pipeline/files/list`` is a single indexed query ordered by
+``(modified_at DESC, id DESC)`` with keyset pagination instead of a walk +
+``stat()`` over every output directory.
+
+``reconcile_artifacts`` walks the output tree once to catalog files created
+outside the API (scripts, restored backups) and drop rows whose file is gone.
+It is exposed as ``POST /api/jobs/artifacts/reconcile`` and runs in a
+background thread at startup (``reconcile_in_background``), never inside a
+request: the list endpoint only reads the catalog.
+"""
+
+import base64
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+from ..models import GeneratedArtifact, Opportunity
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_DATA_DIR = PROJECT_ROOT / "data"
+DATA_DIR = Path(os.getenv("DATA_DIR", str(DEFAULT_DATA_DIR))).resolve()
+OPPORTUNITIES_DIR = DATA_DIR / "opportunities"
+
+ARTIFACT_KINDS = {".json": "json", ".pdf": "pdf", ".md": "markdown", ".markdown": "markdown"}
+UPSERT_BATCH_SIZE = 500
+
+
+def artifact_kind(path: Path) -> str:
+    return ARTIFACT_KINDS.get(path.suffix.lower(), "other")
+
+
+def _relative_path(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(DATA_DIR))
+    except ValueError:
+        return str(path)
+
+
+def _row_values(path: Path, stat: os.stat_result, notice_id: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "path": _relative_path(path),
+        "filename": path.name,
+        # opportunities/<notice_id>/outputs/<file>
+        "notice_id": notice_id or path.parent.parent.name,
+        "kind": artifact_kind(path),
+        "size_bytes": stat.st_size,
+        "modified_at": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+    }
+
+
+def _upsert(rows: List[Dict[str, Any]]):
+    stmt = insert(GeneratedArtifact).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["path"],
+        set_={
+            "size_bytes": stmt.excluded.size_bytes,
+            "modified_at": stmt.excluded.modified_at,
+            "opportunity_id": func.coalesce(stmt.excluded.opportunity_id, GeneratedArtifact.opportunity_id),
+            "analysis_result_id": func.coalesce(stmt.excluded.analysis_result_id, GeneratedArtifact.analysis_result_id),
+            "updated_at": func.now(),
+        },
+    )
+
+
+def register_artifact(
+    db: Session,
+    path: Path,
+    opportunity_id: Optional[int] = None,
+    analysis_result_id: Optional[int] = None,
+    notice_id: Optional[str] = None,
+) -> None:
+    """
+    Catalog an output file that was just written. Runs in a savepoint and is
+    committed with the caller's transaction; errors are logged, never raised
+    (a missed file is picked up by the next reconciliation).
+    """
+    try:
+        path = Path(path)
+        values = _row_values(path, path.stat(), notice_id)
+        values.update(opportunity_id=opportunity_id, analysis_result_id=analysis_result_id)
+        with db.begin_nested():
+            db.execute(_upsert([values]))
+    except Exception as exc:
+        logger.warning(f"[artifact_catalog] Could not register {path}: {exc}")
+
+
+def _scan_outputs() -> List[Tuple[Path, os.stat_result]]:
+    found = []
+    if not OPPORTUNITIES_DIR.exists():
+        return found
+    for outputs_dir in OPPORTUNITIES_DIR.glob("*/outputs"):
+        for artifact in outputs_dir.iterdir():
+            try:
+                if artifact.is_file():
+                    found.append((artifact, artifact.stat()))
+            except OSError as exc:
+                logger.warning(f"[artifact_catalog] Error accessing file {artifact}: {exc}")
+    return found
+
+
+def reconcile_artifacts(db: Session) -> Dict[str, int]:
+    """Bring the catalog in line with the files on disk."""
+    on_disk = {}
+    for path, stat in _scan_outputs():
+        values = _row_values(path, stat)
+        on_disk[values["path"]] = values
+
+    existing = {
+        row.path: row
+        for row in db.query(
+            GeneratedArtifact.id, GeneratedArtifact.path, GeneratedArtifact.size_bytes, GeneratedArtifact.modified_at
+        )
+    }
+    changed = [
+        values for rel_path, values in on_disk.items()
+        if rel_path not in existing
+        or existing[rel_path].size_bytes != values["size_bytes"]
+        or existing[rel_path].modified_at != values["modified_at"]
+    ]
+    missing_ids = [row.id for rel_path, row in existing.items() if rel_path not in on_disk]
+
+    if changed:
+        notice_ids = {values["notice_id"] for values in changed}
+        opportunity_ids = dict(
+            db.query(Opportunity.notice_id, Opportunity.id).filter(Opportunity.notice_id.in_(notice_ids)).all()
+        )
+        for start in range(0, len(changed), UPSERT_BATCH_SIZE):
+            batch = changed[start:start + UPSERT_BATCH_SIZE]
+            for values in batch:
+                values["opportunity_id"] = opportunity_ids.get(values["notice_id"])
+                values["analysis_result_id"] = None
+            db.execute(_upsert(batch))
+    if missing_ids:
+        db.query(GeneratedArtifact).filter(GeneratedArtifact.id.in_(missing_ids)).delete(synchronize_session=False)
+    db.commit()
+
+    summary = {"scanned": len(on_disk), "upserted": len(changed), "removed": len(missing_ids)}
+    logger.info(f"[artifact_catalog] Reconciled: {summary}")
+    return summary
+
+
+_reconcile_lock = threading.Lock()
+
+
+def reconcile_in_background() -> bool:
+    """
+    Run ``reconcile_artifacts`` on a daemon thread with its own session.
+    Returns False when a reconciliation is already running.
+    """
+    if not _reconcile_lock.acquire(blocking=False):
+        return False
+
+    def _run():
+        db = SessionLocal()
+        try:
+            reconcile_artifacts(db)
+        except Exception as exc:
+            logger.warning(f"[artifact_catalog] Background reconcile failed: {exc}")
+        finally:
+            db.close()
+            _reconcile_lock.release()
+
+    threading.Thread(target=_run, daemon=True, name="artifact-reconcile").start()
+    return True
+
+
+def catalog_is_empty(db: Session) -> bool:
+    return db.query(GeneratedArtifact.id).first() is None
+
+
+async def catalog_is_empty_async(db: AsyncSession) -> bool:
+    return (await db.execute(select(GeneratedArtifact.id).limit(1))).first() is None
+
+
+def encode_cursor(artifact: GeneratedArtifact) -> str:
+    """Opaque keyset cursor for the (modified_at, id) position after ``artifact``."""
+    payload = {"m": artifact.modified_at.isoformat(), "i": artifact.id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["m"]), int(payload["i"])
+    except Exception as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
+def artifact_list_statement(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    notice_id: Optional[str] = None,
+    kind: Optional[str] = None,
+    modified_after: Optional[datetime] = None,
+) -> Select:
+    """Newest artifacts first, one row more than ``limit`` (tells whether a next page exists)."""
+    stmt = select(GeneratedArtifact)
+    if notice_id:
+        stmt = stmt.filter(GeneratedArtifact.notice_id == notice_id)
+    if kind:
+        stmt = stmt.filter(GeneratedArtifact.kind == kind)
+    if modified_after:
+        stmt = stmt.filter(GeneratedArtifact.modified_at >= modified_after)
+    if cursor:
+        modified_at, last_id = decode_cursor(cursor)
+        stmt = stmt.filter(or_(
+            GeneratedArtifact.modified_at < modified_at,
+            and_(GeneratedArtifact.modified_at == modified_at, GeneratedArtifact.id < last_id),
+        ))
+    return stmt.order_by(GeneratedArtifact.modified_at.desc(), GeneratedArtifact.id.desc()).limit(limit + 1)
+
+
+def _page(rows: List[GeneratedArtifact], limit: int) -> Tuple[List[GeneratedArtifact], Optional[str]]:
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def list_artifacts(db: Session, limit: int = 100, **filters: Any) -> Tuple[List[GeneratedArtifact], Optional[str]]:
+    """Newest artifacts first; returns the page and the cursor of the next page."""
+    rows = list(db.scalars(artifact_list_statement(limit=limit, **filters)).all())
+    return _page(rows, limit)
+
+
+async def list_artifacts_async(db: AsyncSession, limit: int = 100, **filters: Any) -> Tuple[List[GeneratedArtifact], Optional[str]]:
+    """Async variant of ``list_artifacts``."""
+    rows = list((await db.scalars(artifact_list_statement(limit=limit, **filters))).all())
+    return _page(rows, limit)
@@ -2,7 +2,19 @@
 Attachment Download Service
 SAM.gov'dan attachment'ları indirip dosya sistemine kaydeden servis
 Job tracking ve background task desteği ile
+
+Downloads run concurrently (ATTACHMENT_DOWNLOAD_CONCURRENCY, at most
+ATTACHMENT_DOWNLOAD_PER_HOST per host). Responses are streamed in chunks to a
+``.part`` file, hashed (SHA-256) while streaming, resumed with HTTP Range after
+transport errors and atomically renamed into place when complete.
+
+Completed files go to the content-addressed blob store (see blob_store.py):
+identical content is stored once, and a source URL already downloaded for
+any opportunity is linked instead of fetched again.
 """
+import asyncio
+import contextlib
+import hashlib
 import os
 import logging
 import uuid
@@ -14,7 +26,10 @@ from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from ..models import Opportunity, OpportunityAttachment, DownloadJob, DownloadLog
+from ..config import settings
+from ..models import Opportunity, OpportunityAttachment, DownloadJob
+from . import blob_store
+from .job_log_writer import download_log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +39,18 @@ DEFAULT_DATA_DIR = PROJECT_ROOT / "data"
 BASE_DATA_DIR = Path(os.getenv("DATA_DIR", str(DEFAULT_DATA_DIR))).resolve()
 SAM_API_KEY = os.getenv("SAM_API_KEY")
 
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 2048          # bytes kept from the start of the stream for MIME detection
+MAX_RESUME_ATTEMPTS = 3
+
+EXT_BY_MIME = {
+    "application/pdf": ".pdf",
+    "application/msword": ".doc",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "application/vnd.ms-excel": ".xls",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
+}
+
 
 def _build_download_url(raw_url: str) -> str:
     """Append SAM API key to download URLs if missing."""
@@ -42,24 +69,152 @@ def _build_download_url(raw_url: str) -> str:
         return raw_url
 
 
+def _detect_mime(header: bytes) -> Optional[str]:
+    """Detect file type from the first bytes when content-type is not reliable."""
+    if not header:
+        return None
+    if header.startswith(b'%PDF'):
+        return "application/pdf"
+    if header.startswith(b'PK\x03\x04'):
+        # ZIP-based formats (DOCX, XLSX, PPTX)
+        # Check for Office document signatures
+        if b'word/' in header[:1024] or b'[Content_Types].xml' in header[:2048]:
+            return "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        if b'xl/' in header[:1024] or b'xl/workbook' in header[:2048]:
+            return "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        return "application/zip"
+    if header.startswith(b'\xd0\xcf\x11\xe0'):
+        # Old MS Office formats
+        return "application/msword"
+    return None
+
+
+def _target_filename(notice_id: str, att: OpportunityAttachment, idx: int, mime_type: Optional[str]) -> str:
+    """Safe and unique filename: noticeId_attachmentId_originalName.ext"""
+    base_name = att.name or "attachment"
+    base_name = re.sub(r"[^A-Za-z0-9._-]+", "_", base_name).strip("._") or "attachment"
+    ext = Path(base_name).suffix
+    if not ext and mime_type:
+        ext = EXT_BY_MIME.get(mime_type, "")
+    if not ext and att.source_url:
+        ext = Path(urlparse(att.source_url).path).suffix
+    if not ext:
+        ext = ".bin"
+    stem = Path(base_name).stem or "file"
+    return f"{notice_id}_{att.id or idx}_{stem}{ext}"
+
+
+def _read_prefix(path: Path, size: int) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(size)
+
+
+def _hash_file(path: Path) -> "hashlib._Hash":
+    """SHA-256 of an existing (partial) file, used when resuming."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest
+
+
+async def _stream_to_file(client: httpx.AsyncClient, url: str, part_path: Path) -> Dict[str, Any]:
+    """
+    Stream ``url`` into ``part_path`` chunk by chunk.
+
+    The body is requested with ``Accept-Encoding: identity`` and written as
+    received (``aiter_raw``), so the Range offset, the Content-Length check and
+    the SHA-256 all refer to the same bytes as the stored file. A server that
+    compresses anyway is decoded while streaming; such a download cannot be
+    resumed by offset and restarts from scratch after an error.
+
+    An existing ``.part`` file is resumed with ``Range: bytes=<size>-``; if the
+    server ignores the range (200) the file is rewritten from scratch.
+    Transport errors are retried with resume up to MAX_RESUME_ATTEMPTS times.
+
+    Returns ``{"size_bytes", "sha256", "content_type", "resumed_from"}``.
+    """
+    resumed_from = 0
+    last_error: Optional[Exception] = None
+    for attempt in range(1, MAX_RESUME_ATTEMPTS + 1):
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        encoded = False
+        try:
+            async with client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 416 and offset:
+                    # Stale/complete partial file the server can't extend: start over
+                    part_path.unlink(missing_ok=True)
+                    continue
+                response.raise_for_status()
+
+                encoding = response.headers.get("content-encoding", "").strip().lower()
+                encoded = encoding not in ("", "identity")
+                if offset and response.status_code == 206 and encoded:
+                    # Range of an encoded body does not line up with the decoded .part file
+                    part_path.unlink(missing_ok=True)
+                    continue
+
+                if offset and response.status_code == 206:
+                    digest = await asyncio.to_thread(_hash_file, part_path)
+                    mode = "ab"
+                    resumed_from = resumed_from or offset
+                else:
+                    digest = hashlib.sha256()
+                    mode = "wb"
+                    offset = 0
+
+                size = offset
+                chunks = response.aiter_bytes(CHUNK_SIZE) if encoded else response.aiter_raw(CHUNK_SIZE)
+                with open(part_path, mode) as f:
+                    async for chunk in chunks:
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+
+                # Content-Length counts the bytes on the wire (before any decoding)
+                expected = response.headers.get("content-length")
+                received = response.num_bytes_downloaded
+                if expected and expected.isdigit() and received != int(expected):
+                    raise IOError(f"Incomplete body: expected {expected} bytes, got {received}")
+
+                content_type = response.headers.get("content-type", "")
+                return {
+                    "size_bytes": size,
+                    "sha256": digest.hexdigest(),
+                    "content_type": content_type.split(";")[0].strip() if content_type else "",
+                    "resumed_from": resumed_from,
+                }
+        except httpx.HTTPStatusError:
+            raise
+        except (httpx.TransportError, httpx.DecodingError, IOError) as exc:
+            last_error = exc
+            if encoded:
+                part_path.unlink(missing_ok=True)
+            logger.warning(f"Download interrupted ({exc}), attempt {attempt}/{MAX_RESUME_ATTEMPTS}: {url}")
+            await asyncio.sleep(min(2 ** attempt, 10))
+    raise last_error or IOError(f"Download failed after {MAX_RESUME_ATTEMPTS} attempts")
+
+
 def _log_download(db: Session, job_id: str, level: str, message: str, step: Optional[str] = None, attachment_name: Optional[str] = None, extra_metadata: Optional[Dict] = None):
-    """Helper to log download events"""
-    log = DownloadLog(
-        job_id=job_id,
+    """Helper to log download events (buffered, see job_log_writer)"""
+    download_log_writer.write(
+        job_id,
         level=level,
         message=message,
         step=step,
         attachment_name=attachment_name,
-        extra_metadata=extra_metadata
+        extra_metadata=extra_metadata,
     )
-    db.add(log)
-    db.commit()
 
 
 async def download_attachments_for_opportunity(
     db: Session, 
     opportunity_id: int, 
-    job_id: Optional[str] = None
+    job_id: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Dict[str, Any]:
     """
     Download all attachments for an opportunity from SAM.gov
@@ -69,6 +224,8 @@ async def download_attachments_for_opportunity(
         db: Database session
         opportunity_id: Opportunity database ID
         job_id: Optional job ID for tracking (if None, creates new job)
+        client: Optional shared httpx client (see download_runner); a
+            short-lived one is created when omitted
     
     Returns:
         Dict with job_id, downloaded_count, failed_count, total_attachments
@@ -143,6 +300,7 @@ async def download_attachments_for_opportunity(
                     
                     if not found:
                         logger.warning(f"[Job {job_id}] Attachment {att.id} marked as downloaded but file missing: {att.local_path}. Resetting downloaded flag.")
+                        blob_store.release_attachment(db, att)
                         att.downloaded = False
                         att.local_path = None
                         att.downloaded_at = None
@@ -185,193 +343,140 @@ async def download_attachments_for_opportunity(
         
         downloaded_count = 0
         failed_count = 0
-        
-        # httpx client with redirect following enabled (for SAM.gov 303 redirects)
-        async with httpx.AsyncClient(timeout=120.0, follow_redirects=True) as client:
-            for idx, att in enumerate(attachments):
+
+        total_limit = asyncio.Semaphore(max(1, settings.attachment_download_concurrency))
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        def _host_limit(url: str) -> asyncio.Semaphore:
+            host = urlparse(url).netloc.lower()
+            if host not in host_limits:
+                host_limits[host] = asyncio.Semaphore(max(1, settings.attachment_download_per_host))
+            return host_limits[host]
+
+        # The session is only used here, between the downloads: the concurrent
+        # fetches below get plain values and never touch (or commit) it.
+        pending: List[Dict[str, Any]] = []
+        for idx, att in enumerate(attachments):
+            if not att.source_url:
+                _log_download(db, job_id, 'WARNING', f"Attachment {att.id} has no source_url, skipping", step='download', attachment_name=att.name)
+                continue
+
+            # Same resource already downloaded for another notice/amendment: link the blob
+            shared = blob_store.find_blob_for_source(db, att.source_url, exclude_attachment_id=att.id)
+            if shared is not None:
+                blob_store.link_attachment(db, att, shared)
+                db.commit()
+                _log_download(db, job_id, 'INFO', f"Reused stored copy of {att.name}", step='download', attachment_name=att.name, extra_metadata={"path": shared.storage_path, "sha256": shared.sha256, "deduplicated": True})
+                logger.info(f"[Job {job_id}] Reused blob {shared.sha256[:12]} for {att.name}")
+                downloaded_count += 1
+                continue
+
+            # Skip if already exists under the name we would give it
+            candidate = opp_dir / _target_filename(notice_id, att, idx, att.mime_type)
+            if candidate.exists():
+                # Legacy per-notice copy: move it into the blob store instead of downloading
+                _log_download(db, job_id, 'INFO', "File already exists, skipping", step='download', attachment_name=att.name, extra_metadata={"path": str(candidate)})
+                sha256 = await asyncio.to_thread(blob_store.hash_file, candidate)
+                blob = blob_store.store_file(db, candidate, sha256, candidate.stat().st_size, att.mime_type, candidate.suffix)
+                blob_store.link_attachment(db, att, blob)
+                db.commit()
+                downloaded_count += 1
+                continue
+
+            pending.append({
+                "idx": idx,
+                "att": att,
+                "name": att.name,
+                "source_url": att.source_url,
+                "url": _build_download_url(att.source_url),
+                # Stable partial name so an interrupted job resumes on the next run
+                "part_path": opp_dir / f".{notice_id}_{att.id or idx}.part",
+            })
+
+        async def _fetch_one(target: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            """Network and file work only; returns the streamed file info, None when failed."""
+            name, part_path = target["name"], target["part_path"]
+            async with total_limit, _host_limit(target["url"]):
+                _log_download(
+                    db,
+                    job_id,
+                    'INFO',
+                    f"Downloading {name}",
+                    step='download',
+                    attachment_name=name,
+                    extra_metadata={"url": target["url"], "resume_from": part_path.stat().st_size if part_path.exists() else 0},
+                )
+                logger.info(f"[Job {job_id}] Downloading {name} from {target['url']}")
                 try:
-                    if not att.source_url:
-                        _log_download(db, job_id, 'WARNING', f"Attachment {att.id} has no source_url, skipping", step='download', attachment_name=att.name)
-                        continue
-                    
-                    # Download file first to get content-type
-                    download_url = _build_download_url(att.source_url)
-                    _log_download(
-                        db,
-                        job_id,
-                        'INFO',
-                        f"Downloading {att.name}",
-                        step='download',
-                        attachment_name=att.name,
-                        extra_metadata={"url": download_url},
-                    )
-                    logger.info(f"[Job {job_id}] Downloading {att.name} from {download_url}")
-                    
-                    response = await client.get(download_url)
-                    response.raise_for_status()
-                    
-                    # Get content-type from response
-                    content_type = response.headers.get("content-type", "")
-                    if content_type:
-                        content_type = content_type.split(";")[0].strip()
-                    
-                    # Detect file type from content if content-type is not reliable
-                    detected_mime = None
-                    if response.content:
-                        header = response.content[:16]
-                        if header.startswith(b'%PDF'):
-                            detected_mime = "application/pdf"
-                        elif header.startswith(b'PK\x03\x04'):
-                            # ZIP-based formats (DOCX, XLSX, PPTX)
-                            # Check for Office document signatures
-                            if b'word/' in response.content[:1024] or b'[Content_Types].xml' in response.content[:2048]:
-                                detected_mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            elif b'xl/' in response.content[:1024] or b'xl/workbook' in response.content[:2048]:
-                                detected_mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                            else:
-                                detected_mime = "application/zip"
-                        elif header.startswith(b'\xd0\xcf\x11\xe0'):
-                            # Old MS Office formats
-                            detected_mime = "application/msword"
-                    
-                    # Use detected MIME type if content-type is generic
-                    if detected_mime and (not content_type or content_type == "application/octet-stream"):
-                        content_type = detected_mime
-                    
-                    # Update mime_type if not set or if we detected a better one
-                    if not att.mime_type or (detected_mime and att.mime_type == "application/octet-stream"):
-                        att.mime_type = content_type or detected_mime
-                    
-                    # Generate safe and unique filename (noticeId_attachmentId_originalName.ext)
-                    # Use response content-type or detected MIME type
-                    base_name = att.name or "attachment"
-                    base_name = re.sub(r"[^A-Za-z0-9._-]+", "_", base_name).strip("._") or "attachment"
-                    original_suffix = Path(base_name).suffix
-                    ext = original_suffix
-                    
-                    # Use detected MIME type or content-type
-                    mime_to_use = detected_mime or content_type or att.mime_type
-                    if not ext and mime_to_use:
-                        ext_map = {
-                            "application/pdf": ".pdf",
-                            "application/msword": ".doc",
-                            "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
-                            "application/vnd.ms-excel": ".xls",
-                            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
-                        }
-                        ext = ext_map.get(mime_to_use, "")
-                    if not ext:
-                        parsed = urlparse(att.source_url)
-                        ext = Path(parsed.path).suffix
-                    if not ext:
-                        ext = ".bin"
-                    stem = Path(base_name).stem or "file"
-                    unique_prefix = f"{notice_id}_{att.id or idx}"
-                    filename = f"{unique_prefix}_{stem}{ext}"
-                    local_path = opp_dir / filename
-                    
-                    # Skip if already exists
-                    if local_path.exists():
-                        _log_download(db, job_id, 'INFO', f"File already exists, skipping", step='download', attachment_name=att.name, extra_metadata={"path": str(local_path)})
-                        att.local_path = str(local_path)
-                        att.downloaded = True
-                        att.size_bytes = local_path.stat().st_size
-                        att.downloaded_at = datetime.now()
-                        db.commit()
-                        downloaded_count += 1
-                        continue
-                    
-                    # Ensure directory exists
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Save to disk
-                    try:
-                        with open(local_path, "wb") as f:
-                            f.write(response.content)
-                        
-                        # Verify file was written
-                        if not local_path.exists():
-                            raise IOError(f"File was not created at {local_path}")
-                        
-                        file_size = local_path.stat().st_size
-                        if file_size != len(response.content):
-                            raise IOError(f"File size mismatch: expected {len(response.content)}, got {file_size}")
-                        
-                        logger.info(f"[Job {job_id}] File saved successfully: {local_path} ({file_size} bytes)")
-                    except Exception as save_exc:
-                        logger.error(f"[Job {job_id}] Failed to save file {local_path}: {save_exc}")
-                        _log_download(db, job_id, 'ERROR', f"Failed to save file: {save_exc}", step='save', attachment_name=att.name, extra_metadata={"path": str(local_path), "error": str(save_exc)})
-                        continue
-                    
-                    # Update attachment record
-                    att.local_path = str(local_path)
-                    att.downloaded = True
-                    att.size_bytes = len(response.content)
-                    att.downloaded_at = datetime.now()
-                    
-                    db.commit()
-                    db.refresh(att)
-                    
-                    _log_download(db, job_id, 'INFO', f"Downloaded {att.name} ({att.size_bytes} bytes)", step='save', attachment_name=att.name, extra_metadata={"size_bytes": att.size_bytes, "path": str(local_path)})
-                    logger.info(f"[Job {job_id}] Downloaded {att.name} ({att.size_bytes} bytes) to {local_path}")
-                    downloaded_count += 1
-                    
+                    streamed = await _stream_to_file(client, target["url"], part_path)
                 except httpx.HTTPStatusError as e:
-                    # Handle 303 redirects specially - try to follow Location header
-                    if e.response.status_code == 303:
-                        location = e.response.headers.get("Location")
-                        if location:
-                            logger.info(f"[Job {job_id}] Got 303 redirect for {att.name}, following to {location}")
-                            try:
-                                # Try downloading from the redirect location
-                                redirect_response = await client.get(location)
-                                redirect_response.raise_for_status()
-                                
-                                # Save to disk
-                                with open(local_path, "wb") as f:
-                                    f.write(redirect_response.content)
-                                
-                                # Update attachment record
-                                att.local_path = str(local_path)
-                                att.downloaded = True
-                                att.size_bytes = len(redirect_response.content)
-                                att.downloaded_at = datetime.now()
-                                
-                                # Update mime_type if not set
-                                if not att.mime_type and redirect_response.headers.get("content-type"):
-                                    att.mime_type = redirect_response.headers.get("content-type").split(";")[0]
-                                
-                                db.commit()
-                                db.refresh(att)
-                                
-                                _log_download(db, job_id, 'INFO', f"Downloaded {att.name} via 303 redirect ({att.size_bytes} bytes)", step='save', attachment_name=att.name, extra_metadata={"size_bytes": att.size_bytes, "path": str(local_path), "redirect_url": location})
-                                logger.info(f"[Job {job_id}] Downloaded {att.name} via 303 redirect ({att.size_bytes} bytes) to {local_path}")
-                                downloaded_count += 1
-                                continue
-                            except Exception as redirect_err:
-                                error_msg = f"HTTP 303 redirect failed: {redirect_err}"
-                                logger.error(f"[Job {job_id}] {error_msg} for {att.name} (redirect to {location})")
-                                _log_download(db, job_id, 'ERROR', error_msg, step='download', attachment_name=att.name, extra_metadata={"status_code": 303, "redirect_location": location, "error": str(redirect_err)})
-                                failed_count += 1
-                                continue
-                        else:
-                            error_msg = f"HTTP 303 redirect but no Location header"
-                            logger.error(f"[Job {job_id}] {error_msg} for {att.name}")
-                            _log_download(db, job_id, 'ERROR', error_msg, step='download', attachment_name=att.name, extra_metadata={"status_code": 303, "error": "No Location header"})
-                            failed_count += 1
-                            continue
-                    else:
-                        error_msg = f"HTTP error {e.response.status_code}"
-                        logger.error(f"[Job {job_id}] {error_msg} for {att.name} (URL: {att.source_url})")
-                        _log_download(db, job_id, 'ERROR', error_msg, step='download', attachment_name=att.name, extra_metadata={"status_code": e.response.status_code, "url": att.source_url, "error": str(e)})
-                        failed_count += 1
-                        continue
+                    error_msg = f"HTTP error {e.response.status_code}"
+                    logger.error(f"[Job {job_id}] {error_msg} for {name} (URL: {target['source_url']})")
+                    _log_download(db, job_id, 'ERROR', error_msg, step='download', attachment_name=name, extra_metadata={"status_code": e.response.status_code, "url": target["source_url"], "error": str(e)})
+                    return None
                 except Exception as e:
                     error_msg = f"Error downloading: {e}"
-                    logger.error(f"[Job {job_id}] {error_msg} for {att.name}", exc_info=True)
-                    _log_download(db, job_id, 'ERROR', error_msg, step='download', attachment_name=att.name, extra_metadata={"error": str(e)})
-                    failed_count += 1
-                    continue
+                    logger.error(f"[Job {job_id}] {error_msg} for {name}", exc_info=True)
+                    _log_download(db, job_id, 'ERROR', error_msg, step='download', attachment_name=name, extra_metadata={"error": str(e), "partial_bytes": part_path.stat().st_size if part_path.exists() else 0})
+                    return None
+            streamed["header"] = await asyncio.to_thread(_read_prefix, part_path, SNIFF_BYTES)
+            return streamed
+
+        def _save_one(target: Dict[str, Any], streamed: Dict[str, Any]) -> bool:
+            """Move a finished download into the blob store and link it (one commit per file)."""
+            att, part_path = target["att"], target["part_path"]
+            # Use detected MIME type if content-type is generic
+            content_type = streamed["content_type"]
+            detected_mime = _detect_mime(streamed["header"])
+            if detected_mime and (not content_type or content_type == "application/octet-stream"):
+                content_type = detected_mime
+            if not att.mime_type or (detected_mime and att.mime_type == "application/octet-stream"):
+                att.mime_type = content_type or detected_mime
+
+            ext = Path(_target_filename(notice_id, att, target["idx"], detected_mime or content_type or att.mime_type)).suffix
+            try:
+                # Atomic rename into the blob store; an identical blob makes this copy redundant
+                blob = blob_store.store_file(db, part_path, streamed["sha256"], streamed["size_bytes"], att.mime_type, ext)
+            except Exception as save_exc:
+                db.rollback()
+                logger.error(f"[Job {job_id}] Failed to save file {part_path}: {save_exc}")
+                _log_download(db, job_id, 'ERROR', f"Failed to save file: {save_exc}", step='save', attachment_name=att.name, extra_metadata={"path": str(part_path), "error": str(save_exc)})
+                return False
+
+            # Update attachment record
+            blob_store.link_attachment(db, att, blob)
+            db.commit()
+            db.refresh(att)
+            local_path = Path(att.local_path)
+
+            _log_download(
+                db, job_id, 'INFO', f"Downloaded {att.name} ({att.size_bytes} bytes)", step='save', attachment_name=att.name,
+                extra_metadata={"size_bytes": att.size_bytes, "path": str(local_path), "sha256": streamed["sha256"], "resumed_from": streamed["resumed_from"]},
+            )
+            logger.info(f"[Job {job_id}] Downloaded {att.name} ({att.size_bytes} bytes) to {local_path}")
+            return True
+
+        # httpx client with redirect following enabled (for SAM.gov 303 redirects).
+        async with contextlib.AsyncExitStack() as stack:
+            if client is None:
+                limits = httpx.Limits(max_connections=max(1, settings.attachment_download_concurrency))
+                client = await stack.enter_async_context(
+                    httpx.AsyncClient(timeout=120.0, follow_redirects=True, limits=limits)
+                )
+            outcomes = await asyncio.gather(
+                *(_fetch_one(target) for target in pending),
+                return_exceptions=True,
+            )
+
+        for target, outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"[Job {job_id}] Unexpected error for {target['name']}: {outcome}")
+                _log_download(db, job_id, 'ERROR', f"Error downloading: {outcome}", step='download', attachment_name=target["name"], extra_metadata={"error": str(outcome)})
+                failed_count += 1
+            elif outcome is not None and _save_one(target, outcome):
+                downloaded_count += 1
+            else:
+                failed_count += 1
         
         # Update job with results
         job.status = 'completed'
@@ -400,4 +505,15 @@ async def download_attachments_for_opportunity(
         _log_download(db, job_id, 'ERROR', f"Download failed: {e}", step='error', extra_metadata={"error": str(e)})
         logger.error(f"[Job {job_id}] Download failed: {e}", exc_info=True)
         raise
+    finally:
+        download_log_writer.flush(job_id)
+
+
+def run_download_job(opportunity_id: int, job_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Synchronous entry point for queue workers (RQ ``extraction`` queue).
+    Runs on the shared download loop, which opens its own session.
+    """
+    from .download_runner import submit_download
 
+    return submit_download(opportunity_id, job_id).result(timeout=settings.attachment_download_timeout)
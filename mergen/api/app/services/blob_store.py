@@ -0,0 +1,248 @@
+"""
+Attachment Blob Store
+=====================
+Content-addressed storage for downloaded attachments.
+
+SAM notices and their amendments often link the same resource (standard
+clauses, wage determinations, re-posted SOWs). Every distinct file is stored
+exactly once, keyed by its SHA-256:
+
+    DATA_DIR/blobs/<sha[:2]>/<sha><ext>
+
+``OpportunityAttachment.content_hash`` references the ``AttachmentBlob`` row
+and ``local_path`` points at the shared file. ``AttachmentBlob.ref_count``
+tracks how many attachments use a blob; ``collect_garbage`` recounts from the
+attachment table (attachments removed by ON DELETE CASCADE never decrement)
+and deletes unreferenced files.
+
+Parsed document output is cached on the blob (``parsed_result``) so identical
+files are parsed only once as well.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import AttachmentBlob, OpportunityAttachment
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_DATA_DIR = PROJECT_ROOT / "data"
+BASE_DATA_DIR = Path(os.getenv("DATA_DIR", str(DEFAULT_DATA_DIR))).resolve()
+BLOB_DIR = BASE_DATA_DIR / "blobs"
+
+# Unreferenced blobs younger than this are kept (a download may be linking them)
+GC_GRACE_PERIOD = timedelta(hours=1)
+
+
+def blob_path_for(sha256: str, ext: str = "") -> Path:
+    """Storage path for a blob. The extension is kept because parsers dispatch on it."""
+    return BLOB_DIR / sha256[:2] / f"{sha256}{ext.lower()}"
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _usable(blob: Optional[AttachmentBlob]) -> bool:
+    return bool(blob and blob.storage_path and Path(blob.storage_path).exists())
+
+
+def find_blob_for_source(
+    db: Session,
+    source_url: Optional[str],
+    exclude_attachment_id: Optional[int] = None,
+) -> Optional[AttachmentBlob]:
+    """
+    Return the blob already downloaded for ``source_url`` by any opportunity,
+    so the same SAM resource is not fetched again.
+    """
+    if not source_url:
+        return None
+    query = (
+        db.query(AttachmentBlob)
+        .join(OpportunityAttachment, OpportunityAttachment.content_hash == AttachmentBlob.sha256)
+        .filter(OpportunityAttachment.source_url == source_url)
+    )
+    if exclude_attachment_id is not None:
+        query = query.filter(OpportunityAttachment.id != exclude_attachment_id)
+    blob = query.first()
+    return blob if _usable(blob) else None
+
+
+def store_file(
+    db: Session,
+    src_path: Path,
+    sha256: str,
+    size_bytes: int,
+    mime_type: Optional[str] = None,
+    ext: str = "",
+) -> AttachmentBlob:
+    """
+    Move a fully downloaded file into the store (atomic rename).
+    If the blob already exists the new copy is discarded.
+    """
+    blob = db.get(AttachmentBlob, sha256)
+    if _usable(blob):
+        Path(src_path).unlink(missing_ok=True)
+        return blob
+
+    target = blob_path_for(sha256, ext)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(src_path, target)
+
+    if blob is not None:
+        # Row survived but the file was lost: repoint it
+        blob.storage_path = str(target)
+        db.flush()
+        return blob
+
+    blob = AttachmentBlob(
+        sha256=sha256,
+        size_bytes=size_bytes,
+        mime_type=mime_type,
+        storage_path=str(target),
+        ref_count=0,
+    )
+    try:
+        with db.begin_nested():
+            db.add(blob)
+    except IntegrityError:
+        # Another worker registered the same content concurrently
+        blob = db.get(AttachmentBlob, sha256)
+    return blob
+
+
+def link_attachment(db: Session, att: OpportunityAttachment, blob: AttachmentBlob) -> None:
+    """Point an attachment at a blob and take a reference on it."""
+    if att.content_hash and att.content_hash != blob.sha256:
+        release_attachment(db, att)
+    if att.content_hash != blob.sha256:
+        blob.ref_count = AttachmentBlob.ref_count + 1
+    att.content_hash = blob.sha256
+    att.local_path = blob.storage_path
+    att.size_bytes = blob.size_bytes
+    att.downloaded = True
+    att.downloaded_at = datetime.now()
+    if not att.mime_type or att.mime_type == "application/octet-stream":
+        att.mime_type = blob.mime_type or att.mime_type
+    blob.last_used_at = datetime.now()
+
+
+def release_attachment(db: Session, att: OpportunityAttachment) -> None:
+    """Drop an attachment's reference (the file itself is removed by ``collect_garbage``)."""
+    if not att.content_hash:
+        return
+    db.query(AttachmentBlob).filter(
+        AttachmentBlob.sha256 == att.content_hash,
+        AttachmentBlob.ref_count > 0,
+    ).update({AttachmentBlob.ref_count: AttachmentBlob.ref_count - 1}, synchronize_session=False)
+    att.content_hash = None
+
+
+def get_cached_parse(db: Session, sha256: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return the cached ``analyze_document`` output for a blob, if any."""
+    if not sha256:
+        return None
+    row = db.query(AttachmentBlob.parsed_result).filter(AttachmentBlob.sha256 == sha256).first()
+    return dict(row[0]) if row and row[0] else None
+
+
+def store_parse(db: Session, sha256: Optional[str], result: Dict[str, Any]) -> None:
+    """Cache a successful parse on the blob."""
+    if not sha256 or result.get("error"):
+        return
+    db.query(AttachmentBlob).filter(AttachmentBlob.sha256 == sha256).update(
+        {AttachmentBlob.parsed_result: result}, synchronize_session=False
+    )
+    db.commit()
+
+
+def adopt_legacy_files(db: Session, limit: int = 500) -> int:
+    """
+    Move downloaded attachments saved under data/opportunities/<notice>/attachments
+    into the blob store (duplicates collapse into one file). Returns files adopted.
+
+    Legacy ``local_path`` values are often relative or point at another
+    container's /data; they are resolved the way the pipeline resolves them.
+    """
+    from .pipeline_service import _resolve_attachment_path
+
+    legacy = (
+        db.query(OpportunityAttachment)
+        .filter(
+            OpportunityAttachment.downloaded.is_(True),
+            OpportunityAttachment.local_path.isnot(None),
+            OpportunityAttachment.content_hash.is_(None),
+        )
+        .limit(limit)
+        .all()
+    )
+    adopted = 0
+    for att in legacy:
+        path = _resolve_attachment_path(att.local_path)
+        if path is None or not path.exists():
+            continue
+        try:
+            sha256 = hash_file(path)
+            blob = store_file(db, path, sha256, path.stat().st_size, att.mime_type, path.suffix)
+            link_attachment(db, att, blob)
+            db.commit()
+            adopted += 1
+        except Exception as exc:
+            db.rollback()
+            logger.warning(f"[blob_store] Could not adopt {path}: {exc}")
+    return adopted
+
+
+def recount_references(db: Session) -> None:
+    """Recompute ref_count from opportunity_attachments."""
+    counts = (
+        db.query(OpportunityAttachment.content_hash, func.count(OpportunityAttachment.id))
+        .filter(OpportunityAttachment.content_hash.isnot(None))
+        .group_by(OpportunityAttachment.content_hash)
+        .all()
+    )
+    db.query(AttachmentBlob).update({AttachmentBlob.ref_count: 0}, synchronize_session=False)
+    for sha256, count in counts:
+        db.query(AttachmentBlob).filter(AttachmentBlob.sha256 == sha256).update(
+            {AttachmentBlob.ref_count: count}, synchronize_session=False
+        )
+    db.commit()
+
+
+def collect_garbage(db: Session, dry_run: bool = False) -> Dict[str, Any]:
+    """Delete blobs no attachment references any more (after GC_GRACE_PERIOD)."""
+    recount_references(db)
+    cutoff = datetime.now() - GC_GRACE_PERIOD
+    orphans = (
+        db.query(AttachmentBlob)
+        .filter(
+            AttachmentBlob.ref_count <= 0,
+            func.coalesce(AttachmentBlob.last_used_at, AttachmentBlob.created_at) < cutoff,
+        )
+        .all()
+    )
+    freed = 0
+    for blob in orphans:
+        freed += blob.size_bytes or 0
+        if dry_run:
+            continue
+        Path(blob.storage_path).unlink(missing_ok=True)
+        db.delete(blob)
+    if not dry_run:
+        db.commit()
+    logger.info(f"[blob_store] GC {'(dry run) ' if dry_run else ''}removed {len(orphans)} blobs, {freed} bytes")
+    return {"removed": len(orphans), "bytes_freed": freed, "dry_run": dry_run}
@@ -1,19 +1,15 @@
-import time
-from typing import Optional
-
-from .redis_client import _client
-
-
-def _now() -> int:
-    return int(time.time())
+from .redis_client import run_script
 
 
 class CircuitBreaker:
-    """Basit circuit breaker (Redis tabanlı).
+    """Basit circuit breaker (Redis tabanlı, süreçler arası paylaşılan).
 
     CLOSED -> başarısızlık say, eşik aşılırsa OPEN
     OPEN -> cooldown süresi dolana kadar çağrıları blokla
     HALF_OPEN -> bir denemeye izin ver, başarılıysa CLOSED, değilse OPEN
+
+    Her kontrol tek bir atomik script çağrısıdır (tek round trip); durum
+    ``cb:<name>`` hash'inde tutulur. Redis hatasında çağrılara izin verilir.
     """
 
     def __init__(self, name: str, failure_threshold: int = 5, cooldown_sec: int = 60):
@@ -22,51 +18,21 @@ class CircuitBreaker:
         self.cooldown_sec = cooldown_sec
 
     @property
-    def _state_key(self) -> str:
-        return f"cb:{self.name}:state"
-
-    @property
-    def _fail_key(self) -> str:
-        return f"cb:{self.name}:failures"
-
-    @property
-    def _until_key(self) -> str:
-        return f"cb:{self.name}:until"
-
-    def _get(self, key: str) -> Optional[str]:
-        try:
-            return _client.get(key)
-        except Exception:
-            return None
+    def _key(self) -> str:
+        return f"cb:{self.name}"
 
-    def _setex(self, key: str, ttl: int, val: str) -> None:
+    def _call(self, op: str) -> bool:
         try:
-            _client.setex(key, ttl, val)
+            allowed, _ = run_script("circuit_breaker", self._key, (op, self.failure_threshold, self.cooldown_sec))
+            return allowed
         except Exception:
-            pass
+            return True
 
     def allow(self) -> bool:
-        state = self._get(self._state_key) or "CLOSED"
-        if state == "OPEN":
-            until = int(self._get(self._until_key) or "0")
-            if _now() >= until:
-                # HALF_OPEN
-                self._setex(self._state_key, self.cooldown_sec, "HALF_OPEN")
-                return True
-            return False
-        return True
+        return self._call("allow")
 
     def record_success(self) -> None:
-        self._setex(self._state_key, self.cooldown_sec, "CLOSED")
-        self._setex(self._fail_key, self.cooldown_sec, "0")
+        self._call("success")
 
     def record_failure(self) -> None:
-        try:
-            fails = int(self._get(self._fail_key) or "0") + 1
-        except Exception:
-            fails = 1
-        self._setex(self._fail_key, self.cooldown_sec, str(fails))
-        if fails >= self.failure_threshold:
-            self._setex(self._state_key, self.cooldown_sec, "OPEN")
-            self._setex(self._until_key, self.cooldown_sec, str(_now() + self.cooldown_sec))
-
+        self._call("failure")
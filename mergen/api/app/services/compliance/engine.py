@@ -1,9 +1,16 @@
+from collections import OrderedDict, defaultdict
+from functools import reduce
+from sqlalchemy import Text, cast, func, select
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from ...models import Requirement, Evidence, FacilityFeature, PricingItem, Clause
+from sqlalchemy.sql import ColumnElement
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import threading
+from ...models import Requirement, Evidence, FacilityFeature, PricingItem, Clause, Document, Opportunity
 from ...schemas import ComplianceMatrix, ComplianceMatrixItem
+from .per_diem_index import MonthLike
 from .rules import (
-    check_per_diem_compliance,
+    check_per_diem_batch,
     check_facility_compliance,
     check_distance_compliance,
     check_far_clause_compliance,
@@ -13,6 +20,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Evidence items kept per requirement in the matrix
+TOP_EVIDENCE = 3
+# RFQ matrices kept in memory (oldest dropped first)
+MATRIX_CACHE_SIZE = 128
+
+_matrix_cache: "OrderedDict[int, Tuple[Tuple, ComplianceMatrix]]" = OrderedDict()
+_matrix_cache_lock = threading.Lock()
+
 
 def calculate_risk_level(requirement: Requirement, evidence: List[Evidence]) -> str:
     """Calculate risk level for a requirement based on evidence"""
@@ -41,7 +56,91 @@ def find_best_evidence(requirement: Requirement, all_evidence: List[Evidence]) -
     requirement_evidence.sort(key=lambda x: x.score, reverse=True)
     
     # Return top 3 evidence items
-    return requirement_evidence[:3]
+    return requirement_evidence[:TOP_EVIDENCE]
+
+
+def load_best_evidence(db: Session, rfq_id: int, limit: int = TOP_EVIDENCE) -> Dict[int, List[Evidence]]:
+    """Top evidence per requirement of an RFQ; the ranking is done by the database"""
+    rank = (
+        func.row_number()
+        .over(partition_by=Evidence.requirement_id, order_by=(Evidence.score.desc().nulls_last(), Evidence.id))
+        .label("rank")
+    )
+    ranked = (
+        select(Evidence.id, rank)
+        .join(Requirement, Requirement.id == Evidence.requirement_id)
+        .where(Requirement.rfq_id == rfq_id)
+        .subquery()
+    )
+    rows = (
+        db.query(Evidence)
+        .join(ranked, ranked.c.id == Evidence.id)
+        .filter(ranked.c.rank <= limit)
+        .order_by(Evidence.requirement_id, ranked.c.rank)
+        .all()
+    )
+    grouped: Dict[int, List[Evidence]] = defaultdict(list)
+    for item in rows:
+        grouped[item.requirement_id].append(item)
+    return grouped
+
+
+# Separates the columns of a row in ``_row_text`` (not expected in any value)
+_FIELD_SEP = "\x1f"
+
+
+def _row_text(model) -> ColumnElement:
+    """Every column of a row as one string (NULL kept distinct from '')"""
+    parts = [func.coalesce(cast(column, Text), "\\N") for column in model.__table__.columns]
+    return reduce(lambda left, right: left + _FIELD_SEP + right, parts)
+
+
+def _table_fingerprint(db: Session, model, query) -> Tuple[int, Optional[str]]:
+    """
+    Row count and content hash of ``query``'s ``model`` rows
+
+    On PostgreSQL both are computed by the database (count + md5 of the
+    ordered row texts), so only two values are transferred. Other dialects
+    (SQLite in tests) have no ordered string aggregate / md5 everywhere: the
+    row texts are read and hashed here.
+    """
+    row_text = _row_text(model)
+    if db.get_bind().dialect.name == "postgresql":
+        digest = func.md5(func.aggregate_strings(row_text, "|").aggregate_order_by(model.id))
+        count, value = db.execute(query.with_only_columns(func.count(), digest)).one()
+        return count, value
+    texts = db.execute(query.with_only_columns(row_text).order_by(model.id)).scalars().all()
+    return len(texts), hashlib.sha256("|".join(texts).encode("utf-8")).hexdigest()
+
+
+def _matrix_validators(db: Session, rfq_id: int) -> Tuple:
+    """
+    Fingerprint of the requirements/evidence a matrix was built from
+
+    Counts plus a hash over every column of every row, so in-place edits
+    (text, status, score, snippet...) are caught as well as new rows. The
+    hashing runs in the database; a cache hit does not load the rows.
+    """
+    requirements = _table_fingerprint(
+        db, Requirement, select(Requirement.id).where(Requirement.rfq_id == rfq_id)
+    )
+    evidence = _table_fingerprint(
+        db,
+        Evidence,
+        select(Evidence.id)
+        .join(Requirement, Requirement.id == Evidence.requirement_id)
+        .where(Requirement.rfq_id == rfq_id),
+    )
+    return requirements + evidence
+
+
+def invalidate_compliance_matrix(rfq_id: Optional[int] = None) -> None:
+    """Drop the cached matrix of an RFQ (or of all RFQs)"""
+    with _matrix_cache_lock:
+        if rfq_id is None:
+            _matrix_cache.clear()
+        else:
+            _matrix_cache.pop(rfq_id, None)
 
 
 def generate_gap_analysis(requirement: Requirement, evidence: List[Evidence]) -> str:
@@ -70,8 +169,36 @@ def generate_mitigation_strategy(requirement: Requirement, evidence: List[Eviden
         return "Critical gap identified. Must address before proposal submission."
 
 
-def build_compliance_matrix(db: Session, rfq_id: int) -> ComplianceMatrix:
-    """Build compliance matrix for an RFQ"""
+def build_compliance_matrix(db: Session, rfq_id: int, use_cache: bool = True) -> ComplianceMatrix:
+    """
+    Build compliance matrix for an RFQ
+
+    The matrix is cached per RFQ and reused until its requirements or
+    evidence change (row counts + content hash computed by the database, see
+    ``_matrix_validators``); the cached object is shared, treat it as
+    read-only.
+    """
+    validators = None
+    if use_cache:
+        validators = _matrix_validators(db, rfq_id)
+        with _matrix_cache_lock:
+            cached = _matrix_cache.get(rfq_id)
+            if cached and cached[0] == validators:
+                _matrix_cache.move_to_end(rfq_id)
+                return cached[1]
+
+    matrix = _build_compliance_matrix(db, rfq_id)
+
+    if validators is not None:
+        with _matrix_cache_lock:
+            _matrix_cache[rfq_id] = (validators, matrix)
+            _matrix_cache.move_to_end(rfq_id)
+            while len(_matrix_cache) > MATRIX_CACHE_SIZE:
+                _matrix_cache.popitem(last=False)
+    return matrix
+
+
+def _build_compliance_matrix(db: Session, rfq_id: int) -> ComplianceMatrix:
     logger.info(f"Building compliance matrix for RFQ {rfq_id}")
     
     # Get all requirements for this RFQ
@@ -88,10 +215,8 @@ def build_compliance_matrix(db: Session, rfq_id: int) -> ComplianceMatrix:
             gap_requirements=0
         )
     
-    # Get all evidence
-    all_evidence = db.query(Evidence).join(Requirement).filter(
-        Requirement.rfq_id == rfq_id
-    ).all()
+    # Top evidence per requirement (ranked in SQL, only those rows are loaded)
+    best_evidence = load_best_evidence(db, rfq_id)
     
     # Build compliance matrix items
     matrix_items = []
@@ -100,7 +225,7 @@ def build_compliance_matrix(db: Session, rfq_id: int) -> ComplianceMatrix:
     
     for requirement in requirements:
         # Find best evidence for this requirement
-        evidence = find_best_evidence(requirement, all_evidence)
+        evidence = best_evidence.get(requirement.id, [])
         
         # Calculate risk level
         risk_level = calculate_risk_level(requirement, evidence)
@@ -147,13 +272,53 @@ def build_compliance_matrix(db: Session, rfq_id: int) -> ComplianceMatrix:
     )
 
 
-def check_regulatory_compliance(db: Session, rfq_id: int) -> Dict[str, Any]:
-    """Check regulatory compliance (FAR clauses, IPP billing, etc.)"""
+def _rfq_per_diem_context(db: Session, rfq_id: int) -> Dict[str, Any]:
+    """
+    Event location / state / start date of an RFQ for the per-diem check:
+    from the document's ``meta_json``, else the place of performance of the
+    SAM.gov opportunity the document was downloaded for.
+    """
+    document = db.get(Document, rfq_id)
+    meta = (document.meta_json if document is not None else None) or {}
+    context = {
+        "location": meta.get("location") or meta.get("city") or meta.get("place_of_performance"),
+        "state": meta.get("state"),
+        "month": meta.get("check_in") or meta.get("start_date") or meta.get("event_start"),
+    }
+    notice_id = meta.get("notice_id") or meta.get("sam_gov_notice_id")
+    if not context["location"] and notice_id:
+        context["location"] = db.execute(
+            select(Opportunity.place_of_performance)
+            .where(Opportunity.notice_id == notice_id)
+            .limit(1)
+        ).scalar()
+    return context
+
+
+def check_regulatory_compliance(
+    db: Session,
+    rfq_id: int,
+    location: Optional[str] = None,
+    month: MonthLike = None,
+    state: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Check regulatory compliance (FAR clauses, IPP billing, etc.)
+
+    Per-diem limits use the RFQ's event location and check-in month (taken
+    from the RFQ document when not passed). Without them lodging rates are
+    not checked.
+    """
     logger.info(f"Checking regulatory compliance for RFQ {rfq_id}")
+    if location is None or month is None:
+        context = _rfq_per_diem_context(db, rfq_id)
+        location = location or context["location"]
+        month = month or context["month"]
+        state = state or context["state"]
     
     # Get facility features
-    facility_features = db.query(FacilityFeature).join(Clause).filter(
-        Clause.document_id == rfq_id
+    facility_features = db.query(FacilityFeature).filter(
+        FacilityFeature.source_doc_id == rfq_id
     ).all()
     
     # Get pricing items for per-diem check
@@ -168,14 +333,19 @@ def check_regulatory_compliance(db: Session, rfq_id: int) -> Dict[str, Any]:
     ])
     
     # Check per-diem compliance
-    per_diem_warnings = []
-    for item in pricing_items:
-        if item.category == "lodging" and item.unit_price > 0:
-            compliance = check_per_diem_compliance(
-                item.unit_price, "orlando", "april"  # TODO: Extract from RFQ
-            )
-            if not compliance["compliant"]:
-                per_diem_warnings.append(compliance["warning"])
+    lodging_offers = [
+        {"rate": item.unit_price}
+        for item in pricing_items
+        if item.category == "lodging" and item.unit_price > 0
+    ]
+    per_diem_checks = check_per_diem_batch(lodging_offers, location, month, state=state)
+    per_diem_warnings = [
+        compliance["warning"]
+        for compliance in per_diem_checks
+        if compliance["compliant"] is False
+    ]
+    if lodging_offers and per_diem_checks[0]["limit"] is None:
+        logger.info(f"No per-diem limit for RFQ {rfq_id} (location={location!r}, month={month!r}); lodging rates not checked")
     
     # Check FAR clause compliance
     far_compliance = check_far_clause_compliance([
@@ -192,6 +362,7 @@ def check_regulatory_compliance(db: Session, rfq_id: int) -> Dict[str, Any]:
     return {
         "facility_compliance": facility_compliance,
         "per_diem_warnings": per_diem_warnings,
+        "per_diem_context": {"location": location, "state": state, "month": str(month) if month is not None else None},
         "far_compliance": far_compliance,
         "ipp_compliance": ipp_compliance,
         "overall_compliant": all([
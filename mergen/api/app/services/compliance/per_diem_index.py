@@ -0,0 +1,379 @@
+"""
+GSA Per-Diem Index
+==================
+Local index of the published GSA per-diem rate files, so lodging rates can be
+checked for any SOW location without network calls.
+
+Files are read from ``PER_DIEM_DATA_DIR`` (default ``<DATA_DIR>/per_diem``):
+
+* rate files — the GSA master rates CSV (``State, Destination, County,
+  Season Begin, Season End, FY2025 Lodging Rate, FY2025 M&IE``) or the
+  by-month export (one column per month, ``Oct`` … ``Sep``);
+* ZIP files — any CSV with a ``Zip`` column plus either the destination ``ID``
+  of the rate file or ``State`` and ``Destination``/``City``/``County``.
+
+Header names are matched loosely and title rows above the header are skipped.
+The fiscal year comes from the rate column (``FY2025 Lodging Rate``), a
+``Fiscal Year`` column or the file name.
+
+Rates are stored as a 12-month tuple per ``(state, locality, fiscal_year)``, so
+a lookup is a dict access plus a tuple index. Destinations and their counties
+are both indexed as localities. When seasons change mid-month the month gets
+the highest seasonal rate: an offer is only flagged when it exceeds every rate
+that can apply in that month.
+"""
+import csv
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ...config import settings
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+DEFAULT_DATA_DIR = PROJECT_ROOT / "data"
+DATA_DIR = Path(os.getenv("DATA_DIR", str(DEFAULT_DATA_DIR))).resolve()
+
+MONTHS = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+_MONTH_NUMBERS = {name[:3]: number for number, name in enumerate(MONTHS, start=1)}
+
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_STATE_RE = re.compile(r"^[A-Za-z]{2}$")
+_FISCAL_YEAR_RE = re.compile(r"FY\s*(\d{2,4})", re.IGNORECASE)
+# The GSA standard CONUS rate only applies to the lower 48 states and DC
+_CONUS_STATES = frozenset(
+    "AL AR AZ CA CO CT DC DE FL GA IA ID IL IN KS KY LA MA MD ME MI MN MO MS MT NC ND NE NH NJ NM "
+    "NV NY OH OK OR PA RI SC SD TN TX UT VA VT WA WI WV WY".split()
+)
+_SEASON_RE = re.compile(r"^\s*(?:([A-Za-z]+)\.?\s+(\d{1,2})|(\d{1,2})[/-](\d{1,2})(?:[/-]\d{2,4})?)\s*$")
+
+Key = Tuple[str, str, int]
+MonthLike = Union[int, str, date, datetime, None]
+
+
+def _norm(value: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (value or "").strip().lower())
+
+
+def _county(value: str) -> str:
+    return re.sub(r"\s+county$", "", _norm(value)) + " county"
+
+
+def _header(value: str) -> str:
+    return re.sub(r"[^a-z0-9&]", "", value.lower())
+
+
+def _money(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(str(value).replace("$", "").replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _fiscal_year(value: str) -> Optional[int]:
+    match = _FISCAL_YEAR_RE.search(value or "")
+    if not match:
+        return None
+    year = int(match.group(1))
+    return year + 2000 if year < 100 else year
+
+
+def fiscal_year_of(day: date) -> int:
+    """Federal fiscal year (October – September) of a date."""
+    return day.year + 1 if day.month >= 10 else day.year
+
+
+def month_number(month: MonthLike) -> Optional[int]:
+    """1–12 from a month number, name ("april"/"Apr"), ISO date string or date."""
+    if month is None:
+        return None
+    if isinstance(month, (date, datetime)):
+        return month.month
+    if isinstance(month, int):
+        return month if 1 <= month <= 12 else None
+    text = str(month).strip()
+    if text.isdigit():
+        return month_number(int(text))
+    try:
+        return datetime.fromisoformat(text[:10]).month
+    except ValueError:
+        return _MONTH_NUMBERS.get(text[:3].lower())
+
+
+def _split_location(location: Optional[str], state: Optional[str] = None) -> Tuple[Optional[str], str, Optional[str]]:
+    """``(zip, normalized name, state)`` of a ZIP, "City, ST [ZIP]" or a city name."""
+    text = (location or "").strip()
+    zip_match = _ZIP_RE.search(text)
+    text = _ZIP_RE.sub("", text).strip(" ,")
+    parts = [part.strip() for part in text.split(",") if part.strip()]
+    if len(parts) >= 2 and _STATE_RE.match(parts[-1]):
+        state = state or parts[-1]
+        parts = parts[:-1]
+    state = state.strip().upper() if state and state.strip() else None
+    return zip_match.group(1) if zip_match else None, _norm(parts[0]) if parts else "", state
+
+
+def _season_months(begin: Optional[str], end: Optional[str]) -> List[int]:
+    """Months touched by a season (wrapping around the year end)."""
+    def parse(value: Optional[str]) -> Optional[int]:
+        match = _SEASON_RE.match(value or "")
+        if not match:
+            return None
+        if match.group(1):
+            return _MONTH_NUMBERS.get(match.group(1)[:3].lower())
+        return month_number(int(match.group(3)))
+
+    first, last = parse(begin), parse(end)
+    if first is None or last is None:
+        return list(range(1, 13))
+    months = [first]
+    while months[-1] != last:
+        months.append(months[-1] % 12 + 1)
+    return months
+
+
+@dataclass
+class PerDiemIndex:
+    """In-memory GSA per-diem rates (see module docstring)."""
+
+    lodging: Dict[Key, Tuple[Optional[float], ...]] = field(default_factory=dict)
+    mie: Dict[Key, float] = field(default_factory=dict)
+    zips: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    states_by_locality: Dict[str, Set[str]] = field(default_factory=dict)
+    fiscal_years: Set[int] = field(default_factory=set)
+    standard_lodging: float = 110.0
+
+    def __bool__(self) -> bool:
+        return bool(self.lodging)
+
+    @property
+    def latest_fiscal_year(self) -> Optional[int]:
+        return max(self.fiscal_years) if self.fiscal_years else None
+
+    # -- building ------------------------------------------------------------
+    def add_rates(
+        self,
+        state: str,
+        destination: str,
+        counties: Iterable[str],
+        fiscal_year: int,
+        monthly: Dict[int, float],
+        mie: Optional[float] = None,
+    ) -> None:
+        """Merge one rate row (seasons of a destination add up month by month)."""
+        state = state.strip().upper()
+        # Counties live under "<name> county" so they never clash with a city name
+        localities = [_norm(destination)] + [_county(name) for name in counties if _norm(name)]
+        for locality in localities:
+            key = (state, locality, fiscal_year)
+            rates = list(self.lodging.get(key) or (None,) * 12)
+            for month, rate in monthly.items():
+                current = rates[month - 1]
+                rates[month - 1] = rate if current is None else max(current, rate)
+            self.lodging[key] = tuple(rates)
+            if mie is not None:
+                self.mie[key] = mie
+            self.states_by_locality.setdefault(locality, set()).add(state)
+        self.fiscal_years.add(fiscal_year)
+
+    # -- lookups -------------------------------------------------------------
+    def resolve(self, location: Optional[str], state: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """``(state, locality)`` for a ZIP, "City, ST [ZIP]" or a city name."""
+        zip_code, name, state = _split_location(location, state)
+        if zip_code in self.zips:
+            return self.zips[zip_code]
+        if not name:
+            return None
+        for locality in (name, _county(name)):
+            states = self.states_by_locality.get(locality)
+            if not states:
+                continue
+            if state:
+                if state in states:
+                    return state, locality
+            elif len(states) == 1:
+                return next(iter(states)), locality
+        return None  # unknown, or a city name shared by several states
+
+    def lookup(self, state: str, locality: str, fiscal_year: int, month: int) -> Optional[float]:
+        """Lodging rate of a resolved locality (O(1)); None if not listed."""
+        rates = self.lodging.get((state, locality, fiscal_year))
+        return rates[month - 1] if rates else None
+
+    def lodging_rate(
+        self,
+        location: Optional[str],
+        month: MonthLike,
+        fiscal_year: Optional[int] = None,
+        state: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Lodging limit for a location and month. A locality that is not listed
+        in a known CONUS state gets the standard rate. None when no rates are
+        loaded, the month is unknown or the location is ambiguous ("Portland"
+        without a state) or not recognised.
+        """
+        number = month_number(month)
+        if not self or number is None:
+            return None
+        if fiscal_year is None:
+            if isinstance(month, (date, datetime)):
+                fiscal_year = fiscal_year_of(month)
+            elif isinstance(month, str) and len(month) >= 10 and month[:4].isdigit():
+                fiscal_year = fiscal_year_of(datetime.fromisoformat(month[:10]))
+        if fiscal_year not in self.fiscal_years:
+            fiscal_year = self.latest_fiscal_year
+        resolved = self.resolve(location, state)
+        if resolved:
+            rate = self.lookup(resolved[0], resolved[1], fiscal_year, number)
+            return rate if rate is not None else self.standard_lodging
+        _, name, state = _split_location(location, state)
+        if name and state in _CONUS_STATES:
+            return self.standard_lodging
+        return None
+
+
+# ---------------------------------------------------------------------------
+# CSV loading
+# ---------------------------------------------------------------------------
+def _read_rows(path: Path) -> Tuple[List[str], List[List[str]]]:
+    with path.open(newline="", encoding="utf-8-sig", errors="replace") as handle:
+        rows = list(csv.reader(handle))
+    for position, row in enumerate(rows[:10]):
+        headers = [_header(cell) for cell in row]
+        if "state" in headers or "zip" in headers or "zipcode" in headers:
+            return [cell.strip() for cell in row], rows[position + 1:]
+    return [], []
+
+
+def _column(headers: List[str], *names: str) -> Optional[int]:
+    keys = [_header(value) for value in headers]
+    for name in names:
+        if name in keys:
+            return keys.index(name)
+    return None
+
+
+def _load_rate_file(index: PerDiemIndex, path: Path, headers: List[str], rows: List[List[str]]) -> Dict[str, Tuple[str, str]]:
+    keys = [_header(value) for value in headers]
+    state_col = _column(headers, "state")
+    dest_col = _column(headers, "destination", "city", "primarydestination")
+    county_col = _column(headers, "county", "counties", "countylocationdefined")
+    id_col = _column(headers, "id", "did", "destinationid")
+    fy_col = _column(headers, "fiscalyear", "fy", "year")
+    begin_col = _column(headers, "seasonbegin", "seasonstart", "begin")
+    end_col = _column(headers, "seasonend", "end")
+    lodging_col = next((i for i, key in enumerate(keys) if "lodging" in key), None)
+    mie_col = next((i for i, key in enumerate(keys) if "m&ie" in key or key.endswith("mie")), None)
+    month_cols = {
+        _MONTH_NUMBERS[key[:3]]: i for i, key in enumerate(keys) if key[:3] in _MONTH_NUMBERS and len(key) <= 9
+    }
+    header_fy = (
+        _fiscal_year(headers[lodging_col]) if lodging_col is not None else None
+    ) or _fiscal_year(path.name)
+
+    destinations: Dict[str, Tuple[str, str]] = {}
+    for row in rows:
+        def cell(col: Optional[int]) -> str:
+            return row[col].strip() if col is not None and col < len(row) else ""
+
+        state = cell(state_col).upper()
+        destination = cell(dest_col)
+        if not state or not destination:
+            continue
+        fiscal_year = _fiscal_year("FY" + cell(fy_col)) if cell(fy_col) else header_fy
+        if fiscal_year is None:
+            continue
+        if month_cols and lodging_col is None:
+            monthly = {month: _money(cell(col)) for month, col in month_cols.items()}
+        else:
+            rate = _money(cell(lodging_col))
+            monthly = {month: rate for month in _season_months(cell(begin_col), cell(end_col))}
+        monthly = {month: rate for month, rate in monthly.items() if rate is not None}
+        if not monthly:
+            continue
+        counties = [name.strip() for name in re.split(r"\s*(?:/|;| and )\s*", cell(county_col)) if name.strip()]
+        index.add_rates(state, destination, counties, fiscal_year, monthly, _money(cell(mie_col)))
+        if cell(id_col):
+            destinations[cell(id_col)] = (state, _norm(destination))
+    return destinations
+
+
+def _load_zip_file(index: PerDiemIndex, headers: List[str], rows: List[List[str]], destinations: Dict[str, Tuple[str, str]]) -> None:
+    zip_col = _column(headers, "zip", "zipcode", "zips")
+    id_col = _column(headers, "id", "did", "destinationid")
+    state_col = _column(headers, "state")
+    name_col = _column(headers, "destination", "city", "county", "primarydestination")
+    for row in rows:
+        def cell(col: Optional[int]) -> str:
+            return row[col].strip() if col is not None and col < len(row) else ""
+
+        zip_code = cell(zip_col).zfill(5)[:5]
+        if not zip_code.isdigit():
+            continue
+        target = destinations.get(cell(id_col)) if id_col is not None else None
+        if target is None and cell(state_col) and cell(name_col):
+            target = index.resolve(cell(name_col), cell(state_col))
+        if target:
+            index.zips[zip_code] = target
+
+
+def load_per_diem_index(directory: Optional[Union[str, Path]] = None) -> PerDiemIndex:
+    """Build an index from every ``*.csv`` in ``directory`` (rate files before ZIP files)."""
+    directory = Path(directory or settings.per_diem_data_dir or DATA_DIR / "per_diem")
+    index = PerDiemIndex(standard_lodging=settings.per_diem_standard_lodging)
+    if not directory.is_dir():
+        logger.info(f"[per_diem] No per-diem data directory at {directory}; using built-in limits")
+        return index
+
+    zip_files = []
+    destinations: Dict[str, Tuple[str, str]] = {}
+    for path in sorted(directory.glob("*.csv")):
+        try:
+            headers, rows = _read_rows(path)
+            if not headers:
+                logger.warning(f"[per_diem] Skipping {path.name}: no header row found")
+            elif _column(headers, "zip", "zipcode", "zips") is not None:
+                zip_files.append((headers, rows))
+            else:
+                destinations.update(_load_rate_file(index, path, headers, rows))
+        except Exception as exc:
+            logger.warning(f"[per_diem] Could not read {path.name}: {exc}")
+    for headers, rows in zip_files:
+        _load_zip_file(index, headers, rows, destinations)
+
+    logger.info(
+        f"[per_diem] Loaded {len(index.lodging)} locality rates for FY {sorted(index.fiscal_years)}, "
+        f"{len(index.zips)} ZIP codes from {directory}"
+    )
+    return index
+
+
+_index: Optional[PerDiemIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_per_diem_index() -> PerDiemIndex:
+    """Process-wide index, loaded on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_per_diem_index()
+    return _index
+
+
+def reset_per_diem_index(index: Optional[PerDiemIndex] = None) -> None:
+    """Replace (or drop, to reload on next use) the process-wide index."""
+    global _index
+    with _index_lock:
+        _index = index
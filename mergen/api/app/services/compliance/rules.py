@@ -1,5 +1,6 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
+from .per_diem_index import MONTHS, MonthLike, get_per_diem_index, month_number
 
 # Per-diem limits by location and month
 PER_DIEM_LIMITS = {
@@ -142,22 +143,58 @@ class ComplianceRule:
     check_function: str  # Name of function to check this rule
 
 
-def get_per_diem_limit(location: str, month: str) -> float:
-    """Get per-diem limit for location and month"""
-    location_lower = location.lower()
-    month_lower = month.lower()
-    
-    if location_lower in PER_DIEM_LIMITS:
-        if month_lower in PER_DIEM_LIMITS[location_lower]:
-            return PER_DIEM_LIMITS[location_lower][month_lower]
-    
-    # Default to Orlando April rate if not found
-    return PER_DIEM_LIMITS["orlando"]["april"]
+def get_per_diem_limit(
+    location: Optional[str],
+    month: MonthLike,
+    fiscal_year: Optional[int] = None,
+    state: Optional[str] = None
+) -> Optional[float]:
+    """
+    Get per-diem limit for location and month
+
+    Uses the local GSA per-diem index when rate files are installed (location
+    may be a ZIP code, "City, ST" or a city name; month a name, number or
+    date), otherwise the built-in PER_DIEM_LIMITS. Returns None when the
+    location or month is missing or no rate is known for it.
+    """
+    number = month_number(month)
+    if not location or number is None:
+        return None
 
+    index = get_per_diem_index()
+    if index:
+        return index.lodging_rate(location, month, fiscal_year, state)
 
-def check_per_diem_compliance(rate: float, location: str, month: str) -> Dict[str, Any]:
-    """Check if rate complies with per-diem limits"""
-    limit = get_per_diem_limit(location, month)
+    return PER_DIEM_LIMITS.get(location.strip().lower(), {}).get(MONTHS[number - 1])
+
+
+def _unknown_per_diem(rate: float) -> Dict[str, Any]:
+    """Result for an offer whose per-diem limit is not known (neither compliant nor flagged)"""
+    return {
+        "compliant": None,
+        "rate": rate,
+        "limit": None,
+        "excess": None,
+        "warning": None
+    }
+
+
+def check_per_diem_compliance(
+    rate: float,
+    location: Optional[str],
+    month: MonthLike,
+    fiscal_year: Optional[int] = None,
+    state: Optional[str] = None,
+    limit: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Check if rate complies with per-diem limits (pass ``limit`` when already
+    known). ``compliant`` is None when no limit is known for the location.
+    """
+    if limit is None:
+        limit = get_per_diem_limit(location, month, fiscal_year, state)
+    if limit is None:
+        return _unknown_per_diem(rate)
     
     if rate <= limit:
         return {
@@ -178,6 +215,34 @@ def check_per_diem_compliance(rate: float, location: str, month: str) -> Dict[st
         }
 
 
+def check_per_diem_batch(
+    offers: List[Dict[str, Any]],
+    location: Optional[str] = None,
+    month: MonthLike = None,
+    state: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Check many offers at once. Each offer has a ``rate`` and may override
+    ``location`` / ``state`` / ``month``; limits are looked up once per
+    distinct (location, state, month).
+    """
+    limits: Dict[tuple, Optional[float]] = {}
+    results = []
+    for offer in offers:
+        offer_location = offer.get("location") or location
+        offer_state = offer.get("state") or state
+        offer_month = offer.get("month") or month
+        key = (offer_location, offer_state, str(offer_month))
+        if key not in limits:
+            limits[key] = get_per_diem_limit(offer_location, offer_month, state=offer_state)
+        rate = offer.get("rate") or 0.0
+        if limits[key] is None:
+            results.append(_unknown_per_diem(rate))
+        else:
+            results.append(check_per_diem_compliance(rate, offer_location, offer_month, limit=limits[key]))
+    return results
+
+
 def check_facility_compliance(features: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Check facility compliance against requirements"""
     compliance_results = {}
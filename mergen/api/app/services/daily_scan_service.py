@@ -0,0 +1,354 @@
+"""
+Daily Scan Service
+SAM.gov'dan günlük ilanları çekip paralel olarak analiz eden tarama motoru.
+
+- Already-analyzed notice_ids are prefetched in a single query
+- Pipelines are dispatched through job_queue (analysis queue, same retry
+  policy as API-triggered runs; in-process fallback without Redis) and their
+  AIAnalysisResult status is polled. At most N are in flight at a time
+  (DAILY_SCAN_CONCURRENCY); LLM and download stages are additionally bounded
+  by the worker-side limits in pipeline_service
+- Progress is written to a SyncJob (sync_type='daily_scan') + SyncLog rows:
+    total_processed : opportunities finished (analyzed, skipped or failed)
+    count_new       : analyses completed
+    count_skipped   : opportunities skipped (already analyzed)
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db import SessionLocal
+from ..models import AIAnalysisResult, Opportunity, SyncJob
+from ..crud.opportunities import upsert_opportunity
+from .job_log_writer import sync_log_writer
+from .job_queue import QUEUE_SPECS, dispatch_pipeline_job, queue_for_analysis
+from .pipeline_service import create_pipeline_job
+from .sam_service import fetch_opportunities_from_sam
+from .sam_gov.integration import SAMGovIntegration
+from .sam_mapper import map_sam_record_to_opportunity
+
+logger = logging.getLogger(__name__)
+
+SOW_ANALYSIS_TYPES = ["sow_draft", "sow"]
+SCAN_ANALYSIS_TYPE = "sow_draft"
+
+# Seconds between status polls of a dispatched pipeline
+ANALYSIS_POLL_INTERVAL = 5.0
+_TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def _analysis_wait_timeout() -> float:
+    """Longest a queued pipeline can take: every attempt timing out plus the backoffs."""
+    spec = QUEUE_SPECS[queue_for_analysis(SCAN_ANALYSIS_TYPE)]
+    backoff = sum(spec.backoff_base * (2 ** attempt) for attempt in range(spec.max_retries))
+    return float(spec.timeout * (spec.max_retries + 1) + backoff)
+
+
+def _notice_id_of(record: Dict[str, Any]) -> Optional[str]:
+    notice_id = record.get("noticeId") or record.get("notice_id") or record.get("id")
+    return str(notice_id) if notice_id else None
+
+
+def _log_scan(
+    db: Session,
+    job_id: str,
+    level: str,
+    message: str,
+    step: Optional[str] = None,
+    extra_metadata: Optional[Dict] = None,
+):
+    """Helper to log daily scan events (buffered, see job_log_writer)"""
+    sync_log_writer.write(job_id, level=level, message=message, step=step, extra_metadata=extra_metadata)
+
+
+def create_daily_scan_job(db: Session, params: Dict[str, Any]) -> str:
+    """Create the persistent job record so callers can poll before the scan starts."""
+    job_id = str(uuid.uuid4())
+    db.add(SyncJob(job_id=job_id, status="pending", sync_type="daily_scan", params=params))
+    db.commit()
+    return job_id
+
+
+def fetch_analyzed_notice_ids(db: Session, notice_ids: Iterable[str]) -> Set[str]:
+    """Return the subset of notice_ids that already have a completed SOW analysis (one query)."""
+    notice_ids = [n for n in set(notice_ids) if n]
+    if not notice_ids:
+        return set()
+    rows = (
+        db.query(Opportunity.notice_id)
+        .join(AIAnalysisResult, AIAnalysisResult.opportunity_id == Opportunity.id)
+        .filter(
+            Opportunity.notice_id.in_(notice_ids),
+            AIAnalysisResult.analysis_type.in_(SOW_ANALYSIS_TYPES),
+            AIAnalysisResult.status == "completed",
+        )
+        .distinct()
+        .all()
+    )
+    return {row[0] for row in rows}
+
+
+async def _fetch_records(naics_code: str, days_back: int, limit: int) -> List[Dict[str, Any]]:
+    """SAM.gov integration first, legacy SAM service as fallback."""
+    records = await SAMGovIntegration().search_opportunities(
+        naics_codes=[naics_code],
+        date_range_days=days_back,
+    )
+    if not records:
+        logger.info("SAM.gov integration returned no results, trying legacy SAM service...")
+        records = await fetch_opportunities_from_sam({
+            "naics": naics_code,
+            "days_back": days_back,
+            "limit": limit,
+        })
+    return records if isinstance(records, list) else []
+
+
+def _prepare_candidates(
+    records: List[Dict[str, Any]],
+    force_refresh: bool,
+) -> Dict[str, Any]:
+    """
+    Upsert fetched records and return the opportunity ids that need analysis.
+    Runs in a worker thread with its own session.
+    """
+    db = SessionLocal()
+    try:
+        by_notice = {}
+        for record in records:
+            notice_id = _notice_id_of(record)
+            if notice_id and notice_id not in by_notice:
+                by_notice[notice_id] = record
+
+        analyzed = set() if force_refresh else fetch_analyzed_notice_ids(db, by_notice.keys())
+
+        candidates: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        for notice_id, record in by_notice.items():
+            if notice_id in analyzed:
+                continue
+            try:
+                opportunity = upsert_opportunity(db, map_sam_record_to_opportunity(record))
+                candidates.append({"notice_id": notice_id, "opportunity_id": opportunity.id})
+            except Exception as db_error:
+                logger.error(f"⚠️  İlan {notice_id} veritabanına kaydedilemedi: {db_error}")
+                errors.append(f"İlan {notice_id} kaydedilemedi: {db_error}")
+                try:
+                    db.rollback()
+                except Exception:
+                    pass
+        return {
+            "candidates": candidates,
+            "skipped": sorted(analyzed),
+            "errors": errors,
+        }
+    finally:
+        db.close()
+
+
+def _start_analysis(opportunity_id: int) -> int:
+    """Create one SOW pipeline job and dispatch it to the analysis queue."""
+    db = SessionLocal()
+    try:
+        analysis_result, agent_run_id = create_pipeline_job(
+            db=db,
+            opportunity_id=opportunity_id,
+            analysis_type=SCAN_ANALYSIS_TYPE,
+            pipeline_version="v1",
+            agent_name="autogen",
+            initial_options={},
+        )
+        analysis_result_id = analysis_result.id
+    finally:
+        db.close()
+
+    dispatch_pipeline_job(analysis_result_id, {
+        "opportunity_id": opportunity_id,
+        "analysis_type": SCAN_ANALYSIS_TYPE,
+        "pipeline_version": "v1",
+        "agent_name": "autogen",
+        "options": {},
+        "agent_run_id": agent_run_id,
+    })
+    return analysis_result_id
+
+
+def _analysis_status(analysis_result_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(AIAnalysisResult.status)
+            .filter(AIAnalysisResult.id == analysis_result_id)
+            .scalar()
+        )
+    finally:
+        db.close()
+
+
+async def _wait_for_analysis(analysis_result_id: int, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Poll a dispatched pipeline until it completes or fails (a retrying job goes back to pending)."""
+    if timeout is None:
+        timeout = _analysis_wait_timeout()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        status = await asyncio.to_thread(_analysis_status, analysis_result_id)
+        if status in _TERMINAL_STATUSES:
+            return {"analysis_result_id": analysis_result_id, "status": status}
+        if loop.time() >= deadline:
+            return {
+                "analysis_result_id": analysis_result_id,
+                "status": status,
+                "error": f"analysis still {status} after {timeout:.0f}s",
+            }
+        await asyncio.sleep(ANALYSIS_POLL_INTERVAL)
+
+
+async def run_daily_scan(
+    naics_code: str,
+    days_back: int,
+    limit: int,
+    force_refresh: bool,
+    job_id: Optional[str] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch, filter and analyze the day's opportunities with bounded concurrency.
+    Pipelines run on the job queue; this coroutine only dispatches and polls.
+    """
+    db = SessionLocal()
+    params = {
+        "naics_code": naics_code,
+        "days_back": days_back,
+        "limit": limit,
+        "force_refresh": force_refresh,
+    }
+    if not job_id:
+        job_id = create_daily_scan_job(db, params)
+    job = db.query(SyncJob).filter(SyncJob.job_id == job_id).first()
+    if not job:
+        db.close()
+        raise ValueError(f"Job {job_id} not found")
+
+    concurrency = max(1, concurrency or settings.daily_scan_concurrency)
+
+    try:
+        job.status = "running"
+        job.started_at = datetime.now()
+        db.commit()
+        logger.info(f"📅 GÜNLÜK GÖREV BAŞLADI: NAICS {naics_code}, Son {days_back} gün, Max {limit} ilan")
+        _log_scan(db, job_id, "INFO", f"Daily scan started (concurrency={concurrency})", step="init", extra_metadata=params)
+
+        # Step 1: Fetch opportunities from SAM.gov
+        try:
+            records = await _fetch_records(naics_code, days_back, limit)
+        except Exception as sam_error:
+            logger.error(f"❌ SAM.gov veri çekme hatası: {sam_error}", exc_info=True)
+            _log_scan(db, job_id, "ERROR", f"SAM fetch failed: {sam_error}", step="fetch")
+            records = []
+
+        records = records[:limit]
+        if not records:
+            logger.warning(f"⚠️  NAICS {naics_code} için ilan bulunamadı")
+            job.status = "completed"
+            job.completed_at = datetime.now()
+            db.commit()
+            _log_scan(db, job_id, "WARNING", f"No opportunities found for NAICS {naics_code}", step="fetch")
+            return {
+                "status": "completed",
+                "job_id": job_id,
+                "message": f"No opportunities found for NAICS {naics_code}",
+                "opportunities_processed": 0,
+            }
+
+        # Step 2: Upsert + skip already analyzed (single prefetch query)
+        prepared = await asyncio.to_thread(_prepare_candidates, records, force_refresh)
+        candidates = prepared["candidates"]
+        skipped = prepared["skipped"]
+        errors: List[str] = list(prepared["errors"])
+
+        job.count_skipped = len(skipped)
+        job.total_processed = len(skipped)
+        db.commit()
+        _log_scan(
+            db, job_id, "INFO",
+            f"{len(records)} ilan bulundu: {len(candidates)} analiz edilecek, {len(skipped)} zaten analiz edilmiş",
+            step="prepare",
+            extra_metadata={"candidates": len(candidates), "skipped": len(skipped), "total": len(records)},
+        )
+
+        # Step 3: Dispatch pipelines (at most `concurrency` in flight) and wait for them
+        semaphore = asyncio.Semaphore(concurrency)
+        analyzed_count = 0
+
+        async def _run(candidate: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                logger.info(f"📄 İlan {candidate['notice_id']} analiz ediliyor (Opportunity ID: {candidate['opportunity_id']})...")
+                try:
+                    analysis_result_id = await asyncio.to_thread(_start_analysis, candidate["opportunity_id"])
+                    outcome = await _wait_for_analysis(analysis_result_id)
+                except Exception as exc:
+                    outcome = {"status": "failed", "error": str(exc)}
+                return {**candidate, **outcome}
+
+        tasks = [asyncio.create_task(_run(c)) for c in candidates]
+        for finished in asyncio.as_completed(tasks):
+            outcome = await finished
+            if outcome.get("status") == "completed":
+                analyzed_count += 1
+                level, message = "INFO", f"✅ İlan {outcome['notice_id']} analizi tamamlandı (Analysis ID: {outcome.get('analysis_result_id')})"
+                logger.info(message)
+            else:
+                level, message = "ERROR", f"İlan {outcome['notice_id']} işlenirken hata: {outcome.get('error') or outcome.get('status')}"
+                errors.append(message)
+                logger.error(message)
+
+            job.count_new = analyzed_count
+            job.total_processed = (job.total_processed or 0) + 1
+            db.commit()
+            _log_scan(
+                db, job_id, level, message, step="analyze",
+                extra_metadata={"progress": job.total_processed, "total": len(candidates) + len(skipped), **outcome},
+            )
+
+        job.status = "completed"
+        job.completed_at = datetime.now()
+        job.error_message = "\n".join(errors)[:4000] if errors else None
+        db.commit()
+
+        result = {
+            "status": "completed",
+            "job_id": job_id,
+            "message": f"Günlük görev tamamlandı: {len(candidates)} ilan işlendi, {analyzed_count} analiz yapıldı",
+            "opportunities_found": len(records),
+            "opportunities_processed": len(candidates),
+            "opportunities_skipped": len(skipped),
+            "analyses_completed": analyzed_count,
+            "errors": errors if errors else None,
+        }
+        _log_scan(db, job_id, "INFO", result["message"], step="complete")
+        logger.info(f"✅✅✅ GÜNLÜK GÖREV TAMAMLANDI: {result['message']}")
+        return result
+
+    except Exception as e:
+        logger.error(f"❌ GÜNLÜK GÖREV HATASI: {e}", exc_info=True)
+        db.rollback()
+        job.status = "failed"
+        job.completed_at = datetime.now()
+        job.error_message = str(e)
+        db.commit()
+        _log_scan(db, job_id, "ERROR", f"Daily scan failed: {e}", step="error")
+        return {
+            "status": "failed",
+            "job_id": job_id,
+            "message": f"Günlük görev hatası: {e}",
+            "error": str(e),
+        }
+    finally:
+        db.close()
+        sync_log_writer.flush(job_id)
@@ -0,0 +1,289 @@
+"""
+Dashboard Stats Rollup
+======================
+Incrementally maintained counters behind ``/api/dashboard/stats``.
+
+One ``DashboardStat`` row per scope: ``"all"`` plus ``"naics:<code>"`` for
+per-NAICS breakdowns. Rows are updated from events instead of recounting:
+
+  record_opportunity_created  : new opportunity upserted (sync / daily scan /
+                                SAM proxy search / sync script)
+  record_analysis_completed   : pipeline job finished successfully
+
+Analysis durations (created_at → completed_at) are kept as a sum/count for the
+mean and a fixed bucket histogram for percentiles, so reads are O(1) in table
+size. ``rebuild_dashboard_stats`` recomputes everything from scratch (first
+read, manual refresh, or drift after bulk imports).
+"""
+
+import bisect
+import logging
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, distinct, func
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlalchemy.orm import Session
+
+from ..models import AIAnalysisResult, DashboardStat, Opportunity
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "all"
+
+# Histogram bucket thresholds in seconds; bucket i counts durations in
+# [DURATION_BUCKETS[i-1], DURATION_BUCKETS[i]) (same as Postgres width_bucket)
+DURATION_BUCKETS = (5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600, 900, 1800, 3600, 7200)
+
+
+def _naics_scope(naics_code: Optional[str]) -> Optional[str]:
+    return f"naics:{naics_code}" if naics_code else None
+
+
+def _scopes_for(naics_code: Optional[str]) -> List[str]:
+    scopes = [GLOBAL_SCOPE]
+    if _naics_scope(naics_code):
+        scopes.append(_naics_scope(naics_code))
+    return scopes
+
+
+def _ensure_rows(db: Session, naics_code: Optional[str]) -> List[str]:
+    scopes = _scopes_for(naics_code)
+    for scope in scopes:
+        db.execute(
+            insert(DashboardStat)
+            .values(scope=scope, naics_code=None if scope == GLOBAL_SCOPE else naics_code)
+            .on_conflict_do_nothing(index_elements=["scope"])
+        )
+    return scopes
+
+
+def _bucket_index(seconds: float) -> int:
+    return bisect.bisect_right(DURATION_BUCKETS, seconds)
+
+
+def _percentile(histogram: Dict[str, int], q: float) -> Optional[float]:
+    """Approximate percentile (0..1) by linear interpolation inside the bucket."""
+    counts = [int((histogram or {}).get(str(i), 0)) for i in range(len(DURATION_BUCKETS) + 1)]
+    total = sum(counts)
+    if not total:
+        return None
+    target = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= target:
+            lower = DURATION_BUCKETS[i - 1] if i > 0 else 0
+            upper = DURATION_BUCKETS[i] if i < len(DURATION_BUCKETS) else DURATION_BUCKETS[-1] * 2
+            return lower + (upper - lower) * ((target - seen) / count)
+        seen += count
+    return float(DURATION_BUCKETS[-1])
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """28 -> '28sn', 150 -> '2dk 30sn' (dashboard display format)."""
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}sn"
+    minutes, secs = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}dk {secs}sn" if secs else f"{minutes}dk"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}sa {minutes}dk"
+
+
+def record_opportunity_created(db: Session, naics_code: Optional[str], count: int = 1) -> None:
+    """Count ``count`` newly created opportunities of one NAICS code (total + new today)."""
+    try:
+        today = date.today()
+        scopes = _ensure_rows(db, naics_code)
+        db.query(DashboardStat).filter(DashboardStat.scope.in_(scopes)).update(
+            {
+                DashboardStat.total_opportunities: DashboardStat.total_opportunities + count,
+                DashboardStat.new_today: case(
+                    (DashboardStat.new_today_date == today, DashboardStat.new_today + count),
+                    else_=count,
+                ),
+                DashboardStat.new_today_date: today,
+                DashboardStat.updated_at: func.now(),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.warning(f"[dashboard_stats] Could not record new opportunity: {exc}")
+
+
+def record_opportunities_created(db: Session, naics_codes: Iterable[Optional[str]]) -> None:
+    """Count a batch of newly created opportunities (one NAICS code per new row)."""
+    for naics_code, count in Counter(naics_codes).items():
+        record_opportunity_created(db, naics_code, count=count)
+
+
+def record_analysis_completed(db: Session, analysis_result_id: int) -> None:
+    """Fold a completed analysis into the duration stats and analyzed count."""
+    try:
+        row = (
+            db.query(
+                AIAnalysisResult.opportunity_id,
+                Opportunity.naics_code,
+                func.extract("epoch", AIAnalysisResult.completed_at - AIAnalysisResult.created_at),
+            )
+            .join(Opportunity, Opportunity.id == AIAnalysisResult.opportunity_id)
+            .filter(AIAnalysisResult.id == analysis_result_id, AIAnalysisResult.status == "completed")
+            .first()
+        )
+        if not row:
+            return
+        opportunity_id, naics_code, seconds = row
+        seconds = max(0.0, float(seconds or 0))
+
+        # First completed analysis for this opportunity → it becomes "analyzed"
+        first_completion = not db.query(
+            db.query(AIAnalysisResult.id).filter(
+                AIAnalysisResult.opportunity_id == opportunity_id,
+                AIAnalysisResult.status == "completed",
+                AIAnalysisResult.id != analysis_result_id,
+            ).exists()
+        ).scalar()
+
+        scopes = _ensure_rows(db, naics_code)
+        bucket = str(_bucket_index(seconds))
+        stats = (
+            db.query(DashboardStat)
+            .filter(DashboardStat.scope.in_(scopes))
+            .with_for_update()
+            .all()
+        )
+        for stat in stats:
+            histogram = dict(stat.analysis_duration_histogram or {})
+            histogram[bucket] = int(histogram.get(bucket, 0)) + 1
+            stat.analysis_duration_histogram = histogram
+            stat.analysis_count = (stat.analysis_count or 0) + 1
+            stat.analysis_seconds_sum = (stat.analysis_seconds_sum or 0.0) + seconds
+            if first_completion:
+                stat.analyzed_opportunities = (stat.analyzed_opportunities or 0) + 1
+            stat.updated_at = datetime.now()
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.warning(f"[dashboard_stats] Could not record analysis {analysis_result_id}: {exc}")
+
+
+def rebuild_dashboard_stats(db: Session) -> None:
+    """Recompute every rollup row from the source tables."""
+    today = date.today()
+    today_start = datetime.combine(today, datetime.min.time())
+
+    totals = (
+        db.query(
+            Opportunity.naics_code,
+            func.count(Opportunity.id),
+            func.count(Opportunity.id).filter(Opportunity.created_at >= today_start),
+        )
+        .group_by(Opportunity.naics_code)
+        .all()
+    )
+    analyzed = (
+        db.query(Opportunity.naics_code, func.count(distinct(AIAnalysisResult.opportunity_id)))
+        .join(AIAnalysisResult, AIAnalysisResult.opportunity_id == Opportunity.id)
+        .filter(AIAnalysisResult.status == "completed")
+        .group_by(Opportunity.naics_code)
+        .all()
+    )
+    duration = func.extract("epoch", AIAnalysisResult.completed_at - AIAnalysisResult.created_at)
+    bucket = func.width_bucket(duration, array(DURATION_BUCKETS))
+    durations = (
+        db.query(Opportunity.naics_code, bucket, func.count(AIAnalysisResult.id), func.sum(duration))
+        .join(Opportunity, Opportunity.id == AIAnalysisResult.opportunity_id)
+        .filter(
+            AIAnalysisResult.status == "completed",
+            AIAnalysisResult.completed_at.isnot(None),
+            AIAnalysisResult.created_at.isnot(None),
+        )
+        .group_by(Opportunity.naics_code, bucket)
+        .all()
+    )
+
+    rows: Dict[str, Dict[str, Any]] = {}
+
+    def _row(scope: str, naics_code: Optional[str]) -> Dict[str, Any]:
+        return rows.setdefault(scope, {
+            "scope": scope,
+            "naics_code": naics_code,
+            "total_opportunities": 0,
+            "new_today": 0,
+            "new_today_date": today,
+            "analyzed_opportunities": 0,
+            "analysis_count": 0,
+            "analysis_seconds_sum": 0.0,
+            "analysis_duration_histogram": {},
+        })
+
+    def _targets(naics_code: Optional[str]) -> List[Dict[str, Any]]:
+        targets = [_row(GLOBAL_SCOPE, None)]
+        if naics_code:
+            targets.append(_row(_naics_scope(naics_code), naics_code))
+        return targets
+
+    for naics_code, total, new_today in totals:
+        for target in _targets(naics_code):
+            target["total_opportunities"] += total or 0
+            target["new_today"] += new_today or 0
+    for naics_code, count in analyzed:
+        for target in _targets(naics_code):
+            target["analyzed_opportunities"] += count or 0
+    for naics_code, bucket_index, count, seconds_sum in durations:
+        for target in _targets(naics_code):
+            histogram = target["analysis_duration_histogram"]
+            key = str(bucket_index)
+            histogram[key] = histogram.get(key, 0) + (count or 0)
+            target["analysis_count"] += count or 0
+            target["analysis_seconds_sum"] += float(seconds_sum or 0)
+
+    _row(GLOBAL_SCOPE, None)
+    db.query(DashboardStat).delete(synchronize_session=False)
+    db.add_all(DashboardStat(**values) for values in rows.values())
+    db.commit()
+    logger.info(f"[dashboard_stats] Rebuilt {len(rows)} rollup rows")
+
+
+def _serialize(stat: DashboardStat) -> Dict[str, Any]:
+    new_today = stat.new_today if stat.new_today_date == date.today() else 0
+    count = stat.analysis_count or 0
+    average = (stat.analysis_seconds_sum or 0.0) / count if count else None
+    histogram = stat.analysis_duration_histogram or {}
+    return {
+        "total_opportunities": stat.total_opportunities or 0,
+        "today_new": new_today or 0,
+        "analyzed_count": stat.analyzed_opportunities or 0,
+        "analysis_count": count,
+        "avg_analysis_seconds": round(average, 1) if average is not None else None,
+        "p50_analysis_seconds": _percentile(histogram, 0.50),
+        "p90_analysis_seconds": _percentile(histogram, 0.90),
+        "p95_analysis_seconds": _percentile(histogram, 0.95),
+        "avg_analysis_time": format_duration(average),
+    }
+
+
+def get_dashboard_stats(db: Session, include_naics: bool = True, refresh: bool = False) -> Dict[str, Any]:
+    """Read the rollup (rebuilding it on first use or when ``refresh`` is set)."""
+    stat = None if refresh else db.get(DashboardStat, GLOBAL_SCOPE)
+    if stat is None:
+        rebuild_dashboard_stats(db)
+        stat = db.get(DashboardStat, GLOBAL_SCOPE)
+
+    result = _serialize(stat)
+    result["updated_at"] = stat.updated_at.isoformat() if stat.updated_at else None
+    if include_naics:
+        naics_rows = (
+            db.query(DashboardStat)
+            .filter(DashboardStat.scope != GLOBAL_SCOPE)
+            .order_by(DashboardStat.total_opportunities.desc())
+            .all()
+        )
+        result["by_naics"] = [{"naics_code": row.naics_code, **_serialize(row)} for row in naics_rows]
+    return result
@@ -1,19 +1,42 @@
 """
 Helpers for building decision cache signatures, lookups, and persistence.
+
+Lookup order (``lookup_decision_cache``):
+  exact    : same bucketed signature hash (unique index on key_hash)
+  notice   : an entry saved for the same notice (``decision_cache_notices``)
+  nearest  : closest signature in the same city/state/country
+             (``ix_decision_cache_sig_location``), within NEAREST_MAX_DISTANCE
 """
 import hashlib
 import logging
 import re
 from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from ..models import Opportunity, AIAnalysisResult, DecisionCache
+from ..models import Opportunity, AIAnalysisResult, DecisionCache, DecisionCacheNotice
 from .history_service import upsert_decision_cache, get_decision_cache
 
 logger = logging.getLogger(__name__)
 
+NIGHTS_BUCKETS = ((2, "1-2"), (4, "3-4"), (7, "5-7"), (14, "8-14"))
+PARTICIPANT_BUCKETS = ((25, "1-25"), (50, "26-50"), (100, "51-100"), (250, "101-250"), (500, "251-500"))
+BUDGET_BUCKETS = ((5000, "<=5k"), (20000, "5k-20k"), (50000, "20k-50k"), (100000, "50k-100k"))
+
+# Signature field -> ordered bucket labels (distance = steps between buckets)
+ORDINAL_FIELDS = {
+    "nights": NIGHTS_BUCKETS,
+    "participants": PARTICIPANT_BUCKETS,
+    "budget": BUDGET_BUCKETS,
+}
+CATEGORICAL_FIELDS = ("naics", "location_type")
+UNKNOWN = "UNKNOWN"
+# Larger distances are not close enough to reuse a decision
+NEAREST_MAX_DISTANCE = 2
+NEAREST_CANDIDATE_LIMIT = 200
+
 
 def _safe_number(value: Optional[Any]) -> Optional[float]:
     if value is None:
@@ -148,34 +171,9 @@ def build_signature(
         "city": (city or "UNKNOWN").upper(),
         "state": (state or "UNKNOWN").upper(),
         "country": country.upper(),
-        "nights": _bucketize(
-            nights,
-            (
-                (2, "1-2"),
-                (4, "3-4"),
-                (7, "5-7"),
-                (14, "8-14"),
-            ),
-        ),
-        "participants": _bucketize(
-            participants,
-            (
-                (25, "1-25"),
-                (50, "26-50"),
-                (100, "51-100"),
-                (250, "101-250"),
-                (500, "251-500"),
-            ),
-        ),
-        "budget": _bucketize(
-            budget_total,
-            (
-                (5000, "<=5k"),
-                (20000, "5k-20k"),
-                (50000, "20k-50k"),
-                (100000, "50k-100k"),
-            ),
-        ),
+        "nights": _bucketize(nights, NIGHTS_BUCKETS),
+        "participants": _bucketize(participants, PARTICIPANT_BUCKETS),
+        "budget": _bucketize(budget_total, BUDGET_BUCKETS),
         "naics": str(naics).upper(),
         "location_type": str(location_type).lower(),
     }
@@ -184,13 +182,88 @@ def build_signature(
     return key_hash, signature
 
 
+def _bucket_index(field: str, label: Optional[str]) -> Optional[int]:
+    boundaries = ORDINAL_FIELDS[field]
+    labels = [bucket_label for _, bucket_label in boundaries] + [f">{boundaries[-1][0]}"]
+    return labels.index(label) if label in labels else None
+
+
+def signature_distance(a: Dict[str, str], b: Dict[str, str]) -> int:
+    """
+    Distance between two signatures of the same location: bucket steps for
+    nights / participants / budget (1 if either side is unknown) plus 1 per
+    differing NAICS / location type.
+    """
+    distance = 0
+    for field in ORDINAL_FIELDS:
+        left, right = _bucket_index(field, a.get(field)), _bucket_index(field, b.get(field))
+        if left is None or right is None:
+            distance += 0 if a.get(field) == b.get(field) else 1
+        else:
+            distance += abs(left - right)
+    for field in CATEGORICAL_FIELDS:
+        distance += 0 if a.get(field) == b.get(field) else 1
+    return distance
+
+
+def _entry_signature(entry: DecisionCache) -> Dict[str, Optional[str]]:
+    return {
+        "city": entry.sig_city,
+        "state": entry.sig_state,
+        "country": entry.sig_country,
+        "naics": entry.sig_naics,
+        "location_type": entry.sig_location_type,
+        "nights": entry.sig_nights,
+        "participants": entry.sig_participants,
+        "budget": entry.sig_budget,
+    }
+
+
+def _find_by_notice(db: Session, notice_id: str) -> Optional[DecisionCache]:
+    return (
+        db.query(DecisionCache)
+        .join(DecisionCacheNotice, DecisionCacheNotice.decision_cache_id == DecisionCache.id)
+        .filter(DecisionCacheNotice.notice_id == notice_id)
+        .order_by(DecisionCache.created_at.desc())
+        .first()
+    )
+
+
+def find_nearest_decision(db: Session, signature: Dict[str, str]) -> Optional[DecisionCache]:
+    """Closest cached decision for the same city/state/country, or None if none is close enough."""
+    if signature.get("city", UNKNOWN) == UNKNOWN:
+        return None
+    candidates: List[DecisionCache] = (
+        db.query(DecisionCache)
+        .filter(
+            DecisionCache.sig_country == signature.get("country"),
+            DecisionCache.sig_state == signature.get("state"),
+            DecisionCache.sig_city == signature.get("city"),
+        )
+        .order_by(DecisionCache.created_at.desc())
+        .limit(NEAREST_CANDIDATE_LIMIT)
+        .all()
+    )
+    best, best_distance = None, NEAREST_MAX_DISTANCE + 1
+    for candidate in candidates:  # newest first: ties keep the most recent
+        distance = signature_distance(signature, _entry_signature(candidate))
+        if distance < best_distance:
+            best, best_distance = candidate, distance
+    return best
+
+
 def lookup_decision_cache(
     db: Session,
     *,
     opportunity: Optional[Opportunity],
     context: Optional[Dict[str, Any]] = None,
     notice_id: Optional[str] = None,
-) -> Tuple[str, Dict[str, str], Optional[DecisionCache]]:
+    nearest: bool = True,
+) -> Tuple[str, Dict[str, str], Optional[DecisionCache], Optional[str]]:
+    """
+    Returns ``(key_hash, signature, entry, match_type)``; ``match_type`` is
+    "exact", "notice", "nearest" or None on a miss.
+    """
     event_req = None
     if context and context.get("event_requirements"):
         event_req = context.get("event_requirements")
@@ -205,22 +278,19 @@ def lookup_decision_cache(
 
     entry = get_decision_cache(db, key_hash)
     if entry:
-        return key_hash, signature, entry
+        return key_hash, signature, entry, "exact"
 
     if notice_id:
-        candidate = (
-            db.query(DecisionCache)
-            .order_by(DecisionCache.created_at.desc())
-            .limit(50)
-            .all()
-        )
-        for item in candidate:
-            meta = item.extra_metadata or {}
-            notice_ids = meta.get("notice_ids") or []
-            if notice_id in notice_ids:
-                return key_hash, signature, item
+        entry = _find_by_notice(db, notice_id)
+        if entry:
+            return key_hash, signature, entry, "notice"
+
+    if nearest:
+        entry = find_nearest_decision(db, signature)
+        if entry:
+            return key_hash, signature, entry, "nearest"
 
-    return key_hash, signature, None
+    return key_hash, signature, None, None
 
 
 def persist_decision_cache(
@@ -262,4 +332,19 @@ def persist_decision_cache(
         recommended_hotels=recommended_hotels,
         metadata=metadata,
     )
+    _index_entry(db, entry, metadata.get("signature") or signature, metadata.get("notice_ids") or [])
     return entry
+
+
+def _index_entry(db: Session, entry: DecisionCache, signature: Dict[str, str], notice_ids: List[str]) -> None:
+    """Keep the signature columns and the notice mapping in line with the metadata."""
+    for field, value in signature.items():
+        if hasattr(DecisionCache, f"sig_{field}"):
+            setattr(entry, f"sig_{field}", value)
+    if notice_ids:
+        db.execute(
+            insert(DecisionCacheNotice)
+            .values([{"notice_id": notice, "decision_cache_id": entry.id} for notice in notice_ids])
+            .on_conflict_do_nothing(constraint="uq_decision_cache_notice")
+        )
+    db.commit()
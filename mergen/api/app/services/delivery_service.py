@@ -0,0 +1,321 @@
+"""
+MergenLite — Artifact & Delivery Stage
+=======================================
+Renders the report PDFs and sends the notification mail after a pipeline run.
+
+``run_pipeline_job`` marks the analysis result ``completed`` as soon as the
+result JSON is stored and hands the rest to ``dispatch_delivery``:
+
+  1. PDF report (``analysis_<id>.pdf`` / ``hotel_suggestions_<id>.pdf``),
+     registered in the artifact catalog and saved on ``result.pdf_path``
+  2. notification mail with the PDF / JSON outputs of the result and of its
+     companion run (latest SOW ↔ hotel match of the same opportunity)
+
+The job runs on the ``delivery`` RQ queue (see ``job_queue``); without the
+queue it runs on a small in-process thread pool (``DELIVERY_WORKERS``) so
+rendering and SMTP never block the analysis workers. Mail goes through the
+pooled SMTP connections of ``mail_service`` with its own retries; if a
+transient failure (dropped connection, 4xx) outlasts them the job raises
+``DeliveryError`` (a ``RetryableJobError``) so the queue, or the in-process
+fallback, retries it. Permanent rejections (authentication, refused
+recipients, 5xx) are logged and end the job without a retry. A retried job
+reuses an existing PDF instead of rendering it again.
+
+The job publishes ``{"type": "artifact", "kind": "pdf", "path"}`` when the
+PDF is ready and ends the result's progress stream with ``{"type": "end"}``
+once no retry is coming.
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db import SessionLocal
+from ..models import AIAnalysisResult, EmailLog, Opportunity
+from .artifact_catalog import register_artifact
+from .job_queue import RetryableJobError, dispatch, will_retry
+from .progress_bus import publish_analysis_event
+
+logger = logging.getLogger(__name__)
+
+SOW_ANALYSIS_TYPES = ("sow_draft", "sow")
+NOTIFY_ANALYSIS_TYPES = SOW_ANALYSIS_TYPES + ("hotel_match",)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class DeliveryError(RetryableJobError):
+    """Raised when the notification could not be sent (lets the queue retry)."""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.delivery_workers),
+                thread_name_prefix="delivery",
+            )
+        return _executor
+
+
+def dispatch_delivery(analysis_result_id: int, agent_run_id: Optional[int] = None) -> Dict[str, Any]:
+    """Queue PDF rendering + notification mail for a completed analysis result."""
+    return dispatch(
+        "delivery",
+        run_delivery_job,
+        analysis_result_id,
+        agent_run_id,
+        executor=_get_executor(),
+        job_id=f"delivery-{analysis_result_id}",
+    )
+
+
+def _output_path(path_str: Optional[str]) -> Optional[Path]:
+    """Resolve a stored output path (paths written by another container may be relative to /data)."""
+    if not path_str:
+        return None
+    from .pipeline_service import DATA_DIR
+
+    for candidate in (Path(path_str), Path("/data") / path_str.lstrip("/"), DATA_DIR / path_str.lstrip("/")):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _result_json(result: AIAnalysisResult) -> Dict[str, Any]:
+    data = result.result_json
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            data = {}
+    return dict(data) if isinstance(data, dict) else {}
+
+
+def _latest_result(db: Session, opportunity_id: int, analysis_types) -> Optional[AIAnalysisResult]:
+    return (
+        db.query(AIAnalysisResult)
+        .filter(
+            AIAnalysisResult.opportunity_id == opportunity_id,
+            AIAnalysisResult.analysis_type.in_(list(analysis_types)),
+            AIAnalysisResult.status == "completed",
+        )
+        .order_by(AIAnalysisResult.created_at.desc())
+        .first()
+    )
+
+
+def _output_attachments(result: AIAnalysisResult) -> List[Dict[str, str]]:
+    """PDF / JSON outputs of a result as mail attachments (missing files are skipped)."""
+    if result.analysis_type == "hotel_match":
+        pdf_name, json_name = f"hotel_suggestions_{result.id}.pdf", f"hotel_match_{result.id}.json"
+    else:
+        pdf_name, json_name = f"sow_analysis_{result.id}.pdf", f"sow_analysis_{result.id}.json"
+
+    attachments = []
+    for path_str, filename, mime_type in (
+        (result.pdf_path, pdf_name, "application/pdf"),
+        (result.json_path, json_name, "application/json"),
+    ):
+        path = _output_path(path_str)
+        if path is not None:
+            attachments.append({"path": str(path), "filename": filename, "mime_type": mime_type})
+    return attachments
+
+
+def _render_report(db: Session, result: AIAnalysisResult, opportunity: Opportunity, agent_run_id: Optional[int]) -> None:
+    """Render the result's PDF report unless a previous attempt already did."""
+    from .pdf_generator import generate_analysis_pdf, generate_hotel_match_pdf
+    from .pipeline_service import DATA_DIR, _log_analysis
+
+    existing = _output_path(result.pdf_path)
+    if existing is not None:
+        logger.info(f"[Delivery {result.id}] PDF already generated: {existing}")
+        return
+
+    notice_slug = opportunity.notice_id or f"opp-{opportunity.id}"
+    output_dir = DATA_DIR / "opportunities" / notice_slug / "outputs"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    opp_dict = {
+        "id": opportunity.id,
+        "notice_id": opportunity.notice_id,
+        "title": opportunity.title,
+        "agency": opportunity.agency,
+    }
+    summary = _result_json(result)
+
+    if result.analysis_type == "hotel_match":
+        # Separate PDF with "Hotel Suggestions" title
+        pdf_path = output_dir / f"hotel_suggestions_{result.id}.pdf"
+        generated = generate_hotel_match_pdf(pdf_path, summary, opp_dict)
+        message = f"Hotel match PDF generated: {pdf_path}"
+    else:
+        pdf_path = output_dir / f"analysis_{result.id}.pdf"
+        generated = generate_analysis_pdf(pdf_path, summary, opp_dict)
+        message = f"PDF generated: {pdf_path}"
+
+    if not generated:
+        _log_analysis(db, result.id, "WARNING", f"PDF generation failed: {pdf_path}", step="generate", agent_run_id=agent_run_id)
+        return
+
+    result.pdf_path = str(pdf_path)
+    register_artifact(db, pdf_path, opportunity.id, result.id, notice_slug)
+    db.commit()
+    _log_analysis(db, result.id, "INFO", message, step="generate", agent_run_id=agent_run_id)
+    publish_analysis_event(result.id, {"type": "artifact", "kind": "pdf", "path": str(pdf_path)})
+
+
+def _send_notification(db: Session, result: AIAnalysisResult, opportunity: Opportunity, agent_run_id: Optional[int]) -> None:
+    """
+    Mail the result to PIPELINE_NOTIFICATION_EMAIL.
+    SOW runs attach the latest hotel match outputs and hotels, hotel match runs
+    the latest SOW outputs and SOW analysis. Raises DeliveryError if sending fails.
+    """
+    from .mail_service import PermanentSendError, build_mail_package, send_email_via_smtp
+    from .pipeline_service import DATA_DIR, _log_analysis
+
+    if not (settings.pipeline_notification_email and settings.smtp_host and settings.smtp_username):
+        logger.info(f"[Delivery {result.id}] Email notification not configured (missing SMTP settings or notification email)")
+        return
+
+    _log_analysis(
+        db,
+        result.id,
+        "INFO",
+        f"Sending email notification to {settings.pipeline_notification_email}",
+        step="email",
+        agent_run_id=agent_run_id,
+    )
+
+    analysis_json = _result_json(result)
+    if result.analysis_type == "hotel_match":
+        companion = _latest_result(db, opportunity.id, SOW_ANALYSIS_TYPES)
+        if companion is not None:
+            analysis_json["sow_analysis"] = _result_json(companion).get("sow_analysis", {})
+    else:
+        companion = _latest_result(db, opportunity.id, ("hotel_match",))
+        if companion is not None:
+            hotel_data = _result_json(companion)
+            # Add hotels array to analysis_json for email body
+            if "hotels" in hotel_data:
+                analysis_json["hotels"] = hotel_data["hotels"]
+            elif "hotel_match" in hotel_data:
+                analysis_json["hotel_match"] = hotel_data["hotel_match"]
+
+    notice_id = opportunity.notice_id or str(opportunity.id)
+    mail_package = build_mail_package(
+        opportunity_code=notice_id,
+        folder_path=str(DATA_DIR / "opportunities" / notice_id / "outputs"),
+        to_email=settings.pipeline_notification_email,
+        from_email=settings.smtp_from_email,
+        analysis_result_json=analysis_json,
+    )
+    attachments = mail_package.get("attachments", [])
+    attachments.extend(_output_attachments(result))
+    if companion is not None:
+        attachments.extend(_output_attachments(companion))
+    mail_package["attachments"] = attachments
+    logger.info(f"[Delivery {result.id}] Email will include {len(attachments)} attachments: {[att['filename'] for att in attachments]}")
+
+    smtp_config = {
+        "host": settings.smtp_host,
+        "port": settings.smtp_port,
+        "username": settings.smtp_username,
+        "password": settings.smtp_password,
+        "use_tls": settings.smtp_use_tls,
+    }
+    try:
+        sent = send_email_via_smtp(mail_package, smtp_config)
+    except PermanentSendError as e:
+        # Retrying cannot fix credentials or addresses: log it and finish the job
+        _log_analysis(
+            db,
+            result.id,
+            "ERROR",
+            f"Email notification to {settings.pipeline_notification_email} was rejected: {e}",
+            step="email",
+            agent_run_id=agent_run_id,
+        )
+        return
+    if not sent:
+        _log_analysis(
+            db,
+            result.id,
+            "WARNING",
+            f"Failed to send email notification to {settings.pipeline_notification_email}",
+            step="email",
+            agent_run_id=agent_run_id,
+        )
+        raise DeliveryError(f"Email notification to {settings.pipeline_notification_email} failed")
+
+    _log_analysis(
+        db,
+        result.id,
+        "INFO",
+        f"Email notification sent successfully to {settings.pipeline_notification_email}",
+        step="email",
+        agent_run_id=agent_run_id,
+    )
+
+    # Email'i veritabanına logla (gönderildi; loglama hatası gönderimi etkilemez)
+    try:
+        text_body = mail_package.get("text_body", "")
+        email_log = EmailLog(
+            opportunity_id=opportunity.id,
+            direction="outgoing",
+            subject=mail_package.get("subject", "SOW Analysis Report"),
+            from_address=mail_package.get("from", settings.smtp_from_email),
+            to_address=mail_package.get("to", settings.pipeline_notification_email),
+            message_id=None,
+            raw_body=text_body,
+            parsed_summary=text_body[:200] + "..." if len(text_body) > 200 else text_body,
+            related_agent_run_id=agent_run_id,
+        )
+        db.add(email_log)
+        db.commit()
+        _log_analysis(db, result.id, "INFO", f"Email kaydedildi: EmailLog ID {email_log.id}", step="email", agent_run_id=agent_run_id)
+    except Exception as log_error:
+        db.rollback()
+        logger.error(f"[Delivery {result.id}] Email logging to database failed: {log_error}", exc_info=True)
+
+
+def run_delivery_job(analysis_result_id: int, agent_run_id: Optional[int] = None) -> None:
+    """Render the PDF report and send the notification for a completed result."""
+    from .pipeline_service import _flush_job_logs
+
+    logger.info(f"[Delivery {analysis_result_id}] Delivery job started")
+    session = SessionLocal()
+    retrying = False
+    try:
+        result = session.query(AIAnalysisResult).filter(AIAnalysisResult.id == analysis_result_id).first()
+        if not result or result.status != "completed":
+            logger.warning(f"[Delivery {analysis_result_id}] Result missing or not completed, nothing to deliver")
+            return
+        opportunity = session.query(Opportunity).filter(Opportunity.id == result.opportunity_id).first()
+        if not opportunity:
+            logger.error(f"[Delivery {analysis_result_id}] Opportunity not found")
+            return
+
+        _render_report(session, result, opportunity, agent_run_id)
+        if result.analysis_type in NOTIFY_ANALYSIS_TYPES:
+            _send_notification(session, result, opportunity, agent_run_id)
+    except Exception as exc:
+        if will_retry(exc):
+            retrying = True
+            logger.warning(f"[Delivery {analysis_result_id}] Delivery failed, job will be retried: {exc}")
+            raise
+        logger.exception(f"[Delivery {analysis_result_id}] Delivery failed: {exc}")
+    finally:
+        session.close()
+        _flush_job_logs(analysis_result_id, agent_run_id)
+        # The stream stays open while the queue still has a retry to run
+        if not retrying:
+            publish_analysis_event(analysis_result_id, {"type": "end"})
@@ -0,0 +1,114 @@
+"""
+Download Runner
+===============
+Sync → async bridge for attachment downloads.
+
+A single long-lived event loop runs in a daemon thread and owns one shared
+``httpx.AsyncClient``. Synchronous callers (pipeline threads, RQ workers)
+submit a download job and get a ``concurrent.futures.Future`` back:
+
+    future = submit_download(opportunity_id)
+    result = future.result(timeout=settings.attachment_download_timeout)
+
+Each job opens its own SQLAlchemy session inside the loop thread, so no
+session ever crosses threads, and no caller pays for creating a loop or a
+connection pool per download.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+import httpx
+
+from ..config import settings
+from ..db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadRunner:
+    """Background event loop that executes attachment download jobs."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, daemon=True, name="download-runner")
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            self._client = None
+            logger.info("[download_runner] Download loop started")
+            return loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily on the loop thread so it binds to this loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=120.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=max(1, settings.attachment_download_concurrency) * 4),
+            )
+        return self._client
+
+    async def _download(self, opportunity_id: int, job_id: Optional[str]) -> Dict[str, Any]:
+        from .attachment_service import download_attachments_for_opportunity
+
+        db = SessionLocal()
+        try:
+            return await download_attachments_for_opportunity(
+                db, opportunity_id, job_id=job_id, client=self._get_client()
+            )
+        finally:
+            db.close()
+
+    def submit(self, opportunity_id: int, job_id: Optional[str] = None) -> Future:
+        """Schedule a download job; returns a future resolving to its result dict."""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._download(opportunity_id, job_id), loop)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is None:
+            return
+        if client is not None and not client.is_closed:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout)
+            except Exception as exc:
+                logger.warning(f"[download_runner] Client close failed: {exc}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        loop.close()
+        logger.info("[download_runner] Download loop stopped")
+
+
+_runner = DownloadRunner()
+
+
+def submit_download(opportunity_id: int, job_id: Optional[str] = None) -> Future:
+    """Submit an attachment download job to the shared download loop."""
+    return _runner.submit(opportunity_id, job_id)
+
+
+def shutdown_download_runner() -> None:
+    _runner.shutdown()
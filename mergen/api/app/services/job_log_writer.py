@@ -0,0 +1,215 @@
+"""
+Job Log Writer
+==============
+Buffered writer for the per-job log tables (AnalysisLog, DownloadLog,
+SyncLog) and pipeline AgentMessage rows.
+
+The ``_log_*`` helpers used to insert and commit one row per message, so hot
+loops (per attachment, per SAM record) paid a commit per line. Rows are now
+buffered per job and inserted with a single statement when:
+
+  - the step changes (step boundary)
+  - the job's buffer reaches ``JOB_LOG_BATCH_SIZE`` rows
+  - the oldest buffered row is older than ``JOB_LOG_FLUSH_INTERVAL`` seconds
+    (checked on write and by a background flusher thread)
+  - an ERROR row is written
+  - the job calls ``flush(job_key)`` on completion / failure (``finally``)
+
+Flushes use their own short-lived session: log rows never depend on, nor
+commit, the caller's transaction (the job row itself is always committed
+before its first log line). If a batch insert fails, its rows are retried
+one by one; rows that still fail are logged with their message and dropped.
+Each row carries its own timestamp, so batching does not collapse
+timestamps. Anything still buffered is flushed at exit.
+
+Step boundaries and ERROR rows flush at once, so the interval only delays
+the INFO lines within a step (what the live log stream shows late).
+"""
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+
+from ..config import settings
+from ..db import SessionLocal
+from ..models import AgentMessage, AnalysisLog, DownloadLog, SyncLog
+from .progress_bus import publish_analysis_event
+
+logger = logging.getLogger(__name__)
+
+_writers: List["JobLogWriter"] = []
+_flusher: Optional[threading.Thread] = None
+_flusher_lock = threading.Lock()
+
+
+class JobLogWriter:
+    """Per-job row buffer for one log model."""
+
+    def __init__(
+        self,
+        model,
+        key_column: str,
+        timestamp_column: str = "timestamp",
+        on_flush: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ):
+        self.model = model
+        self.key_column = key_column
+        self.timestamp_column = timestamp_column
+        # Called with the written rows (including their new ``id``) after commit
+        self.on_flush = on_flush
+        self._buffers: Dict[Any, List[Dict[str, Any]]] = {}
+        self._first_at: Dict[Any, float] = {}
+        self._lock = threading.Lock()
+        # Serializes inserts so ids of one job are assigned in write order
+        self._flush_lock = threading.Lock()
+        _writers.append(self)
+
+    def write(self, key: Any, **row: Any) -> None:
+        """Buffer one row for job ``key``. Rows of one writer must share the same columns."""
+        row[self.key_column] = key
+        row.setdefault(self.timestamp_column, datetime.now(timezone.utc))
+        with self._lock:
+            buffer = self._buffers.get(key)
+            step_changed = bool(buffer) and buffer[-1].get("step") != row.get("step")
+            if buffer is None:
+                buffer = self._buffers[key] = []
+                self._first_at[key] = time.monotonic()
+            buffer.append(row)
+            flush_now = (
+                step_changed
+                or len(buffer) >= settings.job_log_batch_size
+                or row.get("level") == "ERROR"
+                or time.monotonic() - self._first_at[key] >= settings.job_log_flush_interval
+            )
+        if flush_now:
+            self.flush(key)
+        else:
+            _ensure_flusher()
+
+    def flush(self, key: Any = None) -> int:
+        """Write the buffered rows of one job (or of every job) now. Returns rows written."""
+        return self._flush_keys(None if key is None else [key])
+
+    def flush_due(self) -> int:
+        """Write the jobs whose oldest buffered row exceeded the flush interval."""
+        now = time.monotonic()
+        with self._lock:
+            due = [k for k, first in self._first_at.items() if now - first >= settings.job_log_flush_interval]
+        return self._flush_keys(due) if due else 0
+
+    def pending(self, key: Any) -> int:
+        with self._lock:
+            return len(self._buffers.get(key, ()))
+
+    def _flush_keys(self, keys: Optional[Iterable[Any]]) -> int:
+        with self._flush_lock:
+            with self._lock:
+                keys = list(self._buffers) if keys is None else list(keys)
+                rows: List[Dict[str, Any]] = []
+                for key in keys:
+                    rows.extend(self._buffers.pop(key, ()))
+                    self._first_at.pop(key, None)
+            if not rows:
+                return 0
+            return self._insert(rows)
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> int:
+        table = self.model.__tablename__
+        try:
+            ids = self._execute(rows)
+        except Exception as exc:
+            # One bad row (or a dropped connection) must not take the whole batch with it
+            logger.warning(f"[job_log] Batch insert of {len(rows)} {table} rows failed, retrying row by row: {exc}")
+            written: List[Dict[str, Any]] = []
+            ids = []
+            for row in rows:
+                try:
+                    ids.extend(self._execute([row]) or ())
+                    written.append(row)
+                except Exception as row_exc:
+                    logger.error(
+                        f"[job_log] Lost {table} row {self.key_column}={row.get(self.key_column)} "
+                        f"at {row.get(self.timestamp_column)}: {str(row.get('message', ''))[:200]!r} ({row_exc})"
+                    )
+            if len(written) < len(rows):
+                logger.error(f"[job_log] Lost {len(rows) - len(written)} of {len(rows)} {table} rows")
+            rows = written
+
+        if self.on_flush is not None and rows:
+            for row, row_id in zip(rows, ids):
+                row["id"] = row_id
+            try:
+                self.on_flush(rows)
+            except Exception as exc:
+                logger.warning(f"[job_log] on_flush failed for {table}: {exc}")
+        return len(rows)
+
+    def _execute(self, rows: List[Dict[str, Any]]) -> Optional[List[Any]]:
+        """Insert and commit ``rows`` in one statement; returns their ids when ``on_flush`` needs them."""
+        db = SessionLocal()
+        try:
+            stmt = insert(self.model)
+            if self.on_flush is not None:
+                stmt = stmt.returning(self.model.id, sort_by_parameter_order=True)
+            result = db.execute(stmt, rows)
+            ids = result.scalars().all() if self.on_flush is not None else None
+            db.commit()
+            return ids
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(max(0.05, settings.job_log_flush_interval / 2))
+        for writer in list(_writers):
+            try:
+                writer.flush_due()
+            except Exception as exc:
+                logger.warning(f"[job_log] Background flush failed: {exc}")
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _flusher_lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        _flusher = threading.Thread(target=_flush_loop, daemon=True, name="job-log-flusher")
+        _flusher.start()
+
+
+def flush_all() -> None:
+    """Write every buffered row of every writer."""
+    for writer in list(_writers):
+        writer.flush()
+
+
+atexit.register(flush_all)
+
+
+def _publish_analysis_logs(rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        publish_analysis_event(row["analysis_result_id"], {
+            "type": "log",
+            "id": row["id"],
+            "level": row["level"],
+            "message": row["message"],
+            "step": row["step"],
+            "timestamp": row["timestamp"].isoformat(),
+        })
+
+
+analysis_log_writer = JobLogWriter(AnalysisLog, "analysis_result_id", on_flush=_publish_analysis_logs)
+agent_message_writer = JobLogWriter(AgentMessage, "agent_run_id", timestamp_column="created_at")
+download_log_writer = JobLogWriter(DownloadLog, "job_id")
+sync_log_writer = JobLogWriter(SyncLog, "job_id")
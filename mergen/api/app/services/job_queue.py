@@ -0,0 +1,333 @@
+"""
+MergenLite — Job Dispatch Layer
+================================
+Routes heavy pipeline work onto RQ queues served by ``mergen/worker/worker.py``
+so the API process only creates job records and returns.
+
+Queues (one per stage, each with its own worker count):
+  extraction  : attachment downloads / document parsing
+  analysis    : SOW analysis (document text → LLM)
+  hotel_match : hotel matching (Amadeus + agent)
+  delivery    : PDF generation and mail delivery
+
+Every queue has a retry policy with exponential backoff. ``priority="high"``
+puts the job at the front of its queue.
+
+When ``JOB_QUEUE_ENABLED`` is false or Redis is unreachable, ``dispatch``
+falls back to FastAPI ``BackgroundTasks``, a caller-provided executor or a
+daemon thread, so local development keeps working without a worker. The
+fallback uses the same retry counts and backoff as the queue; a retry is
+scheduled on a timer, so no worker thread sleeps.
+
+Retries: a job is retried only when it raises. Jobs that record their own
+status call ``will_retry(exc)`` in their error handler. It is True for
+transient failures (connection / timeout / rate limit errors,
+``RetryableJobError``) while the current attempt still has retries left. In
+that case the job re-raises and must not publish a terminal status. Other
+failures are recorded as final and swallowed.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from redis import Redis  # type: ignore
+    from rq import Queue, Retry  # type: ignore
+except Exception:  # pragma: no cover
+    Redis = None
+    Queue = None
+    Retry = None
+
+
+class RetryableJobError(RuntimeError):
+    """Raised by a job to have the attempt retried (see ``is_transient_error``)."""
+
+
+# Exception class names (anywhere in the MRO) treated as transient:
+# DB connection drops, HTTP transport errors, LLM rate limits / outages
+_TRANSIENT_ERROR_NAMES = frozenset({
+    "OperationalError",
+    "DisconnectionError",
+    "ConnectError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "WriteTimeout",
+    "PoolTimeout",
+    "RemoteProtocolError",
+    "APIConnectionError",
+    "APITimeoutError",
+    "RateLimitError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "SMTPServerDisconnected",
+})
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for failures worth retrying later (network, timeouts, rate limits)."""
+    if isinstance(exc, (RetryableJobError, ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+@dataclass(frozen=True)
+class QueueSpec:
+    """Static configuration for one stage queue."""
+
+    name: str
+    timeout: int          # seconds a single job may run
+    max_retries: int
+    backoff_base: int     # first retry delay in seconds; doubles per attempt
+    result_ttl: int = 86400
+
+
+QUEUE_SPECS: Dict[str, QueueSpec] = {
+    "extraction": QueueSpec("extraction", timeout=900, max_retries=3, backoff_base=15),
+    "analysis": QueueSpec("analysis", timeout=3600, max_retries=2, backoff_base=60),
+    "hotel_match": QueueSpec("hotel_match", timeout=1800, max_retries=2, backoff_base=60),
+    "delivery": QueueSpec("delivery", timeout=600, max_retries=5, backoff_base=30),
+}
+
+# analysis_type → queue name
+_ANALYSIS_QUEUE = {
+    "hotel_match": "hotel_match",
+}
+_DEFAULT_ANALYSIS_QUEUE = "analysis"
+
+_redis_conn = None
+_redis_lock = threading.Lock()
+
+# Retries left for the in-process (fallback) attempt running in this thread
+_attempt = threading.local()
+
+
+def _backoff_intervals(spec: QueueSpec) -> list:
+    return [spec.backoff_base * (2 ** attempt) for attempt in range(spec.max_retries)]
+
+
+def _current_rq_job():
+    try:
+        from rq import get_current_job  # type: ignore
+    except Exception:  # pragma: no cover
+        return None
+    try:
+        return get_current_job()
+    except Exception:
+        return None
+
+
+def retries_left() -> Optional[int]:
+    """
+    Retries left after the current attempt of the job running in this thread:
+    RQ's count inside a worker, the fallback's count in process, None outside
+    a dispatched job.
+    """
+    job = _current_rq_job()
+    if job is not None:
+        return int(getattr(job, "retries_left", None) or 0)
+    return getattr(_attempt, "retries_left", None)
+
+
+def will_retry(exc: BaseException) -> bool:
+    """True when ``exc`` is transient and the current job will be attempted again if it re-raises."""
+    return is_transient_error(exc) and bool(retries_left())
+
+
+def _get_connection():
+    """Return a live Redis connection, or None if the queue is unavailable."""
+    global _redis_conn
+    if not settings.job_queue_enabled or Redis is None or Queue is None:
+        return None
+    with _redis_lock:
+        if _redis_conn is not None:
+            return _redis_conn
+        try:
+            conn = Redis.from_url(settings.redis_url)
+            conn.ping()
+            _redis_conn = conn
+        except Exception as exc:
+            logger.warning("[job_queue] Redis unavailable (%s), using in-process execution", exc)
+            return None
+        return _redis_conn
+
+
+def get_queue(name: str):
+    """Return the RQ ``Queue`` for a stage, or None if queueing is disabled."""
+    if name not in QUEUE_SPECS:
+        raise ValueError(f"Unknown queue: {name}")
+    conn = _get_connection()
+    if conn is None:
+        return None
+    spec = QUEUE_SPECS[name]
+    return Queue(spec.name, connection=conn, default_timeout=spec.timeout)
+
+
+def parse_worker_concurrency(raw: Optional[str] = None, defaults: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    Parse ``WORKER_CONCURRENCY`` ("extraction=2,analysis=4") into a dict.
+    Unknown queue names are ignored; missing ones keep their count from
+    ``defaults`` (1 when not given), so an override can change one queue.
+    """
+    counts = {name: (defaults or {}).get(name, 1) for name in QUEUE_SPECS}
+    for part in (raw if raw is not None else settings.worker_concurrency).split(","):
+        if "=" not in part:
+            continue
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in counts:
+            continue
+        try:
+            counts[name] = max(0, int(value.strip()))
+        except ValueError:
+            logger.warning("[job_queue] Invalid worker count for %s: %r", name, value)
+    return counts
+
+
+def enqueue(
+    queue_name: str,
+    func: Callable[..., Any],
+    *args: Any,
+    priority: str = "normal",
+    job_id: Optional[str] = None,
+    **kwargs: Any,
+) -> Optional[str]:
+    """
+    Enqueue ``func(*args, **kwargs)`` on a stage queue.
+    Returns the RQ job id, or None if the queue is unavailable.
+    """
+    queue = get_queue(queue_name)
+    if queue is None:
+        return None
+    spec = QUEUE_SPECS[queue_name]
+    try:
+        job = queue.enqueue(
+            func,
+            *args,
+            kwargs=kwargs or None,
+            job_id=job_id,
+            job_timeout=spec.timeout,
+            result_ttl=spec.result_ttl,
+            retry=Retry(max=spec.max_retries, interval=_backoff_intervals(spec)),
+            at_front=priority == "high",
+        )
+    except Exception as exc:
+        logger.warning("[job_queue] Enqueue on %s failed (%s), using in-process execution", queue_name, exc)
+        return None
+    logger.info("[job_queue] Enqueued %s on %s (job %s, priority %s)", func.__name__, queue_name, job.id, priority)
+    return job.id
+
+
+def dispatch(
+    queue_name: str,
+    func: Callable[..., Any],
+    *args: Any,
+    background_tasks: Any = None,
+    executor: Any = None,
+    priority: str = "normal",
+    job_id: Optional[str] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Run ``func`` on the given queue, falling back to in-process execution.
+
+    The fallback uses ``background_tasks.add_task`` when a FastAPI
+    ``BackgroundTasks`` is passed, ``executor.submit`` when an executor
+    (e.g. a bounded ``ThreadPoolExecutor``) is passed, otherwise a daemon thread.
+    Returns ``{"mode": "queue"|"background"|"pool"|"thread", "job_id": ...}``.
+    """
+    queued_id = enqueue(queue_name, func, *args, priority=priority, job_id=job_id, **kwargs)
+    if queued_id:
+        return {"mode": "queue", "queue": queue_name, "job_id": queued_id}
+
+    spec = QUEUE_SPECS[queue_name]
+    intervals = _backoff_intervals(spec)
+
+    def _run(attempt: int = 0):
+        _attempt.retries_left = spec.max_retries - attempt
+        try:
+            func(*args, **kwargs)
+        except Exception as exc:
+            if attempt < spec.max_retries and is_transient_error(exc):
+                delay = intervals[attempt]
+                logger.warning(
+                    "[job_queue] In-process %s failed (%s), retry %d/%d in %ss",
+                    func.__name__, exc, attempt + 1, spec.max_retries, delay,
+                )
+                timer = threading.Timer(delay, _retry, args=(attempt + 1,))
+                timer.daemon = True
+                timer.start()
+            else:
+                logger.exception("[job_queue] In-process %s failed: %s", func.__name__, exc)
+        finally:
+            _attempt.retries_left = None
+
+    def _retry(attempt: int):
+        if executor is None:
+            _run(attempt)
+            return
+        try:
+            executor.submit(_run, attempt)
+        except RuntimeError as exc:  # executor shut down
+            logger.error("[job_queue] Could not retry %s: %s", func.__name__, exc)
+
+    if background_tasks is not None:
+        background_tasks.add_task(_run)
+        return {"mode": "background", "queue": queue_name, "job_id": job_id}
+
+    if executor is not None:
+        executor.submit(_run)
+        return {"mode": "pool", "queue": queue_name, "job_id": job_id}
+
+    threading.Thread(target=_run, daemon=True, name=f"{queue_name}-{func.__name__}").start()
+    return {"mode": "thread", "queue": queue_name, "job_id": job_id}
+
+
+def queue_for_analysis(analysis_type: Optional[str]) -> str:
+    """Pick the stage queue that should run a pipeline job of this type."""
+    return _ANALYSIS_QUEUE.get(analysis_type or "", _DEFAULT_ANALYSIS_QUEUE)
+
+
+def dispatch_pipeline_job(
+    analysis_result_id: int,
+    payload: Dict[str, Any],
+    *,
+    background_tasks: Any = None,
+    priority: str = "normal",
+) -> Dict[str, Any]:
+    """Dispatch ``run_pipeline_job`` to the queue matching its analysis type."""
+    from .pipeline_service import run_pipeline_job
+
+    return dispatch(
+        queue_for_analysis(payload.get("analysis_type")),
+        run_pipeline_job,
+        analysis_result_id,
+        payload,
+        background_tasks=background_tasks,
+        priority=priority,
+        job_id=f"pipeline-{analysis_result_id}",
+    )
+
+
+def queue_stats() -> Dict[str, Any]:
+    """Return queued/started/failed counts per stage queue (for health/debug)."""
+    stats: Dict[str, Any] = {"enabled": False, "queues": {}}
+    if _get_connection() is None:
+        return stats
+    stats["enabled"] = True
+    for name in QUEUE_SPECS:
+        queue = get_queue(name)
+        try:
+            stats["queues"][name] = {
+                "queued": queue.count,
+                "started": queue.started_job_registry.count,
+                "failed": queue.failed_job_registry.count,
+            }
+        except Exception as exc:
+            stats["queues"][name] = {"error": str(exc)}
+    return stats
@@ -0,0 +1,123 @@
+"""
+Prompt Registry
+===============
+Versioned prompt templates, parsed once and shared by every caller.
+
+Each prompt is registered under a name and a version. A template is parsed
+when it is registered: its placeholders are known up front, so a render with
+missing parameters fails with the prompt name instead of a bare ``KeyError``.
+Prompts without placeholders (agent system messages) are rendered once, at
+registration. Their text is identical on every run, which keeps the prefix of
+each chat stable for provider-side prompt caching.
+
+A prompt's ``fingerprint`` (short sha256 of its text) is meant for logs. It
+shows which prompt version produced an output. When you change a prompt's
+wording, register it under a new version.
+
+    register_prompt("reviewer.system", SYSTEM_TEXT, version="2", static=True)
+    register_prompt("proposal.pricing", "Total Cost: ${total_cost}")
+    render_prompt("proposal.pricing", total_cost="1200.00")
+"""
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from string import Formatter
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PromptNotFoundError(KeyError):
+    """Raised for an unknown prompt name / version."""
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A registered prompt version."""
+
+    name: str
+    version: str
+    template: str
+    # True: the template is the final text (braces are literal, nothing is substituted)
+    static: bool = False
+    fields: Tuple[str, ...] = field(default=(), init=False)
+    fingerprint: str = field(default="", init=False)
+    # Final text of prompts without placeholders (rendered once, at registration)
+    text: Optional[str] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        fields: Tuple[str, ...] = ()
+        if not self.static:
+            names = []
+            for _, field_name, _, _ in Formatter().parse(self.template):
+                if field_name is None:
+                    continue
+                if not field_name or not field_name.isidentifier():
+                    raise ValueError(f"Prompt '{self.name}' v{self.version}: placeholders must be plain names, got '{{{field_name}}}'")
+                if field_name not in names:
+                    names.append(field_name)
+            fields = tuple(names)
+        object.__setattr__(self, "fields", fields)
+        if self.static or not fields:
+            object.__setattr__(self, "text", self.template if self.static else self.template.format())
+        object.__setattr__(self, "fingerprint", hashlib.sha256(self.template.encode("utf-8")).hexdigest()[:12])
+
+    def render(self, **params) -> str:
+        if self.text is not None:
+            return self.text
+        missing = [name for name in self.fields if name not in params]
+        if missing:
+            raise KeyError(f"Prompt '{self.name}' v{self.version} is missing parameters: {', '.join(missing)}")
+        return self.template.format_map(params)
+
+
+class PromptRegistry:
+    """Thread-safe store of prompt templates by name and version."""
+
+    def __init__(self):
+        self._prompts: Dict[str, Dict[str, PromptTemplate]] = {}
+        self._latest: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, template: str, version: str = "1", static: bool = False) -> PromptTemplate:
+        """Register (or re-register with the same text) a prompt version; the last registered version is the default."""
+        prompt = PromptTemplate(name=name, version=str(version), template=template, static=static)
+        with self._lock:
+            versions = self._prompts.setdefault(name, {})
+            existing = versions.get(prompt.version)
+            if existing is not None and existing.template != template:
+                raise ValueError(f"Prompt '{name}' v{prompt.version} is already registered with different text; bump the version")
+            versions[prompt.version] = prompt
+            self._latest[name] = prompt.version
+        logger.debug(f"Prompt registered: {name} v{prompt.version} ({prompt.fingerprint})")
+        return prompt
+
+    def get(self, name: str, version: Optional[str] = None) -> PromptTemplate:
+        versions = self._prompts.get(name)
+        if not versions:
+            raise PromptNotFoundError(f"Unknown prompt '{name}'")
+        version = str(version) if version is not None else self._latest[name]
+        prompt = versions.get(version)
+        if prompt is None:
+            raise PromptNotFoundError(f"Unknown prompt version '{name}' v{version}")
+        return prompt
+
+    def render(self, name: str, version: Optional[str] = None, /, **params) -> str:
+        """Render a prompt (name and version are positional so any placeholder name can be passed)."""
+        return self.get(name, version).render(**params)
+
+
+prompt_registry = PromptRegistry()
+
+
+def register_prompt(name: str, template: str, version: str = "1", static: bool = False) -> PromptTemplate:
+    return prompt_registry.register(name, template, version=version, static=static)
+
+
+def get_prompt(name: str, version: Optional[str] = None) -> PromptTemplate:
+    return prompt_registry.get(name, version)
+
+
+def render_prompt(name: str, version: Optional[str] = None, /, **params) -> str:
+    return prompt_registry.render(name, version, **params)
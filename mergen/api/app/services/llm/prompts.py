@@ -1,12 +1,18 @@
+"""
+LLM prompt templates.
+
+The templates are registered in the prompt registry (``prompt_registry``) once,
+at import, under a version. The ``get_*_prompt`` helpers only build the
+variable parts and render the registered template. Bump a prompt's version
+when you change its text.
+"""
 from typing import Dict, Any, List
 from ...schemas import Requirement, Evidence
+from .prompt_registry import register_prompt, render_prompt
 
+PROMPT_VERSION = "1"
 
-def get_extraction_prompt(text: str, document_type: str) -> str:
-    """Get prompt for extracting structured data from document"""
-    
-    if document_type == "rfq":
-        return f"""
+register_prompt("extraction.rfq", """
         Analyze the following RFQ document and extract requirements in JSON format.
         
         Document text:
@@ -36,10 +42,9 @@ def get_extraction_prompt(text: str, document_type: str) -> str:
             "location": "Orlando, FL",
             "per_diem_limit": 140.0
         }}
-        """
-    
-    elif document_type == "facility":
-        return f"""
+        """, version=PROMPT_VERSION)
+
+register_prompt("extraction.facility", """
         Analyze the following facility document and extract features in JSON format.
         
         Document text:
@@ -75,10 +80,9 @@ def get_extraction_prompt(text: str, document_type: str) -> str:
             }},
             "av_equipment": ["projector", "microphone", "screen"]
         }}
-        """
-    
-    elif document_type == "past_performance":
-        return f"""
+        """, version=PROMPT_VERSION)
+
+register_prompt("extraction.past_performance", """
         Analyze the following past performance document and extract project information.
         
         Document text:
@@ -113,36 +117,22 @@ def get_extraction_prompt(text: str, document_type: str) -> str:
             }},
             "scope_keywords": ["conference", "seminar", "meeting"]
         }}
-        """
-    
-    else:
-        return f"""
+        """, version=PROMPT_VERSION)
+
+register_prompt("extraction.generic", """
         Analyze the following document and extract relevant information.
         
         Document text:
         {text}
         
         Extract key information and return as JSON.
-        """
-
+        """, version=PROMPT_VERSION)
 
-def get_technical_approach_prompt(
-    requirement: Requirement,
-    evidence: List[Evidence],
-    facility_features: List[Dict[str, Any]],
-    past_performance: List[Dict[str, Any]]
-) -> str:
-    """Get prompt for generating technical approach section"""
-    
-    evidence_text = "\n".join([f"- {e.snippet}" for e in evidence])
-    facility_text = "\n".join([f"- {f['name']}: {f['value']}" for f in facility_features])
-    past_perf_text = "\n".join([f"- {p['title']}: {p['scope']}" for p in past_performance])
-    
-    return f"""
+register_prompt("proposal.technical_approach", """
     Write a technical approach section for the following requirement:
     
-    Requirement: {requirement.text}
-    Category: {requirement.category}
+    Requirement: {requirement_text}
+    Category: {category}
     
     Evidence found:
     {evidence_text}
@@ -161,33 +151,24 @@ def get_technical_approach_prompt(
     5. Is 2-3 paragraphs long
     
     Use a professional, confident tone suitable for a government proposal.
-    """
+    """, version=PROMPT_VERSION)
 
-
-def get_executive_summary_prompt(
-    rfq_title: str,
-    compliance_matrix: Dict[str, Any],
-    key_risks: List[str],
-    mitigation_strategies: List[str]
-) -> str:
-    """Get prompt for generating executive summary"""
-    
-    return f"""
+register_prompt("proposal.executive_summary", """
     Write an executive summary for a government proposal with the following information:
     
     RFQ Title: {rfq_title}
     
     Compliance Status:
-    - Total Requirements: {compliance_matrix.get('total_requirements', 0)}
-    - Met Requirements: {compliance_matrix.get('met_requirements', 0)}
-    - Gap Requirements: {compliance_matrix.get('gap_requirements', 0)}
-    - Overall Risk: {compliance_matrix.get('overall_risk', 'unknown')}
+    - Total Requirements: {total_requirements}
+    - Met Requirements: {met_requirements}
+    - Gap Requirements: {gap_requirements}
+    - Overall Risk: {overall_risk}
     
     Key Risks:
-    {chr(10).join([f"- {risk}" for risk in key_risks])}
+    {risks_text}
     
     Mitigation Strategies:
-    {chr(10).join([f"- {strategy}" for strategy in mitigation_strategies])}
+    {strategies_text}
     
     Write a compelling executive summary that:
     1. Highlights our understanding of the requirements
@@ -197,21 +178,9 @@ def get_executive_summary_prompt(
     5. Is 3-4 paragraphs long
     
     Use a professional, confident tone suitable for government contracting.
-    """
-
+    """, version=PROMPT_VERSION)
 
-def get_past_performance_prompt(
-    past_performance: List[Dict[str, Any]],
-    requirement_text: str
-) -> str:
-    """Get prompt for generating past performance section"""
-    
-    perf_text = "\n".join([
-        f"- {p['title']} for {p['client']} ({p['period']}): {p['scope']}"
-        for p in past_performance
-    ])
-    
-    return f"""
+register_prompt("proposal.past_performance", """
     Write a past performance section that demonstrates our capability for this requirement:
     
     Requirement: {requirement_text}
@@ -227,24 +196,9 @@ def get_past_performance_prompt(
     5. Is 2-3 paragraphs long
     
     Use a professional tone that emphasizes our track record of success.
-    """
+    """, version=PROMPT_VERSION)
 
-
-def get_pricing_summary_prompt(
-    pricing_items: List[Dict[str, Any]],
-    total_cost: float,
-    per_diem_compliance: bool
-) -> str:
-    """Get prompt for generating pricing summary"""
-    
-    items_text = "\n".join([
-        f"- {item['name']}: {item['qty']} {item['unit']} @ ${item['unit_price']:.2f} = ${item['total_price']:.2f}"
-        for item in pricing_items
-    ])
-    
-    compliance_text = "compliant with per-diem limits" if per_diem_compliance else "requires per-diem waiver"
-    
-    return f"""
+register_prompt("proposal.pricing_summary", """
     Write a pricing summary section with the following information:
     
     Pricing Items:
@@ -261,23 +215,16 @@ def get_pricing_summary_prompt(
     5. Is 2-3 paragraphs long
     
     Use a professional tone that emphasizes value and compliance.
-    """
+    """, version=PROMPT_VERSION)
 
-
-def get_compliance_matrix_prompt(
-    requirements: List[Requirement],
-    evidence: List[Evidence]
-) -> str:
-    """Get prompt for generating compliance matrix"""
-    
-    return f"""
+register_prompt("proposal.compliance_matrix", """
     Generate a compliance matrix for the following requirements:
     
     Requirements:
-    {chr(10).join([f"- {req.code}: {req.text}" for req in requirements])}
+    {requirements_text}
     
     Available Evidence:
-    {chr(10).join([f"- {ev.snippet}" for ev in evidence])}
+    {evidence_text}
     
     For each requirement, determine:
     1. Whether we meet the requirement (Yes/No/Partial)
@@ -286,4 +233,107 @@ def get_compliance_matrix_prompt(
     4. Any gaps or concerns
     
     Return as a structured format suitable for a compliance matrix table.
-    """
+    """, version=PROMPT_VERSION)
+
+
+_EXTRACTION_PROMPTS = {
+    "rfq": "extraction.rfq",
+    "facility": "extraction.facility",
+    "past_performance": "extraction.past_performance",
+}
+
+
+def get_extraction_prompt(text: str, document_type: str) -> str:
+    """Get prompt for extracting structured data from document"""
+    return render_prompt(_EXTRACTION_PROMPTS.get(document_type, "extraction.generic"), text=text)
+
+
+def get_technical_approach_prompt(
+    requirement: Requirement,
+    evidence: List[Evidence],
+    facility_features: List[Dict[str, Any]],
+    past_performance: List[Dict[str, Any]]
+) -> str:
+    """Get prompt for generating technical approach section"""
+    
+    evidence_text = "\n".join([f"- {e.snippet}" for e in evidence])
+    facility_text = "\n".join([f"- {f['name']}: {f['value']}" for f in facility_features])
+    past_perf_text = "\n".join([f"- {p['title']}: {p['scope']}" for p in past_performance])
+    
+    return render_prompt(
+        "proposal.technical_approach",
+        requirement_text=requirement.text,
+        category=requirement.category,
+        evidence_text=evidence_text,
+        facility_text=facility_text,
+        past_perf_text=past_perf_text,
+    )
+
+
+def get_executive_summary_prompt(
+    rfq_title: str,
+    compliance_matrix: Dict[str, Any],
+    key_risks: List[str],
+    mitigation_strategies: List[str]
+) -> str:
+    """Get prompt for generating executive summary"""
+    
+    return render_prompt(
+        "proposal.executive_summary",
+        rfq_title=rfq_title,
+        total_requirements=compliance_matrix.get('total_requirements', 0),
+        met_requirements=compliance_matrix.get('met_requirements', 0),
+        gap_requirements=compliance_matrix.get('gap_requirements', 0),
+        overall_risk=compliance_matrix.get('overall_risk', 'unknown'),
+        risks_text="\n".join([f"- {risk}" for risk in key_risks]),
+        strategies_text="\n".join([f"- {strategy}" for strategy in mitigation_strategies]),
+    )
+
+
+def get_past_performance_prompt(
+    past_performance: List[Dict[str, Any]],
+    requirement_text: str
+) -> str:
+    """Get prompt for generating past performance section"""
+    
+    perf_text = "\n".join([
+        f"- {p['title']} for {p['client']} ({p['period']}): {p['scope']}"
+        for p in past_performance
+    ])
+    
+    return render_prompt("proposal.past_performance", requirement_text=requirement_text, perf_text=perf_text)
+
+
+def get_pricing_summary_prompt(
+    pricing_items: List[Dict[str, Any]],
+    total_cost: float,
+    per_diem_compliance: bool
+) -> str:
+    """Get prompt for generating pricing summary"""
+    
+    items_text = "\n".join([
+        f"- {item['name']}: {item['qty']} {item['unit']} @ ${item['unit_price']:.2f} = ${item['total_price']:.2f}"
+        for item in pricing_items
+    ])
+    
+    compliance_text = "compliant with per-diem limits" if per_diem_compliance else "requires per-diem waiver"
+    
+    return render_prompt(
+        "proposal.pricing_summary",
+        items_text=items_text,
+        total_cost=total_cost,
+        compliance_text=compliance_text,
+    )
+
+
+def get_compliance_matrix_prompt(
+    requirements: List[Requirement],
+    evidence: List[Evidence]
+) -> str:
+    """Get prompt for generating compliance matrix"""
+    
+    return render_prompt(
+        "proposal.compliance_matrix",
+        requirements_text="\n".join([f"- {req.code}: {req.text}" for req in requirements]),
+        evidence_text="\n".join([f"- {ev.snippet}" for ev in evidence]),
+    )
@@ -7,8 +7,10 @@ from typing import List, Dict, Any, Optional
 
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..db import SessionLocal
 from ..models import LLMCall
+from .redis_client import token_bucket_wait
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,10 @@ class LLMClientWrapper:
         self.client = client
 
     def chat_completion(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        # Provider quota is shared by every API / worker process
+        rate = settings.llm_rate_per_sec
+        if not token_bucket_wait(f"llm:{self.provider}", rate_per_sec=rate, burst=max(1, int(rate))):
+            logger.warning(f"LLM rate limit wait exceeded for {self.provider}; calling anyway")
         t0 = time.time()
         response = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
         latency = int((time.time() - t0) * 1000)
@@ -6,10 +6,20 @@ Analiz raporunu mail paketi olarak hazırlar
 """
 
 import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 from datetime import datetime
 
+from ..config import settings
+
 logger = logging.getLogger(__name__)
 
 def build_mail_package(
@@ -297,9 +307,221 @@ Generated by MergenLite on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
     logger.info(f"[OK] Mail package created for {opportunity_code}")
     return package
 
-def send_email_via_smtp(package: Dict[str, Any], smtp_config: Dict[str, Any]) -> bool:
+class SMTPConnectionPool:
+    """
+    Giriş yapılmış SMTP bağlantılarını mesajlar arasında yeniden kullanır.
+
+    Bağlantılar (host, port, kullanıcı, TLS) anahtarıyla tutulur; boşta en fazla
+    ``max_idle`` bağlantı ``idle_timeout`` saniye saklanır. Havuzdan alınan
+    bağlantı NOOP ile kontrol edilir, kopmuşsa yenisi açılır.
+    """
+
+    def __init__(self, max_idle: int = 2, idle_timeout: float = 60.0, timeout: float = 30.0):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle: Dict[tuple, List[tuple]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(smtp_config: Dict[str, Any]) -> tuple:
+        return (smtp_config['host'], int(smtp_config['port']), smtp_config.get('username'), bool(smtp_config.get('use_tls')))
+
+    def _connect(self, smtp_config: Dict[str, Any]) -> smtplib.SMTP:
+        logger.info(f"[Email] Connecting to SMTP server: {smtp_config.get('host')}:{smtp_config.get('port')} (TLS: {smtp_config.get('use_tls')})")
+        server = smtplib.SMTP(smtp_config['host'], smtp_config['port'], timeout=smtp_config.get('timeout', self.timeout))
+        try:
+            if smtp_config.get('use_tls'):
+                server.starttls()
+            if smtp_config.get('username'):
+                server.login(smtp_config['username'], smtp_config['password'])
+        except Exception:
+            self._close(server)
+            raise
+        logger.info(f"[Email] ✅ Logged in as {smtp_config.get('username')}")
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def _alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _acquire(self, key: tuple) -> Optional[smtplib.SMTP]:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    return None
+                server, released_at = idle.pop()
+            if now - released_at <= self.idle_timeout and self._alive(server):
+                return server
+            self._close(server)
+
+    def _release(self, key: tuple, server: smtplib.SMTP) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((server, time.monotonic()))
+                return
+        self._close(server)
+
+    @contextmanager
+    def connection(self, smtp_config: Dict[str, Any]) -> Iterator[smtplib.SMTP]:
+        """Havuzdan (veya yeni açılan) bağlantı; hata yoksa havuza geri döner."""
+        key = self._key(smtp_config)
+        server = self._acquire(key) or self._connect(smtp_config)
+        try:
+            yield server
+        except smtplib.SMTPRecipientsRefused:
+            # Alıcı reddi bağlantıyı bozmaz (SMTPResponseException alt sınıfı değil)
+            self._release(key, server)
+            raise
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, OSError) as exc:
+            # 5xx komut hataları bağlantıyı bozmaz; diğerlerinde bağlantıyı kapat
+            if isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500:
+                self._release(key, server)
+            else:
+                server.close()
+            raise
+        except BaseException:
+            server.close()
+            raise
+        self._release(key, server)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for server, _ in connections:
+                self._close(server)
+
+
+smtp_pool = SMTPConnectionPool(
+    max_idle=settings.smtp_pool_size,
+    idle_timeout=settings.smtp_idle_timeout,
+    timeout=settings.smtp_timeout,
+)
+
+
+class PermanentSendError(Exception):
+    """Mail kalıcı olarak reddedildi (kimlik doğrulama, alıcı/gönderen reddi, 5xx); tekrar denemek işe yaramaz."""
+
+
+def _is_transient_smtp_error(exc: Exception) -> bool:
+    """Bağlantı kopması / zaman aşımı / 4xx yanıtlar tekrar denenebilir."""
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPException):
+        return False
+    return isinstance(exc, OSError)
+
+
+def _build_mime_message(package: Dict[str, Any]) -> MIMEMultipart:
+    """Mail paketinden MIME mesajı oluştur (body + ekler)."""
+    # Mail oluştur
+    msg = MIMEMultipart('alternative')
+    msg['From'] = package['from']
+    msg['To'] = package['to']
+    msg['Subject'] = package['subject']
+    
+    if package['cc']:
+        msg['Cc'] = ', '.join(package['cc'])
+    
+    # Body ekle
+    msg.attach(MIMEText(package['text_body'], 'plain'))
+    msg.attach(MIMEText(package['html_body'], 'html'))
+    
+    # Ekler
+    attachments_list = package.get('attachments', [])
+    logger.info(f"[Email] Adding {len(attachments_list)} attachments")
+    
+    if not attachments_list:
+        logger.warning("[Email] No attachments in package!")
+    else:
+        for i, att in enumerate(attachments_list, 1):
+            att_path_str = att.get('path', '')
+            if not att_path_str:
+                logger.error(f"[Email] Attachment {i} has no path")
+                continue
+            
+            att_path = Path(att_path_str)
+            # Try absolute path first, then relative to /data
+            if not att_path.exists():
+                # Try alternative paths
+                alt_paths = [
+                    Path('/data') / att_path_str.lstrip('/'),
+                    Path('/app') / att_path_str.lstrip('/'),
+                    att_path,
+                ]
+                found = False
+                for alt_path in alt_paths:
+                    if alt_path.exists():
+                        att_path = alt_path
+                        found = True
+                        logger.info(f"[Email] Found attachment at alternative path: {alt_path}")
+                        break
+                
+                if not found:
+                    logger.error(f"[Email] Attachment {i} not found: {att_path_str} (tried: {[str(p) for p in alt_paths]})")
+                    continue
+            
+            try:
+                file_size = att_path.stat().st_size
+                filename = att.get('filename', att_path.name)
+                mime_type = att.get('mime_type', 'application/octet-stream')
+                
+                logger.info(f"[Email] Attachment {i}: {filename} ({file_size} bytes) from {att_path}")
+                
+                with open(att_path, 'rb') as f:
+                    # Use proper MIME type if available
+                    if mime_type.startswith('application/pdf'):
+                        part = MIMEBase('application', 'pdf')
+                    elif mime_type.startswith('application/json'):
+                        part = MIMEBase('application', 'json')
+                    else:
+                        part = MIMEBase('application', 'octet-stream')
+                    
+                    part.set_payload(f.read())
+                    encoders.encode_base64(part)
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename="{filename}"'
+                    )
+                    part.add_header('Content-Type', mime_type)
+                    msg.attach(part)
+                
+                logger.info(f"[Email] ✅ Attachment {i} ({filename}) added successfully")
+            except Exception as att_error:
+                logger.error(f"[Email] ❌ Error adding attachment {i} ({att.get('filename', 'unknown')}): {att_error}", exc_info=True)
+
+    return msg
+
+
+def send_email_via_smtp(
+    package: Dict[str, Any],
+    smtp_config: Dict[str, Any],
+    attempts: Optional[int] = None,
+) -> bool:
     """
-    SMTP ile mail gönder (örnek implementasyon)
+    SMTP ile mail gönder
+    
+    Bağlantılar ``smtp_pool`` üzerinden yeniden kullanılır. Geçici hatalar
+    (bağlantı kopması, zaman aşımı, 4xx yanıtlar) artan bekleme süresiyle
+    ``attempts`` kez denenir ve tükenince False döner. Kalıcı hatalar
+    (kimlik doğrulama, alıcı/gönderen reddi, 5xx, oluşturulamayan mesaj)
+    tekrar denenmez: ``PermanentSendError`` fırlatılır.
     
     Args:
         package: build_mail_package() çıktısı
@@ -310,152 +532,53 @@ def send_email_via_smtp(package: Dict[str, Any], smtp_config: Dict[str, Any]) ->
             'password': 'password',
             'use_tls': True
         }
+        attempts: Deneme sayısı (varsayılan SMTP_SEND_ATTEMPTS)
     
     Returns:
-        True if successful
+        True if successful, False when the transient retries ran out
+    
+    Raises:
+        PermanentSendError: the message was rejected for good
     """
     try:
-        import smtplib
-        from email.mime.multipart import MIMEMultipart
-        from email.mime.text import MIMEText
-        from email.mime.base import MIMEBase
-        from email import encoders
-        
-        # Mail oluştur
-        msg = MIMEMultipart('alternative')
-        msg['From'] = package['from']
-        msg['To'] = package['to']
-        msg['Subject'] = package['subject']
-        
-        if package['cc']:
-            msg['Cc'] = ', '.join(package['cc'])
-        
-        # Body ekle
-        msg.attach(MIMEText(package['text_body'], 'plain'))
-        msg.attach(MIMEText(package['html_body'], 'html'))
-        
-        # Ekler
-        attachments_list = package.get('attachments', [])
-        logger.info(f"[Email] Adding {len(attachments_list)} attachments")
-        
-        if not attachments_list:
-            logger.warning("[Email] No attachments in package!")
-        else:
-            for i, att in enumerate(attachments_list, 1):
-                att_path_str = att.get('path', '')
-                if not att_path_str:
-                    logger.error(f"[Email] Attachment {i} has no path")
-                    continue
-                
-                att_path = Path(att_path_str)
-                # Try absolute path first, then relative to /data
-                if not att_path.exists():
-                    # Try alternative paths
-                    alt_paths = [
-                        Path('/data') / att_path_str.lstrip('/'),
-                        Path('/app') / att_path_str.lstrip('/'),
-                        att_path,
-                    ]
-                    found = False
-                    for alt_path in alt_paths:
-                        if alt_path.exists():
-                            att_path = alt_path
-                            found = True
-                            logger.info(f"[Email] Found attachment at alternative path: {alt_path}")
-                            break
-                    
-                    if not found:
-                        logger.error(f"[Email] Attachment {i} not found: {att_path_str} (tried: {[str(p) for p in alt_paths]})")
-                        continue
-                
-                try:
-                    file_size = att_path.stat().st_size
-                    filename = att.get('filename', att_path.name)
-                    mime_type = att.get('mime_type', 'application/octet-stream')
-                    
-                    logger.info(f"[Email] Attachment {i}: {filename} ({file_size} bytes) from {att_path}")
-                    
-                    with open(att_path, 'rb') as f:
-                        # Use proper MIME type if available
-                        if mime_type.startswith('application/pdf'):
-                            part = MIMEBase('application', 'pdf')
-                        elif mime_type.startswith('application/json'):
-                            part = MIMEBase('application', 'json')
-                        else:
-                            part = MIMEBase('application', 'octet-stream')
-                        
-                        part.set_payload(f.read())
-                        encoders.encode_base64(part)
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename="{filename}"'
-                        )
-                        part.add_header('Content-Type', mime_type)
-                        msg.attach(part)
-                    
-                    logger.info(f"[Email] ✅ Attachment {i} ({filename}) added successfully")
-                except Exception as att_error:
-                    logger.error(f"[Email] ❌ Error adding attachment {i} ({att.get('filename', 'unknown')}): {att_error}", exc_info=True)
-        
-        # SMTP bağlantısı
-        logger.info(f"[Email] Connecting to SMTP server: {smtp_config.get('host')}:{smtp_config.get('port')}")
-        logger.info(f"[Email] Using TLS: {smtp_config.get('use_tls')}")
-        logger.info(f"[Email] From: {package['from']}, To: {package['to']}")
-        
-        if smtp_config.get('use_tls'):
-            server = smtplib.SMTP(smtp_config['host'], smtp_config['port'])
-            logger.info(f"[Email] Starting TLS...")
-            server.starttls()
-            logger.info(f"[Email] TLS started")
-        else:
-            server = smtplib.SMTP(smtp_config['host'], smtp_config['port'])
-            logger.info(f"[Email] Connected without TLS")
-        
-        logger.info(f"[Email] Logging in as {smtp_config['username']}...")
-        server.login(smtp_config['username'], smtp_config['password'])
-        logger.info(f"[Email] ✅ Login successful")
-        
-        # Gönder
-        recipients = [package['to']]
-        if package.get('cc'):
-            recipients.extend(package['cc'] if isinstance(package['cc'], list) else [package['cc']])
-        if package.get('bcc'):
-            recipients.extend(package['bcc'] if isinstance(package['bcc'], list) else [package['bcc']])
-        # BCC'yi mesajdan çıkar (SMTP protokolü gereği)
-        recipients_all = recipients.copy()
-        logger.info(f"[Email] Sending to recipients: {recipients_all}")
-        
-        # Mesajda sadece TO ve CC görünür
-        logger.info(f"[Email] Calling server.sendmail()...")
+        msg = _build_mime_message(package)
+    except Exception as e:
+        logger.error(f"[ERROR] Email message could not be built: {type(e).__name__}: {e}", exc_info=True)
+        raise PermanentSendError(f"Email message could not be built: {e}") from e
+    
+    # Gönder
+    recipients = [package['to']]
+    if package.get('cc'):
+        recipients.extend(package['cc'] if isinstance(package['cc'], list) else [package['cc']])
+    if package.get('bcc'):
+        recipients.extend(package['bcc'] if isinstance(package['bcc'], list) else [package['bcc']])
+    # BCC'yi mesajdan çıkar (SMTP protokolü gereği) - mesajda sadece TO ve CC görünür
+    message = msg.as_string()
+    logger.info(f"[Email] From: {package['from']}, sending to recipients: {recipients}")
+    
+    attempts = max(1, attempts or settings.smtp_send_attempts)
+    for attempt in range(1, attempts + 1):
         try:
-            send_result = server.sendmail(package['from'], recipients_all, msg.as_string())
+            with smtp_pool.connection(smtp_config) as server:
+                send_result = server.sendmail(package['from'], recipients, message)
             if send_result:
                 logger.warning(f"[Email] ⚠️  SMTP sendmail returned non-empty dict (rejected recipients): {send_result}")
-            else:
-                logger.info(f"[Email] ✅ Message sent via SMTP (sendmail returned empty dict = success)")
-        except Exception as send_error:
-            logger.error(f"[Email] ❌ SMTP sendmail() failed: {send_error}", exc_info=True)
-            raise
-        
-        server.quit()
-        logger.info(f"[Email] ✅ SMTP connection closed")
-        
-        logger.info(f"[Email] ✅✅✅ Email successfully sent to {package['to']} with {len(package.get('attachments', []))} attachments")
-        return True
-        
-    except smtplib.SMTPAuthenticationError as auth_error:
-        logger.error(f"[ERROR] SMTP Authentication failed: {auth_error}", exc_info=True)
-        return False
-    except smtplib.SMTPRecipientsRefused as recip_error:
-        logger.error(f"[ERROR] SMTP Recipients refused: {recip_error}", exc_info=True)
-        return False
-    except smtplib.SMTPSenderRefused as sender_error:
-        logger.error(f"[ERROR] SMTP Sender refused: {sender_error}", exc_info=True)
-        return False
-    except smtplib.SMTPDataError as data_error:
-        logger.error(f"[ERROR] SMTP Data error: {data_error}", exc_info=True)
-        return False
-    except Exception as e:
-        logger.error(f"[ERROR] Email send failed: {type(e).__name__}: {e}", exc_info=True)
-        return False
-
+            logger.info(f"[Email] ✅✅✅ Email successfully sent to {package['to']} with {len(package.get('attachments', []))} attachments")
+            return True
+        except smtplib.SMTPAuthenticationError as auth_error:
+            logger.error(f"[ERROR] SMTP Authentication failed: {auth_error}", exc_info=True)
+            raise PermanentSendError(f"SMTP authentication failed: {auth_error}") from auth_error
+        except smtplib.SMTPRecipientsRefused as recip_error:
+            logger.error(f"[ERROR] SMTP Recipients refused: {recip_error}", exc_info=True)
+            raise PermanentSendError(f"SMTP recipients refused: {recip_error}") from recip_error
+        except Exception as e:
+            if not _is_transient_smtp_error(e):
+                logger.error(f"[ERROR] Email send failed permanently: {type(e).__name__}: {e}", exc_info=True)
+                raise PermanentSendError(f"{type(e).__name__}: {e}") from e
+            if attempt == attempts:
+                logger.error(f"[ERROR] Email send failed (attempt {attempt}/{attempts}): {type(e).__name__}: {e}", exc_info=True)
+                return False
+            delay = settings.smtp_retry_backoff * (2 ** (attempt - 1))
+            logger.warning(f"[Email] ⚠️  Send attempt {attempt}/{attempts} failed ({type(e).__name__}: {e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+    return False
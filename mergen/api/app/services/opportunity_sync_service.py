@@ -12,7 +12,8 @@ from typing import Dict, Any, List, Optional
 from .sam_service import fetch_opportunities_from_sam, SAMFetchError
 from .sam_mapper import map_sam_record_to_opportunity, extract_attachments_from_sam_record
 from ..crud.opportunities import upsert_opportunity, create_attachment, get_opportunity_by_notice_id
-from ..models import SyncJob, SyncLog
+from ..models import SyncJob
+from .job_log_writer import sync_log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +26,14 @@ def _log_sync(
     step: Optional[str] = None,
     extra_metadata: Optional[Dict] = None,
 ):
-    """Helper to log sync events"""
-    log = SyncLog(
-        job_id=job_id,
+    """Helper to log sync events (buffered, see job_log_writer)"""
+    sync_log_writer.write(
+        job_id,
         level=level,
         message=message,
         step=step,
         extra_metadata=extra_metadata,
     )
-    db.add(log)
-    db.commit()
 
 
 async def sync_from_sam(db: Session, params: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
@@ -198,4 +197,6 @@ async def sync_from_sam(db: Session, params: Dict[str, Any], job_id: Optional[st
         _log_sync(db, job_id, 'ERROR', f"Sync failed: {e}", step='error', extra_metadata={"error": str(e)})
         logger.error(f"[Job {job_id}] Sync failed: {e}", exc_info=True)
         raise
+    finally:
+        sync_log_writer.flush(job_id)
 
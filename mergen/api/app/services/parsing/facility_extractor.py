@@ -2,96 +2,119 @@ import re
 from typing import List, Dict, Any
 import logging
 
+from .pattern_scanner import PatternScanner
+
 logger = logging.getLogger(__name__)
 
+# Common facility feature patterns
+FEATURE_PATTERNS = {
+    "shuttle": [
+        r'shuttle\s+service',
+        r'airport\s+shuttle',
+        r'complimentary\s+shuttle',
+        r'free\s+shuttle',
+        r'transportation\s+service'
+    ],
+    "wifi": [
+        r'wi-?fi',
+        r'wireless\s+internet',
+        r'high-?speed\s+internet',
+        r'complimentary\s+wi-?fi',
+        r'free\s+wi-?fi'
+    ],
+    "parking": [
+        r'parking',
+        r'valet\s+parking',
+        r'self-?park',
+        r'complimentary\s+parking',
+        r'free\s+parking'
+    ],
+    "breakout_rooms": [
+        r'breakout\s+room',
+        r'meeting\s+room',
+        r'conference\s+room',
+        r'small\s+group\s+room'
+    ],
+    "boardroom": [
+        r'boardroom',
+        r'executive\s+room',
+        r'board\s+room'
+    ],
+    "av_equipment": [
+        r'audio\s+visual',
+        r'projector',
+        r'microphone',
+        r'sound\s+system',
+        r'video\s+conferencing',
+        r'presentation\s+equipment'
+    ],
+    "restaurant": [
+        r'restaurant',
+        r'dining',
+        r'food\s+service',
+        r'catering',
+        r'meal\s+service'
+    ],
+    "fitness": [
+        r'fitness\s+center',
+        r'gym',
+        r'exercise\s+room',
+        r'workout\s+facility'
+    ],
+    "pool": [
+        r'pool',
+        r'swimming\s+pool',
+        r'outdoor\s+pool'
+    ],
+    "business_center": [
+        r'business\s+center',
+        r'computer\s+room',
+        r'work\s+station'
+    ]
+}
+
+FEATURE_SCANNER = PatternScanner(
+    [(feature_type, pattern) for feature_type, patterns in FEATURE_PATTERNS.items() for pattern in patterns]
+)
+
+AV_EQUIPMENT_PATTERNS = [
+    r'projector',
+    r'microphone',
+    r'speaker',
+    r'screen',
+    r'video\s+conferencing',
+    r'wireless\s+microphone',
+    r'podium',
+    r'lectern',
+    r'whiteboard',
+    r'flip\s+chart'
+]
+
+AV_EQUIPMENT_SCANNER = PatternScanner(
+    [(pattern.replace(r'\s+', ' '), pattern) for pattern in AV_EQUIPMENT_PATTERNS]
+)
+
 
 def extract_facility_features(text: str) -> List[Dict[str, Any]]:
     """Extract facility features from facility document text"""
     features = []
     
-    # Common facility feature patterns
-    feature_patterns = {
-        "shuttle": [
-            r'shuttle\s+service',
-            r'airport\s+shuttle',
-            r'complimentary\s+shuttle',
-            r'free\s+shuttle',
-            r'transportation\s+service'
-        ],
-        "wifi": [
-            r'wi-?fi',
-            r'wireless\s+internet',
-            r'high-?speed\s+internet',
-            r'complimentary\s+wi-?fi',
-            r'free\s+wi-?fi'
-        ],
-        "parking": [
-            r'parking',
-            r'valet\s+parking',
-            r'self-?park',
-            r'complimentary\s+parking',
-            r'free\s+parking'
-        ],
-        "breakout_rooms": [
-            r'breakout\s+room',
-            r'meeting\s+room',
-            r'conference\s+room',
-            r'small\s+group\s+room'
-        ],
-        "boardroom": [
-            r'boardroom',
-            r'executive\s+room',
-            r'board\s+room'
-        ],
-        "av_equipment": [
-            r'audio\s+visual',
-            r'projector',
-            r'microphone',
-            r'sound\s+system',
-            r'video\s+conferencing',
-            r'presentation\s+equipment'
-        ],
-        "restaurant": [
-            r'restaurant',
-            r'dining',
-            r'food\s+service',
-            r'catering',
-            r'meal\s+service'
-        ],
-        "fitness": [
-            r'fitness\s+center',
-            r'gym',
-            r'exercise\s+room',
-            r'workout\s+facility'
-        ],
-        "pool": [
-            r'pool',
-            r'swimming\s+pool',
-            r'outdoor\s+pool'
-        ],
-        "business_center": [
-            r'business\s+center',
-            r'computer\s+room',
-            r'work\s+station'
-        ]
-    }
-    
     text_lower = text.lower()
     
-    for feature_type, patterns in feature_patterns.items():
-        for pattern in patterns:
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
-                # Extract context around the match
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 50)
-                context = text[start:end].strip()
-                
-                features.append({
-                    "name": feature_type,
-                    "value": context,
-                    "confidence": 1.0 if "complimentary" in context.lower() or "free" in context.lower() else 0.8
-                })
+    # Single pass over the text; sorted back into pattern order (feature type, then pattern)
+    matches = sorted(FEATURE_SCANNER.scan(text_lower), key=lambda m: (m.index, m.start))
+    for match in matches:
+        # Extract context around the match
+        start = max(0, match.start - 50)
+        end = min(len(text), match.end + 50)
+        context = text[start:end].strip()
+        context_lower = context.lower()
+        
+        features.append({
+            "name": match.tag,
+            "value": context,
+            "confidence": 1.0 if "complimentary" in context_lower or "free" in context_lower else 0.8
+        })
     
     return features
 
@@ -166,25 +189,10 @@ def extract_av_equipment_list(text: str) -> List[str]:
     """Extract list of AV equipment"""
     av_equipment = []
     
-    # Common AV equipment patterns
-    equipment_patterns = [
-        r'projector',
-        r'microphone',
-        r'speaker',
-        r'screen',
-        r'video\s+conferencing',
-        r'wireless\s+microphone',
-        r'podium',
-        r'lectern',
-        r'whiteboard',
-        r'flip\s+chart'
-    ]
-    
-    text_lower = text.lower()
-    
-    for pattern in equipment_patterns:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            av_equipment.append(pattern.replace(r'\s+', ' '))
+    found = {match.index for match in AV_EQUIPMENT_SCANNER.scan(text.lower())}
+    for index, (name, _) in enumerate(AV_EQUIPMENT_SCANNER.patterns):
+        if index in found:
+            av_equipment.append(name)
     
     return av_equipment
 
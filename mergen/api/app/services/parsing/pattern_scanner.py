@@ -0,0 +1,72 @@
+"""
+Compiled multi-pattern scanner shared by the RFQ / facility extractors.
+
+All patterns are compiled into one regex, so the text is scanned once instead
+of once per pattern. Alternatives are grouped by their literal first
+character (``c(?:omplimentary…|onference…)|s(?:huttle…)``): the regex engine
+rejects a whole group with a single character comparison, which keeps the
+combined scan cheaper than running the patterns one by one.
+
+The alternation sits inside a lookahead, so overlapping matches are reported
+like separate ``finditer`` calls would report them ("swimming pool" yields
+both ``swimming\\s+pool`` and ``pool``), while a single pattern never overlaps
+itself. At one start position only the first matching pattern (in list order)
+is reported.
+"""
+import re
+from collections import OrderedDict
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+_QUANTIFIERS = "?*+{"
+
+
+class ScanMatch(NamedTuple):
+    tag: str
+    index: int  # position of the pattern in the scanner's pattern list
+    start: int
+    end: int
+    text: str
+
+
+class PatternScanner:
+    """Tags every match of ``(tag, regex)`` patterns in a single pass."""
+
+    def __init__(self, patterns: Sequence[Tuple[str, str]], flags: int = 0):
+        self.patterns: List[Tuple[str, str]] = list(patterns)
+        self._regex = re.compile(f"(?=(?:{self._alternation(flags)}))", flags)
+
+    def _alternation(self, flags: int) -> str:
+        buckets: "OrderedDict[str, List[str]]" = OrderedDict()
+        rest: List[str] = []
+        for index, (_, pattern) in enumerate(self.patterns):
+            first = pattern[:1]
+            if first.isalnum() and pattern[1:2] not in _QUANTIFIERS and len(pattern) > 1:
+                key = first.lower() if flags & re.IGNORECASE else first
+                buckets.setdefault(key, []).append(f"(?P<p{index}>{pattern[1:]})")
+            else:
+                rest.append(f"(?P<p{index}>{pattern})")
+        factored = [f"{re.escape(key)}(?:{'|'.join(alts)})" for key, alts in buckets.items()]
+        return "|".join(factored + rest)
+
+    def _to_match(self, match: "re.Match") -> ScanMatch:
+        name = match.lastgroup
+        index = int(name[1:])
+        # The lookahead is zero-width at the match start (bucketed groups begin one character later)
+        start, end = match.start(), match.end(name)
+        return ScanMatch(self.patterns[index][0], index, start, end, match.string[start:end])
+
+    def scan(self, text: str) -> Iterator[ScanMatch]:
+        """Matches in text order (use ``sorted(..., key=...)`` for pattern order)."""
+        ends = {}
+        for match in self._regex.finditer(text):
+            found = self._to_match(match)
+            # A pattern does not overlap itself, as with its own finditer ("24" is not followed by "4")
+            if found.start < ends.get(found.index, 0):
+                continue
+            ends[found.index] = found.end
+            yield found
+
+    def search(self, text: str) -> Optional[ScanMatch]:
+        """First match in ``text`` or None."""
+        match = self._regex.search(text)
+        return self._to_match(match) if match else None
@@ -2,34 +2,34 @@ import re
 from typing import List, Dict, Any
 import logging
 
+from .pattern_scanner import PatternScanner
+
 logger = logging.getLogger(__name__)
 
+# Common RFQ section patterns
+SECTION_PATTERNS = [
+    r"General Requirements?",
+    r"Lodging Room Requirements?",
+    r"Conference Room Requirements?",
+    r"AV/Boardroom Requirements?",
+    r"Schedule/Block Requirements?",
+    r"Invoicing Requirements?",
+    r"FAR Clauses?",
+    r"52\.204-24",
+    r"52\.204-25",
+    r"52\.204-26"
+]
+
+SECTION_SCANNER = PatternScanner([("section", pattern) for pattern in SECTION_PATTERNS], re.IGNORECASE)
+
+# Requirement item markers: "1." / "1)", bullets, "a." / "a)" (lines are stripped)
+ITEM_PATTERN = re.compile(r"(?:\d+[\.\)]|[•\-\*]|[a-z][\.\)])\s+(.+)")
+
 
 def extract_requirements_from_text(text: str) -> List[Dict[str, Any]]:
     """Extract requirements from RFQ text"""
     requirements = []
     
-    # Common RFQ section patterns
-    section_patterns = [
-        r"General Requirements?",
-        r"Lodging Room Requirements?",
-        r"Conference Room Requirements?",
-        r"AV/Boardroom Requirements?",
-        r"Schedule/Block Requirements?",
-        r"Invoicing Requirements?",
-        r"FAR Clauses?",
-        r"52\.204-24",
-        r"52\.204-25",
-        r"52\.204-26"
-    ]
-    
-    # Requirement item patterns
-    item_patterns = [
-        r"^\d+[\.\)]\s+(.+?)(?=\n\d+[\.\)]|\n\n|$)",
-        r"^[•\-\*]\s+(.+?)(?=\n[•\-\*]|\n\n|$)",
-        r"^[a-z][\.\)]\s+(.+?)(?=\n[a-z][\.\)]|\n\n|$)"
-    ]
-    
     lines = text.split('\n')
     current_section = None
     
@@ -39,24 +39,20 @@ def extract_requirements_from_text(text: str) -> List[Dict[str, Any]]:
             continue
             
         # Check for section headers
-        for pattern in section_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                current_section = line
-                break
+        if SECTION_SCANNER.search(line):
+            current_section = line
         
         # Check for requirement items
         if current_section:
-            for pattern in item_patterns:
-                match = re.match(pattern, line, re.MULTILINE)
-                if match:
-                    requirement_text = match.group(1).strip()
-                    if len(requirement_text) > 10:  # Filter out very short items
-                        requirements.append({
-                            "text": requirement_text,
-                            "section": current_section,
-                            "line_number": i + 1
-                        })
-                    break
+            match = ITEM_PATTERN.match(line)
+            if match:
+                requirement_text = match.group(1).strip()
+                if len(requirement_text) > 10:  # Filter out very short items
+                    requirements.append({
+                        "text": requirement_text,
+                        "section": current_section,
+                        "line_number": i + 1
+                    })
     
     return requirements
 
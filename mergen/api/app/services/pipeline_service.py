@@ -5,21 +5,21 @@ Simulates AutoGen workflow, writes logs/results, and stores output artifacts.
 import json
 import os
 import logging
-import asyncio
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from sqlalchemy.orm import Session
 
+from ..config import settings
 from ..db import SessionLocal
 from ..models import (
     Opportunity,
     OpportunityAttachment,
     AIAnalysisResult,
-    AnalysisLog,
     AgentRun,
-    AgentMessage,
 )
 from ..services.history_service import (
     record_opportunity_history,
@@ -36,8 +36,17 @@ from ..services.decision_cache_service import (
 )
 from ..agents.hotel_matcher_agent import run_hotel_match_for_opportunity, HotelMatcherUnavailableError
 from ..agents.sow_analyzer_agent import analyze_sow_document, SOWAnalyzerUnavailableError
-from ..services.pdf_generator import generate_analysis_pdf
 from ..services.parsing.document_analyzer import analyze_document
+from ..services.blob_store import get_cached_parse, store_parse
+from ..services.artifact_catalog import register_artifact
+from ..services.download_runner import submit_download
+from ..services.dashboard_stats_service import record_analysis_completed
+from ..services.progress_bus import publish_analysis_event
+from ..services.job_queue import will_retry
+from ..services.job_log_writer import agent_message_writer, analysis_log_writer
+from ..services.compliance.per_diem_index import get_per_diem_index
+from ..services.compliance.rules import check_per_diem_batch
+from ..services.pricing.scenarios import price_hotel_offers, sow_rooms_per_night
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +54,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_DIR = PROJECT_ROOT / "data"
 DATA_DIR = Path(os.getenv("DATA_DIR", str(DEFAULT_DATA_DIR))).resolve()
 
+# Per-process stage limits shared by every pipeline running in this process
+# (daily scan fan-out, BackgroundTasks, RQ worker threads).
+LLM_SLOTS = threading.BoundedSemaphore(max(1, settings.pipeline_llm_concurrency))
+DOWNLOAD_SLOTS = threading.BoundedSemaphore(max(1, settings.pipeline_download_concurrency))
+
 
 def _resolve_attachment_path(path_str: Optional[str]) -> Optional[Path]:
     """Return a usable Path for stored attachment entries."""
@@ -117,9 +131,6 @@ def _auto_download_attachments(
     
     # Only download if we have attachments with source_url that are missing
     if missing:
-        from ..services.attachment_service import download_attachments_for_opportunity
-        import uuid
-
         _log_analysis(
             db,
             analysis_result_id,
@@ -129,63 +140,18 @@ def _auto_download_attachments(
             agent_run_id=agent_run_id,
         )
         
+        DOWNLOAD_SLOTS.acquire()
         try:
-            # Let download_attachments_for_opportunity create its own job_id
-            # This ensures the job is properly registered in the database
+            # Runs on the shared download loop with its own DB session; we only wait on the future.
+            # download_attachments_for_opportunity creates and registers its own job_id.
             logger.info(f"[Pipeline {analysis_result_id}] Starting auto-download for {len(missing)} attachments")
-            
-            # Check if we're already in an async context
+            future = submit_download(opportunity.id)
             try:
-                loop = asyncio.get_running_loop()
-                # We're in an async context, need to use a different approach
-                logger.warning(f"[Pipeline {analysis_result_id}] Already in async context, creating task for download")
-                # Create a new event loop in a thread
-                import threading
-                import queue
-                result_queue = queue.Queue()
-                
-                def run_download():
-                    try:
-                        new_loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(new_loop)
-                        # Pass None to let download_attachments_for_opportunity create its own job
-                        result = new_loop.run_until_complete(
-                            download_attachments_for_opportunity(db, opportunity.id, job_id=None)
-                        )
-                        result_queue.put(('success', result))
-                        new_loop.close()
-                    except Exception as e:
-                        logger.exception(f"[Pipeline {analysis_result_id}] Download thread error: {e}")
-                        result_queue.put(('error', e))
-                
-                thread = threading.Thread(target=run_download, daemon=False)
-                thread.start()
-                thread.join(timeout=300)  # 5 minute timeout
-                
-                if thread.is_alive():
-                    logger.error(f"[Pipeline {analysis_result_id}] Download timeout after 5 minutes")
-                    raise TimeoutError("Download timeout after 5 minutes")
-                
-                if not result_queue.empty():
-                    status, result = result_queue.get()
-                    if status == 'error':
-                        logger.error(f"[Pipeline {analysis_result_id}] Download failed: {result}")
-                        raise result
-                else:
-                    logger.error(f"[Pipeline {analysis_result_id}] Download thread completed but no result in queue")
-                    raise RuntimeError("Download thread completed but no result available")
-            except RuntimeError as e:
-                if "no running event loop" in str(e).lower() or "no current event loop" in str(e).lower():
-                    # No running loop, we can use asyncio.run
-                    logger.info(f"[Pipeline {analysis_result_id}] No running loop, using asyncio.run")
-                    try:
-                        # Pass None to let download_attachments_for_opportunity create its own job
-                        asyncio.run(download_attachments_for_opportunity(db, opportunity.id, job_id=None))
-                    except Exception as run_error:
-                        logger.exception(f"[Pipeline {analysis_result_id}] asyncio.run failed: {run_error}")
-                        raise
-                else:
-                    raise
+                future.result(timeout=settings.attachment_download_timeout)
+            except FutureTimeoutError:
+                # The download keeps running in the background; later jobs will find the files
+                logger.error(f"[Pipeline {analysis_result_id}] Download still running after {settings.attachment_download_timeout}s, continuing")
+                raise TimeoutError(f"Download timeout after {settings.attachment_download_timeout} seconds")
             
             # Refresh attachment records from DB
             db.expire_all()
@@ -219,6 +185,8 @@ def _auto_download_attachments(
                 agent_run_id=agent_run_id,
             )
             # Continue with whatever attachments we have
+        finally:
+            DOWNLOAD_SLOTS.release()
     elif attachments and not any(att.source_url for att in attachments):
         # No source URLs available
         _log_analysis(
@@ -241,25 +209,44 @@ def _log_analysis(
     step: Optional[str] = None,
     agent_run_id: Optional[int] = None,
 ) -> None:
-    log = AnalysisLog(
-        analysis_result_id=analysis_result_id,
-        level=level,
-        message=message,
-        step=step,
-    )
-    db.add(log)
-    db.commit()
-
+    """
+    Buffer an AnalysisLog row (and the matching AgentMessage). Rows are written
+    in batches by the job log writer; ``db`` is not used or committed.
+    """
+    analysis_log_writer.write(analysis_result_id, level=level, message=message, step=step)
     if agent_run_id:
-        msg = AgentMessage(
-            agent_run_id=agent_run_id,
+        agent_message_writer.write(
+            agent_run_id,
             agent_name="pipeline",
             role="system",
             message_type="log",
             content=message,
         )
-        db.add(msg)
-        db.commit()
+
+
+def _flush_job_logs(analysis_result_id: int, agent_run_id: Optional[int]) -> None:
+    analysis_log_writer.flush(analysis_result_id)
+    if agent_run_id:
+        agent_message_writer.flush(agent_run_id)
+
+
+def _publish_status(analysis_result_id: int, status: str) -> None:
+    """Notify progress stream subscribers of a committed status change."""
+    publish_analysis_event(analysis_result_id, {"type": "status", "status": status})
+
+
+def _start_delivery(db: Session, result: AIAnalysisResult, agent_run_id: Optional[int]) -> bool:
+    """Queue PDF rendering + notification mail for a completed result (see delivery_service)."""
+    from .delivery_service import dispatch_delivery
+
+    try:
+        dispatched = dispatch_delivery(result.id, agent_run_id)
+    except Exception as exc:
+        logger.warning(f"[Pipeline {result.id}] Could not dispatch delivery: {exc}", exc_info=True)
+        _log_analysis(db, result.id, "WARNING", f"Report delivery could not be started: {exc}", step="generate", agent_run_id=agent_run_id)
+        return False
+    _log_analysis(db, result.id, "INFO", f"PDF report and notification queued (via {dispatched['mode']})", step="generate", agent_run_id=agent_run_id)
+    return True
 
 
 def create_pipeline_job(
@@ -305,6 +292,10 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
     """
     logger.info(f"[Pipeline {analysis_result_id}] Background task started")
     session = SessionLocal()
+    # Once delivery is queued the delivery job ends the progress stream
+    delivery_dispatched = False
+    # A transient failure with retries left is re-raised; the next attempt ends the stream
+    retrying = False
     try:
         result = session.query(AIAnalysisResult).filter(AIAnalysisResult.id == analysis_result_id).first()
         if not result:
@@ -320,6 +311,7 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
             result.status = "failed"
             result.result_json = {"error": "Opportunity not found"}
             session.commit()
+            _publish_status(analysis_result_id, "failed")
             return
 
         attachment_ids: Optional[List[int]] = payload.get("attachment_ids")
@@ -330,11 +322,14 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
 
         if result.analysis_type == "hotel_match":
             _execute_hotel_match(session, result, opportunity, options, agent_run_id)
+            if result.status == "completed":
+                delivery_dispatched = _start_delivery(session, result, agent_run_id)
             return
 
         result.status = "running"
         result.updated_at = datetime.utcnow()
         session.commit()
+        _publish_status(analysis_result_id, "running")
         logger.info(f"[Pipeline {analysis_result_id}] Status set to 'running'")
 
         _log_analysis(session, analysis_result_id, "INFO", "Pipeline job started", step="init", agent_run_id=agent_run_id)
@@ -505,7 +500,13 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
                     agent_run_id=agent_run_id,
                 )
                 
-                analysis_result = analyze_document(str(local_path_obj), att.mime_type)
+                # Identical files (shared blob) are parsed only once across the corpus
+                analysis_result = get_cached_parse(session, att.content_hash)
+                if analysis_result is None:
+                    analysis_result = analyze_document(str(local_path_obj), att.mime_type)
+                    store_parse(session, att.content_hash, analysis_result)
+                else:
+                    logger.info(f"[Pipeline {analysis_result_id}] Reusing parsed content of blob {att.content_hash[:12]} for {att.name}")
                 analysis_result["attachment_id"] = att.id
                 analysis_result["attachment_name"] = att.name
                 analyzed_documents.append(analysis_result)
@@ -619,7 +620,8 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
                         agent_run_id=agent_run_id,
                     )
                 
-                sow_analysis = analyze_sow_document(text_to_analyze, llm_model=llm_model, agent_run_id=agent_run_id)
+                with LLM_SLOTS:
+                    sow_analysis = analyze_sow_document(text_to_analyze, llm_model=llm_model, agent_run_id=agent_run_id)
                 _log_analysis(
                     session,
                     analysis_result_id,
@@ -681,6 +683,7 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
 
         json_path = output_dir / f"analysis_{analysis_result_id}.json"
         json_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        register_artifact(session, json_path, opportunity.id, analysis_result_id, notice_slug)
 
         # Get related hotel match results for this opportunity
         hotel_match_results = session.query(AIAnalysisResult).filter(
@@ -689,7 +692,7 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
             AIAnalysisResult.status == "completed"
         ).order_by(AIAnalysisResult.created_at.desc()).limit(1).all()
         
-        # Add hotel match data to summary for PDF
+        # Add hotel match data to summary (PDF report / email)
         if hotel_match_results:
             hotel_result = hotel_match_results[0]
             hotel_data = hotel_result.result_json
@@ -702,19 +705,6 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
             summary["related_hotels"] = hotel_data.get("hotels", [])
             logger.info(f"[Pipeline {analysis_result_id}] Added {len(summary.get('hotels', []))} hotels from hotel match result {hotel_result.id}")
         
-        # Generate PDF
-        pdf_path = output_dir / f"analysis_{analysis_result_id}.pdf"
-        opp_dict = {
-            "id": opportunity.id,
-            "notice_id": opportunity.notice_id,
-            "title": opportunity.title,
-            "agency": opportunity.agency,
-        }
-        pdf_generated = generate_analysis_pdf(pdf_path, summary, opp_dict)
-        if pdf_generated:
-            result.pdf_path = str(pdf_path)
-            _log_analysis(session, analysis_result_id, "INFO", f"PDF generated: {pdf_path}", step="generate", agent_run_id=agent_run_id)
-
         # log synthetic LLM call (replace with real call later)
         try:
             log_llm_call(
@@ -738,296 +728,13 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
         result.status = "completed"
         result.completed_at = datetime.utcnow()
         session.commit()
+        _publish_status(analysis_result_id, "completed")
+        record_analysis_completed(session, analysis_result_id)
 
         _log_analysis(session, analysis_result_id, "INFO", "Pipeline job completed", step="complete", agent_run_id=agent_run_id)
 
-        # Send email notification for both sow_draft and hotel_match analyses
-        # For sow_draft: Send email with SOW PDF/JSON + hotel match JSON (if available)
-        # For hotel_match: Send email with both SOW and hotel match PDFs/JSONs
-        send_email_now = result.analysis_type in ["sow_draft", "sow", "hotel_match"]
-        
-        if send_email_now:
-            try:
-                # Import settings here to get fresh config (in case .env was updated after backend started)
-                from ..config import settings
-                from ..services.mail_service import build_mail_package, send_email_via_smtp
-                
-                logger.info(f"[Pipeline {analysis_result_id}] Email config check: smtp_host={settings.smtp_host}, notification_email={settings.pipeline_notification_email}")
-                
-                if not (settings.pipeline_notification_email and settings.smtp_host and settings.smtp_username):
-                    logger.info(f"[Pipeline {analysis_result_id}] Email notification not configured (missing SMTP settings or notification email)")
-                    logger.info(f"[Pipeline {analysis_result_id}] - pipeline_notification_email: {settings.pipeline_notification_email}")
-                    logger.info(f"[Pipeline {analysis_result_id}] - smtp_host: {settings.smtp_host}")
-                    logger.info(f"[Pipeline {analysis_result_id}] - smtp_username: {settings.smtp_username}")
-                else:
-                    _log_analysis(
-                        session,
-                        analysis_result_id,
-                        "INFO",
-                        f"Sending email notification to {settings.pipeline_notification_email}",
-                        step="email",
-                        agent_run_id=agent_run_id,
-                    )
-                
-                # Build mail package with PDF and JSON attachments
-                notice_id = opportunity.notice_id or str(opportunity.id)
-                output_dir = DATA_DIR / "opportunities" / notice_id / "outputs"
-                
-                # Create mail package with analysis result JSON
-                analysis_json = summary if isinstance(summary, dict) else (json.loads(summary) if isinstance(summary, str) else {})
-                
-                # Add hotel match data to analysis_json if available
-                hotel_match_results = session.query(AIAnalysisResult).filter(
-                    AIAnalysisResult.opportunity_id == opportunity.id,
-                    AIAnalysisResult.analysis_type == "hotel_match",
-                    AIAnalysisResult.status == "completed"
-                ).order_by(AIAnalysisResult.created_at.desc()).limit(1).all()
-                
-                if hotel_match_results:
-                    hotel_result = hotel_match_results[0]
-                    if hotel_result.result_json:
-                        hotel_data = hotel_result.result_json if isinstance(hotel_result.result_json, dict) else json.loads(hotel_result.result_json) if isinstance(hotel_result.result_json, str) else {}
-                        # Add hotels array to analysis_json for email body
-                        if 'hotels' in hotel_data:
-                            analysis_json['hotels'] = hotel_data['hotels']
-                        elif 'hotel_match' in hotel_data:
-                            analysis_json['hotel_match'] = hotel_data['hotel_match']
-                
-                mail_package = build_mail_package(
-                    opportunity_code=notice_id,
-                    folder_path=str(output_dir),
-                    to_email=settings.pipeline_notification_email,
-                    from_email=settings.smtp_from_email,
-                    analysis_result_json=analysis_json,
-                )
-                
-                # Add generated PDF and JSON to attachments if they exist
-                attachments = mail_package.get('attachments', [])
-                
-                # Add SOW PDF and JSON for sow_draft/sow analyses
-                if result.analysis_type in ["sow_draft", "sow"]:
-                    if result.pdf_path and Path(result.pdf_path).exists():
-                        attachments.append({
-                            'path': result.pdf_path,
-                            'filename': f"sow_analysis_{analysis_result_id}.pdf",
-                            'mime_type': 'application/pdf'
-                        })
-                    if result.json_path and Path(result.json_path).exists():
-                        attachments.append({
-                            'path': result.json_path,
-                            'filename': f"sow_analysis_{analysis_result_id}.json",
-                            'mime_type': 'application/json'
-                        })
-                
-                # Add hotel match PDF and JSON for hotel_match analyses
-                if result.analysis_type == "hotel_match":
-                    if result.pdf_path and Path(result.pdf_path).exists():
-                        attachments.append({
-                            'path': result.pdf_path,
-                            'filename': f"hotel_suggestions_{analysis_result_id}.pdf",
-                            'mime_type': 'application/pdf'
-                        })
-                    if result.json_path and Path(result.json_path).exists():
-                        attachments.append({
-                            'path': result.json_path,
-                            'filename': f"hotel_match_{analysis_result_id}.json",
-                            'mime_type': 'application/json'
-                        })
-                
-                # For sow_draft/sow: Also add hotel match PDF and JSON if available (Amadeus hotel suggestions)
-                # For hotel_match: Also add SOW PDF/JSON if available
-                if result.analysis_type in ["sow_draft", "sow"]:
-                    # Add hotel match PDF and JSON if available (Amadeus'tan gelen hotel öneri PDF ve JSON'u)
-                    if not hotel_match_results:
-                        hotel_match_results = session.query(AIAnalysisResult).filter(
-                            AIAnalysisResult.opportunity_id == opportunity.id,
-                            AIAnalysisResult.analysis_type == "hotel_match",
-                            AIAnalysisResult.status == "completed"
-                        ).order_by(AIAnalysisResult.created_at.desc()).limit(1).all()
-                    
-                    for hotel_result in hotel_match_results:
-                        # Add hotel match PDF (Amadeus'tan gelen hotel öneri PDF'i)
-                        if hotel_result.pdf_path:
-                            hotel_pdf_path = Path(hotel_result.pdf_path)
-                            # Try alternative paths if not found
-                            if not hotel_pdf_path.exists():
-                                alt_paths = [
-                                    Path('/data') / hotel_result.pdf_path.lstrip('/'),
-                                    DATA_DIR / hotel_result.pdf_path.lstrip('/'),
-                                ]
-                                for alt_path in alt_paths:
-                                    if alt_path.exists():
-                                        hotel_pdf_path = alt_path
-                                        break
-                            
-                            if hotel_pdf_path.exists():
-                                attachments.append({
-                                    'path': str(hotel_pdf_path),
-                                    'filename': f"hotel_suggestions_{hotel_result.id}.pdf",
-                                    'mime_type': 'application/pdf'
-                                })
-                                logger.info(f"[Pipeline {analysis_result_id}] Added hotel match PDF (Amadeus) to SOW email: {hotel_pdf_path}")
-                        
-                        # Add hotel match JSON (Amadeus'tan gelen hotel öneri JSON'u)
-                        if hotel_result.json_path:
-                            hotel_json_path = Path(hotel_result.json_path)
-                            # Try alternative paths if not found
-                            if not hotel_json_path.exists():
-                                alt_paths = [
-                                    Path('/data') / hotel_result.json_path.lstrip('/'),
-                                    DATA_DIR / hotel_result.json_path.lstrip('/'),
-                                ]
-                                for alt_path in alt_paths:
-                                    if alt_path.exists():
-                                        hotel_json_path = alt_path
-                                        break
-                            
-                            if hotel_json_path.exists():
-                                attachments.append({
-                                    'path': str(hotel_json_path),
-                                    'filename': f"hotel_match_{hotel_result.id}.json",
-                                    'mime_type': 'application/json'
-                                })
-                                logger.info(f"[Pipeline {analysis_result_id}] Added hotel match JSON (Amadeus) to SOW email: {hotel_json_path}")
-                
-                elif result.analysis_type == "hotel_match":
-                    # Add SOW PDF and JSON if available
-                    sow_results = session.query(AIAnalysisResult).filter(
-                        AIAnalysisResult.opportunity_id == opportunity.id,
-                        AIAnalysisResult.analysis_type.in_(["sow_draft", "sow"]),
-                        AIAnalysisResult.status == "completed"
-                    ).order_by(AIAnalysisResult.created_at.desc()).limit(1).all()
-                    
-                    for sow_result in sow_results:
-                        if sow_result.pdf_path:
-                            sow_pdf_path = Path(sow_result.pdf_path)
-                            # Try alternative paths if not found
-                            if not sow_pdf_path.exists():
-                                alt_paths = [
-                                    Path('/data') / sow_result.pdf_path.lstrip('/'),
-                                    DATA_DIR / sow_result.pdf_path.lstrip('/'),
-                                ]
-                                for alt_path in alt_paths:
-                                    if alt_path.exists():
-                                        sow_pdf_path = alt_path
-                                        break
-                            
-                            if sow_pdf_path.exists():
-                                attachments.append({
-                                    'path': str(sow_pdf_path),
-                                    'filename': f"sow_analysis_{sow_result.id}.pdf",
-                                    'mime_type': 'application/pdf'
-                                })
-                                logger.info(f"[Pipeline {analysis_result_id}] Added SOW PDF to hotel match email: {sow_pdf_path}")
-                        
-                        if sow_result.json_path:
-                            sow_json_path = Path(sow_result.json_path)
-                            # Try alternative paths if not found
-                            if not sow_json_path.exists():
-                                alt_paths = [
-                                    Path('/data') / sow_result.json_path.lstrip('/'),
-                                    DATA_DIR / sow_result.json_path.lstrip('/'),
-                                ]
-                                for alt_path in alt_paths:
-                                    if alt_path.exists():
-                                        sow_json_path = alt_path
-                                        break
-                            
-                            if sow_json_path.exists():
-                                attachments.append({
-                                    'path': str(sow_json_path),
-                                    'filename': f"sow_analysis_{sow_result.id}.json",
-                                    'mime_type': 'application/json'
-                                })
-                                logger.info(f"[Pipeline {analysis_result_id}] Added SOW JSON to hotel match email: {sow_json_path}")
-                
-                mail_package['attachments'] = attachments
-                
-                # Log attachment info
-                logger.info(f"[Pipeline {analysis_result_id}] Email will include {len(attachments)} attachments:")
-                for att in attachments:
-                    att_path = Path(att['path'])
-                    if att_path.exists():
-                        logger.info(f"[Pipeline {analysis_result_id}]   - {att['filename']} ({att_path.stat().st_size} bytes) [OK]")
-                    else:
-                        logger.warning(f"[Pipeline {analysis_result_id}]   - {att['filename']} [MISSING: {att_path}]")
-                
-                # SMTP config
-                smtp_config = {
-                    'host': settings.smtp_host,
-                    'port': settings.smtp_port,
-                    'username': settings.smtp_username,
-                    'password': settings.smtp_password,
-                    'use_tls': settings.smtp_use_tls,
-                }
-                
-                # Send email
-                if send_email_via_smtp(mail_package, smtp_config):
-                    _log_analysis(
-                        session,
-                        analysis_result_id,
-                        "INFO",
-                        f"Email notification sent successfully to {settings.pipeline_notification_email}",
-                        step="email",
-                        agent_run_id=agent_run_id,
-                    )
-                    logger.info(f"[Pipeline {analysis_result_id}] Email notification sent successfully")
-                    
-                    # ✅ KAYIP HALKAYI BAĞLAMA: Email'i veritabanına loglama
-                    try:
-                        from ..models import EmailLog
-                        
-                        # Email body'den özet oluştur (ilk 200 karakter)
-                        email_summary = mail_package.get('text_body', '')[:200] + '...' if len(mail_package.get('text_body', '')) > 200 else mail_package.get('text_body', '')
-                        
-                        email_log = EmailLog(
-                            opportunity_id=opportunity.id,
-                            direction="outgoing",
-                            subject=mail_package.get('subject', 'SOW Analysis Report'),
-                            from_address=mail_package.get('from', settings.smtp_from_email),
-                            to_address=mail_package.get('to', settings.pipeline_notification_email),
-                            message_id=None,  # SMTP response'dan alınabilir ileride
-                            raw_body=mail_package.get('text_body', ''),
-                            parsed_summary=email_summary,
-                            related_agent_run_id=agent_run_id,
-                        )
-                        session.add(email_log)
-                        session.commit()
-                        session.refresh(email_log)
-                        
-                        logger.info(f"[Pipeline {analysis_result_id}] ✅ Email logged to database: EmailLog ID {email_log.id}")
-                        _log_analysis(
-                            session,
-                            analysis_result_id,
-                            "INFO",
-                            f"Email kaydedildi: EmailLog ID {email_log.id}",
-                            step="email",
-                            agent_run_id=agent_run_id,
-                        )
-                    except Exception as log_error:
-                        logger.error(f"[Pipeline {analysis_result_id}] Email logging to database failed: {log_error}", exc_info=True)
-                        # Email gönderildi ama loglama başarısız - devam et
-                    
-                else:
-                    _log_analysis(
-                        session,
-                        analysis_result_id,
-                        "WARNING",
-                        f"Failed to send email notification to {settings.pipeline_notification_email}",
-                        step="email",
-                        agent_run_id=agent_run_id,
-                    )
-                    logger.warning(f"[Pipeline {analysis_result_id}] Failed to send email notification")
-            except Exception as email_exc:
-                logger.warning(f"[Pipeline {analysis_result_id}] Email notification failed: {email_exc}", exc_info=True)
-                _log_analysis(
-                    session,
-                    analysis_result_id,
-                    "WARNING",
-                    f"Email notification failed: {email_exc}",
-                    step="email",
-                    agent_run_id=agent_run_id,
-                )
+        # PDF report and email notification follow on the delivery stage
+        delivery_dispatched = _start_delivery(session, result, agent_run_id)
 
         # Auto-trigger hotel match if sow_draft analysis completed successfully
         if result.analysis_type == "sow_draft" and sow_analysis:
@@ -1153,22 +860,15 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
                         "agent_run_id": hotel_agent_run_id,
                     }
                     
-                    # Run hotel match in background thread (non-blocking)
-                    import threading
-                    def run_hotel_match():
-                        try:
-                            run_pipeline_job(hotel_result.id, hotel_payload)
-                        except Exception as e:
-                            logger.error(f"Auto-triggered hotel match failed: {e}", exc_info=True)
-                    
-                    thread = threading.Thread(target=run_hotel_match, daemon=True)
-                    thread.start()
+                    # Run hotel match on the hotel_match queue (thread fallback, non-blocking)
+                    from .job_queue import dispatch_pipeline_job
+                    dispatched = dispatch_pipeline_job(hotel_result.id, hotel_payload)
                     
                     _log_analysis(
                         session,
                         analysis_result_id,
                         "INFO",
-                        f"Hotel match job created: {hotel_result.id}",
+                        f"Hotel match job created: {hotel_result.id} (via {dispatched['mode']})",
                         step="auto-hotel-match",
                         agent_run_id=agent_run_id,
                     )
@@ -1226,6 +926,18 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
 
     except Exception as exc:
         session.rollback()
+        retrying = will_retry(exc)
+        if retrying:
+            logger.warning(f"[Pipeline {analysis_result_id}] Transient failure, job will be retried: {exc}")
+            _log_analysis(session, analysis_result_id, "WARNING", f"Pipeline attempt failed, retrying: {exc}", step="retry", agent_run_id=payload.get("agent_run_id"))
+            result = session.query(AIAnalysisResult).filter(AIAnalysisResult.id == analysis_result_id).first()
+            if result:
+                result.status = "pending"
+                result.updated_at = datetime.utcnow()
+                session.commit()
+                _publish_status(analysis_result_id, "pending")
+            raise
+
         logger.exception(f"[Pipeline {analysis_result_id}] Pipeline job failed with exception: {exc}")
         _log_analysis(session, analysis_result_id, "ERROR", f"Pipeline failed: {exc}", step="error", agent_run_id=payload.get("agent_run_id"))
         result = session.query(AIAnalysisResult).filter(AIAnalysisResult.id == analysis_result_id).first()
@@ -1234,9 +946,12 @@ def run_pipeline_job(analysis_result_id: int, payload: Dict[str, Any]) -> None:
             result.result_json = {"error": str(exc)}
             result.completed_at = datetime.utcnow()
             session.commit()
-        _log_analysis(session, analysis_result_id, "ERROR", f"Pipeline failed: {exc}", step="error", agent_run_id=agent_run_id)
+            _publish_status(analysis_result_id, "failed")
     finally:
         session.close()
+        _flush_job_logs(analysis_result_id, payload.get("agent_run_id"))
+        if not delivery_dispatched and not retrying:
+            publish_analysis_event(analysis_result_id, {"type": "end"})
 
 
 def _execute_hotel_match(
@@ -1261,6 +976,7 @@ def _execute_hotel_match(
     result.status = "running"
     result.updated_at = datetime.utcnow()
     db.commit()
+    _publish_status(result.id, "running")
     
     _log_analysis(db, result.id, "INFO", "Hotel match job started", step="init", agent_run_id=agent_run_id)
     
@@ -1352,6 +1068,7 @@ def _execute_hotel_match(
         result.result_json = {"error": str(exc)}
         result.completed_at = datetime.utcnow()
         db.commit()
+        _publish_status(result.id, "failed")
         _log_analysis(db, result.id, "ERROR", f"Hotel match requirements missing: {exc}", step="prepare", agent_run_id=agent_run_id)
         return
 
@@ -1379,7 +1096,7 @@ def _execute_hotel_match(
     decision_metadata: Dict[str, Any] = {}
 
     if decision_context:
-        key_hash, signature, cached_entry = lookup_decision_cache(
+        key_hash, signature, cached_entry, match_type = lookup_decision_cache(
             db,
             opportunity=opportunity,
             context=decision_context,
@@ -1390,6 +1107,7 @@ def _execute_hotel_match(
                 "key_hash": key_hash,
                 "signature": signature,
                 "matched": cached_entry is not None,
+                "match_type": match_type,
             }
         )
         if cached_entry:
@@ -1466,12 +1184,13 @@ def _execute_hotel_match(
             except:
                 pass
             
-            agent_output = run_hotel_match_for_opportunity(
-                requirements, 
-                decision_hint=decision_hint,
-                sow_requirements=sow_requirements,
-                agent_run_id=agent_run_id
-            )
+            with LLM_SLOTS:
+                agent_output = run_hotel_match_for_opportunity(
+                    requirements, 
+                    decision_hint=decision_hint,
+                    sow_requirements=sow_requirements,
+                    agent_run_id=agent_run_id
+                )
             
             # DEBUG: Log after calling hotel matcher
             try:
@@ -1486,6 +1205,7 @@ def _execute_hotel_match(
             result.result_json = {"error": str(exc)}
             result.completed_at = datetime.utcnow()
             db.commit()
+            _publish_status(result.id, "failed")
             _log_analysis(db, result.id, "ERROR", str(exc), step="agent", agent_run_id=agent_run_id)
             return
         except Exception as exc:
@@ -1493,6 +1213,7 @@ def _execute_hotel_match(
             result.result_json = {"error": f"Hotel matcher failed: {exc}"}
             result.completed_at = datetime.utcnow()
             db.commit()
+            _publish_status(result.id, "failed")
             _log_analysis(db, result.id, "ERROR", f"Hotel matcher failed: {exc}", step="agent", agent_run_id=agent_run_id)
             return
 
@@ -1517,6 +1238,42 @@ def _execute_hotel_match(
             )
             decision_metadata["saved_at"] = persisted.created_at.isoformat() if persisted.created_at else None
 
+    # Flag offers above the GSA lodging per-diem (local rate index, no network calls)
+    over_per_diem = None
+    if hotels and get_per_diem_index():
+        checks = check_per_diem_batch(
+            [{"rate": hotel.get("price_per_night") or 0.0} for hotel in hotels],
+            requirements.get("city_name"),
+            requirements.get("check_in"),
+            state=(decision_context or {}).get("state"),
+        )
+        # No limit (ambiguous / unknown city): the offers are left unflagged
+        hotels = [
+            {**hotel, "per_diem": {k: check[k] for k in ("compliant", "limit", "excess")}}
+            if check["limit"] is not None and hotel.get("price_per_night") and hotel.get("currency", "USD") == "USD" else hotel
+            for hotel, check in zip(hotels, checks)
+        ]
+        over_per_diem = sum(1 for hotel in hotels if hotel.get("per_diem", {}).get("compliant") is False)
+        if over_per_diem:
+            _log_analysis(db, result.id, "WARNING", f"{over_per_diem} hotel offer(s) exceed the per-diem lodging rate", step="agent", agent_run_id=agent_run_id)
+
+    # Room-block cost of each offer for the whole stay, priced and ranked in one batch
+    room_block_ranking = None
+    quotes = price_hotel_offers(
+        hotels,
+        requirements.get("check_in"),
+        requirements.get("check_out"),
+        rooms_per_night=sow_rooms_per_night(sow_analysis),
+        location=requirements.get("city_name"),
+        state=(decision_context or {}).get("state"),
+    )
+    if quotes is not None:
+        hotels = list(hotels)
+        for record in quotes.to_records():
+            position = record.pop("offer")
+            hotels[position] = {**hotels[position], "room_block": record}
+        room_block_ranking = [quotes.scenarios[i].metadata["offer"] for i in quotes.ranked()]
+
     summary = {
         "opportunity": {
             "id": opportunity.id,
@@ -1529,6 +1286,8 @@ def _execute_hotel_match(
         "reasoning": reasoning,
         "generated_at": datetime.utcnow().isoformat(),
         "decision_metadata": decision_metadata,
+        "over_per_diem_count": over_per_diem,
+        "room_block_ranking": room_block_ranking,
     }
     
     # Persist summary to disk
@@ -1539,25 +1298,14 @@ def _execute_hotel_match(
     json_path = output_dir / f"hotel_match_{result.id}.json"
     json_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
     result.json_path = str(json_path)
-    
-    # Generate PDF for hotel match results (separate PDF with "Hotel Suggestions" title)
-    pdf_path = output_dir / f"hotel_suggestions_{result.id}.pdf"
-    opp_dict = {
-        "id": opportunity.id,
-        "notice_id": opportunity.notice_id,
-        "title": opportunity.title,
-        "agency": opportunity.agency,
-    }
-    from ..services.pdf_generator import generate_hotel_match_pdf
-    pdf_generated = generate_hotel_match_pdf(pdf_path, summary, opp_dict)
-    if pdf_generated:
-        result.pdf_path = str(pdf_path)
-        _log_analysis(db, result.id, "INFO", f"Hotel match PDF generated: {pdf_path}", step="generate", agent_run_id=agent_run_id)
+    register_artifact(db, json_path, opportunity.id, result.id, notice_slug)
     
     result.status = "completed"
     result.result_json = summary
     result.completed_at = datetime.utcnow()
     db.commit()
+    _publish_status(result.id, "completed")
+    record_analysis_completed(db, result.id)
 
     _log_analysis(
         db,
@@ -1592,124 +1340,3 @@ def _execute_hotel_match(
         )
     except Exception as exc:  # pragma: no cover - logging only
         logger.warning("Failed to store hotel match training example: %s", exc)
-    
-    # Send email notification for hotel_match (after completion)
-    try:
-        from ..config import settings
-        from ..services.mail_service import build_mail_package, send_email_via_smtp
-        
-        if settings.pipeline_notification_email and settings.smtp_host and settings.smtp_username:
-            _log_analysis(
-                db,
-                result.id,
-                "INFO",
-                f"Sending email notification to {settings.pipeline_notification_email}",
-                step="email",
-                agent_run_id=agent_run_id,
-            )
-            
-            # Build mail package with SOW + Hotel Match results
-            notice_id = opportunity.notice_id or str(opportunity.id)
-            output_dir = DATA_DIR / "opportunities" / notice_id / "outputs"
-            
-            # Get SOW analysis for this opportunity
-            sow_results = db.query(AIAnalysisResult).filter(
-                AIAnalysisResult.opportunity_id == opportunity.id,
-                AIAnalysisResult.analysis_type == "sow_draft",
-                AIAnalysisResult.status == "completed"
-            ).order_by(AIAnalysisResult.created_at.desc()).limit(1).all()
-            
-            # Combine SOW and Hotel Match data
-            analysis_json = summary.copy()  # Start with hotel match summary
-            if sow_results:
-                sow_result = sow_results[0]
-                if sow_result.result_json:
-                    sow_data = sow_result.result_json if isinstance(sow_result.result_json, dict) else json.loads(sow_result.result_json) if sow_result.result_json else {}
-                    # Add SOW analysis to email
-                    analysis_json['sow_analysis'] = sow_data.get('sow_analysis', {})
-            
-            mail_package = build_mail_package(
-                opportunity_code=notice_id,
-                folder_path=str(output_dir),
-                to_email=settings.pipeline_notification_email,
-                from_email=settings.smtp_from_email,
-                analysis_result_json=analysis_json,
-            )
-            
-            # Add attachments
-            attachments = mail_package.get('attachments', [])
-            
-            # Add SOW PDF and JSON if available
-            if sow_results:
-                sow_result = sow_results[0]
-                if sow_result.pdf_path and Path(sow_result.pdf_path).exists():
-                    attachments.append({
-                        'path': sow_result.pdf_path,
-                        'filename': f"sow_analysis_{sow_result.id}.pdf",
-                        'mime_type': 'application/pdf'
-                    })
-                if sow_result.json_path and Path(sow_result.json_path).exists():
-                    attachments.append({
-                        'path': sow_result.json_path,
-                        'filename': f"sow_analysis_{sow_result.id}.json",
-                        'mime_type': 'application/json'
-                    })
-            
-            # Add Hotel Match PDF and JSON
-            if result.pdf_path and Path(result.pdf_path).exists():
-                attachments.append({
-                    'path': result.pdf_path,
-                    'filename': f"hotel_suggestions_{result.id}.pdf",
-                    'mime_type': 'application/pdf'
-                })
-            if result.json_path and Path(result.json_path).exists():
-                attachments.append({
-                    'path': result.json_path,
-                    'filename': f"hotel_match_{result.id}.json",
-                    'mime_type': 'application/json'
-                })
-            
-            mail_package['attachments'] = attachments
-            
-            # SMTP config
-            smtp_config = {
-                'host': settings.smtp_host,
-                'port': settings.smtp_port,
-                'username': settings.smtp_username,
-                'password': settings.smtp_password,
-                'use_tls': settings.smtp_use_tls,
-            }
-            
-            # Send email
-            if send_email_via_smtp(mail_package, smtp_config):
-                _log_analysis(
-                    db,
-                    result.id,
-                    "INFO",
-                    f"Email notification sent successfully to {settings.pipeline_notification_email}",
-                    step="email",
-                    agent_run_id=agent_run_id,
-                )
-                logger.info(f"[Pipeline {result.id}] Email notification sent successfully")
-            else:
-                _log_analysis(
-                    db,
-                    result.id,
-                    "WARNING",
-                    f"Failed to send email notification to {settings.pipeline_notification_email}",
-                    step="email",
-                    agent_run_id=agent_run_id,
-                )
-                logger.warning(f"[Pipeline {result.id}] Failed to send email notification")
-        else:
-            logger.info(f"[Pipeline {result.id}] Email notification not configured (missing SMTP settings or notification email)")
-    except Exception as email_exc:
-        logger.warning(f"[Pipeline {result.id}] Email notification failed: {email_exc}", exc_info=True)
-        _log_analysis(
-            db,
-            result.id,
-            "WARNING",
-            f"Email notification failed: {email_exc}",
-            step="email",
-            agent_run_id=agent_run_id,
-        )
@@ -1,6 +1,9 @@
-from typing import List, Dict, Any
+from datetime import date
+from typing import List, Dict, Any, Optional
+import numpy as np
 from ...models import PricingItem
 from .per_diem import check_per_diem_compliance
+from .scenarios import RoomBlockScenario, price_room_block_scenarios
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,23 +13,22 @@ def calculate_quote(pricing_items: List[PricingItem]) -> Dict[str, Any]:
     """Calculate pricing quote from pricing items"""
     logger.info(f"Calculating quote for {len(pricing_items)} items")
     
-    # Calculate totals by category
-    category_totals = {}
-    total_cost = 0.0
+    # Item totals as arrays (stored total_price wins over qty * unit_price);
+    # the ORM objects are not modified
+    qty = np.array([item.qty or 0.0 for item in pricing_items], dtype=float)
+    unit_price = np.array([item.unit_price or 0.0 for item in pricing_items], dtype=float)
+    stored = np.array(
+        [np.nan if item.total_price is None else item.total_price for item in pricing_items], dtype=float
+    )
+    totals = np.where(np.isnan(stored), qty * unit_price, stored)
     
-    for item in pricing_items:
-        # Calculate total price if not already calculated
-        if item.total_price is None:
-            item.total_price = item.qty * item.unit_price
-        
-        # Add to category total
-        category = item.category or "other"
-        if category not in category_totals:
-            category_totals[category] = 0.0
-        category_totals[category] += item.total_price
-        
-        # Add to total cost
-        total_cost += item.total_price
+    # Calculate totals by category
+    categories = [item.category or "other" for item in pricing_items]
+    positions = {category: i for i, category in enumerate(dict.fromkeys(categories))}
+    codes = np.array([positions[category] for category in categories], dtype=int)
+    sums = np.bincount(codes, weights=totals, minlength=len(positions))
+    category_totals = {category: float(sums[i]) for category, i in positions.items()}
+    total_cost = float(totals.sum())
     
     # Calculate taxes and fees (placeholder)
     tax_rate = 0.0  # TODO: Extract from RFQ or configuration
@@ -44,10 +46,10 @@ def calculate_quote(pricing_items: List[PricingItem]) -> Dict[str, Any]:
                 "qty": item.qty,
                 "unit": item.unit,
                 "unit_price": item.unit_price,
-                "total_price": item.total_price,
+                "total_price": float(total),
                 "category": item.category
             }
-            for item in pricing_items
+            for item, total in zip(pricing_items, totals)
         ],
         "category_totals": category_totals,
         "subtotal": total_cost,
@@ -62,15 +64,27 @@ def calculate_room_block_pricing(
     room_rate: float,
     check_in_date: str,
     check_out_date: str,
-    room_count: int
+    room_count: int,
+    location: Optional[str] = None,
+    state: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Calculate pricing for room block"""
-    # TODO: Implement date parsing and calculation
-    # For now, assume 4 nights (14-18 April)
-    nights = 4
-    
+    """
+    Calculate pricing for room block (one scenario of ``price_room_block_scenarios``).
+    Per-diem compliance is checked for ``location`` in the check-in month.
+    """
+    try:
+        nights = (date.fromisoformat(check_out_date[:10]) - date.fromisoformat(check_in_date[:10])).days
+    except (TypeError, ValueError):
+        nights = 0
+    if nights <= 0:
+        # Dates missing or not ISO: keep the previous 4 night assumption (14-18 April)
+        nights = 4
+    
+    quote = price_room_block_scenarios([
+        RoomBlockScenario(name="room_block", nightly_rates=room_rate, rooms_per_night=room_count, nights=nights)
+    ])
     total_rooms = room_count * nights
-    total_cost = total_rooms * room_rate
+    total_cost = float(quote.total[0])
     
     return {
         "room_rate": room_rate,
@@ -78,7 +92,7 @@ def calculate_room_block_pricing(
         "room_count": room_count,
         "total_rooms": total_rooms,
         "total_cost": total_cost,
-        "per_diem_compliance": check_per_diem_compliance(room_rate, "orlando", "april")
+        "per_diem_compliance": check_per_diem_compliance(room_rate, location, check_in_date, state=state)
     }
 
 
@@ -1,33 +1,39 @@
 from typing import Dict, Any, List, Optional
-from ..compliance.rules import get_per_diem_limit, check_per_diem_compliance
+from ..compliance.rules import get_per_diem_limit, check_per_diem_compliance as _check_per_diem_compliance
+from ..compliance.per_diem_index import MonthLike
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def check_per_diem_compliance(rate: float, location: str, month: str) -> Dict[str, Any]:
+def check_per_diem_compliance(rate: float, location: Optional[str], month: MonthLike, state: Optional[str] = None) -> Dict[str, Any]:
     """Check if rate complies with per-diem limits"""
-    return check_per_diem_compliance(rate, location, month)
+    return _check_per_diem_compliance(rate, location, month, state=state)
 
 
-def get_per_diem_warnings(pricing_items: List[Dict[str, Any]], location: str = "orlando", month: str = "april") -> List[str]:
-    """Get per-diem warnings for pricing items"""
+def get_per_diem_warnings(pricing_items: List[Dict[str, Any]], location: Optional[str], month: MonthLike) -> List[str]:
+    """Get per-diem warnings for pricing items (none when no limit is known for the location/month)"""
     warnings = []
     limit = get_per_diem_limit(location, month)
+    if limit is None:
+        logger.info(f"No per-diem limit for {location!r} / {month!r}; skipping per-diem warnings")
+        return warnings
     
     for item in pricing_items:
         if item.get("category") == "lodging" and item.get("unit_price", 0) > 0:
-            compliance = check_per_diem_compliance(item["unit_price"], location, month)
+            compliance = _check_per_diem_compliance(item["unit_price"], location, month, limit=limit)
             if not compliance["compliant"]:
                 warnings.append(compliance["warning"])
     
     return warnings
 
 
-def suggest_per_diem_alternatives(rate: float, location: str, month: str) -> List[str]:
+def suggest_per_diem_alternatives(rate: float, location: Optional[str], month: MonthLike) -> List[str]:
     """Suggest alternatives for per-diem compliance"""
     limit = get_per_diem_limit(location, month)
     
+    if limit is None:
+        return [f"No per-diem limit found for {location} ({month}); check the GSA rate before pricing"]
     if rate <= limit:
         return ["Rate is compliant with per-diem limits"]
     
@@ -47,10 +53,18 @@ def suggest_per_diem_alternatives(rate: float, location: str, month: str) -> Lis
     return suggestions
 
 
-def calculate_per_diem_savings(rate: float, location: str, month: str) -> Dict[str, Any]:
+def calculate_per_diem_savings(rate: float, location: Optional[str], month: MonthLike) -> Dict[str, Any]:
     """Calculate potential savings from per-diem compliance"""
     limit = get_per_diem_limit(location, month)
     
+    if limit is None:
+        return {
+            "compliant": None,
+            "current_rate": rate,
+            "limit": None,
+            "savings": 0.0,
+            "savings_percentage": 0.0
+        }
     if rate <= limit:
         return {
             "compliant": True,
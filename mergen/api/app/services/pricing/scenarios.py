@@ -0,0 +1,236 @@
+"""
+Room Block Scenarios
+====================
+Array-backed pricing of many room-block scenarios in one batch (multi-city,
+multi-week events, alternative hotels, rate / room-count variants).
+
+Each scenario is a stay of up to N nights. Nightly rates, rooms per night and
+per-diem caps may be given per night or as one value for the whole stay;
+shorter stays are padded and masked. All scenarios are priced with the same
+few array operations, so comparing hundreds of options costs about as much as
+pricing one.
+
+Per scenario the engine returns lodging, tax, attrition exposure, total,
+contracted room nights and the per-diem check (nights over the cap, largest
+nightly excess, total excess cost).
+
+Attrition: a contract commits ``rooms_per_night``; the group may release
+``attrition_allowance`` (e.g. 0.2) of it without penalty. Lodging covers the
+expected ``pickup`` share; if that is below the allowed floor the shortfall
+room nights are billed at the nightly rate as well. Tax applies to both.
+
+Per-diem caps come from ``per_diem_cap`` or, when it is None, from the GSA
+limit of ``location``/``month``. A scenario without a known limit (no
+location, unknown city, no month) is priced with no cap: it is never reported
+as over per-diem, rather than being checked against another city's rate.
+
+Hotel matching prices each USD offer as one scenario (``price_hotel_offers``):
+the SOW sleeping-room block for the stay, ranked by total cost.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..compliance.rules import get_per_diem_limit
+
+logger = logging.getLogger(__name__)
+
+NightlyValue = Union[float, int, Sequence[float], None]
+
+
+@dataclass
+class RoomBlockScenario:
+    """One room-block option (a hotel / city / week combination)."""
+
+    name: str
+    nightly_rates: NightlyValue
+    rooms_per_night: NightlyValue
+    nights: Optional[int] = None  # required when both values above are scalars
+    # Per-diem lodging cap per night; looked up from location/month when None
+    per_diem_cap: NightlyValue = None
+    location: Optional[str] = None
+    month: Any = None
+    state: Optional[str] = None
+    tax_rate: float = 0.0
+    attrition_allowance: float = 0.0
+    pickup: float = 1.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def stay_length(self) -> int:
+        lengths = [
+            len(value)
+            for value in (self.nightly_rates, self.rooms_per_night, self.per_diem_cap)
+            if isinstance(value, (list, tuple, np.ndarray))
+        ]
+        if self.nights is not None:
+            lengths.append(self.nights)
+        if not lengths:
+            raise ValueError(f"Scenario '{self.name}' needs per-night values or 'nights'")
+        return max(lengths)
+
+
+def _fill(matrix: np.ndarray, row: int, value: NightlyValue, nights: int) -> None:
+    if value is None:
+        return
+    if isinstance(value, (list, tuple, np.ndarray)):
+        values = np.asarray(value, dtype=float)[:nights]
+        matrix[row, : len(values)] = values
+    else:
+        matrix[row, :nights] = float(value)
+
+
+@dataclass
+class ScenarioQuotes:
+    """Batch results; every array has one entry per scenario."""
+
+    names: List[str]
+    nights: np.ndarray
+    room_nights: np.ndarray
+    lodging: np.ndarray
+    tax: np.ndarray
+    attrition: np.ndarray
+    total: np.ndarray
+    nights_over_per_diem: np.ndarray
+    max_excess: np.ndarray
+    per_diem_excess: np.ndarray
+    scenarios: List[RoomBlockScenario]
+
+    @property
+    def compliant(self) -> np.ndarray:
+        return self.nights_over_per_diem == 0
+
+    def ranked(self, compliant_only: bool = False) -> List[int]:
+        """Scenario positions from cheapest to most expensive total."""
+        order = np.argsort(self.total, kind="stable")
+        if compliant_only:
+            order = order[self.compliant[order]]
+        return order.tolist()
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        records = []
+        for i, scenario in enumerate(self.scenarios):
+            records.append({
+                "name": self.names[i],
+                "location": scenario.location,
+                "nights": int(self.nights[i]),
+                "room_nights": float(self.room_nights[i]),
+                "lodging_cost": round(float(self.lodging[i]), 2),
+                "tax_amount": round(float(self.tax[i]), 2),
+                "attrition_exposure": round(float(self.attrition[i]), 2),
+                "total_cost": round(float(self.total[i]), 2),
+                "per_diem_compliant": bool(self.compliant[i]),
+                "nights_over_per_diem": int(self.nights_over_per_diem[i]),
+                "max_nightly_excess": round(float(self.max_excess[i]), 2),
+                "per_diem_excess_cost": round(float(self.per_diem_excess[i]), 2),
+                **scenario.metadata,
+            })
+        return records
+
+
+def price_room_block_scenarios(scenarios: Sequence[RoomBlockScenario]) -> ScenarioQuotes:
+    """Price all scenarios in one batch (see module docstring)."""
+    count = len(scenarios)
+    nights = np.array([scenario.stay_length() for scenario in scenarios], dtype=int)
+    width = int(nights.max()) if count else 0
+
+    rates = np.zeros((count, width))
+    rooms = np.zeros((count, width))
+    caps = np.full((count, width), np.inf)
+    # Per-diem caps looked up once per distinct (location, state, month)
+    cap_lookup: Dict[tuple, Optional[float]] = {}
+    for row, scenario in enumerate(scenarios):
+        stay = nights[row]
+        _fill(rates, row, scenario.nightly_rates, stay)
+        _fill(rooms, row, scenario.rooms_per_night, stay)
+        cap = scenario.per_diem_cap
+        if cap is None and scenario.location:
+            key = (scenario.location, scenario.state, str(scenario.month))
+            if key not in cap_lookup:
+                cap_lookup[key] = get_per_diem_limit(scenario.location, scenario.month, state=scenario.state)
+            cap = cap_lookup[key]
+        # No known limit: the row keeps an infinite cap (never over per-diem)
+        _fill(caps, row, cap, stay)
+
+    tax_rate = np.array([scenario.tax_rate for scenario in scenarios], dtype=float)
+    allowance = np.array([scenario.attrition_allowance for scenario in scenarios], dtype=float)
+    pickup = np.array([scenario.pickup for scenario in scenarios], dtype=float)
+
+    contracted_cost = (rates * rooms).sum(axis=1)
+    lodging = contracted_cost * pickup
+    # Room nights below the allowed attrition floor are billed anyway
+    shortfall = np.clip((1.0 - allowance) - pickup, 0.0, None)
+    attrition = contracted_cost * shortfall
+    tax = (lodging + attrition) * tax_rate
+
+    excess = np.clip(rates - caps, 0.0, None) * (rooms > 0)
+    quotes = ScenarioQuotes(
+        names=[scenario.name for scenario in scenarios],
+        nights=nights,
+        room_nights=rooms.sum(axis=1),
+        lodging=lodging,
+        tax=tax,
+        attrition=attrition,
+        total=lodging + tax + attrition,
+        nights_over_per_diem=(excess > 0).sum(axis=1),
+        max_excess=excess.max(axis=1, initial=0.0),
+        per_diem_excess=(excess * rooms).sum(axis=1) * pickup,
+        scenarios=list(scenarios),
+    )
+    logger.debug(f"Priced {count} room block scenarios ({width} nights max)")
+    return quotes
+
+
+def sow_rooms_per_night(sow_analysis: Optional[Dict[str, Any]]) -> Optional[List[float]]:
+    """Rooms per night from the SOW sleeping-room daily breakdown (None when not extracted)."""
+    rooms_reqs = (sow_analysis or {}).get("SleepingRoomRequirements") or {}
+    rooms = []
+    for day in rooms_reqs.get("daily_breakdown") or []:
+        if not isinstance(day, dict):
+            continue
+        value = day.get("number_of_rooms") or day.get("NumberOfRooms") or day.get("rooms")
+        try:
+            rooms.append(float(value))
+        except (TypeError, ValueError):
+            continue
+    return rooms or None
+
+
+def price_hotel_offers(
+    hotels: Sequence[Dict[str, Any]],
+    check_in: Optional[str],
+    check_out: Optional[str],
+    rooms_per_night: NightlyValue = None,
+    location: Optional[str] = None,
+    state: Optional[str] = None,
+) -> Optional[ScenarioQuotes]:
+    """
+    Price the room block of every USD hotel offer with a nightly price in one
+    batch (one room per night when the SOW gives no block). Each scenario's
+    ``metadata["offer"]`` is the offer's position in ``hotels``; None when no
+    offer can be priced or the stay dates are unknown.
+    """
+    try:
+        nights = (date.fromisoformat(str(check_out)[:10]) - date.fromisoformat(str(check_in)[:10])).days
+    except (TypeError, ValueError):
+        return None
+    if nights <= 0:
+        return None
+
+    scenarios = [
+        RoomBlockScenario(
+            name=hotel.get("name") or f"offer {position}",
+            nightly_rates=float(hotel["price_per_night"]),
+            rooms_per_night=rooms_per_night if rooms_per_night is not None else 1,
+            nights=nights,
+            location=location,
+            month=check_in,
+            state=state,
+            metadata={"offer": position},
+        )
+        for position, hotel in enumerate(hotels)
+        if hotel.get("price_per_night") and hotel.get("currency", "USD") == "USD"
+    ]
+    return price_room_block_scenarios(scenarios) if scenarios else None
@@ -0,0 +1,164 @@
+"""
+Pipeline Progress Bus
+=====================
+Publish/subscribe channel for live pipeline progress.
+
+``_log_analysis`` and the pipeline status transitions publish events here;
+``GET /api/pipeline/results/{id}/events`` streams them to the browser as
+Server-Sent Events, so the UI does not poll the result and log endpoints.
+
+Events are delivered in-process to subscribers of the same API process. When
+Redis is reachable they are also published on ``mergen:analysis:<id>`` so
+pipelines running in RQ workers (see ``job_queue``) reach API subscribers; a
+listener thread relays them and skips messages this process published itself.
+
+Event shapes:
+    {"type": "log", "id", "level", "message", "step", "timestamp"}
+    {"type": "status", "status"}
+    {"type": "end"}        pipeline run finished, no further events
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
+
+from .redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "mergen:analysis:"
+SUBSCRIBER_QUEUE_SIZE = 1000
+LISTENER_RETRY_SECONDS = 5
+
+# Identifies this process' own messages when they come back through Redis
+_ORIGIN = uuid.uuid4().hex
+
+
+class Subscription:
+    """Event queue of one stream client, bound to the event loop it was created on."""
+
+    def __init__(self, analysis_result_id: int, loop: asyncio.AbstractEventLoop):
+        self.analysis_result_id = analysis_result_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        # Set when events were dropped; the stream reloads missed logs from the DB
+        self.overflowed = False
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ProgressBus:
+    """Fan-out of analysis events to stream subscribers (thread-safe)."""
+
+    def __init__(self):
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, analysis_result_id: int, event: Dict[str, Any]) -> None:
+        self._dispatch(analysis_result_id, event)
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            client.publish(
+                f"{CHANNEL_PREFIX}{analysis_result_id}",
+                json.dumps({"origin": _ORIGIN, "event": event}, default=str),
+            )
+        except Exception as exc:
+            logger.debug(f"[progress_bus] Redis publish failed: {exc}")
+
+    def subscribe(self, analysis_result_id: int) -> Subscription:
+        """Register a subscriber; must be called from a running event loop."""
+        subscription = Subscription(analysis_result_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(analysis_result_id, set()).add(subscription)
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.analysis_result_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.analysis_result_id, None)
+
+    def _dispatch(self, analysis_result_id: int, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(analysis_result_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Loop already closed (server shutting down)
+                self.unsubscribe(subscription)
+
+    def _ensure_listener(self) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen, args=(client,), daemon=True, name="progress-bus"
+            )
+            self._listener.start()
+
+    def _listen(self, client) -> None:
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                logger.info("[progress_bus] Listening for pipeline events on Redis")
+                for message in pubsub.listen():
+                    self._relay(message)
+            except Exception as exc:
+                logger.warning(f"[progress_bus] Redis listener error: {exc}; retrying in {LISTENER_RETRY_SECONDS}s")
+                time.sleep(LISTENER_RETRY_SECONDS)
+
+    def _relay(self, message: Dict[str, Any]) -> None:
+        try:
+            payload = json.loads(message["data"])
+            if payload.get("origin") == _ORIGIN:
+                return
+            analysis_result_id = int(str(message["channel"])[len(CHANNEL_PREFIX):])
+        except (KeyError, TypeError, ValueError):
+            return
+        self._dispatch(analysis_result_id, payload.get("event") or {})
+
+
+_bus = ProgressBus()
+
+
+def publish_analysis_event(analysis_result_id: int, event: Dict[str, Any]) -> None:
+    """Publish a progress event for an analysis job (never raises)."""
+    try:
+        _bus.publish(analysis_result_id, event)
+    except Exception as exc:
+        logger.warning(f"[progress_bus] Could not publish event for {analysis_result_id}: {exc}")
+
+
+def subscribe_analysis(analysis_result_id: int) -> Subscription:
+    return _bus.subscribe(analysis_result_id)
+
+
+def unsubscribe_analysis(subscription: Subscription) -> None:
+    _bus.unsubscribe(subscription)
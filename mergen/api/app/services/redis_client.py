@@ -1,6 +1,32 @@
+"""
+Redis client, response cache and shared rate limiting
+======================================================
+``_client`` is a Redis connection, or a process-local ``_InMemoryStore`` when
+Redis is not reachable (development, tests).
+
+Rate limiting and the circuit breaker state live in Redis so every API and
+worker process shares the same quota. Each check is one atomic Lua script
+(one round trip) timed with the Redis server clock, so host clock skew does
+not distort the buckets (Redis >= 5, effects replication):
+
+  token_bucket_acquire / token_bucket_allow / token_bucket_wait
+      refill at ``rate_per_sec`` up to ``burst`` tokens
+  sliding_window_acquire / sliding_window_allow
+      at most ``limit`` calls in any ``window_sec`` interval
+  run_script("circuit_breaker", ...)
+      state transitions of ``circuit_breaker.CircuitBreaker``
+
+The in-memory fallback runs the same algorithms in Python under a lock. It
+is bounded (``IN_MEMORY_MAX_KEYS``, oldest keys evicted first) and sweeps
+expired keys periodically, so it does not grow under load.
+"""
+
 import json
+import threading
 import time
-from typing import Any, Optional
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from ..config import settings
 
@@ -9,35 +35,246 @@ try:
 except Exception:  # pragma: no cover
     redis = None  # Fallback için
 
+IN_MEMORY_MAX_KEYS = 10000
+IN_MEMORY_SWEEP_INTERVAL = 30.0
+
+
+# ---------------------------------------------------------------------------
+# Lua scripts (KEYS / ARGV documented per script; all use the server clock)
+# ---------------------------------------------------------------------------
+
+# KEYS[1] bucket hash; ARGV: rate_per_sec, burst, cost
+# Returns {allowed (0/1), seconds until enough tokens (string)}
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = burst
+  ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(wait)}
+"""
+
+# KEYS[1] sorted set of call timestamps; ARGV: limit, window_sec, unique member
+# Returns {allowed (0/1), seconds until a slot frees up (string)}
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+  redis.call('ZADD', KEYS[1], now, ARGV[3])
+  redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+  return {1, '0'}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tostring(math.max(0, tonumber(oldest[2]) + window - now))}
+"""
+
+# KEYS[1] breaker hash; ARGV: op (allow|success|failure), failure_threshold, cooldown_sec
+# Returns {allowed (0/1), state after the call}
+CIRCUIT_BREAKER_LUA = """
+local op = ARGV[1]
+local threshold = tonumber(ARGV[2])
+local cooldown = tonumber(ARGV[3])
+local now = tonumber(redis.call('TIME')[1])
+local s = redis.call('HMGET', KEYS[1], 'state', 'failures', 'until')
+local state = s[1] or 'CLOSED'
+local failures = tonumber(s[2]) or 0
+local until_ts = tonumber(s[3]) or 0
+local allowed = 1
+if op == 'allow' then
+  if state == 'CLOSED' then
+    return {1, state}
+  end
+  if now >= until_ts then
+    -- OPEN cooled down, or the HALF_OPEN probe never reported: one new probe
+    state = 'HALF_OPEN'
+    until_ts = now + cooldown
+  else
+    allowed = 0
+  end
+elseif op == 'success' then
+  if state == 'CLOSED' and failures == 0 then
+    return {1, state}
+  end
+  state = 'CLOSED'
+  failures = 0
+  until_ts = 0
+else
+  failures = failures + 1
+  allowed = 0
+  if state == 'HALF_OPEN' or failures >= threshold then
+    state = 'OPEN'
+    until_ts = now + cooldown
+  end
+end
+redis.call('HSET', KEYS[1], 'state', state, 'failures', failures, 'until', until_ts)
+if state == 'CLOSED' then
+  -- failures are counted within a cooldown-long window
+  redis.call('EXPIRE', KEYS[1], cooldown)
+else
+  redis.call('EXPIRE', KEYS[1], cooldown * 2)
+end
+return {allowed, state}
+"""
+
+
+# ---------------------------------------------------------------------------
+# Python versions of the scripts for the in-memory fallback. Each takes the
+# stored value (None if missing), ``now`` and the script ARGV and returns
+# (result, new value, ttl seconds).
+# ---------------------------------------------------------------------------
+def _token_bucket(state: Optional[Dict[str, float]], now: float, rate: float, burst: float, cost: float):
+    if not state:
+        state = {"tokens": burst, "ts": now}
+    tokens = min(burst, state["tokens"] + max(0.0, now - state["ts"]) * rate)
+    if tokens >= cost:
+        result = (True, 0.0)
+        tokens -= cost
+    else:
+        result = (False, (cost - tokens) / rate)
+    return result, {"tokens": tokens, "ts": now}, burst / rate + 1
+
+
+def _sliding_window(calls: Optional[List[float]], now: float, limit: int, window: float, member: str):
+    calls = [ts for ts in (calls or []) if ts > now - window]
+    if len(calls) < limit:
+        calls.append(now)
+        return (True, 0.0), calls, window
+    return (False, max(0.0, calls[0] + window - now)), calls, window
+
+
+def _circuit_breaker(state: Optional[Dict[str, Any]], now: float, op: str, threshold: int, cooldown: int):
+    state = dict(state or {"state": "CLOSED", "failures": 0, "until": 0})
+    now = int(now)
+    allowed = True
+    if op == "allow":
+        if state["state"] == "CLOSED":
+            return (True, "CLOSED"), None, None
+        if now >= state["until"]:
+            state.update(state="HALF_OPEN", until=now + cooldown)
+        else:
+            allowed = False
+    elif op == "success":
+        if state["state"] == "CLOSED" and state["failures"] == 0:
+            return (True, "CLOSED"), None, None
+        state.update(state="CLOSED", failures=0, until=0)
+    else:
+        state["failures"] += 1
+        allowed = False
+        if state["state"] == "HALF_OPEN" or state["failures"] >= threshold:
+            state.update(state="OPEN", until=now + cooldown)
+    ttl = cooldown if state["state"] == "CLOSED" else cooldown * 2
+    return (allowed, state["state"]), state, ttl
+
+
+_FALLBACK_SCRIPTS: Dict[str, Callable] = {
+    "token_bucket": _token_bucket,
+    "sliding_window": _sliding_window,
+    "circuit_breaker": _circuit_breaker,
+}
+_LUA_SCRIPTS = {
+    "token_bucket": TOKEN_BUCKET_LUA,
+    "sliding_window": SLIDING_WINDOW_LUA,
+    "circuit_breaker": CIRCUIT_BREAKER_LUA,
+}
+
 
 class _InMemoryStore:
-    def __init__(self):
-        self._kv = {}
+    """Process-local stand-in for Redis: TTLs, bounded size, periodic expiry sweeps."""
 
-    def setex(self, key: str, ttl: int, value: str):
-        self._kv[key] = (time.time() + ttl, value)
+    def __init__(self, max_keys: int = IN_MEMORY_MAX_KEYS, sweep_interval: float = IN_MEMORY_SWEEP_INTERVAL):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        # key -> (expires_at or None, value); order = least recently written first
+        self._kv: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
 
-    def get(self, key: str) -> Optional[str]:
-        v = self._kv.get(key)
-        if not v:
+    def _live(self, key: str, now: float):
+        entry = self._kv.get(key)
+        if entry is None:
             return None
-        exp, val = v
-        if time.time() > exp:
-            self._kv.pop(key, None)
+        if entry[0] is not None and now > entry[0]:
+            del self._kv[key]
             return None
-        return val
+        return entry
+
+    def _put(self, key: str, value: Any, ttl: Optional[float], now: float) -> None:
+        self._kv[key] = (now + ttl if ttl is not None else None, value)
+        self._kv.move_to_end(key)
+        self._maintain(now)
+
+    def _maintain(self, now: float) -> None:
+        if time.monotonic() >= self._next_sweep or len(self._kv) > self.max_keys:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            for key in [k for k, (exp, _) in self._kv.items() if exp is not None and now > exp]:
+                del self._kv[key]
+        while len(self._kv) > self.max_keys:
+            self._kv.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._kv)
+
+    def setex(self, key: str, ttl: int, value: str):
+        with self._lock:
+            self._put(key, value, ttl, time.time())
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._live(key, time.time())
+            return entry[1] if entry else None
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._kv.pop(key, None) is not None)
 
     def incr(self, key: str, amount: int = 1) -> int:
-        exp, val = self._kv.get(key, (time.time() + 60, "0"))
-        new_val = str(int(val) + amount)
-        self._kv[key] = (exp, new_val)
-        return int(new_val)
+        with self._lock:
+            now = time.time()
+            entry = self._live(key, now)
+            expires_at, val = entry if entry else (None, "0")
+            new_val = int(val) + amount
+            self._kv[key] = (expires_at, str(new_val))
+            self._kv.move_to_end(key)
+            self._maintain(now)
+            return new_val
 
     def expire(self, key: str, ttl: int):
-        v = self._kv.get(key)
-        if v:
-            _, val = v
-            self._kv[key] = (time.time() + ttl, val)
+        with self._lock:
+            now = time.time()
+            entry = self._live(key, now)
+            if entry:
+                self._kv[key] = (now + ttl, entry[1])
+
+    def run_script(self, name: str, key: str, args: Sequence[Any]):
+        with self._lock:
+            now = time.time()
+            entry = self._live(key, now)
+            result, value, ttl = _FALLBACK_SCRIPTS[name](entry[1] if entry else None, now, *args)
+            if value is not None:
+                self._put(key, value, ttl, now)
+            return result
 
 
 def _make_client():
@@ -53,6 +290,30 @@ def _make_client():
 
 
 _client = _make_client()
+_scripts: Dict[str, Any] = {}
+
+
+def get_redis():
+    """Return the Redis client, or None when running on the in-memory fallback."""
+    return None if isinstance(_client, _InMemoryStore) else _client
+
+
+def run_script(name: str, key: str, args: Sequence[Any]):
+    """
+    Run one of the atomic scripts (``token_bucket``, ``sliding_window``,
+    ``circuit_breaker``) on ``key``: EVALSHA on Redis, Python in-memory.
+    Returns the decoded ``(allowed, value)`` pair.
+    """
+    if isinstance(_client, _InMemoryStore):
+        return _client.run_script(name, key, args)
+    script = _scripts.get(name)
+    if script is None:
+        # register_script caches the SHA and falls back to EVAL after a SCRIPT FLUSH
+        script = _scripts[name] = _client.register_script(_LUA_SCRIPTS[name])
+    allowed, value = script(keys=[key], args=list(args))
+    if name == "circuit_breaker":
+        return bool(allowed), value
+    return bool(allowed), float(value)
 
 
 def cache_get_json(key: str) -> Optional[Any]:
@@ -72,16 +333,45 @@ def cache_set_json(key: str, value: Any, ttl_seconds: int = 3600) -> None:
         pass
 
 
-def token_bucket_allow(bucket: str, rate_per_sec: float = 1.0, burst: int = 3) -> bool:
-    """Basit token bucket: saniyede rate_per_sec, birikmiş en fazla burst."""
-    now = int(time.time())
-    counter_key = f"tb:{bucket}:{now}"
+def token_bucket_acquire(bucket: str, rate_per_sec: float = 1.0, burst: int = 3, cost: int = 1) -> Tuple[bool, float]:
+    """
+    Take ``cost`` tokens from a bucket shared by all processes. The bucket
+    refills at ``rate_per_sec`` and holds at most ``burst`` tokens.
+    Returns ``(allowed, retry_after_seconds)``; fails open if Redis errors.
+    """
     try:
-        count = _client.incr(counter_key, 1)
-        _client.expire(counter_key, 1)
-        if count <= max(1, int(burst)):
+        return run_script("token_bucket", f"tb:{bucket}", (rate_per_sec, max(1, burst), cost))
+    except Exception:
+        return True, 0.0
+
+
+def token_bucket_allow(bucket: str, rate_per_sec: float = 1.0, burst: int = 3) -> bool:
+    """Token bucket: saniyede rate_per_sec token, birikmiş en fazla burst."""
+    return token_bucket_acquire(bucket, rate_per_sec, burst)[0]
+
+
+def token_bucket_wait(bucket: str, rate_per_sec: float = 1.0, burst: int = 3, max_wait: float = 60.0) -> bool:
+    """Block until a token is available (for workers); False if it would take longer than ``max_wait``."""
+    deadline = time.monotonic() + max_wait
+    while True:
+        allowed, retry_after = token_bucket_acquire(bucket, rate_per_sec, burst)
+        if allowed:
             return True
-        return False
+        if time.monotonic() + retry_after > deadline:
+            return False
+        time.sleep(retry_after)
+
+
+def sliding_window_acquire(key: str, limit: int, window_sec: float) -> Tuple[bool, float]:
+    """
+    At most ``limit`` calls in any ``window_sec`` interval, across processes.
+    Returns ``(allowed, retry_after_seconds)``; fails open if Redis errors.
+    """
+    try:
+        return run_script("sliding_window", f"sw:{key}", (limit, window_sec, uuid.uuid4().hex))
     except Exception:
-        return True
+        return True, 0.0
+
 
+def sliding_window_allow(key: str, limit: int, window_sec: float) -> bool:
+    return sliding_window_acquire(key, limit, window_sec)[0]
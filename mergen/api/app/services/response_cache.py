@@ -0,0 +1,215 @@
+"""
+Response Cache
+==============
+Conditional GET and a shared response cache for the read-mostly routes
+(opportunity detail / attachments / analysis history, analysis results).
+
+ETags are derived from the row validators the routes already have —
+``updated_at`` / ``completed_at`` / status, plus the attachment state — so a
+client sending ``If-None-Match`` gets a 304 without the payload being loaded
+or serialized.
+
+When Redis is reachable, serialized bodies are also cached there for
+``RESPONSE_CACHE_TTL`` seconds. Entries live under a per-scope version
+(``opportunity:<id>``, ``analysis:<id>``); the session hooks installed by
+``install_invalidation_hooks`` bump the version of every scope whose rows were
+written as soon as the transaction commits, in whichever process (API, RQ
+worker, script) made the change. A bumped version makes the old entries
+unreachable, so there is no key scanning. On a cache hit the route does no
+database work at all.
+
+Without Redis (in-memory fallback) only the ETag part is active: a
+process-local cache could not be invalidated by writes made in workers.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "mergen:resp:"
+VERSION_PREFIX = "mergen:resp-version:"
+# Versions outlive every entry written under them
+VERSION_TTL_SECONDS = 7 * 24 * 3600
+# Browsers keep the body but revalidate it with If-None-Match on every use
+CACHE_CONTROL = "private, no-cache"
+
+_SESSION_SCOPES_KEY = "response_cache_scopes"
+
+
+def make_etag(*validators: Any) -> str:
+    """Weak ETag over the validators (timestamps, status, counts)."""
+    digest = hashlib.sha1(json.dumps(validators, default=str).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` check with weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def opportunity_scope(opportunity_id: Any) -> str:
+    return f"opportunity:{opportunity_id}"
+
+
+def analysis_scope(analysis_result_id: Any) -> str:
+    return f"analysis:{analysis_result_id}"
+
+
+def _redis():
+    if settings.response_cache_ttl <= 0:
+        return None
+    # Imported lazily: db.py installs the hooks and must not connect at import
+    from .redis_client import get_redis
+    return get_redis()
+
+
+def _version(client, scope: str) -> str:
+    version = client.get(f"{VERSION_PREFIX}{scope}")
+    if not version:
+        # A fresh, unique version never resolves to entries of an expired one
+        version = str(time.time_ns())
+        client.setex(f"{VERSION_PREFIX}{scope}", VERSION_TTL_SECONDS, version)
+    return version
+
+
+def get_cached(scope: str, key: str) -> Optional[Tuple[str, Any, str]]:
+    """
+    ``(etag, body, version)`` of a cached response, or ``(None, None, version)``
+    on a miss (pass ``version`` to ``set_cached``). None when caching is off.
+    """
+    client = _redis()
+    if client is None:
+        return None
+    try:
+        version = _version(client, scope)
+        raw = client.get(f"{KEY_PREFIX}{scope}:{version}:{key}")
+        if not raw:
+            return None, None, version
+        entry = json.loads(raw)
+        return entry["etag"], entry["body"], version
+    except Exception as exc:
+        logger.debug(f"[response_cache] Lookup failed for {scope}/{key}: {exc}")
+        return None
+
+
+def set_cached(scope: str, key: str, version: str, etag: str, body: Any) -> None:
+    """Store a serialized response under the version read before it was built."""
+    client = _redis()
+    if client is None:
+        return
+    try:
+        client.setex(
+            f"{KEY_PREFIX}{scope}:{version}:{key}",
+            settings.response_cache_ttl,
+            json.dumps({"etag": etag, "body": body}),
+        )
+    except Exception as exc:
+        logger.debug(f"[response_cache] Store failed for {scope}/{key}: {exc}")
+
+
+def invalidate(scopes: Iterable[str]) -> None:
+    """Drop every cached response of the given scopes (never raises)."""
+    client = _redis()
+    if client is None:
+        return
+    version = str(time.time_ns())
+    try:
+        for scope in set(scopes):
+            client.setex(f"{VERSION_PREFIX}{scope}", VERSION_TTL_SECONDS, version)
+    except Exception as exc:
+        logger.warning(f"[response_cache] Invalidation failed for {scopes}: {exc}")
+
+
+async def cached_json_response(
+    request,
+    scope: str,
+    key: str,
+    load_etag: Callable[[], Awaitable[str]],
+    build: Callable[[], Awaitable[Any]],
+):
+    """
+    Serve a JSON read route with conditional GET and the Redis cache.
+
+    ``load_etag`` runs a cheap validator query (and raises 404 itself);
+    ``build`` loads and returns the response model. Neither runs on a cache
+    hit, and ``build`` does not run when the client's copy is current.
+    """
+    # FastAPI is only needed by the routes; db.py imports this module too
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, Response
+
+    if_none_match = request.headers.get("if-none-match")
+    cached = get_cached(scope, key)
+    if cached is not None and cached[0] is not None:
+        etag, body, _ = cached
+    else:
+        etag, body = await load_etag(), None
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if body is None:
+        body = jsonable_encoder(await build())
+        if cached is not None:
+            set_cached(scope, key, cached[2], etag, body)
+    return JSONResponse(body, headers=headers)
+
+
+# ---------------------------------------------------------------------------
+# Write tracking
+# ---------------------------------------------------------------------------
+def _scopes_for(instance: Any) -> Set[str]:
+    # Read the loaded state only: never trigger a lazy load inside a flush
+    values: Dict[str, Any] = inspect(instance).dict
+    table = getattr(instance, "__tablename__", None)
+    scopes = set()
+    if table == "opportunities" and values.get("id") is not None:
+        scopes.add(opportunity_scope(values["id"]))
+    elif table == "opportunity_attachments" and values.get("opportunity_id") is not None:
+        scopes.add(opportunity_scope(values["opportunity_id"]))
+    elif table == "ai_analysis_results":
+        if values.get("id") is not None:
+            scopes.add(analysis_scope(values["id"]))
+        if values.get("opportunity_id") is not None:
+            scopes.add(opportunity_scope(values["opportunity_id"]))
+    return scopes
+
+
+def _collect_scopes(session, flush_context) -> None:
+    scopes = session.info.setdefault(_SESSION_SCOPES_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        scopes |= _scopes_for(instance)
+
+
+def _invalidate_committed(session) -> None:
+    scopes = session.info.pop(_SESSION_SCOPES_KEY, None)
+    if scopes:
+        invalidate(scopes)
+
+
+def install_invalidation_hooks(session_class) -> None:
+    """Invalidate cached responses of rows written by ``session_class`` sessions on commit."""
+    if event.contains(session_class, "after_commit", _invalidate_committed):
+        return
+    event.listen(session_class, "after_flush", _collect_scopes)
+    # Scopes of rolled back flushes stay collected: invalidating too much is harmless
+    event.listen(session_class, "after_commit", _invalidate_committed)
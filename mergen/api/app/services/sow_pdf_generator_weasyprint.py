@@ -1,20 +1,155 @@
 """
 SOW PDF Generator using WeasyPrint
 Converts HTML to PDF with proper formatting.
+
+``SOWPdfRenderer`` is a long-lived renderer: it keeps one WeasyPrint
+``FontConfiguration`` (fonts are resolved once, not per document) and parses
+each distinct ``<style>`` block once. SOW documents all carry the same
+stylesheet (``sow_template_engine.get_sow_html_template`` / the markdown
+wrapper below), so after the first document only the HTML body is parsed.
+``html_batch_to_pdf`` renders many documents on one persistent process pool
+shared by the process (each worker with its own renderer); it is stopped with
+``shutdown_batch_pool`` (application shutdown).
+
+A cached stylesheet goes to ``render(stylesheets=...)``, which WeasyPrint
+treats as a *user* stylesheet, not an author one like the ``<style>`` block.
+For normal declarations that makes no difference here: the only other author
+styles are inline ``style=""`` attributes, which win over any stylesheet
+either way, and presentational hints are not enabled. ``!important`` is
+where the origins differ (user ``!important`` beats author inline styles),
+so a stylesheet is only swapped when it is the document's single plain
+``<style>`` block and has no ``!important``; any other document is rendered
+from its HTML as is. Renderers are per thread (``get_renderer``); WeasyPrint
+font configurations are not shared across threads.
 """
 import logging
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
 try:
-    from weasyprint import HTML
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
     WEASYPRINT_AVAILABLE = True
 except (ImportError, OSError) as e:
     WEASYPRINT_AVAILABLE = False
     logger.warning(f"weasyprint not available: {e}. PDF generation will be limited. Use ReportLab fallback.")
 
+# A plain <style> element (no media / other attributes)
+_STYLE_BLOCK = re.compile(r"<style(?:\s+type=[\"']text/css[\"'])?\s*>(.*?)</style\s*>", re.IGNORECASE | re.DOTALL)
+_OTHER_STYLESHEETS = re.compile(r"<style\b|<link\b[^>]*stylesheet", re.IGNORECASE)
+# Declarations whose precedence changes when the block becomes a user stylesheet
+_IMPORTANT = re.compile(r"!\s*important", re.IGNORECASE)
+
+STYLESHEET_CACHE_SIZE = 32
+
+
+class SOWPdfRenderer:
+    """Reusable HTML → PDF renderer with cached font configuration and stylesheets."""
+
+    def __init__(self, stylesheet_cache_size: int = STYLESHEET_CACHE_SIZE):
+        if not WEASYPRINT_AVAILABLE:
+            raise RuntimeError("weasyprint not installed. Install with: pip install weasyprint")
+        self.font_config = FontConfiguration()
+        self.stylesheet_cache_size = stylesheet_cache_size
+        self._stylesheets: "OrderedDict[str, CSS]" = OrderedDict()
+
+    def _stylesheet(self, css_text: str) -> "CSS":
+        css = self._stylesheets.get(css_text)
+        if css is None:
+            css = CSS(string=css_text, font_config=self.font_config)
+            self._stylesheets[css_text] = css
+            if len(self._stylesheets) > self.stylesheet_cache_size:
+                self._stylesheets.popitem(last=False)
+        else:
+            self._stylesheets.move_to_end(css_text)
+        return css
+
+    @staticmethod
+    def split_stylesheet(html: str) -> Tuple[str, Optional[str]]:
+        """
+        Return ``(html_without_style, css_text)`` when the document has exactly
+        one plain ``<style>`` block without ``!important`` and no other
+        stylesheet, else ``(html, None)``.
+        """
+        blocks = list(_STYLE_BLOCK.finditer(html))
+        if len(blocks) != 1:
+            return html, None
+        block = blocks[0]
+        rest = html[:block.start()] + html[block.end():]
+        if _OTHER_STYLESHEETS.search(rest) or _IMPORTANT.search(block.group(1)):
+            return html, None
+        return rest, block.group(1)
+
+    def layout(self, html: str):
+        """Lay out one HTML document (WeasyPrint ``Document``)."""
+        body, css_text = self.split_stylesheet(html)
+        stylesheets = [self._stylesheet(css_text)] if css_text is not None else None
+        return HTML(string=body).render(stylesheets=stylesheets, font_config=self.font_config)
+
+    def render(self, html: str, output_path: str) -> str:
+        """Render one HTML document to ``output_path``."""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        self.layout(html).write_pdf(output_path)
+        return output_path
+
+
+_local = threading.local()
+
+
+def get_renderer() -> SOWPdfRenderer:
+    """Renderer of the current thread (created on first use)."""
+    renderer = getattr(_local, "renderer", None)
+    if renderer is None:
+        renderer = _local.renderer = SOWPdfRenderer()
+    return renderer
+
+
+def _render_or_none(renderer: SOWPdfRenderer, html: str, output_path: str) -> Optional[str]:
+    try:
+        return renderer.render(html, output_path)
+    except Exception as e:
+        logger.error(f"Error generating PDF from HTML ({output_path}): {e}", exc_info=True)
+        return None
+
+
+def _render_in_worker(html: str, output_path: str) -> Optional[str]:
+    return _render_or_none(get_renderer(), html, output_path)
+
+
+_batch_pool: Optional[ProcessPoolExecutor] = None
+_batch_pool_workers = 0
+_batch_pool_lock = threading.Lock()
+
+
+def _get_batch_pool(workers: int) -> ProcessPoolExecutor:
+    # Called with _batch_pool_lock held. The pool (and each worker's renderer)
+    # is kept for later batches; it is replaced by a larger one if needed
+    global _batch_pool, _batch_pool_workers
+    if _batch_pool is None or _batch_pool_workers < workers:
+        if _batch_pool is not None:
+            _batch_pool.shutdown(wait=True)
+        # spawn: forking a process with live font handles / threads is not safe
+        _batch_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        _batch_pool_workers = workers
+    return _batch_pool
+
+
+def shutdown_batch_pool() -> None:
+    """Stop the batch rendering processes (started again by the next batch)."""
+    global _batch_pool, _batch_pool_workers
+    with _batch_pool_lock:
+        pool, _batch_pool, _batch_pool_workers = _batch_pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True)
+
 
 def html_to_pdf(html: str, output_path: str) -> str:
     """
@@ -31,11 +166,7 @@ def html_to_pdf(html: str, output_path: str) -> str:
         raise RuntimeError("weasyprint not installed. Install with: pip install weasyprint")
     
     try:
-        output_path_obj = Path(output_path)
-        output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Generate PDF from HTML
-        HTML(string=html).write_pdf(output_path)
+        get_renderer().render(html, output_path)
         
         logger.info(f"PDF generated successfully: {output_path}")
         return output_path
@@ -45,6 +176,27 @@ def html_to_pdf(html: str, output_path: str) -> str:
         raise
 
 
+def html_batch_to_pdf(documents: Sequence[Tuple[str, str]], workers: Optional[int] = None) -> List[Optional[str]]:
+    """
+    Convert many ``(html, output_path)`` pairs on the shared process pool.
+    Returns output paths in input order (None for failed documents).
+    """
+    if not WEASYPRINT_AVAILABLE:
+        raise RuntimeError("weasyprint not installed. Install with: pip install weasyprint")
+    if not documents:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(documents)))
+    if workers == 1:
+        results = [_render_or_none(get_renderer(), html, path) for html, path in documents]
+    else:
+        with _batch_pool_lock:
+            pool = _get_batch_pool(workers)
+            futures = [pool.submit(_render_in_worker, html, path) for html, path in documents]
+        results = [future.result() for future in futures]
+    logger.info(f"Batch PDF generation: {sum(1 for r in results if r)}/{len(documents)} documents")
+    return results
+
+
 def generate_pdf_from_markdown(markdown_text: str, output_path: str) -> str:
     """
     Convert Markdown to PDF (via HTML).
@@ -3,6 +3,7 @@ SOW Template Engine
 Renders SOW HTML from SOWDataModel using Jinja2 templates.
 """
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from jinja2 import Environment, FileSystemLoader, Template
@@ -365,6 +366,12 @@ def get_sow_html_template() -> str:
 </html>"""
 
 
+@lru_cache(maxsize=1)
+def _compiled_sow_template() -> "Template":
+    """Default SOW template, compiled once per process."""
+    return Template(get_sow_html_template())
+
+
 def render_sow_from_model(data_model: Any) -> str:
     """
     Render SOW HTML from SOWDataModel.
@@ -379,7 +386,7 @@ def render_sow_from_model(data_model: Any) -> str:
         template_str = get_sow_html_template()
         
         if JINJA2_AVAILABLE:
-            template = Template(template_str)
+            template = _compiled_sow_template()
         else:
             # Fallback: simple string replacement
             logger.warning("jinja2 not available, using simple string template")
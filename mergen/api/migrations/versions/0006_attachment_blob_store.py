@@ -0,0 +1,47 @@
+"""attachment blob store (content-addressed dedup)
+
+Revision ID: 0006
+Revises: 7fda53160d19
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '7fda53160d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'attachment_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=True),
+        sa.Column('mime_type', sa.String(length=255), nullable=True),
+        sa.Column('storage_path', sa.String(length=1024), nullable=False),
+        sa.Column('ref_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('parsed_result', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+
+    op.add_column('opportunity_attachments', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_opportunity_attachments_content_hash'), 'opportunity_attachments', ['content_hash'], unique=False)
+    op.create_foreign_key(
+        'fk_opportunity_attachments_content_hash',
+        'opportunity_attachments', 'attachment_blobs',
+        ['content_hash'], ['sha256'],
+        ondelete='SET NULL',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_opportunity_attachments_content_hash', 'opportunity_attachments', type_='foreignkey')
+    op.drop_index(op.f('ix_opportunity_attachments_content_hash'), table_name='opportunity_attachments')
+    op.drop_column('opportunity_attachments', 'content_hash')
+    op.drop_table('attachment_blobs')
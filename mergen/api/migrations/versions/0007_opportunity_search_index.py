@@ -0,0 +1,52 @@
+"""opportunity full-text search, trigram and keyset indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with app.models.db_models.OPPORTUNITY_SEARCH_VECTOR_SQL
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(notice_id, '') || ' ' || "
+    "coalesce(solicitation_number, '') || ' ' || coalesce(agency, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Generated column: maintained by Postgres on every insert/update (upsert)
+    op.execute(
+        f"ALTER TABLE opportunities ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    op.create_index(
+        'ix_opportunities_search_vector', 'opportunities', ['search_vector'],
+        unique=False, postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_opportunities_title_trgm', 'opportunities', ['title'],
+        unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_opportunities_posted_date_id "
+        "ON opportunities (posted_date DESC NULLS LAST, id DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_opportunities_posted_date_id', table_name='opportunities')
+    op.drop_index('ix_opportunities_title_trgm', table_name='opportunities')
+    op.drop_index('ix_opportunities_search_vector', table_name='opportunities')
+    op.drop_column('opportunities', 'search_vector')
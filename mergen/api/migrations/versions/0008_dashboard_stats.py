@@ -0,0 +1,40 @@
+"""dashboard stats rollup table
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows are (re)built by the API on first read (dashboard_stats_service)
+    op.create_table(
+        'dashboard_stats',
+        sa.Column('scope', sa.String(length=150), nullable=False),
+        sa.Column('naics_code', sa.String(length=100), nullable=True),
+        sa.Column('total_opportunities', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('new_today', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('new_today_date', sa.Date(), nullable=True),
+        sa.Column('analyzed_opportunities', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('analysis_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('analysis_seconds_sum', sa.Float(), server_default='0', nullable=False),
+        sa.Column('analysis_duration_histogram', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('scope')
+    )
+    op.create_index(op.f('ix_dashboard_stats_naics_code'), 'dashboard_stats', ['naics_code'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_dashboard_stats_naics_code'), table_name='dashboard_stats')
+    op.drop_table('dashboard_stats')
@@ -0,0 +1,59 @@
+"""generated artifact catalog
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing output files are picked up by artifact_catalog.reconcile_artifacts
+    op.create_table(
+        'generated_artifacts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(length=1024), nullable=False),
+        sa.Column('filename', sa.String(length=512), nullable=False),
+        sa.Column('notice_id', sa.String(length=255), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('opportunity_id', sa.Integer(), nullable=True),
+        sa.Column('analysis_result_id', sa.Integer(), nullable=True),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('modified_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['opportunity_id'], ['opportunities.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['analysis_result_id'], ['ai_analysis_results.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('path')
+    )
+    op.create_index(op.f('ix_generated_artifacts_id'), 'generated_artifacts', ['id'], unique=False)
+    op.create_index(op.f('ix_generated_artifacts_kind'), 'generated_artifacts', ['kind'], unique=False)
+    op.create_index(op.f('ix_generated_artifacts_opportunity_id'), 'generated_artifacts', ['opportunity_id'], unique=False)
+    op.create_index(op.f('ix_generated_artifacts_analysis_result_id'), 'generated_artifacts', ['analysis_result_id'], unique=False)
+    op.create_index(
+        'ix_generated_artifacts_modified_at_id', 'generated_artifacts',
+        [sa.text('modified_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.create_index(
+        'ix_generated_artifacts_notice_modified', 'generated_artifacts',
+        ['notice_id', sa.text('modified_at DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_generated_artifacts_notice_modified', table_name='generated_artifacts')
+    op.drop_index('ix_generated_artifacts_modified_at_id', table_name='generated_artifacts')
+    op.drop_index(op.f('ix_generated_artifacts_analysis_result_id'), table_name='generated_artifacts')
+    op.drop_index(op.f('ix_generated_artifacts_opportunity_id'), table_name='generated_artifacts')
+    op.drop_index(op.f('ix_generated_artifacts_kind'), table_name='generated_artifacts')
+    op.drop_index(op.f('ix_generated_artifacts_id'), table_name='generated_artifacts')
+    op.drop_table('generated_artifacts')
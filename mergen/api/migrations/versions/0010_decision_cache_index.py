@@ -0,0 +1,82 @@
+"""decision cache notice mapping and signature columns
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+SIGNATURE_COLUMNS = (
+    ('sig_city', 'city', 255),
+    ('sig_state', 'state', 100),
+    ('sig_country', 'country', 100),
+    ('sig_naics', 'naics', 50),
+    ('sig_location_type', 'location_type', 100),
+    ('sig_nights', 'nights', 20),
+    ('sig_participants', 'participants', 20),
+    ('sig_budget', 'budget', 20),
+)
+
+
+def upgrade() -> None:
+    for column, _, length in SIGNATURE_COLUMNS:
+        op.add_column('decision_cache', sa.Column(column, sa.String(length=length), nullable=True))
+    op.create_index(
+        'ix_decision_cache_sig_location', 'decision_cache',
+        ['sig_country', 'sig_state', 'sig_city'], unique=False
+    )
+
+    op.create_table(
+        'decision_cache_notices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('notice_id', sa.String(length=255), nullable=False),
+        sa.Column('decision_cache_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['decision_cache_id'], ['decision_cache.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('notice_id', 'decision_cache_id', name='uq_decision_cache_notice')
+    )
+    op.create_index(op.f('ix_decision_cache_notices_id'), 'decision_cache_notices', ['id'], unique=False)
+    op.create_index(op.f('ix_decision_cache_notices_notice_id'), 'decision_cache_notices', ['notice_id'], unique=False)
+    op.create_index(
+        op.f('ix_decision_cache_notices_decision_cache_id'), 'decision_cache_notices', ['decision_cache_id'], unique=False
+    )
+
+    # Backfill from the JSON metadata written so far
+    assignments = ", ".join(
+        f"{column} = extra_metadata->'signature'->>'{field}'" for column, field, _ in SIGNATURE_COLUMNS
+    )
+    op.execute(
+        f"UPDATE decision_cache SET {assignments} "
+        "WHERE extra_metadata IS NOT NULL AND json_typeof(extra_metadata->'signature') = 'object'"
+    )
+    op.execute(
+        """
+        INSERT INTO decision_cache_notices (notice_id, decision_cache_id)
+        SELECT DISTINCT notice.value, decision_cache.id
+        FROM decision_cache,
+             json_array_elements_text(
+                 CASE WHEN json_typeof(decision_cache.extra_metadata->'notice_ids') = 'array'
+                      THEN decision_cache.extra_metadata->'notice_ids' ELSE '[]'::json END
+             ) AS notice(value)
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_decision_cache_notices_decision_cache_id'), table_name='decision_cache_notices')
+    op.drop_index(op.f('ix_decision_cache_notices_notice_id'), table_name='decision_cache_notices')
+    op.drop_index(op.f('ix_decision_cache_notices_id'), table_name='decision_cache_notices')
+    op.drop_table('decision_cache_notices')
+    op.drop_index('ix_decision_cache_sig_location', table_name='decision_cache')
+    for column, _, _ in reversed(SIGNATURE_COLUMNS):
+        op.drop_column('decision_cache', column)
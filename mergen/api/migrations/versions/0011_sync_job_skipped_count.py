@@ -0,0 +1,28 @@
+"""sync job skipped count
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('sync_jobs', sa.Column('count_skipped', sa.Integer(), server_default='0', nullable=True))
+    # Daily scans stored their skipped count in count_updated
+    op.execute(
+        "UPDATE sync_jobs SET count_skipped = count_updated, count_updated = 0 "
+        "WHERE sync_type = 'daily_scan'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('sync_jobs', 'count_skipped')
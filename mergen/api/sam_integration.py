@@ -26,6 +26,14 @@ except ImportError:
     DocumentProcessor = None
     logger.warning("DocumentProcessor not available, attachment processing will be limited")
 
+# Süreçler arası paylaşılan SAM kotası (API + worker); yoksa instance bazlı bekleme
+try:
+    from app.config import settings as _settings
+    from app.services.redis_client import sliding_window_acquire, token_bucket_wait
+    SHARED_RATE_LIMIT_AVAILABLE = True
+except Exception:
+    SHARED_RATE_LIMIT_AVAILABLE = False
+
 # .env dosyasını yükle
 try:
     from dotenv import load_dotenv
@@ -267,6 +275,17 @@ class SAMIntegration:
                 logger.warning(f"⏳ Quota limit aşıldı. {wait_seconds:.0f} saniye bekleniyor (reset: {self.quota_reset_time})")
                 raise ValueError(f"API quota limit aşıldı. Sonraki erişim: {self.quota_reset_time}")
         
+        if SHARED_RATE_LIMIT_AVAILABLE:
+            # Günlük kota (kayan 24 saatlik pencere), tüm süreçlerde ortak
+            if _settings.sam_daily_quota > 0:
+                allowed, retry_after = sliding_window_acquire("sam_api:daily", _settings.sam_daily_quota, 86400)
+                if not allowed:
+                    raise ValueError(f"API quota limit aşıldı. Sonraki erişim {retry_after:.0f} saniye sonra")
+            # Ortak token bucket: tüm API / worker süreçleri aynı hıza uyar
+            if token_bucket_wait("sam_api", rate_per_sec=_settings.sam_rate_per_sec, burst=1, max_wait=300):
+                self.last_request_time = time.time()
+                return
+
         # Normal rate limiting
         current_time = time.time()
         time_since_last = current_time - self.last_request_time
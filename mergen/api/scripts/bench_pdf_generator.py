@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the analysis / hotel match PDF reports
+
+Renders synthetic analyses with many locations, daily breakdown rows and
+hotels and prints the average render time per report.
+
+    python scripts/bench_pdf_generator.py --hotels 300 --locations 200 --runs 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.pdf_generator import generate_analysis_pdf, generate_hotel_match_pdf
+
+
+def build_analysis(hotels: int, locations: int) -> dict:
+    """Synthetic analysis payload shaped like the SOW analyzer output"""
+    return {
+        "opportunity": {"title": "Benchmark Lodging Event", "notice_id": "BENCH-0001", "agency": "GSA"},
+        "sow_analysis": {
+            "EventDetails": {
+                "event_name": "Benchmark Lodging Event",
+                "start_date": "2026-04-14",
+                "end_date": "2026-04-18",
+                "locations": [{"city": "Orlando"}],
+            },
+            "LodgingRequirements": {
+                "rooms_per_city_min": 40,
+                "rooms_per_city_max": 60,
+                "amenities_required": ["wifi", "parking", "shuttle"],
+                "cancellation_policy": {"free_cancellation_hours_before_checkin": 48},
+            },
+            "Locations": [
+                {
+                    "city": f"City {i}",
+                    "stadium": f"Venue {i}",
+                    "zip_codes": [f"{32800 + i:05d}", f"{33800 + i:05d}"],
+                    "start_date": "2026-04-14",
+                    "num_days": 3,
+                }
+                for i in range(locations)
+            ],
+            "SleepingRoomRequirements": {
+                "total_room_nights_min": 400,
+                "daily_breakdown": [
+                    {"day": f"Day {i + 1}", "date": "2026-04-14", "number_of_rooms": 40 + i % 7}
+                    for i in range(locations)
+                ],
+            },
+            "FoodAndBeverageRequirements": {
+                "daily_breakdown": [
+                    {"day": f"Day {i + 1}", "date": "2026-04-14", "time": "08:00", "headcount": 50, "menu": "Continental breakfast"}
+                    for i in range(locations // 2)
+                ],
+            },
+            "Deliverables": [
+                {"name": f"Deliverable {i}", "due_days_post_award": i, "recipient": "COR"} for i in range(20)
+            ],
+        },
+        "hotels": [
+            {
+                "name": f"Benchmark Hotel {i}",
+                "score": 0.5 + (i % 50) / 100,
+                "price_per_night": 120.0 + i % 80,
+                "total_price": 480.0 + i,
+                "distance": 1.5 + i % 10,
+                "rating": 4,
+                "city": "ORL",
+            }
+            for i in range(hotels)
+        ],
+        "document_analysis": {"documents_analyzed": 3, "total_word_count": 12000},
+        "notes": "Synthetic benchmark payload.",
+    }
+
+
+def bench(label: str, render, runs: int) -> float:
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(runs):
+            path = Path(tmp) / f"report_{run}.pdf"
+            started = time.perf_counter()
+            if not render(path):
+                raise SystemExit(f"{label}: PDF generation failed")
+            timings.append(time.perf_counter() - started)
+    first, rest = timings[0], timings[1:] or timings
+    print(f"{label:<28} first {first * 1000:8.1f} ms   avg {sum(rest) / len(rest) * 1000:8.1f} ms   ({runs} runs)")
+    return sum(rest) / len(rest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=300)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    analysis = build_analysis(args.hotels, args.locations)
+    opportunity = analysis["opportunity"]
+    hotel_match = {"opportunity": opportunity, "options": {"city_code": "ORL"}, "hotels": analysis["hotels"]}
+
+    print(f"{args.hotels} hotels, {args.locations} locations")
+    bench("generate_analysis_pdf", lambda path: generate_analysis_pdf(path, analysis, opportunity), args.runs)
+    bench("generate_hotel_match_pdf", lambda path: generate_hotel_match_pdf(path, hotel_match, opportunity), args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for SOW PDF rendering (WeasyPrint)
+
+Renders the SOW template for a synthetic event and prints per-document latency
+for the one-shot ``HTML(string=...).write_pdf`` call, the persistent
+``SOWPdfRenderer`` and ``html_batch_to_pdf`` on the shared process pool.
+
+    python scripts/bench_sow_renderer.py --docs 20 --rooms 30 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sow_pdf_generator_weasyprint import (
+    WEASYPRINT_AVAILABLE,
+    SOWPdfRenderer,
+    html_batch_to_pdf,
+    shutdown_batch_pool,
+)
+from app.services.sow_template_engine import render_sow_from_model
+
+
+def build_sow(index: int, rooms: int) -> dict:
+    """Synthetic SOW data model (dict form of SOWDataModel)"""
+    return {
+        "event_name": f"Benchmark Training Event {index}",
+        "agency": "GSA",
+        "solicitation_number": f"BENCH-{index:04d}",
+        "dates": {"start": "2026-04-14", "end": "2026-04-18"},
+        "location": "Orlando, FL",
+        "sleeping_rooms": [
+            {"day": f"Day {i + 1}", "date": "2026-04-14", "rooms": 40 + i % 7} for i in range(rooms)
+        ],
+        "function_space_calendar": [
+            {"day": f"Day {i + 1}", "room": "General Session", "setup": "Classroom", "attendees": 120}
+            for i in range(rooms // 2)
+        ],
+        "meeting_rooms": [{"name": f"Breakout {i}", "setup": "U-Shape", "capacity": 30} for i in range(8)],
+        "av_requirements": [{"room": "General Session", "item": "Projector", "quantity": 2}],
+        "food_beverage": [{"day": "Day 1", "meal": "Breakfast", "headcount": 120}],
+        "commercial_terms": {"payment": "Net 30", "cancellation": "48 hours"},
+        "compliance_clauses": {"far": "FAR 52.212-4"},
+        "seating_layout": None,
+    }
+
+
+def bench(label: str, render_all, docs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        render_all(Path(tmp))
+        elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000 / docs:8.1f} ms/doc   ({docs} docs, {elapsed:.2f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--rooms", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if not WEASYPRINT_AVAILABLE:
+        raise SystemExit("weasyprint is not available (install it and its Pango libraries)")
+
+    from weasyprint import HTML
+
+    documents = [render_sow_from_model(build_sow(i, args.rooms)) for i in range(args.docs)]
+    renderer = SOWPdfRenderer()
+
+    def one_shot(tmp: Path):
+        for i, html in enumerate(documents):
+            HTML(string=html).write_pdf(str(tmp / f"sow_{i}.pdf"))
+
+    def persistent(tmp: Path):
+        for i, html in enumerate(documents):
+            renderer.render(html, str(tmp / f"sow_{i}.pdf"))
+
+    def batch(tmp: Path):
+        results = html_batch_to_pdf(
+            [(html, str(tmp / f"sow_{i}.pdf")) for i, html in enumerate(documents)],
+            workers=args.workers,
+        )
+        if not all(results):
+            raise SystemExit("batch: PDF generation failed")
+
+    print(f"{args.docs} SOW documents, {args.rooms} room rows, {args.workers} workers")
+    bench("write_pdf (one-shot)", one_shot, args.docs)
+    bench("SOWPdfRenderer.render", persistent, args.docs)
+    # First batch starts the pool; report the warm run
+    with tempfile.TemporaryDirectory() as tmp:
+        batch(Path(tmp))
+    bench("html_batch_to_pdf", batch, args.docs)
+    shutdown_batch_pool()
+
+
+if __name__ == "__main__":
+    main()
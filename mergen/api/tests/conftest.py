@@ -0,0 +1,31 @@
+"""
+Shared fixtures
+"""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+
+
+@pytest.fixture
+def pg_engine():
+    """Engine on a throwaway schema of DATABASE_URL (skipped without PostgreSQL)."""
+    engine = create_engine(settings.database_url)
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        engine.dispose()
+        pytest.skip("PostgreSQL is not reachable (DATABASE_URL)")
+    schema = f"test_{uuid.uuid4().hex[:8]}"
+    with engine.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    try:
+        yield engine.execution_options(schema_translate_map={None: schema})
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        engine.dispose()
@@ -0,0 +1,79 @@
+"""
+Tests for the artifact catalog helpers (no DB required)
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import artifact_catalog
+
+
+def test_artifact_kind():
+    assert artifact_catalog.artifact_kind(Path("analysis_1.json")) == "json"
+    assert artifact_catalog.artifact_kind(Path("hotel_suggestions_2.PDF")) == "pdf"
+    assert artifact_catalog.artifact_kind(Path("draft.md")) == "markdown"
+    assert artifact_catalog.artifact_kind(Path("notes.txt")) == "other"
+
+
+def test_row_values_derive_notice_from_layout(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_catalog, "DATA_DIR", tmp_path)
+    outputs = tmp_path / "opportunities" / "W912-25-Q-0001" / "outputs"
+    outputs.mkdir(parents=True)
+    artifact = outputs / "analysis_7.json"
+    artifact.write_text("{}")
+
+    values = artifact_catalog._row_values(artifact, artifact.stat())
+    assert values["path"] == "opportunities/W912-25-Q-0001/outputs/analysis_7.json"
+    assert values["notice_id"] == "W912-25-Q-0001"
+    assert values["kind"] == "json"
+    assert values["size_bytes"] == 2
+    assert values["modified_at"].tzinfo is not None
+
+
+def test_cursor_round_trip():
+    modified = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+    cursor = artifact_catalog.encode_cursor(SimpleNamespace(modified_at=modified, id=42))
+    assert artifact_catalog.decode_cursor(cursor) == (modified, 42)
+    with pytest.raises(ValueError):
+        artifact_catalog.decode_cursor("not-a-cursor")
+
+
+def test_list_statement_is_keyset_ordered_and_fetches_one_extra_row():
+    modified = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+    cursor = artifact_catalog.encode_cursor(SimpleNamespace(modified_at=modified, id=42))
+    sql = str(artifact_catalog.artifact_list_statement(limit=10, cursor=cursor, kind="pdf"))
+
+    assert "ORDER BY generated_artifacts.modified_at DESC, generated_artifacts.id DESC" in sql
+    assert "generated_artifacts.id <" in sql and "generated_artifacts.kind =" in sql
+    rows = [SimpleNamespace(modified_at=modified, id=i) for i in (3, 2, 1)]
+    assert artifact_catalog._page(rows, 2) == (rows[:2], artifact_catalog.encode_cursor(rows[1]))
+    assert artifact_catalog._page(rows[:2], 2) == (rows[:2], None)
+
+
+def test_background_reconcile_runs_once_off_the_caller_thread(monkeypatch):
+    import threading
+
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    class FakeSession:
+        def close(self):
+            calls.append("close")
+
+    def reconcile(db):
+        calls.append(threading.current_thread().name)
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(artifact_catalog, "SessionLocal", FakeSession)
+    monkeypatch.setattr(artifact_catalog, "reconcile_artifacts", reconcile)
+
+    assert artifact_catalog.reconcile_in_background() is True
+    assert started.wait(5)
+    assert artifact_catalog.reconcile_in_background() is False  # one walk at a time
+    release.set()
+    assert artifact_catalog._reconcile_lock.acquire(timeout=5)  # released once the thread is done
+    artifact_catalog._reconcile_lock.release()
+    assert calls == ["artifact-reconcile", "close"]
@@ -0,0 +1,57 @@
+"""
+Tests for the async session dependency (aiosqlite stands in for asyncpg)
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("aiosqlite")
+
+from app import db
+from app.models import AgentRun
+from app.routes import opportunities
+
+
+@pytest.fixture
+def async_sqlite(monkeypatch, tmp_path):
+    path = tmp_path / "api.db"
+    # Only agent_runs; the opportunity tables use PostgreSQL-only types
+    sync_engine = create_engine(f"sqlite:///{path}")
+    db.Base.metadata.create_all(sync_engine, tables=[AgentRun.__table__])
+    with Session(sync_engine) as session:
+        session.add_all([
+            AgentRun(opportunity_id=7, run_type="sow_analysis", status="completed", started_at=datetime(2026, 3, 1, tzinfo=timezone.utc)),
+            AgentRun(opportunity_id=7, run_type="hotel_match", status="failed", started_at=datetime(2026, 3, 2, tzinfo=timezone.utc)),
+            AgentRun(opportunity_id=8, run_type="sow_analysis", status="started", started_at=datetime(2026, 3, 3, tzinfo=timezone.utc)),
+        ])
+        session.commit()
+    sync_engine.dispose()
+
+    # The engine is replaced before first use, so get_async_engine never builds the asyncpg one
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    monkeypatch.setattr(db, "_async_engine", engine)
+    monkeypatch.setattr(db, "_AsyncSessionLocal", async_sessionmaker(bind=engine, expire_on_commit=False, autoflush=False))
+    return engine
+
+
+def test_async_route_reads_through_get_async_db(async_sqlite):
+    app = FastAPI()
+    app.include_router(opportunities.router)
+
+    response = TestClient(app).get("/api/opportunities/7/agent-runs")
+
+    assert response.status_code == 200
+    assert [(run["run_type"], run["status"]) for run in response.json()] == [("hotel_match", "failed"), ("sow_analysis", "completed")]
+
+
+def test_dispose_async_engine_resets_the_lazy_engine(async_sqlite):
+    asyncio.run(db.dispose_async_engine())
+
+    assert db._async_engine is None and db._AsyncSessionLocal is None
@@ -0,0 +1,85 @@
+"""
+Tests for streamed attachment downloads (httpx MockTransport, no network)
+"""
+import asyncio
+import gzip
+import hashlib
+
+import httpx
+import pytest
+
+from app.services import attachment_service
+
+BODY = b"%PDF-1.7\n" + bytes(range(256)) * 600
+
+
+class _Stream(httpx.AsyncByteStream):
+    """Network-like body (``content=`` responses are pre-read); ``drop`` cuts the connection after ``data``."""
+
+    def __init__(self, data: bytes, drop: bool = False):
+        self.data = data
+        self.drop = drop
+
+    async def __aiter__(self):
+        yield self.data
+        if self.drop:
+            raise httpx.ReadError("connection reset")
+
+
+def _response(status: int, data: bytes, length: int = None, **headers) -> httpx.Response:
+    headers["Content-Length"] = str(len(data) if length is None else length)
+    return httpx.Response(status, headers=headers, stream=_Stream(data, drop=length is not None))
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    async def sleep(_seconds):
+        return None
+
+    monkeypatch.setattr(attachment_service.asyncio, "sleep", sleep)
+
+
+def _download(handler, part_path):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await attachment_service._stream_to_file(client, "https://sam.test/file", part_path)
+
+    return asyncio.run(run())
+
+
+def test_gzip_encoded_body_is_checked_on_wire_bytes_and_stored_decoded(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return _response(200, gzip.compress(BODY), **{"Content-Encoding": "gzip"})
+
+    part_path = tmp_path / "file.part"
+    streamed = _download(handler, part_path)
+
+    assert requests[0].headers["Accept-Encoding"] == "identity"
+    assert part_path.read_bytes() == BODY
+    assert streamed["size_bytes"] == len(BODY)
+    assert streamed["sha256"] == hashlib.sha256(BODY).hexdigest()
+
+
+def test_interrupted_download_resumes_with_range(tmp_path):
+    part_path = tmp_path / "file.part"
+    part_path.write_bytes(BODY[:1000])  # left over from an earlier job
+    ranges = []
+
+    def handler(request):
+        ranges.append(request.headers.get("Range"))
+        start = int(request.headers["Range"][len("bytes="):-1])
+        if len(ranges) == 1:
+            # Drops mid-body; whole chunks written before that are kept
+            return _response(206, BODY[start:start + 70000], length=len(BODY) - start)
+        return _response(206, BODY[start:])
+
+    streamed = _download(handler, part_path)
+
+    assert ranges == ["bytes=1000-", f"bytes={1000 + attachment_service.CHUNK_SIZE}-"]
+    assert part_path.read_bytes() == BODY
+    assert streamed["sha256"] == hashlib.sha256(BODY).hexdigest()
+    assert streamed["size_bytes"] == len(BODY)
+    assert streamed["resumed_from"] == 1000
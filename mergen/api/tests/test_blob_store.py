@@ -0,0 +1,69 @@
+"""
+Tests for the attachment blob store (legacy adoption on in-memory SQLite)
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.models import AttachmentBlob, OpportunityAttachment
+from app.services import blob_store, pipeline_service
+
+
+@pytest.fixture
+def db():
+    # The opportunities table uses PostgreSQL-only types; the FK is not enforced on SQLite
+    sqlite = create_engine("sqlite://")
+    Base.metadata.create_all(sqlite, tables=[AttachmentBlob.__table__, OpportunityAttachment.__table__])
+    with Session(sqlite) as session:
+        yield session
+
+
+@pytest.fixture
+def data_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(pipeline_service, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(blob_store, "BLOB_DIR", tmp_path / "data" / "blobs")
+    return tmp_path / "data"
+
+
+def _legacy(db, data_dir, notice, content, opportunity_id):
+    relative = f"opportunities/{notice}/attachments/sow.pdf"
+    path = data_dir / relative
+    path.parent.mkdir(parents=True)
+    path.write_bytes(content)
+    att = OpportunityAttachment(
+        opportunity_id=opportunity_id,
+        name="sow.pdf",
+        local_path=relative,
+        downloaded=True,
+        mime_type="application/pdf",
+    )
+    db.add(att)
+    db.commit()
+    return att, path
+
+
+def test_adopt_resolves_relative_paths_and_collapses_duplicates(db, data_dir):
+    first, first_path = _legacy(db, data_dir, "N-1", b"%PDF same sow", 1)
+    amendment, amendment_path = _legacy(db, data_dir, "N-1-A1", b"%PDF same sow", 2)
+    other, _ = _legacy(db, data_dir, "N-2", b"%PDF other sow", 3)
+
+    assert blob_store.adopt_legacy_files(db) == 3
+
+    blobs = {blob.sha256: blob for blob in db.query(AttachmentBlob).all()}
+    assert len(blobs) == 2
+    assert first.content_hash == amendment.content_hash != other.content_hash
+    assert first.local_path == amendment.local_path == blobs[first.content_hash].storage_path
+    assert blobs[first.content_hash].ref_count == 2
+    assert not first_path.exists() and not amendment_path.exists()
+    # Adopted rows have a content hash and are not picked up again
+    assert blob_store.adopt_legacy_files(db) == 0
+
+
+def test_adopt_skips_missing_files(db, data_dir):
+    att = OpportunityAttachment(opportunity_id=1, name="gone.pdf", local_path="opportunities/N-9/gone.pdf", downloaded=True)
+    db.add(att)
+    db.commit()
+
+    assert blob_store.adopt_legacy_files(db) == 0
+    assert att.content_hash is None
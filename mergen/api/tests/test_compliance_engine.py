@@ -0,0 +1,146 @@
+"""
+Tests for the compliance engine (matrix cache; DB checks on in-memory SQLite,
+and on PostgreSQL when reachable)
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.models import Clause, Document, Evidence, FacilityFeature, PricingItem, Requirement
+from app.schemas import ComplianceMatrix
+from app.services.compliance import engine, per_diem_index
+
+
+@pytest.fixture
+def db():
+    # Only the RFQ tables; the opportunity tables use PostgreSQL-only types
+    sqlite = create_engine("sqlite://")
+    tables = [model.__table__ for model in (Document, Requirement, Evidence, FacilityFeature, PricingItem, Clause)]
+    Base.metadata.create_all(sqlite, tables=tables)
+    with Session(sqlite) as session:
+        yield session
+
+
+@pytest.fixture
+def pg_db(pg_engine):
+    tables = [model.__table__ for model in (Document, Requirement, Evidence)]
+    Base.metadata.create_all(pg_engine, tables=tables)
+    with Session(pg_engine) as session:
+        yield session
+
+
+def _matrix(rfq_id):
+    return ComplianceMatrix(
+        rfq_id=rfq_id,
+        items=[],
+        overall_risk="unknown",
+        total_requirements=0,
+        met_requirements=0,
+        gap_requirements=0,
+    )
+
+
+def test_matrix_rebuilt_only_when_evidence_changes(monkeypatch):
+    engine.invalidate_compliance_matrix()
+    validators = [(2, 5, "a1")]
+    builds = []
+
+    def build(db, rfq_id):
+        builds.append(rfq_id)
+        return _matrix(rfq_id)
+
+    monkeypatch.setattr(engine, "_matrix_validators", lambda db, rfq_id: validators[0])
+    monkeypatch.setattr(engine, "_build_compliance_matrix", build)
+
+    first = engine.build_compliance_matrix(None, 7)
+    assert engine.build_compliance_matrix(None, 7) is first
+    assert builds == [7]
+
+    validators[0] = (2, 6, "b2")  # new evidence row
+    assert engine.build_compliance_matrix(None, 7) is not first
+    assert builds == [7, 7]
+
+    engine.invalidate_compliance_matrix(7)
+    engine.build_compliance_matrix(None, 7)
+    engine.build_compliance_matrix(None, 7, use_cache=False)
+    assert builds == [7, 7, 7, 7]
+
+
+def test_regulatory_per_diem_uses_rfq_location_and_dates(db):
+    per_diem_index.reset_per_diem_index(per_diem_index.PerDiemIndex())  # built-in limits only
+    try:
+        rfq = Document(kind="rfq", title="RFQ", path="rfq.pdf", meta_json={"location": "miami", "check_in": "2026-05-03"})
+        unknown = Document(kind="rfq", title="RFQ", path="rfq2.pdf", meta_json={})
+        db.add_all([rfq, unknown])
+        db.flush()
+        for document in (rfq, unknown):
+            db.add(PricingItem(rfq_id=document.id, name="Rooms", unit_price=170.0, category="lodging"))
+        db.commit()
+
+        result = engine.check_regulatory_compliance(db, rfq.id)
+        assert result["per_diem_warnings"] == ["Rate $170.00 exceeds per-diem limit of $150.00 by $20.00"]
+        assert engine.check_regulatory_compliance(db, rfq.id, location="tampa", month="may")["per_diem_warnings"][0].endswith("by $40.00")
+        # No location / dates on the RFQ: lodging is not checked against another city's rate
+        assert engine.check_regulatory_compliance(db, unknown.id)["per_diem_warnings"] == []
+    finally:
+        per_diem_index.reset_per_diem_index()
+
+
+@pytest.mark.parametrize("backend", ["db", "pg_db"])
+def test_matrix_cache_sees_in_place_edits(backend, request):
+    from app.routes.compliance import get_compliance_matrix
+
+    db = request.getfixturevalue(backend)
+
+    engine.invalidate_compliance_matrix()
+    rfq = Document(kind="rfq", title="RFQ", path="rfq.pdf")
+    db.add(rfq)
+    db.flush()
+    requirement = Requirement(rfq_id=rfq.id, text="40 rooms per night", status="pending")
+    db.add(requirement)
+    db.flush()
+    evidence = Evidence(requirement_id=requirement.id, snippet="Hotel has 200 rooms", score=0.9)
+    db.add(evidence)
+    db.commit()
+
+    first = get_compliance_matrix(rfq.id, db)
+    assert engine.build_compliance_matrix(db, rfq.id) is first
+    assert first.overall_risk == "low" and first.items[0].requirement.text == "40 rooms per night"
+
+    # Same row counts and ids, only column values change
+    requirement.text = "60 rooms per night"
+    db.commit()
+    edited = engine.build_compliance_matrix(db, rfq.id)
+    assert edited is not first
+    assert edited.items[0].requirement.text == "60 rooms per night"
+
+    evidence.score = 0.1
+    db.commit()
+    rescored = engine.build_compliance_matrix(db, rfq.id)
+    assert rescored is not edited
+    assert rescored.overall_risk == "critical" and rescored.gap_requirements == 1
+
+
+def test_matrix_cache_hit_does_not_load_rows(pg_db):
+    engine.invalidate_compliance_matrix()
+    rfq = Document(kind="rfq", title="RFQ", path="rfq.pdf")
+    pg_db.add(rfq)
+    pg_db.flush()
+    requirements = [Requirement(rfq_id=rfq.id, text=f"Requirement {i}") for i in range(5)]
+    pg_db.add_all(requirements)
+    pg_db.flush()
+    pg_db.add_all(Evidence(requirement_id=r.id, snippet=f"Evidence {i}", score=0.5) for r in requirements for i in range(4))
+    pg_db.commit()
+    first = engine.build_compliance_matrix(pg_db, rfq.id)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(pg_db.get_bind().engine, "before_cursor_execute", listener)
+    try:
+        assert engine.build_compliance_matrix(pg_db, rfq.id) is first
+    finally:
+        event.remove(pg_db.get_bind().engine, "before_cursor_execute", listener)
+
+    # One count + md5 aggregate per table, nothing else
+    assert len(statements) == 2 and all("md5(string_agg(" in statement for statement in statements)
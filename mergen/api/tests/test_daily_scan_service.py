@@ -0,0 +1,98 @@
+"""
+Tests for the daily scan (SAM fetch, queue dispatch and analyses faked; job record on in-memory SQLite)
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import SyncJob
+from app.services import daily_scan_service as scan
+
+
+@pytest.fixture
+def scan_env(monkeypatch):
+    sqlite = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SyncJob.__table__.create(sqlite)
+    session_factory = sessionmaker(bind=sqlite)
+    monkeypatch.setattr(scan, "SessionLocal", session_factory)
+    monkeypatch.setattr(scan, "ANALYSIS_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(scan.sync_log_writer, "write", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scan.sync_log_writer, "flush", lambda *args, **kwargs: 0)
+
+    state = {"dispatched": [], "statuses": {}, "polls": {}, "in_flight": 0, "max_in_flight": 0}
+    # Pipeline outcome per opportunity id after a few polls; None never finishes
+    finals = {1: "completed", 2: "failed", 3: "completed", 4: "completed"}
+
+    async def fetch_records(naics_code, days_back, limit):
+        return [{"noticeId": f"N-{i}"} for i in range(6)]
+
+    def prepare_candidates(records, force_refresh):
+        return {
+            "candidates": [{"notice_id": f"N-{i}", "opportunity_id": i} for i in range(1, 5)],
+            "skipped": ["N-0", "N-5"],
+            "errors": [],
+        }
+
+    class Result:
+        def __init__(self, id):
+            self.id = id
+
+    def create_pipeline_job(db, opportunity_id, analysis_type, **kwargs):
+        assert analysis_type == "sow_draft"
+        return Result(100 + opportunity_id), None
+
+    def dispatch_pipeline_job(analysis_result_id, payload, **kwargs):
+        state["dispatched"].append(analysis_result_id)
+        state["statuses"][analysis_result_id] = "pending"
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        return {"mode": "queue", "job_id": f"pipeline-{analysis_result_id}"}
+
+    def analysis_status(analysis_result_id):
+        polls = state["polls"][analysis_result_id] = state["polls"].get(analysis_result_id, 0) + 1
+        if polls == 3:
+            final = finals[analysis_result_id - 100]
+            if final:
+                state["statuses"][analysis_result_id] = final
+                state["in_flight"] -= 1
+        elif polls == 2:
+            state["statuses"][analysis_result_id] = "running"
+        return state["statuses"][analysis_result_id]
+
+    monkeypatch.setattr(scan, "_fetch_records", fetch_records)
+    monkeypatch.setattr(scan, "_prepare_candidates", prepare_candidates)
+    monkeypatch.setattr(scan, "create_pipeline_job", create_pipeline_job)
+    monkeypatch.setattr(scan, "dispatch_pipeline_job", dispatch_pipeline_job)
+    monkeypatch.setattr(scan, "_analysis_status", analysis_status)
+    state["finals"] = finals
+    state["session"] = session_factory
+    return state
+
+
+def test_scan_dispatches_pipelines_and_polls_them(scan_env):
+    result = asyncio.run(scan.run_daily_scan("721110", 1, 10, False, concurrency=2))
+
+    assert sorted(scan_env["dispatched"]) == [101, 102, 103, 104]
+    assert scan_env["max_in_flight"] == 2
+    assert all(polls == 3 for polls in scan_env["polls"].values())
+    assert result["analyses_completed"] == 3
+    assert result["opportunities_skipped"] == 2
+    assert len(result["errors"]) == 1 and "N-2" in result["errors"][0]
+
+    with scan_env["session"]() as db:
+        job = db.query(SyncJob).one()
+        assert job.status == "completed"
+        assert (job.count_new, job.count_skipped, job.count_updated, job.total_processed) == (3, 2, 0, 6)
+
+
+def test_wait_for_analysis_gives_up_after_timeout(scan_env):
+    scan_env["finals"][1] = None
+    scan.dispatch_pipeline_job(101, {})
+
+    outcome = asyncio.run(scan._wait_for_analysis(101, timeout=0.05))
+
+    assert outcome["status"] == "running"
+    assert "after 0s" in outcome["error"]
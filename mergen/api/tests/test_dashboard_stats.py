@@ -0,0 +1,76 @@
+"""
+Tests for the dashboard rollup (helpers; rollup vs. rebuild on PostgreSQL when reachable)
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.crud.opportunities import upsert_opportunity
+from app.db import Base
+from app.models import AIAnalysisResult, DashboardStat, Opportunity
+from app.routes import proxy
+from app.services import dashboard_stats_service as stats
+
+
+def test_bucket_index_matches_width_bucket():
+    assert stats._bucket_index(0) == 0
+    assert stats._bucket_index(4.9) == 0
+    assert stats._bucket_index(5) == 1
+    assert stats._bucket_index(10_000) == len(stats.DURATION_BUCKETS)
+
+
+def test_percentile_interpolates_within_bucket():
+    # 10 durations, all in [30, 45)
+    histogram = {str(stats._bucket_index(35)): 10}
+    assert stats._percentile(histogram, 0.5) == 37.5
+    assert stats._percentile({}, 0.5) is None
+
+
+def test_format_duration():
+    assert stats.format_duration(None) == "-"
+    assert stats.format_duration(28.4) == "28sn"
+    assert stats.format_duration(150) == "2dk 30sn"
+    assert stats.format_duration(3720) == "1sa 2dk"
+
+
+@pytest.fixture
+def pg_db(pg_engine):
+    """Session on a throwaway PostgreSQL schema (see conftest.pg_engine)."""
+    try:
+        with pg_engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))  # title index, as in the migrations
+    except DBAPIError:
+        pytest.skip("pg_trgm extension is not available")
+    Base.metadata.create_all(pg_engine, tables=[Opportunity.__table__, AIAnalysisResult.__table__, DashboardStat.__table__])
+    with Session(pg_engine) as session:
+        yield session
+
+
+def _counts(result):
+    return (
+        result["total_opportunities"],
+        result["today_new"],
+        sorted((row["naics_code"], row["total_opportunities"], row["today_new"]) for row in result["by_naics"]),
+    )
+
+
+def test_proxy_upserts_bump_the_rollup_like_a_rebuild(pg_db):
+    assert _counts(stats.get_dashboard_stats(pg_db)) == (0, 0, [])
+
+    items = [
+        {"noticeId": "N-1", "opportunityId": "O-1", "title": "Lodging A", "naicsCode": "721110"},
+        {"noticeId": "N-2", "opportunityId": "O-2", "title": "Lodging B", "naicsCode": "721110"},
+        {"noticeId": "N-3", "opportunityId": "O-3", "title": "Conference", "naicsCode": "561920", "fullParentPathName": "GSA"},
+        {"noticeId": "N-1", "opportunityId": "O-1", "title": "Lodging A (amended)", "naicsCode": "721110"},
+    ]
+    assert proxy._upsert_opportunities(pg_db, items) == 4
+    # Updates of existing notices are not counted again
+    assert proxy._upsert_opportunities(pg_db, items[:2]) == 2
+    conference = pg_db.query(Opportunity).filter_by(notice_id="N-3").one()
+    assert (conference.organization, conference.source) == ("GSA", "sam_live")
+    upsert_opportunity(pg_db, {"notice_id": "N-4", "opportunity_id": "O-4", "title": "Crud sync", "naics_code": "561920"})
+
+    incremental = _counts(stats.get_dashboard_stats(pg_db))
+    assert incremental == (4, 4, [("561920", 2, 2), ("721110", 2, 2)])
+    assert incremental == _counts(stats.get_dashboard_stats(pg_db, refresh=True))
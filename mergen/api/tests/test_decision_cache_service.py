@@ -0,0 +1,43 @@
+"""
+Tests for decision cache signature matching (no DB required)
+"""
+from app.services import decision_cache_service as dcs
+
+
+def _signature(**overrides):
+    signature = {
+        "city": "AUSTIN",
+        "state": "TX",
+        "country": "US",
+        "naics": "721110",
+        "location_type": "HOTEL",
+        "nights": "3-4",
+        "participants": "51-100",
+        "budget": "20k-50k",
+    }
+    signature.update(overrides)
+    return signature
+
+
+def test_build_signature_buckets():
+    _, signature = dcs.build_signature(
+        opportunity=None,
+        context={"city": "Austin", "state": "TX", "nights": 3, "participants": 600, "budget_total": 30000},
+        event_requirements=None,
+    )
+    assert signature["nights"] == "3-4"
+    assert signature["participants"] == ">500"
+    assert signature["budget"] == "20k-50k"
+
+
+def test_signature_distance_counts_bucket_steps():
+    base = _signature()
+    assert dcs.signature_distance(base, base) == 0
+    assert dcs.signature_distance(base, _signature(nights="5-7")) == 1
+    assert dcs.signature_distance(base, _signature(participants=">500")) == 3
+    assert dcs.signature_distance(base, _signature(budget="UNKNOWN")) == 1
+    assert dcs.signature_distance(base, _signature(naics="561920", location_type="UNKNOWN")) == 2
+
+
+def test_nearest_requires_known_city():
+    assert dcs.find_nearest_decision(None, _signature(city="UNKNOWN")) is None
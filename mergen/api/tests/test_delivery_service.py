@@ -0,0 +1,131 @@
+"""
+Tests for the delivery job retries (session, PDF rendering and mail faked)
+"""
+import smtplib
+import threading
+
+import pytest
+
+from app.models import AIAnalysisResult
+from app.services import delivery_service, job_queue, pipeline_service
+
+original_send_notification = delivery_service._send_notification
+
+
+class FakeResult:
+    id = 42
+    status = "completed"
+    analysis_type = "sow_draft"
+    opportunity_id = 7
+
+
+class FakeOpportunity:
+    id = 7
+    notice_id = "N-7"
+
+
+class FakeSession:
+    def query(self, model):
+        self.row = FakeResult() if model is AIAnalysisResult else FakeOpportunity()
+        return self
+
+    def filter(self, *criteria):
+        return self
+
+    def first(self):
+        return self.row
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def delivery(monkeypatch):
+    state = {"sends": 0, "fail": 0, "events": [], "done": threading.Event()}
+
+    def send_notification(db, result, opportunity, agent_run_id):
+        state["sends"] += 1
+        if state["sends"] <= state["fail"]:
+            raise delivery_service.DeliveryError("smtp down")
+
+    def publish(analysis_result_id, event):
+        state["events"].append(event["type"])
+        if event["type"] == "end":
+            state["done"].set()
+
+    monkeypatch.setattr(delivery_service, "SessionLocal", FakeSession)
+    monkeypatch.setattr(delivery_service, "_render_report", lambda *args: None)
+    monkeypatch.setattr(delivery_service, "_send_notification", send_notification)
+    monkeypatch.setattr(delivery_service, "publish_analysis_event", publish)
+    monkeypatch.setattr(pipeline_service, "_flush_job_logs", lambda *args: None)
+    monkeypatch.setattr(job_queue, "_get_connection", lambda: None)
+    monkeypatch.setattr(job_queue, "_backoff_intervals", lambda spec: [0.01] * spec.max_retries)
+    return state
+
+
+def test_failed_send_is_retried_in_process_and_ends_once(delivery):
+    delivery["fail"] = 2
+
+    assert delivery_service.dispatch_delivery(42)["mode"] == "pool"
+    assert delivery["done"].wait(5)
+
+    assert delivery["sends"] == 3
+    assert delivery["events"] == ["end"]
+
+
+def test_last_failed_attempt_ends_the_stream(delivery):
+    delivery["fail"] = 99
+
+    # Outside a dispatched job no retry is coming: the failure is final
+    delivery_service.run_delivery_job(42)
+
+    assert delivery["sends"] == 1
+    assert delivery["events"] == ["end"]
+
+
+def test_rejected_credentials_end_the_job_without_a_retry(delivery, monkeypatch):
+    from app.services import mail_service
+
+    logins = []
+    logs = []
+
+    class RejectingSMTP:
+        def __init__(self, host, port, timeout=None):
+            pass
+
+        def starttls(self):
+            pass
+
+        def login(self, username, password):
+            logins.append(username)
+            raise smtplib.SMTPAuthenticationError(535, b"bad credentials")
+
+        def close(self):
+            pass
+
+    for name, value in {
+        "pipeline_notification_email": "ops@example.com",
+        "smtp_host": "smtp.test",
+        "smtp_username": "user",
+        "smtp_send_attempts": 3,
+        "smtp_retry_backoff": 0,
+    }.items():
+        monkeypatch.setattr(delivery_service.settings, name, value)
+    monkeypatch.setattr(mail_service.smtplib, "SMTP", RejectingSMTP)
+    monkeypatch.setattr(mail_service, "smtp_pool", mail_service.SMTPConnectionPool(max_idle=2))
+    monkeypatch.setattr(mail_service, "build_mail_package", lambda **kwargs: {
+        "from": "noreply@example.com", "to": "ops@example.com", "cc": [], "subject": "Report",
+        "text_body": "body", "html_body": "<p>body</p>", "attachments": [],
+    })
+    monkeypatch.setattr(pipeline_service, "_log_analysis", lambda db, result_id, level, message, **kwargs: logs.append(level))
+    monkeypatch.setattr(delivery_service, "_send_notification", original_send_notification)
+    monkeypatch.setattr(delivery_service, "_result_json", lambda result: {})
+    monkeypatch.setattr(delivery_service, "_latest_result", lambda *args: None)
+    monkeypatch.setattr(delivery_service, "_output_attachments", lambda result: [])
+
+    assert delivery_service.dispatch_delivery(42)["mode"] == "pool"
+    assert delivery["done"].wait(5)
+
+    assert logins == ["user"]
+    assert logs == ["INFO", "ERROR"]
+    assert delivery["events"] == ["end"]
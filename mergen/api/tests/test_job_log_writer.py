@@ -0,0 +1,85 @@
+"""
+Tests for the buffered job log writer (inserts are captured, no DB required)
+"""
+import pytest
+
+from app.config import settings
+from app.models import SyncLog
+from app.services import job_log_writer
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    monkeypatch.setattr(settings, "job_log_batch_size", 3)
+    monkeypatch.setattr(settings, "job_log_flush_interval", 60.0)
+    monkeypatch.setattr(job_log_writer, "_ensure_flusher", lambda: None)
+    w = job_log_writer.JobLogWriter(SyncLog, "job_id")
+    job_log_writer._writers.remove(w)
+    w.batches = []
+    monkeypatch.setattr(w, "_insert", lambda rows: w.batches.append(rows) or len(rows))
+    return w
+
+
+def _messages(batch):
+    return [row["message"] for row in batch]
+
+
+def test_rows_are_buffered_until_size_threshold(writer):
+    for i in range(2):
+        writer.write("job-1", level="INFO", message=f"m{i}", step="fetch")
+    assert writer.batches == []
+    assert writer.pending("job-1") == 2
+
+    writer.write("job-1", level="INFO", message="m2", step="fetch")
+    assert [_messages(b) for b in writer.batches] == [["m0", "m1", "m2"]]
+    assert writer.pending("job-1") == 0
+    assert all(row["job_id"] == "job-1" and row["timestamp"] for row in writer.batches[0])
+
+
+def test_step_boundary_and_error_flush(writer):
+    writer.write("job-1", level="INFO", message="a", step="fetch")
+    writer.write("job-1", level="INFO", message="b", step="process")
+    assert [_messages(b) for b in writer.batches] == [["a", "b"]]
+
+    writer.write("job-1", level="ERROR", message="boom", step="process")
+    assert _messages(writer.batches[-1]) == ["boom"]
+
+
+def test_explicit_and_time_based_flush(writer, monkeypatch):
+    writer.write("job-1", level="INFO", message="a", step="s")
+    writer.write("job-2", level="INFO", message="b", step="s")
+    assert writer.flush("job-2") == 1
+    assert _messages(writer.batches[-1]) == ["b"]
+    assert writer.pending("job-1") == 1
+
+    monkeypatch.setattr(settings, "job_log_flush_interval", 0.0)
+    assert writer.flush_due() == 1
+    assert _messages(writer.batches[-1]) == ["a"]
+    assert writer.flush() == 0
+
+
+def test_failed_batch_is_retried_row_by_row(monkeypatch, caplog):
+    flushed = []
+    w = job_log_writer.JobLogWriter(SyncLog, "job_id", on_flush=flushed.extend)
+    job_log_writer._writers.remove(w)
+    inserts = []
+
+    def execute(rows):
+        inserts.append(_messages(rows))
+        if len(rows) > 1 or rows[0]["message"] == "bad":
+            raise ValueError("value too long")
+        return [len(inserts)]
+
+    monkeypatch.setattr(w, "_execute", execute)
+    monkeypatch.setattr(settings, "job_log_batch_size", 50)
+    monkeypatch.setattr(settings, "job_log_flush_interval", 60.0)
+    monkeypatch.setattr(job_log_writer, "_ensure_flusher", lambda: None)
+    for message in ("a", "bad", "c"):
+        w.write("job-1", level="INFO", message=message, step="s")
+
+    with caplog.at_level("ERROR", logger=job_log_writer.__name__):
+        assert w.flush("job-1") == 2
+
+    assert inserts == [["a", "bad", "c"], ["a"], ["bad"], ["c"]]
+    assert [(row["message"], row["id"]) for row in flushed] == [("a", 2), ("c", 4)]
+    assert "'bad'" in caplog.text and "Lost 1 of 3 sync_logs rows" in caplog.text
@@ -0,0 +1,127 @@
+"""
+Tests for the pipeline job dispatch layer (no Redis required)
+"""
+import threading
+
+from app.services import job_queue
+
+
+def test_parse_worker_concurrency_defaults_and_overrides():
+    counts = job_queue.parse_worker_concurrency("analysis=4, delivery=0, bogus=9, extraction=x")
+    assert counts["analysis"] == 4
+    assert counts["delivery"] == 0
+    assert counts["extraction"] == 1  # invalid value keeps default
+    assert counts["hotel_match"] == 1
+    assert "bogus" not in counts
+
+
+def test_queue_for_analysis():
+    assert job_queue.queue_for_analysis("hotel_match") == "hotel_match"
+    assert job_queue.queue_for_analysis("sow_draft") == "analysis"
+    assert job_queue.queue_for_analysis(None) == "analysis"
+
+
+def test_dispatch_falls_back_without_queue(monkeypatch):
+    monkeypatch.setattr(job_queue, "_get_connection", lambda: None)
+    done = threading.Event()
+    seen = []
+
+    def work(value):
+        seen.append(value)
+        done.set()
+
+    result = job_queue.dispatch("extraction", work, 42)
+    assert result["mode"] == "thread"
+    assert done.wait(5)
+    assert seen == [42]
+
+
+def test_dispatch_uses_background_tasks(monkeypatch):
+    monkeypatch.setattr(job_queue, "_get_connection", lambda: None)
+
+    class FakeBackgroundTasks:
+        def __init__(self):
+            self.tasks = []
+
+        def add_task(self, fn, *args, **kwargs):
+            self.tasks.append((fn, args, kwargs))
+
+    tasks = FakeBackgroundTasks()
+    result = job_queue.dispatch("analysis", lambda: None, background_tasks=tasks)
+    assert result["mode"] == "background"
+    assert len(tasks.tasks) == 1
+
+
+def test_dispatch_uses_executor(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(job_queue, "_get_connection", lambda: None)
+    seen = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = job_queue.dispatch("delivery", seen.append, 7, executor=executor)
+    assert result["mode"] == "pool"
+    assert seen == [7]
+
+
+def test_parse_worker_concurrency_override_keeps_other_queues():
+    configured = job_queue.parse_worker_concurrency("extraction=2,analysis=2,hotel_match=3,delivery=1")
+    counts = job_queue.parse_worker_concurrency("analysis=8", defaults=configured)
+    assert counts == {"extraction": 2, "analysis": 8, "hotel_match": 3, "delivery": 1}
+
+
+def test_is_transient_error():
+    class RateLimitError(Exception):
+        pass
+
+    assert job_queue.is_transient_error(ConnectionError("reset"))
+    assert job_queue.is_transient_error(TimeoutError())
+    assert job_queue.is_transient_error(RateLimitError("429"))
+    assert job_queue.is_transient_error(job_queue.RetryableJobError("smtp down"))
+    assert not job_queue.is_transient_error(ValueError("bad input"))
+    assert not job_queue.is_transient_error(FileNotFoundError("missing.pdf"))
+
+
+def test_will_retry_uses_rq_retries_left(monkeypatch):
+    class FakeJob:
+        retries_left = 1
+
+    monkeypatch.setattr(job_queue, "_current_rq_job", lambda: FakeJob())
+    assert job_queue.will_retry(ConnectionError())
+    assert not job_queue.will_retry(ValueError())
+    FakeJob.retries_left = 0
+    assert not job_queue.will_retry(ConnectionError())
+
+
+def test_in_process_fallback_retries_transient_failures(monkeypatch):
+    monkeypatch.setattr(job_queue, "_get_connection", lambda: None)
+    monkeypatch.setattr(job_queue, "_backoff_intervals", lambda spec: [0.01] * spec.max_retries)
+    done = threading.Event()
+    attempts = []
+
+    def flaky():
+        attempts.append(job_queue.retries_left())
+        if len(attempts) < 3:
+            raise ConnectionError("smtp reset")
+        done.set()
+
+    job_queue.dispatch("delivery", flaky)
+    assert done.wait(5)
+    spec = job_queue.QUEUE_SPECS["delivery"]
+    assert attempts == [spec.max_retries, spec.max_retries - 1, spec.max_retries - 2]
+
+
+def test_in_process_fallback_does_not_retry_permanent_failures(monkeypatch):
+    monkeypatch.setattr(job_queue, "_get_connection", lambda: None)
+    monkeypatch.setattr(job_queue, "_backoff_intervals", lambda spec: [0.01] * spec.max_retries)
+    from concurrent.futures import ThreadPoolExecutor
+
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad payload")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        job_queue.dispatch("analysis", broken, executor=executor)
+    threading.Event().wait(0.1)
+    assert attempts == [1]
@@ -0,0 +1,122 @@
+"""
+Tests for pooled SMTP sending and retries (fake SMTP server, no network)
+"""
+import smtplib
+
+import pytest
+
+from app.services import mail_service
+
+SMTP_CONFIG = {"host": "smtp.test", "port": 587, "username": "user", "password": "secret", "use_tls": True}
+
+
+class FakeSMTP:
+    instances = []
+    fail_sends = []  # exceptions raised by the next sendmail calls
+    fail_login = None
+    logins = 0
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        FakeSMTP.logins += 1
+        if FakeSMTP.fail_login:
+            raise FakeSMTP.fail_login
+
+    def noop(self):
+        return (421, b"closed") if self.closed else (250, b"OK")
+
+    def sendmail(self, sender, recipients, message):
+        if FakeSMTP.fail_sends:
+            raise FakeSMTP.fail_sends.pop(0)
+        self.sent.append((sender, tuple(recipients)))
+        return {}
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.instances = []
+    FakeSMTP.fail_sends = []
+    FakeSMTP.fail_login = None
+    FakeSMTP.logins = 0
+    monkeypatch.setattr(mail_service.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(mail_service.settings, "smtp_retry_backoff", 0)
+    monkeypatch.setattr(mail_service, "smtp_pool", mail_service.SMTPConnectionPool(max_idle=2))
+    return FakeSMTP
+
+
+def _package(to="ops@example.com"):
+    return {
+        "from": "noreply@example.com",
+        "to": to,
+        "cc": [],
+        "subject": "Report",
+        "text_body": "body",
+        "html_body": "<p>body</p>",
+        "attachments": [],
+    }
+
+
+def test_connection_is_reused_across_messages(fake_smtp):
+    assert mail_service.send_email_via_smtp(_package(), SMTP_CONFIG)
+    assert mail_service.send_email_via_smtp(_package("cfo@example.com"), SMTP_CONFIG)
+    assert len(fake_smtp.instances) == 1
+    assert [to for _, (to,) in fake_smtp.instances[0].sent] == ["ops@example.com", "cfo@example.com"]
+
+
+def test_dropped_connection_is_replaced(fake_smtp):
+    assert mail_service.send_email_via_smtp(_package(), SMTP_CONFIG)
+    fake_smtp.instances[0].closed = True  # server hung up while idle
+    assert mail_service.send_email_via_smtp(_package(), SMTP_CONFIG)
+    assert len(fake_smtp.instances) == 2
+
+
+def test_transient_errors_are_retried(fake_smtp):
+    fake_smtp.fail_sends = [smtplib.SMTPServerDisconnected("gone"), smtplib.SMTPDataError(451, b"try later")]
+    assert mail_service.send_email_via_smtp(_package(), SMTP_CONFIG, attempts=3)
+    # Each failed attempt drops its connection
+    assert len(fake_smtp.instances) == 3
+    assert len(fake_smtp.instances[-1].sent) == 1
+
+
+def test_permanent_errors_are_not_retried(fake_smtp):
+    fake_smtp.fail_sends = [smtplib.SMTPDataError(554, b"rejected")]
+    with pytest.raises(mail_service.PermanentSendError):
+        mail_service.send_email_via_smtp(_package(), SMTP_CONFIG, attempts=3)
+    assert len(fake_smtp.instances) == 1
+    # The connection is still usable and goes back to the pool
+    assert mail_service.send_email_via_smtp(_package(), SMTP_CONFIG)
+    assert len(fake_smtp.instances) == 1
+
+
+def test_retries_give_up_after_attempts(fake_smtp):
+    fake_smtp.fail_sends = [ConnectionResetError("reset")] * 3
+    assert not mail_service.send_email_via_smtp(_package(), SMTP_CONFIG, attempts=2)
+    assert len(fake_smtp.fail_sends) == 1
+
+
+def test_refused_recipients_keep_the_connection(fake_smtp):
+    fake_smtp.fail_sends = [smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"no such user")})]
+    with pytest.raises(mail_service.PermanentSendError):
+        mail_service.send_email_via_smtp(_package("bad@example.com"), SMTP_CONFIG)
+    assert mail_service.send_email_via_smtp(_package(), SMTP_CONFIG)
+    assert len(fake_smtp.instances) == 1 and not fake_smtp.instances[0].closed
+
+
+def test_authentication_failure_is_permanent(fake_smtp):
+    fake_smtp.fail_login = smtplib.SMTPAuthenticationError(535, b"bad credentials")
+    with pytest.raises(mail_service.PermanentSendError, match="authentication"):
+        mail_service.send_email_via_smtp(_package(), SMTP_CONFIG, attempts=3)
+    assert fake_smtp.logins == 1
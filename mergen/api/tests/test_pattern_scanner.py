@@ -0,0 +1,42 @@
+"""
+Tests for the shared extraction scanner and the extractors using it
+"""
+import re
+
+from app.services.parsing.facility_extractor import extract_av_equipment_list, extract_facility_features
+from app.services.parsing.pattern_scanner import PatternScanner
+from app.services.parsing.rfq_extractor import extract_requirements_from_text
+
+
+def test_scanner_reports_overlapping_matches_with_positions():
+    scanner = PatternScanner([("pool", r"pool"), ("pool", r"swimming\s+pool"), ("gym", r"gym"), ("num", r"\d+")])
+    matches = list(scanner.scan("swimming  pool, gym 24h"))
+    assert [(m.index, m.start, m.end, m.text) for m in matches] == [
+        (1, 0, 14, "swimming  pool"),
+        (0, 10, 14, "pool"),
+        (2, 16, 19, "gym"),
+        (3, 20, 22, "24"),
+    ]
+
+
+def test_scanner_search_ignore_case():
+    scanner = PatternScanner([("section", r"FAR Clauses?")], re.IGNORECASE)
+    assert scanner.search("Applicable far clause list").start == 11
+    assert scanner.search("nothing here") is None
+
+
+def test_facility_features_keep_pattern_order():
+    text = "Free parking and complimentary WiFi. Pool and swimming pool."
+    names = [feature["name"] for feature in extract_facility_features(text)]
+    assert names == ["wifi", "wifi", "parking", "parking", "pool", "pool", "pool"]
+    assert extract_av_equipment_list("wireless microphone and a screen") == ["microphone", "screen", "wireless microphone"]
+
+
+def test_requirements_are_tagged_with_section():
+    text = "Intro\n1. Ignored before any section header\nLodging Room Requirements\n1. Provide 40 rooms per night\n- Short\nb) Rooms must be non-smoking"
+    requirements = extract_requirements_from_text(text)
+    assert [(r["text"], r["line_number"]) for r in requirements] == [
+        ("Provide 40 rooms per night", 4),
+        ("Rooms must be non-smoking", 6),
+    ]
+    assert requirements[0]["section"] == "Lodging Room Requirements"
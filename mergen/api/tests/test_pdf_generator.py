@@ -0,0 +1,177 @@
+"""
+Tests for the analysis PDF report (story outline and invariant PDF bytes pinned)
+"""
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+from reportlab import Version as REPORTLAB_VERSION
+from reportlab import rl_config
+from reportlab.platypus import BaseDocTemplate, PageBreak, Paragraph, Spacer, Table
+
+from app.services import pdf_generator
+
+OPPORTUNITY = {"title": "Regional Training Summit", "notice_id": "W912-26-Q-0042", "agency": "USACE", "naics_code": "721110"}
+
+FULL_RESULT = {
+    "opportunity": {"agency": "U.S. Army Corps of Engineers"},
+    "sow_analysis": {
+        "EventDetails": {
+            "event_name": "Regional Training Summit",
+            "solicitation_number": "W912-26-Q-0042",
+            "agency": "USACE",
+            "start_date": "2026-04-14",
+            "Dates": {"End": "2026-04-18", "Duration": 5},
+            "locations": [{"city": "Orlando", "state": "FL"}],
+            "submission_due": "2026-03-01 14:00 ET",
+        },
+        "LodgingRequirements": {
+            "rooms_per_city_min": 40,
+            "rooms_per_city_max": 55,
+            "max_stay_days_per_city": 5,
+            "uniform_terms_required": True,
+            "amenities_required": ["Wi-Fi", "Breakfast"],
+            "cancellation_policy": {"free_cancellation_hours_before_checkin": 48, "force_majeure_no_penalty": True},
+        },
+        "Locations": [{"city": "Orlando", "stadium": "Camping World", "zip_codes": ["32801", "32805"], "start_date": "2026-04-14", "num_days": 5}],
+        "TransportationRequirements": {"max_distance_miles_hotel_to_venue": 3, "required_transportation_options": ["Shuttle"], "transportation_plan_required": True},
+        "SleepingRoomRequirements": {
+            "total_room_nights_min": 200,
+            "total_room_nights_max": 240,
+            "special_requirements": ["ADA rooms"],
+            "daily_breakdown": [{"day": "Day 1", "date": "2026-04-14", "number_of_rooms": 40}, {"Day": "Day 2", "Date": "2026-04-15", "rooms": 45}],
+        },
+        "FunctionSpaceRequirements": {
+            "room_types": ["General Session", "Breakout"],
+            "capacity_requirements": [{"room_type": "General Session", "capacity": 120}],
+            "setup_requirements": [{"room_type": "Breakout", "setup": "U-Shape"}],
+            "daily_breakdown": [{"day": "Day 1", "date": "2026-04-14"}],
+        },
+        "AVRequirements": {
+            "room_requirements": [{"room_type": "General Session", "equipment": [{"type": "Projector", "quantity": 2}, {"name": "Mic"}]}],
+            "special_notes": ["Confidence monitor"],
+            "hybrid_meeting_needs": ["Zoom"],
+        },
+        "FoodAndBeverageRequirements": {"daily_breakdown": [{"day": "Day 1", "date": "2026-04-14", "time": "07:30", "headcount": 120, "menu": "Continental"}]},
+        "CommercialTerms": {"naics_code": "721110", "psc_code": "V231", "SizeStandard": "$40M"},
+        "CostProposalRequirements": {"QuoteDueDate": "2026-03-01", "RequiredAttachments": ["Price sheet", "W-9"]},
+        "Deliverables": [{"name": "Rooming list", "due_days_post_award": 10, "recipient": "COR"}],
+        "PerformanceMetrics": [{"metric": "Check-in time", "target": "< 10 min", "time_limit": "per guest"}],
+        "PeriodOfPerformance": {"start_date": "2026-04-13", "end_date": "2026-04-19"},
+        "SubmissionPackage": {
+            "required_sections": [{"name": "Technical", "max_pages": 10}, {"name": "Price"}],
+            "submission_method": "Email",
+            "submission_emails": ["co@usace.army.mil"],
+            "due_datetime_local": "2026-03-01 14:00",
+        },
+        "InvoicingInstructions": {"allowed_invoice_structure": ["Monthly"], "billing_basis": "Actuals", "tax_exempt_lodging": True, "invoice_recipients": ["finance@usace.army.mil"]},
+        "EvaluationCriteria": {"PaymentTerms": "Net 30", "factors": [{"name": "Price", "weight": "60%"}], "notes": ["LPTA"]},
+        "ComplianceRequirements": {"FARClauses": [{"ClauseNumber": "52.212-4", "Title": "Contract Terms"}]},
+        "Appendices": {"AdditionalDocuments": "Floor plans"},
+    },
+    "hotels": [
+        {"name": "Hotel Alpha", "score": 9.1, "price_per_night": 139.0, "total_price": 695.0, "distance": 1.234, "rating": 4, "hotel_id": "ALP1", "address": "1 Main St", "city": "Orlando"},
+        {"hotel_name": "Unknown Hotel", "offer": {"hotel": {"name": "Hotel Beta"}}, "score": "n/a", "price": "TBD", "distance": "near"},
+        {"hotel": {"name": "Unknown"}},
+    ],
+    "hotel_search_criteria": {"city_code": "MCO", "check_in": "2026-04-14", "check_out": "2026-04-18", "adults": 1},
+    "document_analysis": {"documents_analyzed": 3, "total_word_count": 12000, "total_tables": 4},
+    "notes": "Pricing assumes the government per-diem rate.",
+}
+
+SPARSE_RESULT = {
+    "sow_analysis": {
+        "LodgingRequirements": {},
+        "SleepingRoomRequirements": {"total_room_nights_min": 120},
+        "FunctionSpaceRequirements": {"room_types": []},
+        "AVRequirements": {"court_reporter_needs": []},
+        "FoodAndBeverageRequirements": {"notes": "TBD"},
+        "EventDetails": {"Location": {"City": "Tampa", "State": "FL"}},
+        "EvaluationCriteria": {"BillingMethod": "Direct bill"},
+        "ComplianceRequirements": {"FARClauses": []},
+    },
+    "related_hotels": [{"name": "Hotel Gamma", "distance": 0.5}],
+}
+
+# Recorded from the single-function generator before it was split into section builders
+GOLDEN_OUTLINES = Path(__file__).parent / "fixtures" / "analysis_pdf_outlines.json"
+# PDF bytes with rl_config.invariant = 1 depend on the reportlab release
+GOLDEN_PDFS = {
+    "5.0.1": {
+        "full": "aebdb2787c8c92ad13f06f02f1efb3848181c162a3d085acbb7aff6ec0dd2e3b",
+        "sparse": "2aa871110a628830543735445d1fbf0e77514d32fda70515baa03e56098dbab0",
+        "empty": "3c7afdee6880ec3fb74ac2874794ee05cfe52c4c7a8c4d1227a9f626ff258d11",
+    },
+}
+
+CASES = {
+    "full": (FULL_RESULT, OPPORTUNITY),
+    "sparse": (SPARSE_RESULT, OPPORTUNITY),
+    "empty": ({"sow_analysis": None}, None),
+}
+
+
+def _describe(flowable):
+    if isinstance(flowable, Spacer):
+        return ["Spacer", round(flowable.height, 3)]
+    if isinstance(flowable, PageBreak):
+        return ["PageBreak"]
+    if isinstance(flowable, Paragraph):
+        return ["Paragraph", flowable.style.name, flowable.text]
+    if isinstance(flowable, Table):
+        return [
+            "Table",
+            [round(width, 3) for width in flowable._colWidths],
+            flowable.repeatRows,
+            [[_describe(cell) for cell in row] for row in flowable._cellvalues],
+        ]
+    return [type(flowable).__name__]
+
+
+@pytest.fixture
+def captured_story(monkeypatch):
+    stories = []
+    build = BaseDocTemplate.build
+
+    def capture(doc, flowables, *args, **kwargs):
+        stories.append([_describe(flowable) for flowable in flowables])
+        return build(doc, flowables, *args, **kwargs)
+
+    monkeypatch.setattr(BaseDocTemplate, "build", capture)
+    monkeypatch.setattr(rl_config, "invariant", 1)
+    return stories
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_analysis_report_matches_recorded_output(case, captured_story, tmp_path):
+    analysis_result, opportunity = CASES[case]
+    output = tmp_path / f"{case}.pdf"
+
+    assert pdf_generator.generate_analysis_pdf(output, analysis_result, opportunity)
+
+    expected = json.loads(GOLDEN_OUTLINES.read_text(encoding="utf-8"))[case]
+    outline = captured_story[0]
+    for index, (item, recorded) in enumerate(zip(outline, expected)):
+        assert item == recorded, f"flowable {index}"
+    assert len(outline) == len(expected)
+    pdfs = GOLDEN_PDFS.get(REPORTLAB_VERSION)
+    if pdfs:
+        assert _digest(output.read_bytes()) == pdfs[case]
+
+
+def test_analysis_report_sections_in_order(captured_story, tmp_path):
+    assert pdf_generator.generate_analysis_pdf(tmp_path / "report.pdf", FULL_RESULT, OPPORTUNITY)
+
+    headers = [
+        item[3][0][0][2]
+        for item in captured_story[0]
+        if item[0] == "Table" and item[3][0][0][0] == "Paragraph" and item[3][0][0][1] == "SectionHeader"
+    ]
+    assert headers[:3] == ["<b>Event Details</b>", "<b>Lodging Requirements</b>", "<b>Locations</b>"]
+    assert headers[-3:] == ["<b>Top Hotel Recommendations - Detailed Information</b>", "<b>Document Analysis Summary</b>", "<b>Notes</b>"]
+    assert len(headers) == 22
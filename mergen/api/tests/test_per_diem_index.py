@@ -0,0 +1,84 @@
+"""
+Tests for the local GSA per-diem index (CSV files written to tmp_path)
+"""
+import pytest
+
+from app.services.compliance import per_diem_index, rules
+
+RATES_CSV = """FY2025 Per Diem Rates
+ID,State,Destination,County,Season Begin,Season End,FY2025 Lodging Rate,FY2025 M&IE
+1,FL,Orlando,Orange,October 1,September 30,$145,$69
+2,FL,Miami,Miami-Dade,October 1,December 31,$190,$74
+2,FL,Miami,Miami-Dade,January 1,March 15,$260,$74
+2,FL,Miami,Miami-Dade,March 16,September 30,$180,$74
+3,OR,Portland,Multnomah,,,$169,$74
+4,ME,Portland,Cumberland,10/01,09/30,$175,$74
+"""
+
+ZIP_CSV = """Zip,ID,State
+32801,1,FL
+33101,2,FL
+04101,4,ME
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    (tmp_path / "FY2025_PerDiemMasterRatesFile.csv").write_text(RATES_CSV)
+    (tmp_path / "FY2025_ZipCodeFile.csv").write_text(ZIP_CSV)
+    index = per_diem_index.load_per_diem_index(tmp_path)
+    per_diem_index.reset_per_diem_index(index)
+    yield index
+    per_diem_index.reset_per_diem_index()
+
+
+def test_seasons_expand_to_months(index):
+    assert index.lookup("FL", "miami", 2025, 11) == 190
+    assert index.lookup("FL", "miami", 2025, 2) == 260
+    assert index.lookup("FL", "miami", 2025, 3) == 260  # mid-month change keeps the higher rate
+    assert index.lookup("FL", "miami", 2025, 7) == 180
+    assert index.lookup("OR", "portland", 2025, 7) == 169
+
+
+def test_locations_resolve_by_zip_city_state_and_county(index):
+    assert index.resolve("32801") == ("FL", "orlando")
+    assert index.resolve("Portland, ME 04101") == ("ME", "portland")
+    assert index.resolve("Portland, OR") == ("OR", "portland")
+    assert index.resolve("Portland") is None  # ambiguous without a state
+    assert index.resolve("Orange County, FL") == ("FL", "orange county")
+    assert index.lodging_rate("Nowhere, KS", "april") == index.standard_lodging
+
+
+def test_ambiguous_or_unknown_locations_have_no_limit(index):
+    # Standard rate only for a locality known to be unlisted in a CONUS state
+    assert index.lodging_rate("Portland", "april") is None
+    assert index.lodging_rate("Nowhere", "april") is None
+    assert index.lodging_rate("Honolulu, HI", "april") is None
+    assert index.lodging_rate("Portland", "april", state="ME") == 175
+    assert rules.get_per_diem_limit("Portland", "april") is None
+    assert rules.get_per_diem_limit(None, "april") is None
+    assert rules.get_per_diem_limit("Miami, FL", None) is None
+
+    results = rules.check_per_diem_batch([{"rate": 500}], location="Portland", month="april")
+    assert results[0]["compliant"] is None and results[0]["warning"] is None
+
+
+def test_compliance_uses_index(index):
+    assert rules.get_per_diem_limit("Miami, FL", "2025-02-10") == 260
+    results = rules.check_per_diem_batch(
+        [{"rate": 150}, {"rate": 150, "location": "33101"}, {"rate": 200, "location": "Portland", "state": "OR"}],
+        location="orlando",
+        month="april",
+    )
+    assert [r["compliant"] for r in results] == [False, True, False]
+    assert results[0]["excess"] == pytest.approx(5.0)
+
+
+def test_builtin_limits_without_rate_files(tmp_path):
+    per_diem_index.reset_per_diem_index(per_diem_index.load_per_diem_index(tmp_path / "missing"))
+    try:
+        assert rules.get_per_diem_limit("miami", "may") == 150.0
+        assert rules.get_per_diem_limit("miami", 5) == 150.0
+        assert rules.get_per_diem_limit("unknown", "may") is None
+    finally:
+        per_diem_index.reset_per_diem_index()
@@ -0,0 +1,101 @@
+"""
+Tests for the batch room-block pricing engine
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.compliance import per_diem_index
+from app.services.pricing.engine import calculate_quote, calculate_room_block_pricing
+from app.services.pricing.scenarios import (
+    RoomBlockScenario,
+    price_hotel_offers,
+    price_room_block_scenarios,
+    sow_rooms_per_night,
+)
+
+
+def test_scenarios_priced_in_one_batch():
+    quotes = price_room_block_scenarios([
+        RoomBlockScenario("orlando", nightly_rates=[140, 150, 160], rooms_per_night=[10, 20, 10], per_diem_cap=145),
+        RoomBlockScenario("tampa", nightly_rates=120, rooms_per_night=15, nights=5, per_diem_cap=130, tax_rate=0.1),
+        RoomBlockScenario(
+            "miami", nightly_rates=200, rooms_per_night=10, nights=2, per_diem_cap=[150, 250],
+            attrition_allowance=0.2, pickup=0.5,
+        ),
+    ])
+    assert quotes.lodging.tolist() == pytest.approx([6000.0, 9000.0, 2000.0])
+    assert quotes.tax[1] == pytest.approx(900.0)
+    # 80% floor, 50% picked up: 30% of the contracted block is billed as attrition
+    assert quotes.attrition[2] == pytest.approx(1200.0)
+    assert quotes.nights_over_per_diem.tolist() == [2, 0, 1]
+    assert quotes.max_excess.tolist() == pytest.approx([15.0, 0.0, 50.0])
+    assert quotes.per_diem_excess[0] == pytest.approx(5 * 20 + 15 * 10)
+    assert quotes.ranked() == [2, 0, 1]
+    assert quotes.ranked(compliant_only=True) == [1]
+    assert quotes.to_records()[1]["total_cost"] == pytest.approx(9900.0)
+
+
+def test_quote_does_not_modify_items():
+    items = [
+        SimpleNamespace(id=1, name="Rooms", description=None, qty=10, unit="night", unit_price=140.0, total_price=None, category="lodging"),
+        SimpleNamespace(id=2, name="AV", description=None, qty=1, unit="day", unit_price=500.0, total_price=450.0, category="av"),
+        SimpleNamespace(id=3, name="Rooms 2", description=None, qty=2, unit="night", unit_price=100.0, total_price=None, category="lodging"),
+    ]
+    quote = calculate_quote(items)
+    assert quote["category_totals"] == {"lodging": 1600.0, "av": 450.0}
+    assert quote["grand_total"] == pytest.approx(2050.0)
+    assert items[0].total_price is None
+
+
+def test_room_block_uses_stay_dates():
+    block = calculate_room_block_pricing(140.0, "2026-04-14", "2026-04-17", 20)
+    assert block["nights"] == 3
+    assert block["total_cost"] == pytest.approx(8400.0)
+    assert block["per_diem_compliance"]["compliant"] is None  # no location, no limit
+
+
+def test_room_block_checks_per_diem_for_its_location():
+    per_diem_index.reset_per_diem_index(per_diem_index.PerDiemIndex())  # built-in limits only
+    try:
+        block = calculate_room_block_pricing(150.0, "2026-04-14", "2026-04-17", 20, location="tampa")
+    finally:
+        per_diem_index.reset_per_diem_index()
+    assert block["per_diem_compliance"]["limit"] == 130.0
+    assert block["per_diem_compliance"]["compliant"] is False
+
+
+def test_unknown_location_or_month_prices_without_a_cap():
+    per_diem_index.reset_per_diem_index(per_diem_index.PerDiemIndex())  # built-in limits only
+    try:
+        quotes = price_room_block_scenarios([
+            RoomBlockScenario("known", nightly_rates=200, rooms_per_night=1, nights=2, location="tampa", month="may"),
+            RoomBlockScenario("no month", nightly_rates=200, rooms_per_night=1, nights=2, location="tampa"),
+            RoomBlockScenario("unknown city", nightly_rates=200, rooms_per_night=1, nights=2, location="Springfield", month="may"),
+        ])
+    finally:
+        per_diem_index.reset_per_diem_index()
+    assert quotes.nights_over_per_diem.tolist() == [2, 0, 0]
+    assert quotes.max_excess.tolist() == pytest.approx([70.0, 0.0, 0.0])
+
+
+def test_hotel_offers_priced_for_the_sow_room_block():
+    hotels = [
+        {"name": "A", "price_per_night": 180.0, "currency": "USD"},
+        {"name": "B", "price_per_night": 120.0, "currency": "EUR"},
+        {"name": "C", "price_per_night": 150.0},
+        {"name": "D"},
+    ]
+    sow = {"SleepingRoomRequirements": {"daily_breakdown": [
+        {"day": "Day 1", "number_of_rooms": 20}, {"day": "Day 2", "rooms": "10"}, {"day": "Day 3"},
+    ]}}
+    rooms = sow_rooms_per_night(sow)
+    assert rooms == [20.0, 10.0]
+
+    quotes = price_hotel_offers(hotels, "2026-04-14", "2026-04-16", rooms_per_night=rooms)
+    records = quotes.to_records()
+    assert [record["offer"] for record in records] == [0, 2]
+    assert [record["total_cost"] for record in records] == pytest.approx([5400.0, 4500.0])
+    assert [quotes.scenarios[i].metadata["offer"] for i in quotes.ranked()] == [2, 0]
+    assert price_hotel_offers(hotels, None, "2026-04-16") is None
+    assert sow_rooms_per_night(None) is None
@@ -0,0 +1,56 @@
+"""
+Tests for the in-process pipeline progress bus (no Redis required)
+"""
+import asyncio
+import json
+import threading
+
+from app.services import progress_bus
+
+
+def test_events_from_worker_threads_reach_subscriber(monkeypatch):
+    monkeypatch.setattr(progress_bus, "get_redis", lambda: None)
+    bus = progress_bus.ProgressBus()
+
+    async def scenario():
+        subscription = bus.subscribe(7)
+        other = bus.subscribe(8)
+        worker = threading.Thread(target=bus.publish, args=(7, {"type": "status", "status": "running"}))
+        worker.start()
+        worker.join()
+        event = await subscription.get(1.0)
+        assert await other.get(0.05) is None
+        bus.unsubscribe(subscription)
+        bus.unsubscribe(other)
+        return event
+
+    assert asyncio.run(scenario()) == {"type": "status", "status": "running"}
+    assert bus._subscriptions == {}
+
+
+def test_full_queue_marks_overflow(monkeypatch):
+    monkeypatch.setattr(progress_bus, "SUBSCRIBER_QUEUE_SIZE", 1)
+
+    async def scenario():
+        subscription = progress_bus.Subscription(1, asyncio.get_running_loop())
+        subscription._deliver({"type": "log", "id": 1})
+        subscription._deliver({"type": "log", "id": 2})
+        return subscription
+
+    subscription = asyncio.run(scenario())
+    assert subscription.overflowed
+    assert subscription.queue.qsize() == 1
+
+
+def test_relay_skips_own_messages(monkeypatch):
+    bus = progress_bus.ProgressBus()
+    seen = []
+    monkeypatch.setattr(bus, "_dispatch", lambda analysis_result_id, event: seen.append((analysis_result_id, event)))
+
+    own = {"origin": progress_bus._ORIGIN, "event": {"type": "end"}}
+    remote = {"origin": "other-process", "event": {"type": "end"}}
+    bus._relay({"channel": f"{progress_bus.CHANNEL_PREFIX}5", "data": json.dumps(own)})
+    bus._relay({"channel": f"{progress_bus.CHANNEL_PREFIX}5", "data": json.dumps(remote)})
+    bus._relay({"channel": f"{progress_bus.CHANNEL_PREFIX}x", "data": json.dumps(remote)})
+
+    assert seen == [(5, {"type": "end"})]
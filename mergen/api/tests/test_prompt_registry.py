@@ -0,0 +1,135 @@
+"""
+Tests for the prompt registry and the AutoGen agent pool (no LLM calls)
+"""
+import pytest
+
+from app.agents.agent_pool import AgentPool
+from app.services.llm.prompt_registry import PromptNotFoundError, PromptRegistry
+from app.services.llm.prompts import get_executive_summary_prompt, get_extraction_prompt
+
+
+def test_render_uses_latest_version_and_pinned_versions():
+    registry = PromptRegistry()
+    registry.register("greeting", "Hello {name}", version="1")
+    registry.register("greeting", "Hi {name}!", version="2")
+
+    assert registry.render("greeting", name="Ada") == "Hi Ada!"
+    assert registry.render("greeting", "1", name="Ada") == "Hello Ada"
+    with pytest.raises(PromptNotFoundError):
+        registry.get("greeting", version="3")
+    with pytest.raises(KeyError, match="missing parameters: name"):
+        registry.render("greeting")
+
+
+def test_static_prompts_keep_braces_and_versions_are_immutable():
+    registry = PromptRegistry()
+    prompt = registry.register("system", 'Respond with {"hotels": []}', static=True)
+
+    assert prompt.fields == ()
+    assert registry.render("system") == 'Respond with {"hotels": []}'
+    # Same text again is fine (module reloads); different text needs a new version
+    registry.register("system", 'Respond with {"hotels": []}', static=True)
+    with pytest.raises(ValueError, match="bump the version"):
+        registry.register("system", "Respond with JSON", static=True)
+
+
+def test_registered_prompts_render_like_the_inline_templates():
+    prompt = get_extraction_prompt("Rooms: {40} per night", "rfq")
+    assert "Document text:\n        Rooms: {40} per night\n" in prompt
+    assert '"per_diem_limit": 140.0\n        }' in prompt
+
+    summary = get_executive_summary_prompt("Lodging", {"met_requirements": 3}, ["late award"], [])
+    assert "- Total Requirements: 0\n    - Met Requirements: 3" in summary
+    assert "Key Risks:\n    - late award\n" in summary
+
+
+class FakeAgent:
+    def __init__(self):
+        self.history = []
+        self.resets = 0
+
+    def reset(self):
+        self.history.clear()
+        self.resets += 1
+
+
+def test_agent_pool_reuses_reset_agents_per_key():
+    pool = AgentPool(max_idle=1)
+
+    with pool.agent(("reviewer", "gpt-4o-mini"), FakeAgent) as first:
+        first.history.append("message")
+    with pool.agent(("reviewer", "gpt-4o-mini"), FakeAgent) as second:
+        assert second is first and second.history == []
+    with pool.agent(("reviewer", "gpt-4o"), FakeAgent) as other:
+        assert other is not first
+
+    assert pool.stats() == {"created": 2, "reused": 1, "idle": 2}
+
+
+def test_agent_pool_drops_failed_and_unresettable_agents():
+    pool = AgentPool(max_idle=2)
+
+    with pytest.raises(RuntimeError):
+        with pool.agent("analyzer", FakeAgent):
+            raise RuntimeError("chat failed")
+    pool.release("analyzer", object())  # new-API agent without reset()
+
+    assert pool.stats()["idle"] == 0
+    assert AgentPool(max_idle=0).stats()["idle"] == 0
+
+
+class FakeAnalyzer(FakeAgent):
+    def __init__(self, reply):
+        super().__init__()
+        self.reply = reply
+
+    def last_message(self):
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return {"content": self.reply}
+
+
+class FakeUser:
+    def __init__(self, **kwargs):
+        pass
+
+    def initiate_chat(self, agent, message):
+        agent.history.append(message)
+
+
+def test_sow_analyzer_returns_its_agent_only_after_a_clean_chat(monkeypatch):
+    from app.agents import sow_analyzer_agent
+
+    pool = AgentPool(max_idle=2)
+    replies = iter(['{"EventDetails": {}}', RuntimeError("connection reset")])
+    monkeypatch.setattr(sow_analyzer_agent, "AUTOGEN_AVAILABLE", True)
+    monkeypatch.setattr(sow_analyzer_agent, "agent_pool", pool)
+    monkeypatch.setattr(sow_analyzer_agent, "UserProxyAgent", FakeUser, raising=False)
+    monkeypatch.setattr(sow_analyzer_agent, "create_sow_analyzer_agent", lambda **_: FakeAnalyzer(next(replies)))
+
+    assert "error" not in sow_analyzer_agent.analyze_sow_document("SOW text", api_key="test")
+    assert pool.stats()["idle"] == 1
+
+    # a fresh agent for the failing chat; it is dropped, not pooled
+    pool.clear()
+    result = sow_analyzer_agent.analyze_sow_document("SOW text", api_key="test")
+    assert result == {"error": "connection reset", "table_extraction_failed": True}
+    assert pool.stats() == {"created": 2, "reused": 0, "idle": 0}
+
+
+def test_sow_analyzer_does_not_take_an_agent_when_the_user_agent_fails(monkeypatch):
+    from app.agents import sow_analyzer_agent
+
+    pool = AgentPool(max_idle=2)
+
+    def broken_user(**kwargs):
+        raise ValueError("bad llm config")
+
+    monkeypatch.setattr(sow_analyzer_agent, "AUTOGEN_AVAILABLE", True)
+    monkeypatch.setattr(sow_analyzer_agent, "agent_pool", pool)
+    monkeypatch.setattr(sow_analyzer_agent, "UserProxyAgent", broken_user, raising=False)
+    monkeypatch.setattr(sow_analyzer_agent, "create_sow_analyzer_agent", lambda **_: FakeAnalyzer("{}"))
+
+    with pytest.raises(ValueError):
+        sow_analyzer_agent.analyze_sow_document("SOW text", api_key="test")
+    assert pool.stats()["created"] == 0
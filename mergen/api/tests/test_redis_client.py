@@ -0,0 +1,88 @@
+"""
+Tests for the rate limiting / circuit breaker fallbacks (no Redis required)
+"""
+import pytest
+
+from app.services import circuit_breaker, redis_client
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = redis_client._InMemoryStore()
+    monkeypatch.setattr(redis_client, "_client", store)
+    return store
+
+
+def test_token_bucket_refills_at_rate():
+    state = None
+    results = []
+    for _ in range(4):
+        result, state, _ = redis_client._token_bucket(state, 100.0, 2.0, 3, 1)
+        results.append(result[0])
+    assert results == [True, True, True, False]
+
+    # 0.5s at 2 tokens/s -> one token back
+    result, state, _ = redis_client._token_bucket(state, 100.5, 2.0, 3, 1)
+    assert result == (True, 0.0)
+    result, _, _ = redis_client._token_bucket(state, 100.5, 2.0, 3, 1)
+    assert result[0] is False and result[1] == pytest.approx(0.5)
+
+
+def test_sliding_window_counts_calls_in_window():
+    calls = None
+    for now in (0.0, 1.0, 2.0):
+        (allowed, _), calls, _ = redis_client._sliding_window(calls, now, 3, 10.0, "m")
+        assert allowed
+    (allowed, retry_after), calls, _ = redis_client._sliding_window(calls, 5.0, 3, 10.0, "m")
+    assert not allowed and retry_after == pytest.approx(5.0)
+    (allowed, _), _, _ = redis_client._sliding_window(calls, 10.5, 3, 10.0, "m")
+    assert allowed
+
+
+def test_token_bucket_acquire_uses_fallback(store):
+    assert redis_client.token_bucket_allow("sam", rate_per_sec=0.001, burst=2)
+    assert redis_client.token_bucket_allow("sam", rate_per_sec=0.001, burst=2)
+    allowed, retry_after = redis_client.token_bucket_acquire("sam", rate_per_sec=0.001, burst=2)
+    assert not allowed and retry_after > 0
+    # Other buckets are independent
+    assert redis_client.token_bucket_allow("amadeus", rate_per_sec=0.001, burst=1)
+
+
+def test_circuit_breaker_transitions(store, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(redis_client.time, "time", lambda: clock[0])
+    cb = circuit_breaker.CircuitBreaker("sam_search", failure_threshold=2, cooldown_sec=60)
+
+    assert cb.allow()
+    cb.record_failure()
+    assert cb.allow()
+    cb.record_failure()
+    assert not cb.allow()  # OPEN
+
+    clock[0] += 61
+    assert cb.allow()  # HALF_OPEN probe
+    assert not cb.allow()  # only one probe at a time
+    cb.record_failure()
+    assert not cb.allow()  # back to OPEN
+
+    clock[0] += 61
+    assert cb.allow()
+    cb.record_success()
+    assert cb.allow() and cb.allow()  # CLOSED
+
+
+def test_in_memory_store_is_bounded_and_sweeps(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(redis_client.time, "time", lambda: clock[0])
+    store = redis_client._InMemoryStore(max_keys=3, sweep_interval=0)
+
+    for i in range(5):
+        store.setex(f"k{i}", 100, str(i))
+    assert len(store) == 3
+    assert store.get("k0") is None and store.get("k4") == "4"
+
+    store.setex("short", 1, "x")
+    clock[0] += 2
+    store.setex("k5", 100, "5")  # write triggers the sweep
+    assert store.get("short") is None
+    assert len(store) == 3
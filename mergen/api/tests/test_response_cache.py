@@ -0,0 +1,70 @@
+"""
+Tests for the response cache helpers (no DB / Redis required)
+"""
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.models import AIAnalysisResult, Opportunity, OpportunityAttachment
+from app.services import response_cache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.kv = {}
+
+    def get(self, key):
+        return self.kv.get(key)
+
+    def setex(self, key, ttl, value):
+        self.kv[key] = value
+
+
+def test_etag_is_stable_and_tracks_validators():
+    updated = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+    etag = response_cache.make_etag("detail", (updated, None))
+    assert etag == response_cache.make_etag("detail", (updated, None))
+    assert etag.startswith('W/"')
+    assert etag != response_cache.make_etag("detail", (updated, updated))
+
+
+def test_if_none_match_weak_comparison():
+    etag = response_cache.make_etag("result", ("completed",))
+    assert response_cache.etag_matches(etag, etag)
+    assert response_cache.etag_matches(etag[2:], etag)
+    assert response_cache.etag_matches(f'"other", {etag}', etag)
+    assert response_cache.etag_matches("*", etag)
+    assert not response_cache.etag_matches('"other"', etag)
+    assert not response_cache.etag_matches(None, etag)
+
+
+def test_invalidate_hides_cached_entries(monkeypatch):
+    client = _FakeRedis()
+    monkeypatch.setattr(response_cache, "_redis", lambda: client)
+    scope = response_cache.analysis_scope(7)
+
+    etag, body, version = response_cache.get_cached(scope, "result")
+    assert etag is None and body is None
+    response_cache.set_cached(scope, "result", version, 'W/"a"', {"id": 7})
+    assert response_cache.get_cached(scope, "result")[:2] == ('W/"a"', {"id": 7})
+
+    time.sleep(0.001)
+    response_cache.invalidate([scope])
+    assert response_cache.get_cached(scope, "result")[:2] == (None, None)
+
+
+def test_cache_disabled_without_redis(monkeypatch):
+    monkeypatch.setattr(response_cache, "_redis", lambda: None)
+    assert response_cache.get_cached("opportunity:1", "detail") is None
+    response_cache.invalidate(["opportunity:1"])  # no-op, never raises
+
+
+def test_written_rows_map_to_scopes():
+    session = SimpleNamespace(
+        info={},
+        new=[OpportunityAttachment(id=3, opportunity_id=5)],
+        dirty=[AIAnalysisResult(id=9, opportunity_id=5), Opportunity(id=5)],
+        deleted=[],
+    )
+    response_cache._collect_scopes(session, None)
+    assert session.info[response_cache._SESSION_SCOPES_KEY] == {"opportunity:5", "analysis:9"}
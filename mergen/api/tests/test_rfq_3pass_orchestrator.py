@@ -0,0 +1,113 @@
+"""
+Tests for the 3-pass RFQ pipeline step graph and batch runner (steps faked, no LLM / PDF work)
+"""
+import threading
+import time
+
+import pytest
+
+from app.agents import rfq_3pass_orchestrator as orchestrator
+
+
+@pytest.fixture
+def fake_steps(monkeypatch, tmp_path):
+    calls = {"analysis": [], "seating": [], "active": 0, "max_active": 0}
+    lock = threading.Lock()
+
+    def analyze_document(path, mime_type):
+        return {"extracted_text": f"text of {path}"}
+
+    def run_3pass_rfq_analysis(document_text, llm_model, api_key, max_retries):
+        with lock:
+            calls["analysis"].append(document_text)
+            calls["active"] += 1
+            calls["max_active"] = max(calls["max_active"], calls["active"])
+        time.sleep(0.05)
+        with lock:
+            calls["active"] -= 1
+        return {"pass1_output": {"raw": document_text}, "pass2_output": {"event_name": document_text}, "errors": []}
+
+    def parse_seating_chart_pdf(path):
+        calls["seating"].append(threading.current_thread().name)
+        return {"layout": path}
+
+    class FakeModel:
+        @staticmethod
+        def from_analyzer_json(normalized_json, seating_layout):
+            return {"model": normalized_json, "seating": seating_layout}
+
+    def generate_pdf_from_markdown(markdown, path):
+        open(path, "w").write(markdown)
+
+    monkeypatch.setattr(orchestrator, "AUTOGEN_AVAILABLE", True)
+    monkeypatch.setattr(orchestrator, "analyze_document", analyze_document)
+    monkeypatch.setattr(orchestrator, "run_3pass_rfq_analysis", run_3pass_rfq_analysis)
+    monkeypatch.setattr(orchestrator, "parse_seating_chart_pdf", parse_seating_chart_pdf)
+    monkeypatch.setattr(orchestrator, "SOWDataModel", FakeModel)
+    monkeypatch.setattr(orchestrator, "run_sow_generator_agent", lambda normalized_json, **_: f"# SOW {normalized_json['event_name']}")
+    monkeypatch.setattr(orchestrator, "generate_pdf_from_markdown", generate_pdf_from_markdown)
+
+    rfqs = []
+    for i in range(4):
+        rfq = tmp_path / f"rfq_{i}.pdf"
+        rfq.write_bytes(b"%PDF")
+        seating = tmp_path / f"seating_{i}.pdf"
+        seating.write_bytes(b"%PDF")
+        rfqs.append({"rfq_pdf_path": str(rfq), "seating_chart_pdf_path": str(seating)})
+    return calls, rfqs
+
+
+def test_parallel_seating_chart_gives_sequential_results(fake_steps):
+    calls, rfqs = fake_steps
+    options = {"use_template_engine": False, "api_key": "test"}
+
+    sequential = orchestrator.run_rfq_3pass_pipeline(**rfqs[0], parallel=False, **options)
+    parallel = orchestrator.run_rfq_3pass_pipeline(**rfqs[0], **options)
+
+    assert parallel == sequential
+    assert parallel["seating_layout"] == {"layout": rfqs[0]["seating_chart_pdf_path"]}
+    assert calls["seating"][1].startswith("rfq-3pass-step")
+
+
+def test_batch_keeps_order_and_caps_concurrency(fake_steps):
+    calls, rfqs = fake_steps
+    options = {"use_template_engine": False, "api_key": "test"}
+
+    results = orchestrator.run_rfq_3pass_batch(rfqs, max_concurrency=2, **options)
+
+    expected = [orchestrator.run_rfq_3pass_pipeline(**rfq, parallel=False, **options) for rfq in rfqs]
+    assert results == expected
+    assert calls["max_active"] == 2
+
+
+def test_batch_rejects_bad_inputs_before_running(fake_steps, tmp_path):
+    calls, rfqs = fake_steps
+
+    with pytest.raises(FileNotFoundError):
+        orchestrator.run_rfq_3pass_batch(rfqs + [{"rfq_pdf_path": str(tmp_path / "missing.pdf")}])
+    with pytest.raises(ValueError, match="same SOW PDF"):
+        orchestrator.run_rfq_3pass_batch([rfqs[0], rfqs[0]])
+    assert calls["analysis"] == []
+
+
+def test_batch_renders_template_pdfs_in_one_call(fake_steps, monkeypatch):
+    calls, rfqs = fake_steps
+    batches = []
+
+    def html_batch_to_pdf(documents, workers=None):
+        batches.append(documents)
+        # the second document fails to render and takes the markdown fallback
+        return [path if i != 1 else None for i, (html, path) in enumerate(documents)]
+
+    monkeypatch.setattr(orchestrator, "WEASYPRINT_AVAILABLE", True)
+    monkeypatch.setattr(orchestrator, "render_sow_from_model", lambda model: f"<html>{model['model']['event_name']}</html>")
+    monkeypatch.setattr(orchestrator, "html_batch_to_pdf", html_batch_to_pdf)
+    monkeypatch.setattr(orchestrator, "html_to_pdf", lambda html, path: pytest.fail("batch rendered a PDF per document"))
+
+    results = orchestrator.run_rfq_3pass_batch(rfqs, api_key="test")
+
+    assert len(batches) == 1
+    assert [path for _, path in batches[0]] == [str(orchestrator._sow_pdf_target(rfq["rfq_pdf_path"])) for rfq in rfqs]
+    assert [result["sow_pdf_path"] for result in results] == [path for _, path in batches[0]]
+    assert [bool(result["fallback_markdown"]) for result in results] == [False, True, False, False]
+    assert all(not result["errors"] for result in results)
@@ -0,0 +1,105 @@
+"""
+Tests for the SOW mail agent section memo and PDF render manifest (PDF writers faked)
+"""
+import sys
+import types
+
+import pytest
+
+
+def _llm_client_stub() -> types.ModuleType:
+    module = types.ModuleType("llm_client")
+    module.LLMNotAvailableError = type("LLMNotAvailableError", (RuntimeError,), {})
+    module.call_logged_llm = module.extract_message_text = None  # replaced per test
+    return module
+
+
+# The real llm_client imports the API models a second time under the
+# "mergen.api.app" package path, which breaks the mappers of later tests
+sys.modules.setdefault("llm_client", _llm_client_stub())
+
+from app.agents import sow_mail_agent  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    sow_mail_agent.clear_section_cache()
+    yield
+    sow_mail_agent.clear_section_cache()
+
+
+@pytest.fixture
+def fake_pdf_writers(monkeypatch):
+    renders = []
+
+    def markdown_to_pdf(markdown_text, output_path, title):
+        renders.append(("markdown", title))
+        open(output_path, "w").write(markdown_text)
+        return True
+
+    def generate_gpt_style_sow_pdf(output_path, opportunity_code, sow_data):
+        renders.append(("gpt", opportunity_code))
+        open(output_path, "w").write(opportunity_code)
+        return True
+
+    module = types.ModuleType("sow_pdf_generator")
+    module.markdown_to_pdf = markdown_to_pdf
+    module.generate_gpt_style_sow_pdf = generate_gpt_style_sow_pdf
+    monkeypatch.setitem(sys.modules, "sow_pdf_generator", module)
+    return renders
+
+
+def test_sections_are_shared_across_agents_and_keyed_by_content():
+    builds = []
+
+    def build(value):
+        builds.append(value)
+        return f"built {value}"
+
+    first, second = sow_mail_agent.make_sow_mail_agent(), sow_mail_agent.make_sow_mail_agent()
+    assert first is not second
+    memoized = sow_mail_agent.memoized_section
+
+    assert memoized("table", {"a": 1, "b": 2}, lambda: build(1)) == "built 1"
+    # Another agent, same content in another key order: cached
+    assert memoized("table", {"b": 2, "a": 1}, lambda: build(2)) == "built 1"
+    # Same inputs under another section name, or changed inputs: rebuilt
+    assert memoized("html", {"a": 1, "b": 2}, lambda: build(3)) == "built 3"
+    assert memoized("table", {"a": 1, "b": 3}, lambda: build(4)) == "built 4"
+    assert builds == [1, 3, 4]
+    assert sow_mail_agent.section_cache_stats == {"hits": 1, "misses": 3}
+
+
+def test_llm_sow_is_not_cached(monkeypatch):
+    agent = sow_mail_agent.make_sow_mail_agent()
+    implementation = sys.modules[sow_mail_agent.SOWMailAgent.__module__]
+    calls = []
+    monkeypatch.setattr(implementation, "call_logged_llm", lambda **kwargs: calls.append(kwargs) or f"draft {len(calls)}")
+    monkeypatch.setattr(implementation, "extract_message_text", lambda response: response)
+
+    drafts = [agent._generate_sow_with_llm({"event": "x"}, {"title": "Event"}, None) for _ in range(2)]
+    assert drafts == ["draft 1", "draft 2"]
+
+
+def test_unchanged_pdfs_are_not_rendered_again(tmp_path, fake_pdf_writers):
+    agent = sow_mail_agent.make_sow_mail_agent()
+    sow = {"sow_text": "# SOW\n\nRooms: 40 per night"}
+    report = {"event_requirements": {"participants_target": 40}}
+
+    first = agent.generate_sow_pdfs(sow, str(tmp_path), "W912", report_data=report)
+    assert len(fake_pdf_writers) == 3
+    assert (tmp_path / sow_mail_agent.RENDER_MANIFEST).exists()
+
+    # Fresh agent, same content: every PDF comes from the manifest
+    again = sow_mail_agent.make_sow_mail_agent().generate_sow_pdfs(sow, str(tmp_path), "W912", report_data=report)
+    assert again == first
+    assert len(fake_pdf_writers) == 3
+
+    # Changed SOW text: the markdown PDFs are rendered again
+    agent.generate_sow_pdfs({"sow_text": "# SOW\n\nRooms: 45 per night"}, str(tmp_path), "W912", report_data=report)
+    assert [kind for kind, _ in fake_pdf_writers[3:]][:2] == ["markdown", "markdown"]
+
+    # A deleted PDF is rendered even though the manifest still lists it
+    (tmp_path / "sow_internal_W912.pdf").unlink()
+    agent.generate_sow_pdfs({"sow_text": "# SOW\n\nRooms: 45 per night"}, str(tmp_path), "W912", report_data=report)
+    assert fake_pdf_writers[-1] == ("markdown", "Statement of Work (SOW) - Internal - W912")
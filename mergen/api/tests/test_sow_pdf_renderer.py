@@ -0,0 +1,82 @@
+"""
+Tests for the WeasyPrint SOW renderer (stylesheet split; layout parity when
+WeasyPrint and Pango are installed)
+"""
+import pytest
+
+from app.services import sow_pdf_generator_weasyprint as weasyprint_generator
+from app.services.sow_pdf_generator_weasyprint import SOWPdfRenderer
+from app.services.sow_template_engine import render_sow_from_model
+
+CSS = "body { font-family: serif; }"
+
+
+@pytest.mark.parametrize("style_tag", ["<style>", "<style type=\"text/css\">", "<STYLE type='text/css'>"])
+def test_single_plain_style_block_is_split_out(style_tag):
+    html = f"<html><head>{style_tag}{CSS}</style></head><body>SOW</body></html>"
+
+    body, css_text = SOWPdfRenderer.split_stylesheet(html)
+
+    assert css_text == CSS
+    assert body == "<html><head></head><body>SOW</body></html>"
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        # media-scoped styles keep their meaning only inside the document
+        f"<html><head><style media=\"print\">{CSS}</style></head><body>SOW</body></html>",
+        f"<html><head><style>{CSS}</style><link rel=\"stylesheet\" href=\"sow.css\"></head><body>SOW</body></html>",
+        f"<html><head><style>{CSS}</style><style>h1 {{ color: navy; }}</style></head><body>SOW</body></html>",
+        f"<html><head><style>{CSS}</style><style media=\"print\">h1 {{ color: navy; }}</style></head><body>SOW</body></html>",
+        "<html><body>SOW</body></html>",
+        # as a user stylesheet, !important would beat inline style="" attributes
+        "<html><head><style>td { color: red ! IMPORTANT; }</style></head><body><td style=\"color: blue\">SOW</td></body></html>",
+    ],
+    ids=["media", "extra-link", "two-blocks", "plain-and-media", "no-style", "important"],
+)
+def test_other_stylesheets_leave_the_document_untouched(html):
+    assert SOWPdfRenderer.split_stylesheet(html) == (html, None)
+
+
+SOW_DATA = {
+    "event_name": "Regional Training Summit",
+    "agency": "USACE",
+    "solicitation_number": "W912-26-Q-0042",
+    "dates": {"start": "2026-04-14", "end": "2026-04-18"},
+    "location": "Orlando, FL",
+    "sleeping_rooms": [{"date": "2026-04-14", "rooms": 40}, {"date": "2026-04-15", "rooms": 45}],
+    "meeting_rooms": [{"name": "General Session", "capacity": 120, "setup": "Classroom"}],
+    "commercial_terms": {"naics_code": "721110"},
+}
+
+
+def _boxes(document):
+    """Page count plus type, geometry and text of every laid-out box."""
+    pages = []
+    for page in document.pages:
+        boxes = []
+        for box in page._page_box.descendants():
+            geometry = [box.position_x, box.position_y, box.width, box.height]
+            boxes.append((
+                type(box).__name__,
+                tuple(round(value, 3) if isinstance(value, (int, float)) else value for value in geometry),
+                getattr(box, "text", None),
+            ))
+        pages.append(boxes)
+    return len(pages), pages
+
+
+@pytest.mark.parametrize("inline_style", [False, True])
+def test_swapped_stylesheet_lays_out_like_the_html(inline_style):
+    if not weasyprint_generator.WEASYPRINT_AVAILABLE:
+        pytest.skip("WeasyPrint / Pango not available")
+    html = render_sow_from_model(SOW_DATA)
+    if inline_style:
+        html = html.replace("<body>", '<body><p style="font-size: 30px; color: green">Inline styled</p>', 1)
+    assert SOWPdfRenderer.split_stylesheet(html)[1] is not None
+
+    swapped = SOWPdfRenderer().layout(html)
+    as_is = weasyprint_generator.HTML(string=html).render()
+
+    assert _boxes(swapped) == _boxes(as_is)
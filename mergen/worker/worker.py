@@ -1,11 +1,30 @@
 #!/usr/bin/env python3
 """
 Background worker for ZgrBid
+
+Starts RQ workers for the pipeline stage queues defined in
+``app.services.job_queue`` (extraction, analysis, hotel_match, delivery).
+The number of worker processes per queue comes from WORKER_CONCURRENCY
+(e.g. "extraction=2,analysis=4,hotel_match=1,delivery=1") and can be
+overridden on the command line:
+
+    python worker.py                      # all queues, configured counts
+    python worker.py --queues analysis    # only the analysis queue
+    python worker.py --concurrency analysis=8   # other queues keep their counts
+
+Scale horizontally by running more containers of this worker.
+
+The delivery queue runs jobs in the worker process itself (``SimpleWorker``)
+instead of a forked child per job, so pooled SMTP connections and the PDF
+styles stay warm across jobs.
 """
+import argparse
+import multiprocessing
 import os
+import signal
 import sys
-from rq import Worker, Connection
 from redis import Redis
+from rq import SimpleWorker, Worker
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,21 +34,65 @@ load_dotenv()
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
 
 from app.config import settings
+from app.services.job_queue import QUEUE_SPECS, parse_worker_concurrency
+
+# Queues whose jobs run in the worker process (no fork per job)
+IN_PROCESS_QUEUES = {"delivery"}
+
+
+def run_worker(queue_name: str, index: int):
+    """Run a single RQ worker process bound to one stage queue."""
+    redis_conn = Redis.from_url(settings.redis_url)
+    worker_class = SimpleWorker if queue_name in IN_PROCESS_QUEUES else Worker
+    worker = worker_class([queue_name], connection=redis_conn, name=f"{queue_name}-{os.getpid()}-{index}")
+    print(f"[worker] {worker.name} listening on '{queue_name}'")
+    worker.work(with_scheduler=index == 0)
+
 
 def main():
     """Main worker function"""
-    # Connect to Redis
-    redis_conn = Redis.from_url(settings.redis_url)
-    
-    # Create worker
-    with Connection(redis_conn):
-        worker = Worker(['default'])
-        print("Starting ZgrBid worker...")
-        print(f"Redis URL: {settings.redis_url}")
-        worker.work()
+    parser = argparse.ArgumentParser(description="ZgrBid pipeline worker")
+    parser.add_argument("--queues", help="Comma separated queue names (default: all)")
+    parser.add_argument("--concurrency", help="Override WORKER_CONCURRENCY, e.g. analysis=4")
+    args = parser.parse_args()
 
-if __name__ == "__main__":
-    main()
+    counts = parse_worker_concurrency(settings.worker_concurrency)
+    if args.concurrency:
+        # Override only the queues named on the command line
+        counts = parse_worker_concurrency(args.concurrency, defaults=counts)
+    if args.queues:
+        selected = [q.strip() for q in args.queues.split(",") if q.strip()]
+        unknown = [q for q in selected if q not in QUEUE_SPECS]
+        if unknown:
+            parser.error(f"Unknown queue(s): {', '.join(unknown)}")
+        counts = {name: count for name, count in counts.items() if name in selected}
+
+    print("Starting ZgrBid worker...")
+    print(f"Redis URL: {settings.redis_url}")
+    print(f"Worker processes: {counts}")
+
+    processes = []
+    for queue_name, count in counts.items():
+        for index in range(count):
+            proc = multiprocessing.Process(target=run_worker, args=(queue_name, index), daemon=False)
+            proc.start()
+            processes.append(proc)
+
+    if not processes:
+        print("No worker processes configured, exiting.")
+        return
 
+    def _shutdown(signum, frame):
+        for proc in processes:
+            if proc.is_alive():
+                proc.terminate()
 
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
 
+    for proc in processes:
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()